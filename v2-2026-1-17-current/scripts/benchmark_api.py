@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+接口与分析模块基准测试
+
+在合成数据库上进程内（FastAPI TestClient）调用各分析接口，记录耗时与内存，
+结果写入 JSON 文件，可与其他提交的结果对比，发现数据规模增长后的性能回退。
+
+每个用例测量：
+    cold_ms      进程内首次调用（分词缓存、频道缓存、SQLite 页缓存均为空）
+    runs_ms      清空结果缓存后重复调用的耗时（min / p50 / p95）
+    cached_ms    命中结果缓存时的耗时
+    peak_mb      单次调用期间 Python 堆内存峰值（tracemalloc，单独一轮测量，不计入耗时）
+    bytes        响应体大小
+
+使用方法:
+    # 1 万条视频（不存在时自动生成合成数据）
+    python scripts/benchmark_api.py --size 10k
+
+    # 100 万条视频，每个用例重复 5 次，只跑部分用例
+    python scripts/benchmark_api.py --size 1m --repeat 5 --only analyze,creator_helper
+
+    # 与基线结果对比（耗时或内存增长超过 20% 标记为回退）
+    python scripts/benchmark_api.py --size 100k --compare data/benchmark/results/baseline.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from synthetic_data import SIZES, SyntheticDataGenerator, parse_size, read_params
+
+# 默认测试主题 / 评论关键词（与合成数据中占比最大的主题一致）
+THEME = "养生"
+KEYWORD = "八段锦"
+
+# 对比时超过该比例的增长视为回退
+REGRESSION_THRESHOLD = 0.20
+
+RESULTS_DIR = PROJECT_ROOT / "data" / "benchmark" / "results"
+
+
+# ==================== 用例 ====================
+
+def build_cases(client, workdir: Path) -> Dict[str, Callable[[], Any]]:
+    """
+    基准用例：名称 -> 无参调用（返回 (状态, 响应字节数)）
+
+    Args:
+        client: FastAPI TestClient
+        workdir: 合成数据所在的工作目录
+    """
+    def get(path: str, **params):
+        def call():
+            response = client.get(path, params=params)
+            status = "ok"
+            if response.status_code != 200:
+                status = f"http_{response.status_code}"
+            elif response.headers.get("content-type", "").startswith("application/json"):
+                body = response.json()
+                if isinstance(body, dict) and body.get("status") == "error":
+                    status = f"error: {body.get('message', '')}"[:200]
+            return status, len(response.content)
+        return call
+
+    def report():
+        from src.research.research_report import ResearchReportGenerator
+
+        output = workdir / "research_report.html"
+        ResearchReportGenerator(str(workdir / "data" / "youtube_pipeline.db")).generate(
+            theme=THEME, output_path=str(output)
+        )
+        return "ok", output.stat().st_size
+
+    return {
+        "analyze": get(f"/api/analyze/{THEME}", limit=1000, min_views=0),
+        "analyze_ndjson": get(f"/api/analyze/{THEME}", limit=5000, min_views=0, mode="ndjson"),
+        "creator_helper": get(f"/api/creator-helper/{THEME}"),
+        "centrality": get("/api/centrality"),
+        "user_insights": get(f"/api/user-insights/{KEYWORD}"),
+        "research_report": report,
+    }
+
+
+def _clear_result_caches():
+    """清空结果缓存（分词、频道等底层缓存保留，测的是"数据未变时重新计算"的耗时）"""
+    from src.shared.result_cache import get_analysis_cache
+
+    get_analysis_cache().invalidate()
+
+
+def _timed(call: Callable[[], Any]) -> tuple:
+    started = time.perf_counter()
+    status, size = call()
+    return (time.perf_counter() - started) * 1000, status, size
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_case(name: str, call: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """执行单个用例"""
+    result: Dict[str, Any] = {"name": name}
+    try:
+        gc.collect()
+        cold_ms, status, size = _timed(call)
+        result.update(status=status, bytes=size, cold_ms=round(cold_ms, 2))
+
+        cached_ms, _, _ = _timed(call)
+        result["cached_ms"] = round(cached_ms, 2)
+
+        runs = []
+        for _ in range(repeat):
+            _clear_result_caches()
+            gc.collect()
+            elapsed, _, _ = _timed(call)
+            runs.append(elapsed)
+        result["runs_ms"] = {
+            "min": round(min(runs), 2),
+            "p50": round(statistics.median(runs), 2),
+            "p95": round(_percentile(runs, 95), 2),
+        }
+
+        # 内存单独测一轮（tracemalloc 会显著拖慢执行）
+        _clear_result_caches()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            call()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result["peak_mb"] = round(peak / 1024 / 1024, 2)
+    except Exception as e:
+        result["status"] = f"exception: {type(e).__name__}: {e}"[:200]
+    return result
+
+
+# ==================== 环境 ====================
+
+def _git_info() -> Dict[str, Optional[str]]:
+    def git(*args):
+        try:
+            return subprocess.run(
+                ["git", *args], cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=10
+            ).stdout.strip() or None
+        except Exception:
+            return None
+
+    return {
+        "commit": git("rev-parse", "--short", "HEAD"),
+        "subject": git("log", "-1", "--format=%s"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+    }
+
+
+def _max_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位为 KB，macOS 为字节
+    return round(rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024, 1)
+
+
+def prepare_workdir(workdir: Path, generator: SyntheticDataGenerator, regenerate: bool) -> Path:
+    """准备合成数据库（参数一致时复用已有数据）"""
+    db_path = workdir / "data" / "youtube_pipeline.db"
+    if not regenerate and read_params(db_path) == generator.params():
+        print(f"复用合成数据: {db_path}")
+        return db_path
+
+    print(f"生成合成数据: {generator.videos:,} 条视频 → {db_path}")
+    if db_path.exists():
+        db_path.unlink()
+    started = time.time()
+    generator.write(db_path)
+    print(f"生成完成，耗时 {time.time() - started:.1f}s")
+    return db_path
+
+
+# ==================== 对比 ====================
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """
+    与基线结果对比
+
+    Returns:
+        回退的用例描述（耗时 p50 或内存峰值增长超过 REGRESSION_THRESHOLD）
+    """
+    base_cases = {case["name"]: case for case in baseline.get("cases", [])}
+    regressions = []
+
+    print(f"\n对比基线 {baseline.get('git', {}).get('commit')} ({baseline.get('dataset', {}).get('videos', 0):,} 条视频)")
+    print(f"{'用例':<18}{'p50 基线':>12}{'p50 当前':>12}{'变化':>9}{'内存 基线':>12}{'内存 当前':>12}{'变化':>9}")
+    for case in current["cases"]:
+        base = base_cases.get(case["name"])
+        if not base or "runs_ms" not in base or "runs_ms" not in case:
+            continue
+        cells = []
+        for label, old, new in (
+            ("p50", base["runs_ms"]["p50"], case["runs_ms"]["p50"]),
+            ("peak_mb", base.get("peak_mb"), case.get("peak_mb")),
+        ):
+            change = (new - old) / old if old else 0.0
+            cells.append((old, new, change))
+            if change > REGRESSION_THRESHOLD:
+                regressions.append(f"{case['name']} {label}: {old} → {new} (+{change:.0%})")
+        (t_old, t_new, t_change), (m_old, m_new, m_change) = cells
+        print(f"{case['name']:<20}{t_old:>12.1f}{t_new:>12.1f}{t_change:>+9.0%}"
+              f"{m_old or 0:>12.1f}{m_new or 0:>12.1f}{m_change:>+9.0%}")
+
+    if baseline.get("dataset", {}).get("params") != current["dataset"]["params"]:
+        print("⚠️ 基线使用的合成数据参数不同，对比结果仅供参考")
+    return regressions
+
+
+# ==================== 入口 ====================
+
+def main():
+    parser = argparse.ArgumentParser(description="接口与分析模块基准测试")
+    parser.add_argument("--size", default="10k", help=f"规模：{'/'.join(SIZES)} 或视频数")
+    parser.add_argument("--seed", type=int, default=42, help="合成数据随机种子")
+    parser.add_argument("--anchor", default=None, help="合成数据基准日期 YYYY-MM-DD（默认今天）")
+    parser.add_argument("--repeat", type=int, default=3, help="每个用例清空结果缓存后的重复次数")
+    parser.add_argument("--only", default=None, help="只运行指定用例（逗号分隔）")
+    parser.add_argument("--workdir", default=None, help="合成数据目录（默认 data/benchmark/<size>-<seed>）")
+    parser.add_argument("--regenerate", action="store_true", help="强制重新生成合成数据")
+    parser.add_argument("--output", default=None, help="结果 JSON 路径（默认 data/benchmark/results/<commit>-<size>.json）")
+    parser.add_argument("--compare", default=None, help="对比的基线结果 JSON")
+    args = parser.parse_args()
+
+    if os.environ.get("DATABASE_URL"):
+        print("❌ 检测到 DATABASE_URL，基准测试只在本地 SQLite 合成数据上运行，请先取消该环境变量")
+        sys.exit(1)
+
+    videos = parse_size(args.size)
+    generator = SyntheticDataGenerator(
+        videos, seed=args.seed, anchor=date.fromisoformat(args.anchor) if args.anchor else None
+    )
+    workdir = Path(args.workdir or PROJECT_ROOT / "data" / "benchmark" / f"{args.size}-{args.seed}").resolve()
+    db_path = prepare_workdir(workdir, generator, args.regenerate)
+
+    # 各接口按相对路径 data/youtube_pipeline.db 打开数据库，切换到工作目录
+    os.chdir(workdir)
+    from fastapi.testclient import TestClient
+    import src.api_server as api_server
+
+    api_server.SERVER_DB_PATH = db_path
+    client = TestClient(api_server.app)
+
+    cases = build_cases(client, workdir)
+    if args.only:
+        selected = [name.strip() for name in args.only.split(",") if name.strip()]
+        unknown = [name for name in selected if name not in cases]
+        if unknown:
+            print(f"❌ 未知用例: {', '.join(unknown)}（可选: {', '.join(cases)}）")
+            sys.exit(1)
+        cases = {name: cases[name] for name in selected}
+
+    results = []
+    for name, call in cases.items():
+        print(f"▶ {name} ...", end=" ", flush=True)
+        result = run_case(name, call, args.repeat)
+        results.append(result)
+        if "runs_ms" in result:
+            print(f"cold {result['cold_ms']:.0f}ms | p50 {result['runs_ms']['p50']:.0f}ms | "
+                  f"cached {result['cached_ms']:.1f}ms | peak {result['peak_mb']:.1f}MB | {result['status']}")
+        else:
+            print(result["status"])
+
+    git = _git_info()
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git": git,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "dataset": {
+            "videos": videos,
+            "params": generator.params(),
+            "db_size_mb": round(db_path.stat().st_size / 1024 / 1024, 1),
+        },
+        "repeat": args.repeat,
+        "max_rss_mb": _max_rss_mb(),
+        "cases": results,
+    }
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{git['commit'] or 'unknown'}-{args.size}.json"
+    if not output.is_absolute():
+        output = PROJECT_ROOT / output
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n结果已写入: {output}")
+
+    if args.compare:
+        baseline_path = Path(args.compare)
+        if not baseline_path.is_absolute():
+            baseline_path = PROJECT_ROOT / baseline_path
+        regressions = compare(report, json.loads(baseline_path.read_text(encoding="utf-8")))
+        if regressions:
+            print("\n⚠️ 性能回退:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(2)
+        print("\n✓ 未发现性能回退")
+
+
+if __name__ == "__main__":
+    main()
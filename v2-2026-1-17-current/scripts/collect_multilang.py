@@ -21,7 +21,7 @@ import argparse
 import json
 import sqlite3
 import subprocess
-import time
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
@@ -29,6 +29,14 @@ from typing import Dict, List, Optional, Any
 # 路径配置
 DB_PATH = Path(__file__).parent.parent / "data" / "youtube_pipeline.db"
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.research.request_governor import get_governor
+
+
+class SearchError(Exception):
+    """yt-dlp 搜索失败（消息为 stderr，限流信号由请求调度器识别）"""
+    pass
+
 # ============================================================
 # 多语言关键词映射表
 # ============================================================
@@ -159,9 +167,17 @@ def init_multilang_table():
     print("✓ multilang_videos 表已初始化")
 
 
+def run_search(cmd: List[str]) -> str:
+    """执行 yt-dlp 搜索命令，返回 stdout（失败抛 SearchError）"""
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
+    if result.returncode != 0:
+        raise SearchError(result.stderr.strip() or f"yt-dlp 退出码 {result.returncode}")
+    return result.stdout
+
+
 def search_videos(keyword: str, lang: str, geo: str, max_results: int = 50) -> List[Dict]:
     """
-    使用 yt-dlp 搜索视频
+    使用 yt-dlp 搜索视频（经请求调度器发出，限流时退避重试）
 
     Args:
         keyword: 搜索关键词
@@ -182,13 +198,10 @@ def search_videos(keyword: str, lang: str, geo: str, max_results: int = 50) -> L
             f"ytsearch{max_results}:{keyword}"
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
-
-        if result.returncode != 0:
-            return []
+        output = get_governor().call("search", run_search, cmd)
 
         videos = []
-        for line in result.stdout.strip().split('\n'):
+        for line in output.strip().split('\n'):
             if not line:
                 continue
             try:
@@ -207,7 +220,7 @@ def search_videos(keyword: str, lang: str, geo: str, max_results: int = 50) -> L
 
         return videos
 
-    except subprocess.TimeoutExpired:
+    except (subprocess.TimeoutExpired, SearchError):
         return []
     except Exception as e:
         print(f"  搜索失败: {e}")
@@ -285,7 +298,6 @@ def collect_topic_multilang(topic: str, languages: List[str],
             saved = save_videos(videos, lang, geo, topic, keyword)
 
             lang_total += saved
-            time.sleep(2)  # 请求间隔
 
         stats["languages"][lang] = lang_total
         print(f"  [{config['name']}] 保存 {lang_total} 条")
@@ -416,8 +428,6 @@ def main():
         stats = collect_topic_multilang(topic, languages, args.max)
         all_stats.append(stats)
 
-        time.sleep(3)  # 话题间休息
-
     # 输出汇总
     print("\n" + "=" * 70)
     print("采集完成汇总")
@@ -253,10 +253,6 @@ def daily_update(config_name: str = DEFAULT_CONFIG, max_keywords: int = None) ->
         else:
             fail_count += 1
 
-        # 关键词之间间隔，避免请求过快
-        if i < len(keywords) - 1:
-            time.sleep(3)
-
     # 汇总
     total_elapsed = time.time() - start_time
     stats = collector.get_statistics()
@@ -18,7 +18,7 @@
 使用方法:
     python scripts/fetch_channel_info.py              # 采集所有
     python scripts/fetch_channel_info.py --limit 100  # 只采集100个
-    python scripts/fetch_channel_info.py --workers 5  # 5并发
+    python scripts/fetch_channel_info.py --workers 5  # 最多5个线程（实际并发由请求调度器按限流情况调整）
 """
 
 import argparse
@@ -36,9 +36,13 @@ from typing import Optional, Dict, Any
 # 路径配置
 DB_PATH = Path(__file__).parent.parent / "data" / "youtube_pipeline.db"
 
-# 并发配置
-DEFAULT_WORKERS = 3
-REQUEST_DELAY = 1.5  # 请求间隔（秒）
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.research.request_governor import get_governor
+
+
+class PageFetchError(Exception):
+    """页面下载失败（消息含 HTTP 状态码，429 由请求调度器识别为限流）"""
+    pass
 
 
 def get_connection():
@@ -206,26 +210,44 @@ def parse_count(count_str: str) -> int:
     return int(num)
 
 
+def download_page(url: str) -> str:
+    """
+    下载页面 HTML
+
+    Raises:
+        PageFetchError: curl 失败或 HTTP 状态码不是 2xx
+        subprocess.TimeoutExpired: 超时
+    """
+    cmd = ["curl", "-s", "-L", "--max-time", "15",
+           "-H", "Accept-Language: en-US,en;q=0.9",  # 强制英文以统一日期格式
+           "-w", "\n%{http_code}",                   # 末行追加状态码，用于识别 429 限流
+           url]
+
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=20)
+    if result.returncode != 0:
+        raise PageFetchError(f"curl 退出码 {result.returncode}: {result.stderr.strip()}")
+
+    html, _, status = result.stdout.rpartition("\n")
+    if status == "429":
+        raise PageFetchError("HTTP Error 429: Too Many Requests")
+    if not status.startswith("2"):
+        raise PageFetchError(f"HTTP Error {status}")
+    return html
+
+
 def fetch_channel_about(channel_id: str) -> Optional[Dict[str, Any]]:
     """
     从 YouTube 频道 About 页面获取完整信息
 
-    直接解析页面内嵌的 ytInitialData JSON
+    直接解析页面内嵌的 ytInitialData JSON；请求经请求调度器发出（限流时退避重试）
     """
     try:
         url = f"https://www.youtube.com/channel/{channel_id}/about"
 
-        cmd = ["curl", "-s", "-L", "--max-time", "15",
-               "-H", "Accept-Language: en-US,en;q=0.9",  # 强制英文以统一日期格式
-               url]
-
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=20)
-
-        if result.returncode != 0 or not result.stdout:
+        html = get_governor().call("channel", download_page, url)
+        if not html:
             return None
 
-        html = result.stdout
-
         # 提取 ytInitialData JSON
         match = re.search(r'var ytInitialData = ({.*?});', html)
         if not match:
@@ -381,7 +403,6 @@ def process_channel(channel: dict) -> dict:
     channel_id = channel["channel_id"]
 
     info = fetch_channel_about(channel_id)
-    time.sleep(REQUEST_DELAY)
 
     if info and (info["subscriber_count"] > 0 or info["created_at"]):
         save_channel_info(info)
@@ -415,8 +436,8 @@ def format_number(n: int) -> str:
 
 def main():
     parser = argparse.ArgumentParser(description="采集 YouTube 频道完整信息")
-    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
-                        help=f"并发数 (默认 {DEFAULT_WORKERS})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="线程数 (默认取请求调度器的 channel 并发上限)")
     parser.add_argument("--limit", type=int, default=None,
                         help="最多采集 N 个频道")
     args = parser.parse_args()
@@ -439,8 +460,8 @@ def main():
         print("没有需要采集的频道")
         return
 
-    print(f"并发数: {args.workers}")
-    print(f"预计耗时: {total * REQUEST_DELAY / args.workers / 60:.1f} 分钟")
+    workers = args.workers or get_governor().max_concurrency("channel")
+    print(f"线程数: {workers}（实际并发按限流情况自适应）")
     print("\n" + "-" * 70)
     print(f"{'#':<5} {'状态':<4} {'频道名':<20} {'订阅':<10} {'视频':<8} {'创建时间':<12} {'地区'}")
     print("-" * 70)
@@ -450,7 +471,7 @@ def main():
     start_time = time.time()
 
     try:
-        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
             futures = {executor.submit(process_channel, ch): ch for ch in channels}
 
             for i, future in enumerate(as_completed(futures)):
@@ -22,11 +22,10 @@
 """
 
 import argparse
-import json
 import sqlite3
-import subprocess
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, List, Dict, Any
@@ -34,10 +33,16 @@ from typing import Optional, List, Dict, Any
 # 路径配置
 DB_PATH = Path(__file__).parent.parent / "data" / "youtube_pipeline.db"
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.research.request_governor import get_governor
+from src.research.yt_dlp_client import YtDlpClient, YtDlpError
+
 # 默认配置
 DEFAULT_VIDEO_LIMIT = 100      # 默认采集 Top 100 视频
 DEFAULT_MAX_COMMENTS = 50      # 每视频最多评论数
-REQUEST_DELAY = 3              # 请求间隔（秒）
+
+# yt-dlp 客户端（main 中创建，各线程共享；请求速率和并发由请求调度器控制）
+ytdlp = None
 
 
 def get_connection():
@@ -129,23 +134,8 @@ def fetch_comments(youtube_id: str, max_comments: int = 50) -> Optional[List[Dic
         评论列表
     """
     try:
-        cmd = [
-            "yt-dlp",
-            "--dump-json",
-            "--no-download",
-            "--no-warnings",
-            "--write-comments",
-            "--extractor-args", f"youtube:comment_sort=top;max_comments={max_comments}",
-            f"https://www.youtube.com/watch?v={youtube_id}"
-        ]
-
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
-
-        if result.returncode != 0:
-            return None
-
-        data = json.loads(result.stdout)
-        comments = data.get("comments", [])
+        data = ytdlp.get_video_json(youtube_id, max_comments=max_comments, timeout=120)
+        comments = data.get("comments") or []
 
         # 解析评论
         parsed = []
@@ -165,9 +155,7 @@ def fetch_comments(youtube_id: str, max_comments: int = 50) -> Optional[List[Dic
 
         return parsed
 
-    except subprocess.TimeoutExpired:
-        return None
-    except json.JSONDecodeError:
+    except YtDlpError:
         return None
     except Exception as e:
         print(f"  错误: {e}")
@@ -212,6 +200,8 @@ def save_comments(comments: List[Dict]):
 
 
 def main():
+    global ytdlp
+
     parser = argparse.ArgumentParser(description="采集 YouTube 视频评论")
     parser.add_argument("--limit", type=int, default=DEFAULT_VIDEO_LIMIT,
                         help=f"采集 Top N 视频 (默认 {DEFAULT_VIDEO_LIMIT})")
@@ -226,6 +216,8 @@ def main():
 
     # 初始化表
     init_comments_table()
+    workers = get_governor().max_concurrency('comments')
+    ytdlp = YtDlpClient(concurrency=workers)
 
     # 获取 Top 视频
     videos = get_top_videos(args.limit)
@@ -233,7 +225,7 @@ def main():
 
     print(f"\n待采集视频: {total} 个")
     print(f"每视频最多: {args.max_comments} 条评论")
-    print(f"预计耗时: {total * (REQUEST_DELAY + 5) / 60:.1f} 分钟")
+    print(f"并发上限: {workers}（按限流情况自适应）")
     print("\n" + "-" * 70)
     print(f"{'#':<5} {'状态':<4} {'标题':<30} {'播放':<10} {'评论':<8} {'采集'}")
     print("-" * 70)
@@ -242,27 +234,28 @@ def main():
     stats = {"success": 0, "error": 0, "total_comments": 0}
     start_time = time.time()
 
-    for i, video in enumerate(videos):
-        youtube_id = video["youtube_id"]
-        title = video["title"][:28]
-        view_count = video["view_count"]
-        comment_count = video["comment_count"]
-
-        # 采集评论
-        comments = fetch_comments(youtube_id, args.max_comments)
-
-        if comments:
-            save_comments(comments)
-            stats["success"] += 1
-            stats["total_comments"] += len(comments)
-            print(f"{i+1:<5} {'✓':<4} {title:<30} {view_count:<10,} {comment_count:<8} {len(comments)}条")
-        else:
-            stats["error"] += 1
-            print(f"{i+1:<5} {'✗':<4} {title:<30} {view_count:<10,} {comment_count:<8} 失败")
-
-        # 请求间隔
-        if i < total - 1:
-            time.sleep(REQUEST_DELAY)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(fetch_comments, video["youtube_id"], args.max_comments): video
+            for video in videos
+        }
+
+        # 评论按完成顺序在主线程写入数据库
+        for i, future in enumerate(as_completed(futures)):
+            video = futures[future]
+            comments = future.result()
+            title = video["title"][:28]
+            view_count = video["view_count"]
+            comment_count = video["comment_count"]
+
+            if comments:
+                save_comments(comments)
+                stats["success"] += 1
+                stats["total_comments"] += len(comments)
+                print(f"{i+1:<5} {'✓':<4} {title:<30} {view_count:<10,} {comment_count:<8} {len(comments)}条")
+            else:
+                stats["error"] += 1
+                print(f"{i+1:<5} {'✗':<4} {title:<30} {view_count:<10,} {comment_count:<8} 失败")
 
     elapsed = time.time() - start_time
 
@@ -15,6 +15,7 @@ from pathlib import Path
 # 添加项目根目录到路径
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.shared.repositories import CompetitorVideoRepository
 from src.research.yt_dlp_client import YtDlpClient, YtDlpError
 
 
@@ -40,11 +41,14 @@ def fix_missing_channel_names(db_path: str = "data/youtube_pipeline.db", limit:
     """, (limit,))
 
     videos = cursor.fetchall()
+    conn.close()
 
     if not videos:
         print("没有需要修复的视频")
         return
 
+    repo = CompetitorVideoRepository(db_path)
+
     print(f"找到 {len(videos)} 个需要修复的视频")
 
     # 初始化 yt-dlp
@@ -68,13 +72,11 @@ def fix_missing_channel_names(db_path: str = "data/youtube_pipeline.db", limit:
             subscriber_count = info.get('subscriber_count', 0)
 
             if channel_name:
-                # 更新数据库
-                cursor.execute("""
-                    UPDATE competitor_videos
-                    SET channel_name = ?, subscriber_count = ?
-                    WHERE youtube_id = ?
-                """, (channel_name, subscriber_count, youtube_id))
-                conn.commit()
+                # 更新数据库（经 Repository 写入，同步维护聚合表）
+                repo.update_fields(youtube_id, {
+                    'channel_name': channel_name,
+                    'subscriber_count': subscriber_count,
+                })
                 print(f"✓ {channel_name}")
                 fixed_count += 1
             else:
@@ -91,8 +93,6 @@ def fix_missing_channel_names(db_path: str = "data/youtube_pipeline.db", limit:
             print(f"✗ 异常: {e}")
             fail_count += 1
 
-    conn.close()
-
     print(f"\n完成: 修复 {fixed_count} 个, 失败 {fail_count} 个")
 
 
@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+合成数据生成器（基准测试用）
+
+按固定随机种子生成可复现的 competitor_videos / channels / video_comments / video_stats_history 数据，
+标题、标签、评论均为中文模板拼接，播放量服从长尾分布，频道规模服从幂律分布，
+用于在 1 万到 500 万视频规模下测量接口与分析模块的耗时和内存。
+
+同一组 (videos, seed, anchor) 参数生成的数据完全一致。
+
+使用方法:
+    # 生成 10 万条视频到 data/benchmark/100k/data/youtube_pipeline.db
+    python scripts/synthetic_data.py --size 100k
+
+    # 指定视频数、种子和输出路径
+    python scripts/synthetic_data.py --videos 250000 --seed 7 --db /tmp/bench.db
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import sqlite3
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from itertools import accumulate
+from typing import Dict, Iterator, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# 预设规模（视频数）
+SIZES = {
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+    "5m": 5_000_000,
+}
+
+# 每批写入的行数
+BATCH_ROWS = 5000
+
+# 默认每个视频的评论数 / 历史快照数
+COMMENTS_PER_VIDEO = 2
+HISTORY_PER_VIDEO = 3
+
+# 平均每个频道的视频数
+VIDEOS_PER_CHANNEL = 25
+
+# 发布时间跨度（天）
+PUBLISH_SPAN_DAYS = 3 * 365
+
+# 主题 -> (占比, 关键词, 标题主体词)
+THEMES = {
+    "养生": (0.55, ["老人养生", "中医养生", "养生食谱", "八段锦", "穴位按摩", "睡眠改善"],
+            ["八段锦", "穴位按摩", "艾灸", "泡脚", "食疗", "太极拳", "五禽戏", "拍打操", "气血", "脾胃", "肝脏", "颈椎", "膝盖"]),
+    "美食": (0.15, ["家常菜", "快手早餐", "减脂餐", "地方小吃"],
+            ["红烧肉", "番茄炒蛋", "小米粥", "包子", "凉拌菜", "炖汤", "手擀面", "饺子", "卤味"]),
+    "科技": (0.12, ["手机评测", "AI工具", "电脑装机", "数码开箱"],
+            ["手机", "平板", "笔记本", "耳机", "ChatGPT", "显卡", "智能手表", "路由器"]),
+    "旅行": (0.10, ["自驾游", "穷游攻略", "古镇", "海岛"],
+            ["云南", "西藏", "新疆", "川西", "海南", "桂林", "敦煌", "大理"]),
+    "教育": (0.08, ["英语口语", "小学数学", "书法入门", "钢琴自学"],
+            ["单词", "口算", "楷书", "五线谱", "作文", "拼音", "古诗"]),
+}
+
+AUDIENCES = ["老年人", "中老年人", "50岁以上", "上班族", "宝妈", "新手", "学生", "退休人员"]
+ACTIONS = ["每天坚持", "一学就会", "简单几步", "跟着做", "在家就能练", "手把手教你", "10分钟学会"]
+EFFECTS = ["效果惊人", "比吃药还管用", "医生都推荐", "坚持一个月变化明显", "太实用了", "建议收藏", "99%的人不知道"]
+HOOKS = ["必看", "干货", "揭秘", "注意", "千万别", "终于找到了", "强烈推荐"]
+
+TITLE_TEMPLATES = [
+    "{audience}{hook}！{subject}{action}，{effect}",
+    "【{subject}】{action}｜{effect}",
+    "{subject}的{n}个技巧，{audience}{hook}",
+    "{hook}：{subject}这样做，{effect}",
+    "{audience}学{subject}，{action}",
+    "{n}分钟{subject}跟练｜{effect}",
+    "为什么{audience}都在练{subject}？{effect}",
+    "{subject}｜{keyword}第{n}集",
+]
+
+COMMENT_TEMPLATES = [
+    "跟着练了{n}天，{feeling}",
+    "请问{subject}每天做几次比较好？",
+    "老师讲得太好了，{feeling}",
+    "我妈{n}岁了，可以练{subject}吗？",
+    "收藏了，{feeling}",
+    "{subject}做完之后{body}有点酸，正常吗？",
+    "已经坚持{n}个月了，{feeling}",
+    "希望多出一些{subject}的视频",
+]
+FEELINGS = ["感觉很有用", "睡眠好多了", "效果不错", "谢谢分享", "学到了", "浑身轻松", "有点难度"]
+BODY_PARTS = ["肩膀", "腰", "膝盖", "脖子", "手臂"]
+
+COUNTRIES = ["CN", "TW", "HK", "SG", "MY", "US", "CA"]
+CATEGORIES = ["Howto & Style", "Education", "People & Blogs", "Entertainment", "Science & Technology"]
+
+ID_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+
+CREATE_META_SQL = """
+CREATE TABLE IF NOT EXISTS bench_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+)
+"""
+
+
+def _make_id(rng: random.Random, length: int, prefix: str = "") -> str:
+    return prefix + "".join(rng.choice(ID_ALPHABET) for _ in range(length))
+
+
+def _video_id(seed: int, index: int) -> str:
+    """第 index 个视频的 ID（由种子和序号推导，评论/历史生成时无需保存全部 ID）"""
+    digest = hashlib.blake2b(f"{seed}:{index}".encode(), digest_size=9).digest()
+    return base64.urlsafe_b64encode(digest).decode()[:11]
+
+
+def _pick_theme(rng: random.Random) -> str:
+    roll = rng.random()
+    for theme, (share, _, _) in THEMES.items():
+        if roll < share:
+            return theme
+        roll -= share
+    return "养生"
+
+
+def _make_title(rng: random.Random, theme: str, keyword: str) -> str:
+    subjects = THEMES[theme][2]
+    return rng.choice(TITLE_TEMPLATES).format(
+        audience=rng.choice(AUDIENCES),
+        hook=rng.choice(HOOKS),
+        subject=rng.choice(subjects),
+        action=rng.choice(ACTIONS),
+        effect=rng.choice(EFFECTS),
+        keyword=keyword,
+        n=rng.randint(3, 30),
+    )
+
+
+class SyntheticDataGenerator:
+    """可复现的合成数据生成器"""
+
+    def __init__(
+        self,
+        videos: int,
+        seed: int = 42,
+        anchor: Optional[date] = None,
+        comments_per_video: float = COMMENTS_PER_VIDEO,
+        history_per_video: float = HISTORY_PER_VIDEO,
+    ):
+        """
+        Args:
+            videos: 视频数
+            seed: 随机种子
+            anchor: 基准日期（最新发布时间），默认今天
+            comments_per_video: 平均每个视频的评论数
+            history_per_video: 平均每个视频的播放量历史快照数
+        """
+        self.videos = videos
+        self.seed = seed
+        self.anchor = anchor or date.today()
+        self.comments_per_video = comments_per_video
+        self.history_per_video = history_per_video
+        self.channel_count = max(10, videos // VIDEOS_PER_CHANNEL)
+
+        self._anchor_dt = datetime.combine(self.anchor, datetime.min.time())
+        self._channels = self._build_channels()
+        # 大频道视频更多：按订阅数平方根加权抽取频道
+        self._channel_weights = list(accumulate(c["subscriber_count"] ** 0.5 for c in self._channels))
+
+    def params(self) -> Dict[str, object]:
+        """生成参数（写入 bench_meta，用于判断是否可以复用已有数据库）"""
+        return {
+            "videos": self.videos,
+            "seed": self.seed,
+            "anchor": self.anchor.isoformat(),
+            "channels": self.channel_count,
+            "comments_per_video": self.comments_per_video,
+            "history_per_video": self.history_per_video,
+        }
+
+    def _build_channels(self) -> List[dict]:
+        """频道列表（订阅数服从幂律分布，少数头部频道占大部分播放）"""
+        rng = random.Random(f"{self.seed}:channels")
+        channels = []
+        for i in range(self.channel_count):
+            theme = _pick_theme(rng)
+            subscribers = int(min(rng.paretovariate(1.1) * 800, 20_000_000))
+            created = self.anchor - timedelta(days=rng.randint(30, 12 * 365))
+            channels.append({
+                "channel_id": _make_id(rng, 22, "UC"),
+                "channel_name": f"{rng.choice(THEMES[theme][2])}{rng.choice(['课堂', '频道', '日记', '小屋', '说', '研究所'])}{i}",
+                "theme": theme,
+                "subscriber_count": subscribers,
+                "country": rng.choice(COUNTRIES),
+                "created_at": created.isoformat(),
+            })
+        return channels
+
+    # ==================== 行生成 ====================
+
+    def iter_videos(self) -> Iterator[tuple]:
+        """competitor_videos 行（列顺序见 VIDEO_COLUMNS）"""
+        rng = random.Random(f"{self.seed}:videos")
+        for index in range(self.videos):
+            channel = rng.choices(self._channels, cum_weights=self._channel_weights)[0]
+            theme = channel["theme"] if rng.random() < 0.9 else _pick_theme(rng)
+            keyword = rng.choice(THEMES[theme][1])
+            title = _make_title(rng, theme, keyword)
+
+            # 播放量：对数正态长尾，叠加频道规模
+            scale = 1 + channel["subscriber_count"] / 50_000
+            views = int(rng.lognormvariate(8, 2.2) * scale)
+            likes = int(views * rng.uniform(0.005, 0.06))
+            comments = int(views * rng.uniform(0.0005, 0.006))
+            published = self._anchor_dt - timedelta(
+                days=int(rng.random() ** 1.6 * PUBLISH_SPAN_DAYS),
+                seconds=rng.randint(0, 86399),
+            )
+            collected = published + timedelta(days=rng.randint(0, 30))
+            has_details = 1 if rng.random() < 0.7 else 0
+            tags = [keyword, theme] + rng.sample(THEMES[theme][2], 3)
+
+            youtube_id = _video_id(self.seed, index)
+            yield (
+                youtube_id, title, channel["channel_name"], views,
+                rng.randint(30, 3600), published.isoformat(),
+                has_details, likes, comments,
+                f"{title}\n本期内容：{'、'.join(tags[2:])}" if has_details else None,
+                json.dumps(tags, ensure_ascii=False) if has_details else None,
+                channel["channel_id"], f"https://i.ytimg.com/vi/{youtube_id}/hqdefault.jpg",
+                rng.choice(CATEGORIES),
+                channel["subscriber_count"] if has_details else None,
+                theme, keyword, "unknown", None,
+                min(collected, self._anchor_dt).isoformat(),
+            )
+
+    def iter_channels(self) -> Iterator[tuple]:
+        """channels 行"""
+        rng = random.Random(f"{self.seed}:channel_rows")
+        for channel in self._channels:
+            yield (
+                channel["channel_id"], channel["channel_name"], f"@{channel['channel_id'][2:12].lower()}",
+                channel["subscriber_count"], rng.randint(10, 2000),
+                channel["subscriber_count"] * rng.randint(20, 300),
+                channel["country"], f"{channel['channel_name']}，分享{channel['theme']}相关内容",
+                channel["created_at"], f"https://www.youtube.com/channel/{channel['channel_id']}",
+            )
+
+    def iter_comments(self) -> Iterator[tuple]:
+        """video_comments 行"""
+        rng = random.Random(f"{self.seed}:comments")
+        subjects = THEMES["养生"][2]
+        serial = 0
+        for index in range(self.videos):
+            youtube_id = _video_id(self.seed, index)
+            for _ in range(int(rng.expovariate(1 / self.comments_per_video)) if self.comments_per_video else 0):
+                serial += 1
+                text = rng.choice(COMMENT_TEMPLATES).format(
+                    n=rng.randint(2, 90), feeling=rng.choice(FEELINGS),
+                    subject=rng.choice(subjects), body=rng.choice(BODY_PARTS),
+                )
+                published = self._anchor_dt - timedelta(days=rng.randint(0, PUBLISH_SPAN_DAYS))
+                yield (
+                    youtube_id, f"Ug{serial:012d}", text, f"用户{rng.randint(1, 10**6)}",
+                    f"@user{rng.randint(1, 10**6)}", int(rng.paretovariate(1.3)) - 1,
+                    rng.randint(0, 5), 1 if rng.random() < 0.01 else 0,
+                    1 if rng.random() < 0.03 else 0, published.strftime('%Y-%m-%d'),
+                )
+
+    def iter_history(self) -> Iterator[tuple]:
+        """video_stats_history 行"""
+        rng = random.Random(f"{self.seed}:history")
+        for index in range(self.videos):
+            youtube_id = _video_id(self.seed, index)
+            views = rng.randint(100, 10_000)
+            for step in range(int(rng.expovariate(1 / self.history_per_video)) if self.history_per_video else 0):
+                delta = int(views * rng.uniform(0.01, 0.5))
+                views += delta
+                recorded = self._anchor_dt - timedelta(hours=6 * (20 - step))
+                yield (
+                    youtube_id, views, int(views * 0.03), int(views * 0.002),
+                    recorded.strftime('%Y-%m-%d %H:%M:%S'), delta, 6,
+                    round(delta / max(views - delta, 1), 4),
+                )
+
+    # ==================== 写入 ====================
+
+    def write(self, db_path: Path, verbose: bool = True) -> Dict[str, int]:
+        """
+        写入 SQLite 数据库（已存在的同名表会被清空）
+
+        Args:
+            db_path: 数据库路径
+            verbose: 是否打印进度
+
+        Returns:
+            每张表写入的行数
+        """
+        from src.shared.repositories import AggregateRepository, CompetitorVideoRepository
+
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        CompetitorVideoRepository(db_path)  # 建表 + 索引（与线上结构一致）
+
+        # 数据库已是 WAL 模式（见 sqlite_tuning），仓库的空闲连接仍打开着，不能再切换 journal_mode
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("PRAGMA synchronous=OFF")
+        _create_tables(conn)
+        for table in ("competitor_videos", "channels", "video_comments", "video_stats_history"):
+            conn.execute(f"DELETE FROM {table}")
+
+        counts = {}
+        for table, columns, rows in (
+            ("competitor_videos", VIDEO_COLUMNS, self.iter_videos()),
+            ("channels", CHANNEL_COLUMNS, self.iter_channels()),
+            ("video_comments", COMMENT_COLUMNS, self.iter_comments()),
+            ("video_stats_history", HISTORY_COLUMNS, self.iter_history()),
+        ):
+            started = time.time()
+            counts[table] = _insert_rows(conn, table, columns, rows)
+            if verbose:
+                print(f"  ✓ {table}: {counts[table]:,} 行 ({time.time() - started:.1f}s)")
+
+        conn.execute(CREATE_META_SQL)
+        conn.execute("DELETE FROM bench_meta")
+        conn.executemany(
+            "INSERT INTO bench_meta (key, value) VALUES (?, ?)",
+            [(k, json.dumps(v)) for k, v in self.params().items()],
+        )
+        conn.commit()
+        conn.execute("ANALYZE")
+        conn.close()
+
+        # 直接写入基础表绕过了增量维护，最后全量重建聚合表
+        AggregateRepository(db_path).rebuild()
+        return counts
+
+
+VIDEO_COLUMNS = (
+    "youtube_id", "title", "channel_name", "view_count", "duration", "published_at",
+    "has_details", "like_count", "comment_count", "description", "tags",
+    "channel_id", "thumbnail_url", "category", "subscriber_count",
+    "theme", "keyword_source", "pattern_type", "pattern_score", "collected_at",
+)
+CHANNEL_COLUMNS = (
+    "channel_id", "channel_name", "handle", "subscriber_count", "video_count",
+    "total_views", "country", "description", "created_at", "canonical_url",
+)
+COMMENT_COLUMNS = (
+    "youtube_id", "comment_id", "text", "author", "author_id", "like_count",
+    "reply_count", "is_pinned", "is_favorited", "published_at",
+)
+HISTORY_COLUMNS = (
+    "youtube_id", "view_count", "like_count", "comment_count", "recorded_at",
+    "view_count_delta", "hours_since_last", "growth_rate",
+)
+
+
+def _create_tables(conn: sqlite3.Connection):
+    """channels / video_comments / video_stats_history 表（结构与采集脚本一致）"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS channels (
+            channel_id TEXT PRIMARY KEY,
+            channel_name TEXT,
+            handle TEXT,
+            subscriber_count INTEGER,
+            video_count INTEGER,
+            total_views INTEGER,
+            country TEXT,
+            description TEXT,
+            created_at TEXT,
+            canonical_url TEXT,
+            collected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS video_comments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            youtube_id TEXT NOT NULL,
+            comment_id TEXT UNIQUE,
+            text TEXT,
+            author TEXT,
+            author_id TEXT,
+            like_count INTEGER DEFAULT 0,
+            reply_count INTEGER DEFAULT 0,
+            is_pinned INTEGER DEFAULT 0,
+            is_favorited INTEGER DEFAULT 0,
+            published_at TEXT,
+            collected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS video_stats_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            youtube_id TEXT NOT NULL,
+            view_count INTEGER,
+            like_count INTEGER,
+            comment_count INTEGER,
+            recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            view_count_delta INTEGER,
+            hours_since_last INTEGER,
+            growth_rate REAL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_channels_subs ON channels(subscriber_count DESC)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_comments_video ON video_comments(youtube_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_comments_likes ON video_comments(like_count DESC)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_stats_composite ON video_stats_history(youtube_id, recorded_at)")
+
+
+def _insert_rows(conn: sqlite3.Connection, table: str, columns: tuple, rows: Iterator[tuple]) -> int:
+    """分批写入（内存占用与总行数无关）"""
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    total = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_ROWS:
+            conn.executemany(sql, batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        conn.executemany(sql, batch)
+        total += len(batch)
+    conn.commit()
+    return total
+
+
+def read_params(db_path: Path) -> Optional[Dict[str, object]]:
+    """读取已有合成数据库的生成参数（不是合成数据库时返回 None）"""
+    if not Path(db_path).exists():
+        return None
+    conn = sqlite3.connect(str(db_path))
+    try:
+        rows = conn.execute("SELECT key, value FROM bench_meta").fetchall()
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+    return {key: json.loads(value) for key, value in rows}
+
+
+def parse_size(size: str) -> int:
+    """解析规模参数：预设名（10k/100k/1m/5m）或整数"""
+    key = size.strip().lower()
+    if key in SIZES:
+        return SIZES[key]
+    return int(key.replace("_", "").replace(",", ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成基准测试用的合成数据")
+    parser.add_argument("--size", default="10k", help=f"规模：{'/'.join(SIZES)} 或视频数")
+    parser.add_argument("--videos", type=int, default=None, help="视频数（覆盖 --size）")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--anchor", default=None, help="基准日期 YYYY-MM-DD（默认今天）")
+    parser.add_argument("--comments", type=float, default=COMMENTS_PER_VIDEO, help="平均每个视频的评论数")
+    parser.add_argument("--history", type=float, default=HISTORY_PER_VIDEO, help="平均每个视频的历史快照数")
+    parser.add_argument("--db", default=None, help="输出数据库路径")
+    args = parser.parse_args()
+
+    videos = args.videos or parse_size(args.size)
+    db_path = Path(args.db) if args.db else PROJECT_ROOT / "data" / "benchmark" / args.size / "data" / "youtube_pipeline.db"
+    generator = SyntheticDataGenerator(
+        videos,
+        seed=args.seed,
+        anchor=date.fromisoformat(args.anchor) if args.anchor else None,
+        comments_per_video=args.comments,
+        history_per_video=args.history,
+    )
+
+    print(f"生成合成数据: {videos:,} 条视频, {generator.channel_count:,} 个频道 → {db_path}")
+    started = time.time()
+    generator.write(db_path)
+    print(f"完成，耗时 {time.time() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
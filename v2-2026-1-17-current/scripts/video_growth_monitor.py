@@ -13,23 +13,24 @@
     0 */6 * * * cd /path/to/project && .venv/bin/python scripts/video_growth_monitor.py
 """
 
-import json
-import sqlite3
-import subprocess
 import sys
 import math
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
-from threading import Lock
 from typing import Optional
 
 # 路径配置
 DB_PATH = Path(__file__).parent.parent / "data" / "youtube_pipeline.db"
 
-# 并发配置
-WORKERS = 5  # 采集并发数
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.shared.sqlite_tuning import connect as sqlite_connect
+from src.research.request_governor import get_governor
+from src.research.yt_dlp_client import YtDlpClient
+
+# yt-dlp 客户端（main 中创建，各线程共用进程内的预热提取实例；请求速率和并发由请求调度器控制）
+ytdlp = None
 
 # 监控配置
 TIERS = {
@@ -46,9 +47,6 @@ VIRAL_THRESHOLDS = {
     "min_data_points": 3,         # 最少数据点数
 }
 
-# 锁
-db_lock = Lock()
-
 # 统计
 stats = {
     "checked": 0,
@@ -59,8 +57,8 @@ stats = {
 
 
 def get_connection():
-    """获取数据库连接"""
-    return sqlite3.connect(str(DB_PATH), timeout=30)
+    """获取数据库连接（WAL + busy_timeout，多个工作线程可以同时读写）"""
+    return sqlite_connect(DB_PATH)
 
 
 def get_videos_to_monitor() -> list:
@@ -150,24 +148,13 @@ def get_videos_to_monitor() -> list:
 def fetch_video_stats(video_id: str) -> Optional[dict]:
     """使用 yt-dlp 获取视频当前统计"""
     try:
-        cmd = [
-            "yt-dlp",
-            "--dump-json",
-            "--no-download",
-            "--no-warnings",
-            f"https://www.youtube.com/watch?v={video_id}"
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-        if result.returncode == 0:
-            data = json.loads(result.stdout)
-            return {
-                "view_count": data.get("view_count", 0),
-                "like_count": data.get("like_count", 0),
-                "comment_count": data.get("comment_count", 0),
-            }
-        return None
-    except:
+        data = ytdlp.get_video_json(video_id)
+        return {
+            "view_count": data.get("view_count", 0),
+            "like_count": data.get("like_count", 0),
+            "comment_count": data.get("comment_count", 0),
+        }
+    except Exception:
         return None
 
 
@@ -361,31 +348,31 @@ def process_video(video: dict) -> dict:
     if not current_stats:
         return {"status": "error", "youtube_id": youtube_id}
 
-    with db_lock:
-        conn = get_connection()
+    # WAL + busy_timeout 下各线程独立连接，写入由 SQLite 排队，不再需要全局锁
+    conn = get_connection()
 
-        # 获取上次统计
-        last_stats = get_last_stats(conn, youtube_id)
+    # 获取上次统计
+    last_stats = get_last_stats(conn, youtube_id)
 
-        # 计算增长指标
-        growth = calculate_growth_metrics(current_stats, last_stats)
+    # 计算增长指标
+    growth = calculate_growth_metrics(current_stats, last_stats)
 
-        # 保存历史
-        save_stats(conn, youtube_id, current_stats, growth)
+    # 保存历史
+    save_stats(conn, youtube_id, current_stats, growth)
 
-        # 计算加速度
-        acceleration = calculate_acceleration(conn, youtube_id)
+    # 计算加速度
+    acceleration = calculate_acceleration(conn, youtube_id)
 
-        # 更新监控状态
-        is_potential, viral_score = update_monitoring_status(
-            conn, youtube_id, growth["growth_rate"],
-            acceleration, video["video_age_days"]
-        )
+    # 更新监控状态
+    is_potential, viral_score = update_monitoring_status(
+        conn, youtube_id, growth["growth_rate"],
+        acceleration, video["video_age_days"]
+    )
 
-        # 检测病毒式增长
-        is_viral = detect_viral_growth(conn, youtube_id)
+    # 检测病毒式增长
+    is_viral = detect_viral_growth(conn, youtube_id)
 
-        conn.close()
+    conn.close()
 
     return {
         "status": "success",
@@ -402,6 +389,8 @@ def process_video(video: dict) -> dict:
 
 
 def main():
+    global ytdlp
+
     print("=" * 60)
     print("视频增长监控")
     print(f"时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -417,14 +406,16 @@ def main():
         print("没有需要检查的视频")
         return
 
-    print(f"并发数: {WORKERS}")
-    print(f"预计耗时: {total * 3 // WORKERS // 60 + 1} 分钟\n")
+    workers = get_governor().max_concurrency("video")
+    ytdlp = YtDlpClient(concurrency=workers)
+
+    print(f"线程数: {workers}（实际并发按限流情况自适应，yt-dlp 后端: {ytdlp.backend}）\n")
 
     start_time = time.time()
     viral_videos = []
 
     try:
-        with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
             futures = {executor.submit(process_video, v): v for v in videos}
 
             for i, future in enumerate(as_completed(futures)):
@@ -5,9 +5,6 @@
 使用多进程加速，5个并行任务
 """
 
-import json
-import sqlite3
-import subprocess
 import sys
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -18,11 +15,17 @@ from threading import Lock
 # 数据库路径
 DB_PATH = Path(__file__).parent.parent / "data" / "youtube_pipeline.db"
 
-# 并行数量
-WORKERS = 10
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.shared.repositories import CompetitorVideoRepository
+from src.shared.sqlite_tuning import connect as sqlite_connect
+from src.research.request_governor import get_governor
+from src.research.yt_dlp_client import YtDlpClient
 
-# 数据库锁
-db_lock = Lock()
+# yt-dlp 客户端（main 中创建，各线程共用进程内的预热提取实例；请求速率和并发由请求调度器控制）
+ytdlp = None
+
+# 视频 Repository（main 中创建）
+repo = None
 
 # 统计
 stats = {"success": 0, "failed": 0, "processed": 0}
@@ -31,7 +34,7 @@ stats_lock = Lock()
 
 def get_videos_to_update():
     """获取需要更新的视频列表"""
-    conn = sqlite3.connect(str(DB_PATH))
+    conn = sqlite_connect(DB_PATH)
     c = conn.cursor()
     c.execute("""
         SELECT youtube_id, title
@@ -46,31 +49,21 @@ def get_videos_to_update():
 def fetch_video_details(video_id):
     """使用 yt-dlp 获取视频详情"""
     try:
-        cmd = [
-            "yt-dlp",
-            "--dump-json",
-            "--no-download",
-            "--no-warnings",
-            f"https://www.youtube.com/watch?v={video_id}"
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        if result.returncode == 0:
-            data = json.loads(result.stdout)
-            return {
-                "youtube_id": video_id,
-                "channel_id": data.get("channel_id") or data.get("uploader_id"),
-                "published_at": parse_upload_date(data.get("upload_date")),
-                "view_count": data.get("view_count"),
-                "like_count": data.get("like_count"),
-                "comment_count": data.get("comment_count"),
-                "duration": data.get("duration"),
-                "description": data.get("description", "")[:500] if data.get("description") else None,
-                "tags": data.get("tags", [])[:10],
-                "thumbnail_url": data.get("thumbnail"),
-                "subscriber_count": data.get("channel_follower_count"),  # 频道订阅数
-            }
-        return None
-    except:
+        data = ytdlp.get_video_json(video_id)
+        return {
+            "youtube_id": video_id,
+            "channel_id": data.get("channel_id") or data.get("uploader_id"),
+            "published_at": parse_upload_date(data.get("upload_date")),
+            "view_count": data.get("view_count"),
+            "like_count": data.get("like_count"),
+            "comment_count": data.get("comment_count"),
+            "duration": data.get("duration"),
+            "description": data.get("description", "")[:500] if data.get("description") else None,
+            "tags": data.get("tags", [])[:10],
+            "thumbnail_url": data.get("thumbnail"),
+            "subscriber_count": data.get("channel_follower_count"),  # 频道订阅数
+        }
+    except Exception:
         return None
 
 
@@ -84,70 +77,35 @@ def parse_upload_date(date_str):
         return None
 
 
+# 详情字段 -> 是否只在非空时更新（否则只要不是 None 就更新）
+DETAIL_FIELDS = {
+    "channel_id": True,
+    "published_at": True,
+    "view_count": False,
+    "like_count": False,
+    "comment_count": False,
+    "duration": False,
+    "description": True,
+    "tags": True,
+    "thumbnail_url": True,
+    "subscriber_count": False,
+}
+
+
 def update_video(details):
-    """更新视频详情到数据库"""
+    """更新视频详情到数据库（经 Repository 写入，同步维护聚合表和结果缓存版本）"""
     if not details:
         return False
 
-    with db_lock:
-        conn = sqlite3.connect(str(DB_PATH))
-        c = conn.cursor()
-
-        updates = []
-        values = []
-
-        if details.get("channel_id"):
-            updates.append("channel_id = ?")
-            values.append(details["channel_id"])
-
-        if details.get("published_at"):
-            updates.append("published_at = ?")
-            values.append(details["published_at"])
-
-        if details.get("view_count") is not None:
-            updates.append("view_count = ?")
-            values.append(details["view_count"])
-
-        if details.get("like_count") is not None:
-            updates.append("like_count = ?")
-            values.append(details["like_count"])
-
-        if details.get("comment_count") is not None:
-            updates.append("comment_count = ?")
-            values.append(details["comment_count"])
+    fields = {
+        name: details[name]
+        for name, truthy in DETAIL_FIELDS.items()
+        if (details.get(name) if truthy else details.get(name) is not None)
+    }
+    fields["has_details"] = True
 
-        if details.get("duration") is not None:
-            updates.append("duration = ?")
-            values.append(details["duration"])
-
-        if details.get("description"):
-            updates.append("description = ?")
-            values.append(details["description"])
-
-        if details.get("tags"):
-            updates.append("tags = ?")
-            values.append(json.dumps(details["tags"]))
-
-        if details.get("thumbnail_url"):
-            updates.append("thumbnail_url = ?")
-            values.append(details["thumbnail_url"])
-
-        if details.get("subscriber_count") is not None:
-            updates.append("subscriber_count = ?")
-            values.append(details["subscriber_count"])
-
-        updates.append("has_details = 1")
-
-        if not updates:
-            conn.close()
-            return False
-
-        values.append(details["youtube_id"])
-        query = f"UPDATE competitor_videos SET {', '.join(updates)} WHERE youtube_id = ?"
-        c.execute(query, values)
-        conn.commit()
-        conn.close()
-        return True
+    # WAL + busy_timeout：并发写入由 SQLite 排队等待，不再需要全局锁
+    return repo.update_fields(details["youtube_id"], fields)
 
 
 def process_video(args):
@@ -170,28 +128,35 @@ def process_video(args):
 
 
 def main():
+    global ytdlp, repo
+
+    workers = get_governor().max_concurrency("video")
+
     print("=" * 60)
     print("并行补全视频详情数据")
-    print(f"并行数: {WORKERS}")
+    print(f"线程数: {workers}（实际并发按限流情况自适应）")
     print("=" * 60)
 
     videos = get_videos_to_update()
     total = len(videos)
 
-    print(f"\n需要补全的视频: {total} 个")
-    print(f"预计耗时: {total * 2 // WORKERS // 60} 分钟\n")
+    print(f"\n需要补全的视频: {total} 个\n")
 
     if total == 0:
         print("没有需要补全的视频")
         return
 
+    repo = CompetitorVideoRepository(DB_PATH)
+    ytdlp = YtDlpClient(concurrency=workers)
+    print(f"yt-dlp 后端: {ytdlp.backend}")
+
     start_time = time.time()
 
     # 准备任务参数
     tasks = [(i, total, vid, title) for i, (vid, title) in enumerate(videos)]
 
     try:
-        with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
             futures = [executor.submit(process_video, task) for task in tasks]
             for future in as_completed(futures):
                 pass  # 结果已在 process_video 中打印
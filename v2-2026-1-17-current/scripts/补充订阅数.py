@@ -6,9 +6,7 @@
 使用多线程并行采集，提高效率
 """
 
-import json
 import sqlite3
-import subprocess
 import sys
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -19,11 +17,16 @@ from threading import Lock
 # 数据库路径
 DB_PATH = Path(__file__).parent.parent / "data" / "youtube_pipeline.db"
 
-# 并行数量
-WORKERS = 10
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.shared.repositories import CompetitorVideoRepository
+from src.research.request_governor import get_governor
+from src.research.yt_dlp_client import YtDlpClient, YtDlpError
 
-# 数据库锁
-db_lock = Lock()
+# yt-dlp 客户端（main 中创建，各线程共享；请求速率和并发由请求调度器控制）
+ytdlp = None
+
+# 视频 Repository（main 中创建）
+repo = None
 
 # 统计
 stats = {"success": 0, "failed": 0, "processed": 0, "skipped": 0}
@@ -57,46 +60,23 @@ def get_videos_without_subscribers(limit=None):
 def fetch_subscriber_count(video_id):
     """使用 yt-dlp 获取频道订阅数"""
     try:
-        cmd = [
-            "yt-dlp",
-            "--dump-json",
-            "--no-download",
-            "--no-warnings",
-            f"https://www.youtube.com/watch?v={video_id}"
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-        if result.returncode == 0:
-            data = json.loads(result.stdout)
-            return {
-                "channel_id": data.get("channel_id") or data.get("uploader_id"),
-                "subscriber_count": data.get("channel_follower_count"),
-            }
+        data = ytdlp.get_video_json(video_id)
+        return {
+            "channel_id": data.get("channel_id") or data.get("uploader_id"),
+            "subscriber_count": data.get("channel_follower_count"),
+        }
+    except YtDlpError:
         return None
     except Exception as e:
         return None
 
 
 def update_channel_subscribers(channel_id, subscriber_count):
-    """更新该频道所有视频的订阅数"""
+    """更新该频道所有视频的订阅数（经 Repository 写入，同步维护聚合表和结果缓存版本）"""
     if not channel_id or subscriber_count is None:
         return 0
 
-    with db_lock:
-        conn = sqlite3.connect(str(DB_PATH))
-        c = conn.cursor()
-
-        c.execute("""
-            UPDATE competitor_videos
-            SET subscriber_count = ?
-            WHERE channel_id = ?
-        """, (subscriber_count, channel_id))
-
-        updated = c.rowcount
-        conn.commit()
-        conn.close()
-
-        return updated
+    return repo.update_channel_subscribers(channel_id, subscriber_count)
 
 
 def process_video(args):
@@ -132,9 +112,13 @@ def process_video(args):
 
 
 def main():
+    global ytdlp, repo
+
+    workers = get_governor().max_concurrency("video")
+
     print("=" * 60)
     print("补充频道订阅数数据")
-    print(f"并行数: {WORKERS}")
+    print(f"线程数: {workers}（实际并发按限流情况自适应）")
     print("=" * 60)
 
     # 获取需要更新的视频
@@ -147,7 +131,9 @@ def main():
         print("没有需要补充的频道")
         return
 
-    print(f"预计耗时: {total * 3 // WORKERS // 60 + 1} 分钟\n")
+    repo = CompetitorVideoRepository(DB_PATH)
+    ytdlp = YtDlpClient(concurrency=workers)
+    print(f"yt-dlp 后端: {ytdlp.backend}\n")
 
     start_time = time.time()
 
@@ -155,7 +141,7 @@ def main():
     tasks = [(i, total, vid, channel, cid) for i, (vid, channel, cid) in enumerate(videos)]
 
     try:
-        with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
             futures = [executor.submit(process_video, task) for task in tasks]
             for future in as_completed(futures):
                 pass  # 结果已在 process_video 中打印
@@ -16,6 +16,9 @@ from pathlib import Path
 # 数据库路径
 DB_PATH = Path(__file__).parent.parent / "data" / "youtube_pipeline.db"
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.shared.repositories import CompetitorVideoRepository
+
 # 批次大小
 BATCH_SIZE = 50
 
@@ -81,69 +84,35 @@ def parse_upload_date(date_str):
         return None
 
 
-def update_video(conn, details):
-    """更新视频详情到数据库"""
-    if not details:
-        return False
-
-    c = conn.cursor()
-
-    # 构建更新语句（只更新非空字段）
-    updates = []
-    values = []
-
-    if details.get("channel_id"):
-        updates.append("channel_id = ?")
-        values.append(details["channel_id"])
-
-    if details.get("published_at"):
-        updates.append("published_at = ?")
-        values.append(details["published_at"])
-
-    if details.get("view_count") is not None:
-        updates.append("view_count = ?")
-        values.append(details["view_count"])
+# 详情字段 -> 是否只在非空时更新（否则只要不是 None 就更新）
+DETAIL_FIELDS = {
+    "channel_id": True,
+    "published_at": True,
+    "view_count": False,
+    "like_count": False,
+    "comment_count": False,
+    "duration": False,
+    "description": True,
+    "tags": True,
+    "thumbnail_url": True,
+    "subscriber_count": False,
+}
 
-    if details.get("like_count") is not None:
-        updates.append("like_count = ?")
-        values.append(details["like_count"])
 
-    if details.get("comment_count") is not None:
-        updates.append("comment_count = ?")
-        values.append(details["comment_count"])
-
-    if details.get("duration") is not None:
-        updates.append("duration = ?")
-        values.append(details["duration"])
-
-    if details.get("description"):
-        updates.append("description = ?")
-        values.append(details["description"])
-
-    if details.get("tags"):
-        updates.append("tags = ?")
-        values.append(json.dumps(details["tags"]))
-
-    if details.get("thumbnail_url"):
-        updates.append("thumbnail_url = ?")
-        values.append(details["thumbnail_url"])
-
-    if details.get("subscriber_count") is not None:
-        updates.append("subscriber_count = ?")
-        values.append(details["subscriber_count"])
-
-    # 标记已获取详情
-    updates.append("has_details = 1")
-
-    if not updates:
+def update_video(repo, details):
+    """更新视频详情到数据库（经 Repository 写入，同步维护聚合表和结果缓存版本）"""
+    if not details:
         return False
 
-    values.append(details["youtube_id"])
+    # 只更新非空字段，并标记已获取详情
+    fields = {
+        name: details[name]
+        for name, truthy in DETAIL_FIELDS.items()
+        if (details.get(name) if truthy else details.get(name) is not None)
+    }
+    fields["has_details"] = True
 
-    query = f"UPDATE competitor_videos SET {', '.join(updates)} WHERE youtube_id = ?"
-    c.execute(query, values)
-    conn.commit()
-    return True
+    return repo.update_fields(details["youtube_id"], fields)
 
 
 def main():
@@ -152,6 +121,7 @@ def main():
     print("=" * 60)
 
     conn = sqlite3.connect(str(DB_PATH))
+    repo = CompetitorVideoRepository(DB_PATH)
 
     # 获取需要更新的视频
     videos = get_videos_to_update(conn)
@@ -181,7 +151,7 @@ def main():
             details = fetch_video_details(video_id)
 
             if details:
-                if update_video(conn, details):
+                if update_video(repo, details):
                     success += 1
                     pub = details.get("published_at", "无")[:10] if details.get("published_at") else "无"
                     print(f"  ✓ 已更新 (发布: {pub}, 频道ID: {details.get('channel_id', '无')[:15]}...)")
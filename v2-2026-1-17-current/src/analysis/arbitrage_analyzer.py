@@ -15,12 +15,19 @@
 """
 
 import re
-import sqlite3
+import sys
 from collections import Counter, defaultdict
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-import jieba
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.shared.db_compat import FETCH_BATCH_ROWS
+from src.shared.repositories import CompetitorVideoRepository
+from src.shared.title_tokens import get_title_token_store
 
 # 尝试导入 networkx，如果没有则用简化版
 try:
@@ -42,11 +49,178 @@ class ArbitrageOpportunity:
     recommendation: str
 
 
+# 整表扫描读取的列，以及转换为分析用 dict 时对应的键
+SCAN_COLUMNS = (
+    "youtube_id", "title", "channel_name", "view_count", "like_count", "comment_count",
+    "duration", "published_at",
+)
+VIDEO_KEYS = ("id", "title", "channel_name", "views", "likes", "comments", "duration", "published_at")
+
+# 时长分桶：(名称, 下限秒数, 上限秒数)
+DURATION_BUCKETS = [
+    ('0-1min', 0, 60),
+    ('1-3min', 60, 180),
+    ('3-5min', 180, 300),
+    ('5-10min', 300, 600),
+    ('10-20min', 600, 1200),
+    ('20-30min', 1200, 1800),
+    ('30min+', 1800, float('inf')),
+]
+
+
+# ============================================================
+# 可逐批累加的统计量（analyze_all 流式扫描时每批调用 add()，最后 result()）
+# ============================================================
+
+class TopicArbitrageStats:
+    """话题套利：关键词共现网络（有 networkx）或关键词频次 / 播放量（简化版）"""
+
+    def __init__(self, analyzer: 'ArbitrageAnalyzer'):
+        self.analyzer = analyzer
+        self.graph = nx.Graph() if HAS_NETWORKX else None
+        self.keyword_freq = Counter()
+        self.keyword_views = defaultdict(int)
+
+    def add(self, videos: List[Dict]) -> 'TopicArbitrageStats':
+        G = self.graph
+        for v in videos:
+            keywords = self.analyzer._extract_keywords(v.get('title', ''))
+            views = v.get('views', 0)
+
+            if G is None:
+                for kw in keywords:
+                    self.keyword_freq[kw] += 1
+                    self.keyword_views[kw] += views
+                continue
+
+            # 添加/更新节点
+            for kw in keywords:
+                if kw in G:
+                    G.nodes[kw]['count'] += 1
+                    G.nodes[kw]['total_views'] += views
+                else:
+                    G.add_node(kw, count=1, total_views=views)
+
+            # 添加边（共现）
+            for i, kw1 in enumerate(keywords):
+                for kw2 in keywords[i+1:]:
+                    if G.has_edge(kw1, kw2):
+                        G[kw1][kw2]['weight'] += 1
+                    else:
+                        G.add_edge(kw1, kw2, weight=1)
+        return self
+
+    def result(self) -> Dict[str, Any]:
+        if self.graph is None:
+            return self.analyzer._simplified_topic_analysis(dict(self.keyword_freq), self.keyword_views)
+        return self.analyzer._topic_network_analysis(self.graph)
+
+
+class ChannelArbitrageStats:
+    """频道套利：每个频道的视频数、总播放、最高播放视频"""
+
+    def __init__(self, analyzer: 'ArbitrageAnalyzer'):
+        self.analyzer = analyzer
+        self.channels: Dict[Any, Dict[str, Any]] = {}
+
+    def add(self, videos: List[Dict]) -> 'ChannelArbitrageStats':
+        for v in videos:
+            ch = v.get('channel_name', 'Unknown')
+            views = v.get('views', 0)
+            data = self.channels.get(ch)
+            if data is None:
+                self.channels[ch] = {
+                    'video_count': 1,
+                    'total_views': views,
+                    'max_views': views,
+                    'max_video_title': v.get('title', ''),
+                }
+                continue
+            data['video_count'] += 1
+            data['total_views'] += views
+            # 并列最高时保留先出现的视频
+            if views > data['max_views']:
+                data['max_views'] = views
+                data['max_video_title'] = v.get('title', '')
+        return self
+
+    def result(self) -> Dict[str, Any]:
+        return self.analyzer._channel_analysis(self.channels)
+
+
+class DurationArbitrageStats:
+    """时长套利：每个时长区间的视频数、总播放"""
+
+    def __init__(self, analyzer: 'ArbitrageAnalyzer'):
+        self.analyzer = analyzer
+        self.buckets = {name: {'count': 0, 'total_views': 0} for name, _, _ in DURATION_BUCKETS}
+        self.total_videos = 0
+
+    def add(self, videos: List[Dict]) -> 'DurationArbitrageStats':
+        for v in videos:
+            duration = v.get('duration', 0)
+            views = v.get('views', 0)
+            for bucket_name, low, high in DURATION_BUCKETS:
+                if low <= duration < high:
+                    bucket = self.buckets[bucket_name]
+                    bucket['count'] += 1
+                    bucket['total_views'] += views
+                    break
+        self.total_videos += len(videos)
+        return self
+
+    def result(self) -> Dict[str, Any]:
+        return self.analyzer._duration_analysis(self.buckets, self.total_videos)
+
+
+class TimingArbitrageStats:
+    """时间套利：近期（30 天内）/ 历史视频数及各自的标题关键词频次"""
+
+    def __init__(self, analyzer: 'ArbitrageAnalyzer'):
+        self.analyzer = analyzer
+        self.recent_cutoff = datetime.now() - timedelta(days=30)
+        self.recent_count = 0
+        self.historical_count = 0
+        self.recent_keywords = Counter()
+        self.historical_keywords = Counter()
+
+    def _is_recent(self, pub_date: Optional[str]) -> bool:
+        if not pub_date:
+            return False
+        try:
+            if 'T' in pub_date:
+                dt = datetime.fromisoformat(pub_date.replace('Z', '+00:00'))
+            else:
+                dt = datetime.strptime(pub_date[:10], '%Y-%m-%d')
+            return dt.replace(tzinfo=None) > self.recent_cutoff
+        except (ValueError, TypeError):
+            return False
+
+    def add(self, videos: List[Dict]) -> 'TimingArbitrageStats':
+        for v in videos:
+            keywords = self.analyzer._extract_keywords(v.get('title', ''))
+            if self._is_recent(v.get('published_at', '')):
+                self.recent_count += 1
+                self.recent_keywords.update(keywords)
+            else:
+                self.historical_count += 1
+                self.historical_keywords.update(keywords)
+        return self
+
+    def result(self) -> Dict[str, Any]:
+        return self.analyzer._timing_analysis(
+            self.recent_count, self.historical_count,
+            dict(self.recent_keywords), dict(self.historical_keywords),
+        )
+
+
 class ArbitrageAnalyzer:
     """套利分析器 - 发现被低估的内容机会"""
 
     def __init__(self, db_path: str = "data/youtube_pipeline.db"):
         self.db_path = db_path
+        # 标题分词缓存（与 API 各分析接口共享）
+        self.title_tokens = get_title_token_store(db_path)
         # 停用词
         self.stopwords = {
             '的', '是', '在', '了', '和', '与', '或', '等', '这', '那',
@@ -58,18 +232,34 @@ class ArbitrageAnalyzer:
         }
 
     def analyze_all(self, min_videos: int = 100) -> Dict[str, Any]:
-        """执行全部套利分析"""
-        videos = self._load_videos()
+        """
+        执行全部套利分析
 
-        if len(videos) < min_videos:
+        视频表分批流式读取，各项分析的统计量逐批累加（计数、求和、共现），
+        内存占用取决于关键词 / 频道数量，不随视频数增长。
+        """
+        topic = TopicArbitrageStats(self)
+        channel = ChannelArbitrageStats(self)
+        duration = DurationArbitrageStats(self)
+        timing = TimingArbitrageStats(self)
+
+        sample_size = 0
+        for videos in self._iter_video_batches():
+            # 批量预热标题分词缓存（后续 _extract_keywords 按标题读取内存层）
+            self.title_tokens.load([{'youtube_id': v['id'], 'title': v['title']} for v in videos])
+            for stats in (topic, channel, duration, timing):
+                stats.add(videos)
+            sample_size += len(videos)
+
+        if sample_size < min_videos:
             return {'error': f'视频数量不足，需要至少 {min_videos} 个'}
 
         results = {
-            'sample_size': len(videos),
-            'topic_arbitrage': self.analyze_topic_arbitrage(videos),
-            'channel_arbitrage': self.analyze_channel_arbitrage(videos),
-            'duration_arbitrage': self.analyze_duration_arbitrage(videos),
-            'timing_arbitrage': self.analyze_timing_arbitrage(videos),
+            'sample_size': sample_size,
+            'topic_arbitrage': topic.result(),
+            'channel_arbitrage': channel.result(),
+            'duration_arbitrage': duration.result(),
+            'timing_arbitrage': timing.result(),
             'summary': None
         }
 
@@ -91,15 +281,10 @@ class ArbitrageAnalyzer:
         - 程度中心性：关键词的常见程度（已被充分传播）
         - 有趣度 = 中介中心性 / 程度中心性
         """
-        # 构建关键词共现网络
-        network_data = self._build_keyword_network(videos)
-
-        if not HAS_NETWORKX:
-            # 简化版分析（不使用 networkx）
-            return self._simplified_topic_analysis(videos, network_data)
-
-        G = network_data['graph']
+        return TopicArbitrageStats(self).add(videos).result()
 
+    def _topic_network_analysis(self, G) -> Dict[str, Any]:
+        """基于关键词共现网络计算话题有趣度（需要 networkx）"""
         if len(G.nodes()) < 10:
             return {'error': '关键词太少，无法分析'}
 
@@ -163,26 +348,21 @@ class ArbitrageAnalyzer:
         有趣度 = 内容价值 / 频道传播力
               = 视频播放量 / 频道平均播放量（或订阅者估算）
         """
-        # 按频道聚合
-        channels = defaultdict(lambda: {'videos': [], 'total_views': 0})
-        for v in videos:
-            ch = v.get('channel_name', 'Unknown')
-            channels[ch]['videos'].append(v)
-            channels[ch]['total_views'] += v.get('views', 0)
+        return ChannelArbitrageStats(self).add(videos).result()
 
-        # 计算每个频道的统计
+    def _channel_analysis(self, channels: Dict[Any, Dict[str, Any]]) -> Dict[str, Any]:
+        """按频道统计（视频数、总播放、最高播放视频）计算频道有趣度"""
         channel_stats = []
         for ch_name, data in channels.items():
-            video_count = len(data['videos'])
+            video_count = data['video_count']
             if video_count < 2:
                 continue
 
             total_views = data['total_views']
             avg_views = total_views / video_count
 
-            # 找出该频道的爆款
-            max_video = max(data['videos'], key=lambda x: x.get('views', 0))
-            max_views = max_video.get('views', 0)
+            # 该频道的爆款
+            max_views = data['max_views']
 
             # 频道有趣度 = 最高播放 / 平均播放
             # 高有趣度 = 有单个爆款远超平均，说明有潜力
@@ -199,7 +379,7 @@ class ArbitrageAnalyzer:
                 'total_views': total_views,
                 'avg_views': round(avg_views),
                 'max_views': max_views,
-                'max_video_title': max_video.get('title', ''),
+                'max_video_title': data['max_video_title'],
                 'interestingness': round(channel_interestingness, 2),
                 'is_small_channel': total_views < 100000,
                 'has_breakout': max_views > avg_views * 5
@@ -236,33 +416,15 @@ class ArbitrageAnalyzer:
         有趣度 = 该时长区间的平均播放量 / 该时长区间的视频供给
         高有趣度 = 播放量高但供给少的时长区间
         """
-        # 按时长分桶
-        duration_buckets = {
-            '0-1min': {'range': (0, 60), 'videos': [], 'total_views': 0},
-            '1-3min': {'range': (60, 180), 'videos': [], 'total_views': 0},
-            '3-5min': {'range': (180, 300), 'videos': [], 'total_views': 0},
-            '5-10min': {'range': (300, 600), 'videos': [], 'total_views': 0},
-            '10-20min': {'range': (600, 1200), 'videos': [], 'total_views': 0},
-            '20-30min': {'range': (1200, 1800), 'videos': [], 'total_views': 0},
-            '30min+': {'range': (1800, float('inf')), 'videos': [], 'total_views': 0},
-        }
-
-        for v in videos:
-            duration = v.get('duration', 0)
-            views = v.get('views', 0)
-            for bucket_name, bucket_data in duration_buckets.items():
-                low, high = bucket_data['range']
-                if low <= duration < high:
-                    bucket_data['videos'].append(v)
-                    bucket_data['total_views'] += views
-                    break
+        return DurationArbitrageStats(self).add(videos).result()
 
+    def _duration_analysis(self, duration_buckets: Dict[str, Dict[str, Any]], total_videos: int) -> Dict[str, Any]:
+        """按时长分桶的视频数、总播放计算各区间有趣度"""
         # 计算每个桶的有趣度
-        total_videos = len(videos)
         bucket_analysis = []
 
         for bucket_name, bucket_data in duration_buckets.items():
-            count = len(bucket_data['videos'])
+            count = bucket_data['count']
             if count == 0:
                 continue
 
@@ -304,48 +466,26 @@ class ArbitrageAnalyzer:
         - 上升趋势话题（早期套利机会）
         - 下降趋势话题（应避开）
         """
-        from datetime import datetime, timedelta
-
-        # 划分时间段：近期 vs 历史
-        now = datetime.now()
-        recent_cutoff = now - timedelta(days=30)
-
-        recent_videos = []
-        historical_videos = []
-
-        for v in videos:
-            pub_date = v.get('published_at', '')
-            if not pub_date:
-                historical_videos.append(v)
-                continue
-
-            try:
-                if 'T' in pub_date:
-                    dt = datetime.fromisoformat(pub_date.replace('Z', '+00:00'))
-                else:
-                    dt = datetime.strptime(pub_date[:10], '%Y-%m-%d')
+        return TimingArbitrageStats(self).add(videos).result()
 
-                if dt.replace(tzinfo=None) > recent_cutoff:
-                    recent_videos.append(v)
-                else:
-                    historical_videos.append(v)
-            except (ValueError, TypeError):
-                historical_videos.append(v)
-
-        if len(recent_videos) < 10 or len(historical_videos) < 10:
+    def _timing_analysis(
+        self,
+        recent_count: int,
+        historical_count: int,
+        recent_keywords: Dict[str, int],
+        historical_keywords: Dict[str, int],
+    ) -> Dict[str, Any]:
+        """按近期 / 历史视频数和关键词频次计算话题趋势"""
+        if recent_count < 10 or historical_count < 10:
             return {'error': '数据时间跨度不足'}
 
-        # 提取关键词频率
-        recent_keywords = self._extract_keyword_freq(recent_videos)
-        historical_keywords = self._extract_keyword_freq(historical_videos)
-
         # 计算趋势变化
         trends = []
         all_keywords = set(recent_keywords.keys()) | set(historical_keywords.keys())
 
         for kw in all_keywords:
-            recent_freq = recent_keywords.get(kw, 0) / len(recent_videos)
-            historical_freq = historical_keywords.get(kw, 0) / len(historical_videos)
+            recent_freq = recent_keywords.get(kw, 0) / recent_count
+            historical_freq = historical_keywords.get(kw, 0) / historical_count
 
             if historical_freq > 0:
                 trend_ratio = recent_freq / historical_freq
@@ -377,8 +517,8 @@ class ArbitrageAnalyzer:
         )[:10]
 
         return {
-            'recent_videos': len(recent_videos),
-            'historical_videos': len(historical_videos),
+            'recent_videos': recent_count,
+            'historical_videos': historical_count,
             'rising_topics': rising_topics,
             'falling_topics': falling_topics,
             'insight': self._generate_timing_insight(rising_topics, falling_topics)
@@ -446,44 +586,24 @@ class ArbitrageAnalyzer:
 
     # ==================== 辅助方法 ====================
 
-    def _load_videos(self) -> List[Dict]:
-        """从数据库加载视频"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-
-        query = """
-        SELECT
-            youtube_id as id,
-            title,
-            channel_name,
-            view_count as views,
-            like_count as likes,
-            comment_count as comments,
-            duration,
-            published_at
-        FROM competitor_videos
-        WHERE view_count > 0
-        ORDER BY view_count DESC
-        """
-
-        cursor = conn.execute(query)
-        videos = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-
-        return videos
+    def _iter_video_batches(self, batch_size: int = FETCH_BATCH_ROWS) -> Iterator[List[Dict]]:
+        """按播放量降序分批读取视频（只读分析用到的列）"""
+        repo = CompetitorVideoRepository(self.db_path)
+        for rows in repo.scan_batches(SCAN_COLUMNS, batch_size, sort_by="views", min_views=1):
+            yield [dict(zip(VIDEO_KEYS, row)) for row in rows]
 
     def _extract_keywords(self, title: str) -> List[str]:
         """从标题提取关键词"""
         if not title:
             return []
 
-        # 分词
-        words = jieba.lcut(title)
+        # 分词（读取共享的标题分词缓存，已去除空白、单字和纯数字）
+        words = self.title_tokens.tokens(title)
 
         # 过滤
         keywords = []
         for w in words:
-            w = w.strip().lower()
+            w = w.lower()
             if (len(w) >= 2 and
                 w not in self.stopwords and
                 not w.isdigit() and
@@ -500,36 +620,6 @@ class ArbitrageAnalyzer:
                 counter[kw] += 1
         return dict(counter)
 
-    def _build_keyword_network(self, videos: List[Dict]) -> Dict[str, Any]:
-        """构建关键词共现网络"""
-        if not HAS_NETWORKX:
-            # 返回基础统计
-            return {'graph': None, 'keyword_stats': self._extract_keyword_freq(videos)}
-
-        G = nx.Graph()
-
-        for v in videos:
-            keywords = self._extract_keywords(v.get('title', ''))
-            views = v.get('views', 0)
-
-            # 添加/更新节点
-            for kw in keywords:
-                if kw in G:
-                    G.nodes[kw]['count'] += 1
-                    G.nodes[kw]['total_views'] += views
-                else:
-                    G.add_node(kw, count=1, total_views=views)
-
-            # 添加边（共现）
-            for i, kw1 in enumerate(keywords):
-                for kw2 in keywords[i+1:]:
-                    if G.has_edge(kw1, kw2):
-                        G[kw1][kw2]['weight'] += 1
-                    else:
-                        G.add_edge(kw1, kw2, weight=1)
-
-        return {'graph': G}
-
     def _get_connected_topics(self, G, keyword: str, limit: int = 5) -> List[str]:
         """获取与关键词相连的话题"""
         if keyword not in G:
@@ -540,19 +630,13 @@ class ArbitrageAnalyzer:
         neighbors.sort(key=lambda x: G[keyword][x].get('weight', 0), reverse=True)
         return neighbors[:limit]
 
-    def _simplified_topic_analysis(self, videos: List[Dict], network_data: Dict) -> Dict[str, Any]:
-        """简化版话题分析（不使用 networkx）"""
-        keyword_freq = self._extract_keyword_freq(videos)
-
+    def _simplified_topic_analysis(
+        self, keyword_freq: Dict[str, int], keyword_views: Dict[str, int]
+    ) -> Dict[str, Any]:
+        """简化版话题分析（不使用 networkx）：按关键词频次和播放量计算"""
         # 按频率排序
         sorted_keywords = sorted(keyword_freq.items(), key=lambda x: x[1], reverse=True)
 
-        # 计算播放量
-        keyword_views = defaultdict(int)
-        for v in videos:
-            for kw in self._extract_keywords(v.get('title', '')):
-                keyword_views[kw] += v.get('views', 0)
-
         # 简化版有趣度 = 平均播放量 / 频率
         opportunities = []
         for kw, freq in sorted_keywords[:50]:
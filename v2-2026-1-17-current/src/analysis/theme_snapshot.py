@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+主题列式快照
+
+把一个主题下的视频列表转换为 NumPy 列式数组，供 /api/analyze 等接口做向量化聚合：
+1. 数值列 - 播放、点赞、评论、时长、订阅数（int64）
+2. 时间列 - 发布时间、采集时间（微秒级 epoch，int64 + 有效掩码）
+3. 字典编码列 - 频道（channel_id 优先，其次 channel_name）、分类（category）
+
+分组聚合统一通过 GroupBy 完成，分组顺序与"按首次出现顺序插入 dict"一致，
+保证输出结果与逐行循环的旧实现完全相同。
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+# 时间换算常量
+EPOCH = datetime(1970, 1, 1)
+US_PER_DAY = 86_400_000_000
+
+# 缺失分类的默认名称
+DEFAULT_CATEGORY = '未分类'
+
+
+def to_epoch_us(dt: datetime) -> int:
+    """
+    把 datetime 转为微秒级 epoch（按本地墙钟时间，忽略时区）
+
+    Args:
+        dt: 时间
+
+    Returns:
+        距 1970-01-01 的微秒数
+    """
+    return (dt.replace(tzinfo=None) - EPOCH) // timedelta(microseconds=1)
+
+
+def channel_key_of(video) -> Optional[str]:
+    """频道分组键：有效 channel_id 优先，否则使用 channel_name"""
+    if video.channel_id and video.channel_id != 'None':
+        return video.channel_id
+    return video.channel_name or None
+
+
+def encode(values: Sequence[Optional[str]]) -> tuple:
+    """
+    字典编码（None 编码为 -1）
+
+    Args:
+        values: 原始取值序列
+
+    Returns:
+        (codes, labels)：codes 为 int64 数组，labels[code] 为原始取值
+    """
+    mapping: Dict[str, int] = {}
+    codes = np.empty(len(values), dtype=np.int64)
+    for i, value in enumerate(values):
+        if value is None:
+            codes[i] = -1
+            continue
+        code = mapping.get(value)
+        if code is None:
+            code = mapping[value] = len(mapping)
+        codes[i] = code
+    return codes, list(mapping)
+
+
+class GroupBy:
+    """
+    按编码分组（分组顺序 = 各组在行序中首次出现的顺序）
+
+    Attributes:
+        rows: 参与分组的行号
+        labels: 每个参与行所属的组号（0..size-1）
+        first_rows: 每组首次出现的行号
+        codes: 每组对应的原始编码
+        size: 分组数量
+    """
+
+    def __init__(self, codes: np.ndarray, mask: Optional[np.ndarray] = None):
+        valid = codes >= 0
+        if mask is not None:
+            valid &= mask
+        self.rows = np.flatnonzero(valid)
+
+        uniq, first, inverse = np.unique(
+            codes[self.rows], return_index=True, return_inverse=True
+        )
+        order = np.argsort(first, kind='stable')
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+
+        self.labels = rank[inverse.reshape(-1)]
+        self.first_rows = self.rows[first[order]]
+        self.codes = uniq[order]
+        self.size = len(uniq)
+
+    def count(self) -> np.ndarray:
+        """每组行数"""
+        return np.bincount(self.labels, minlength=self.size)
+
+    def sum(self, values: np.ndarray) -> np.ndarray:
+        """每组求和（保持 values 的 dtype，int64 不丢精度）"""
+        out = np.zeros(self.size, dtype=values.dtype)
+        np.add.at(out, self.labels, values[self.rows])
+        return out
+
+    def max(self, values: np.ndarray, initial) -> np.ndarray:
+        """每组最大值（空组返回 initial）"""
+        out = np.full(self.size, initial, dtype=values.dtype)
+        np.maximum.at(out, self.labels, values[self.rows])
+        return out
+
+    def min(self, values: np.ndarray, initial) -> np.ndarray:
+        """每组最小值（空组返回 initial）"""
+        out = np.full(self.size, initial, dtype=values.dtype)
+        np.minimum.at(out, self.labels, values[self.rows])
+        return out
+
+
+class ThemeSnapshot:
+    """主题视频的列式快照"""
+
+    def __init__(
+        self,
+        videos: List[Any],
+        views: np.ndarray,
+        likes: np.ndarray,
+        comments: np.ndarray,
+        duration: np.ndarray,
+        subscribers: np.ndarray,
+        published: np.ndarray,
+        has_published: np.ndarray,
+        collected: np.ndarray,
+        has_collected: np.ndarray,
+        channel_codes: np.ndarray,
+        channel_keys: List[str],
+        category_codes: np.ndarray,
+        categories: List[str],
+    ):
+        self.videos = videos
+        self.views = views
+        self.likes = likes
+        self.comments = comments
+        self.duration = duration
+        self.subscribers = subscribers
+        self.published = published
+        self.has_published = has_published
+        self.collected = collected
+        self.has_collected = has_collected
+        self.channel_codes = channel_codes
+        self.channel_keys = channel_keys
+        self.category_codes = category_codes
+        self.categories = categories
+
+    @classmethod
+    def from_videos(cls, videos: List[Any]) -> 'ThemeSnapshot':
+        """
+        从 CompetitorVideo 列表构建快照
+
+        Args:
+            videos: 视频列表
+
+        Returns:
+            ThemeSnapshot 实例
+        """
+        videos = list(videos)
+        n = len(videos)
+
+        def int_column(attr: str) -> np.ndarray:
+            return np.fromiter(
+                ((getattr(v, attr, 0) or 0) for v in videos), dtype=np.int64, count=n
+            )
+
+        def time_column(attr: str) -> tuple:
+            values = [getattr(v, attr, None) for v in videos]
+            present = np.fromiter((t is not None for t in values), dtype=bool, count=n)
+            micros = np.fromiter(
+                (to_epoch_us(t) if t is not None else 0 for t in values),
+                dtype=np.int64, count=n
+            )
+            return micros, present
+
+        published, has_published = time_column('published_at')
+        collected, has_collected = time_column('collected_at')
+        channel_codes, channel_keys = encode([channel_key_of(v) for v in videos])
+        category_codes, categories = encode(
+            [getattr(v, 'category', None) or DEFAULT_CATEGORY for v in videos]
+        )
+
+        return cls(
+            videos=videos,
+            views=int_column('view_count'),
+            likes=int_column('like_count'),
+            comments=int_column('comment_count'),
+            duration=int_column('duration'),
+            subscribers=int_column('subscriber_count'),
+            published=published,
+            has_published=has_published,
+            collected=collected,
+            has_collected=has_collected,
+            channel_codes=channel_codes,
+            channel_keys=channel_keys,
+            category_codes=category_codes,
+            categories=categories,
+        )
+
+    def __len__(self) -> int:
+        return len(self.videos)
+
+    # ==================== 行选择 ====================
+
+    def take(self, idx) -> 'ThemeSnapshot':
+        """
+        按行号（或布尔掩码）选取/重排行，字典编码表保持不变
+
+        Args:
+            idx: 行号数组、切片或布尔掩码
+
+        Returns:
+            新的 ThemeSnapshot
+        """
+        rows = np.arange(len(self))[idx]
+        return ThemeSnapshot(
+            videos=[self.videos[i] for i in rows.tolist()],
+            views=self.views[rows],
+            likes=self.likes[rows],
+            comments=self.comments[rows],
+            duration=self.duration[rows],
+            subscribers=self.subscribers[rows],
+            published=self.published[rows],
+            has_published=self.has_published[rows],
+            collected=self.collected[rows],
+            has_collected=self.has_collected[rows],
+            channel_codes=self.channel_codes[rows],
+            channel_keys=self.channel_keys,
+            category_codes=self.category_codes[rows],
+            categories=self.categories,
+        )
+
+    def filter(
+        self,
+        min_views: int = 0,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> 'ThemeSnapshot':
+        """
+        按播放量和发布时间筛选（无发布时间的视频在指定日期范围时被排除）
+
+        Args:
+            min_views: 最小播放量（<=0 表示不限）
+            date_from: 发布时间下限（含）
+            date_to: 发布时间上限（含）
+
+        Returns:
+            筛选后的快照
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if min_views > 0:
+            mask &= self.views >= min_views
+        if date_from is not None:
+            mask &= self.has_published & (self.published >= to_epoch_us(date_from))
+        if date_to is not None:
+            mask &= self.has_published & (self.published <= to_epoch_us(date_to))
+        return self.take(mask)
+
+    def sort(self, sort_by: str) -> 'ThemeSnapshot':
+        """
+        降序稳定排序
+
+        Args:
+            sort_by: views/likes/date/engagement，其它值保持原顺序
+
+        Returns:
+            排序后的快照
+        """
+        if sort_by == "views":
+            key = -self.views
+        elif sort_by == "likes":
+            key = -self.likes
+        elif sort_by == "date":
+            # 无发布时间的视频排在最后
+            key = np.where(self.has_published, -self.published, np.iinfo(np.int64).max)
+        elif sort_by == "engagement":
+            key = -((self.likes + self.comments) / np.maximum(self.views, 1))
+        else:
+            return self
+        return self.take(np.argsort(key, kind='stable'))
+
+    # ==================== 派生列 ====================
+
+    def duration_buckets(self) -> np.ndarray:
+        """时长分档：0=short(<5分钟) 1=medium(5-15分钟) 2=long(>15分钟)"""
+        return np.where(self.duration < 300, 0, np.where(self.duration < 900, 1, 2))
+
+    def days_old(self, now: datetime) -> np.ndarray:
+        """发布至今的天数（与 timedelta.days 一致，向下取整）"""
+        return (to_epoch_us(now) - self.published) // US_PER_DAY
+
+    def published_months(self) -> np.ndarray:
+        """发布月份字符串（YYYY-MM），缺失行的取值无意义"""
+        months = self.published.astype('datetime64[us]').astype('datetime64[M]')
+        return np.datetime_as_string(months, unit='M')
+
+    def published_weekdays(self) -> np.ndarray:
+        """发布星期（0=周一, 6=周日），缺失行的取值无意义"""
+        # 1970-01-01 是周四
+        return (self.published // US_PER_DAY + 3) % 7
+
+    def group_by_channel(self, mask: Optional[np.ndarray] = None) -> GroupBy:
+        """按频道分组（跳过无频道标识的行）"""
+        return GroupBy(self.channel_codes, mask)
@@ -21,7 +21,23 @@ from dataclasses import dataclass, field, asdict
 from enum import Enum
 import uuid
 import sqlite3
-from src.shared.db_compat import get_connection as db_get_connection, db_exists, is_using_neon
+from src.shared.db_compat import get_connection as db_get_connection, db_exists, is_using_neon, get_pool_stats
+import numpy as np
+from src.analysis.theme_snapshot import ThemeSnapshot, GroupBy, US_PER_DAY
+from src.shared.offload import OffloadRejected, offloaded, get_offload_stats
+from src.shared.result_cache import get_analysis_cache
+from src.shared.channel_cache import get_channel_cache
+from src.shared import fast_response
+from src.shared.title_tokens import get_title_token_store, filter_tokens
+
+# 分析结果缓存（LRU + TTL + 字节预算，同一实例内复用，数据变化后自动失效）
+_analysis_cache = get_analysis_cache()
+
+# 频道维度缓存（channels 表的进程内副本，各分析接口共享）
+_channel_cache = get_channel_cache()
+
+# 标题分词缓存（title_tokens 表 + 内存 LRU，各分析接口共享）
+_title_tokens = get_title_token_store()
 
 # 预加载 jieba（避免每次请求冷启动）
 try:
@@ -30,16 +46,12 @@ try:
 except Exception:
     pass
 
-# 分析结果缓存（Vercel 函数实例级别，同一实例复用）
-_analyze_cache = {}
-_CACHE_TTL = 600  # 10 分钟缓存
-
 # 添加项目根目录到路径
 sys.path.insert(0, str(Path(__file__).parent))
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, HTMLResponse, FileResponse
+from fastapi.responses import JSONResponse, HTMLResponse, FileResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 
@@ -48,6 +60,19 @@ import uvicorn
 DataCollector = None
 CompetitorVideoRepository = None
 
+# 中心性 / 排行榜 / 套利 / 频道详情等接口读取的数据库（基准测试会替换为合成数据库）
+SERVER_DB_PATH = Path(__file__).parent / "data" / "youtube_pipeline.db"
+
+# /api/analyze 读取的列（投影查询，返回懒解码的 VideoRecord）
+ANALYZE_COLUMNS = (
+    "youtube_id", "title", "channel_name", "channel_id", "view_count", "like_count", "comment_count",
+    "duration", "published_at", "collected_at", "subscriber_count", "category",
+    "thumbnail_url", "description", "tags",
+)
+
+# /api/videos 每页最多返回的视频数
+VIDEO_PAGE_MAX = 500
+
 
 def _get_data_collector():
     """惰性加载 DataCollector"""
@@ -58,6 +83,18 @@ def _get_data_collector():
     return DataCollector()
 
 
+def _get_aggregates(db_path=None):
+    """惰性加载 AggregateRepository（物化聚合表）"""
+    from src.shared.repositories import AggregateRepository
+    return AggregateRepository(db_path)
+
+
+def _get_search_index(db_path=None):
+    """惰性加载视频模糊搜索索引（FTS5 trigram / pg_trgm）"""
+    from src.shared.repositories.search_index import get_search_index
+    return get_search_index(db_path)
+
+
 def _get_repository(db_path=None):
     """惰性加载 CompetitorVideoRepository"""
     global CompetitorVideoRepository
@@ -67,6 +104,12 @@ def _get_repository(db_path=None):
     return CompetitorVideoRepository(db_path)
 
 
+def _get_async_repository(db_path=None):
+    """惰性加载异步 Repository（进程内共享，async 接口直接 await）"""
+    from src.shared.repositories.async_repo import get_async_repository
+    return get_async_repository(db_path)
+
+
 # ============================================================
 # 任务状态管理
 # ============================================================
@@ -152,6 +195,23 @@ if public_dir.exists():
     app.mount("/report", StaticFiles(directory=str(public_dir), html=True), name="report")
 
 
+@app.on_event("shutdown")
+async def close_async_databases():
+    """关闭异步 Repository 的连接池"""
+    from src.shared.repositories.async_repo import dispose_async_databases
+    await dispose_async_databases()
+
+
+# 分析接口线程池已满时返回 503，提示客户端稍后重试
+@app.exception_handler(OffloadRejected)
+async def offload_rejected_handler(request, exc: OffloadRejected):
+    return JSONResponse(
+        status_code=503,
+        content={"status": "error", "message": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
 # ============================================================
 # HTTP 端点
 # ============================================================
@@ -180,6 +240,25 @@ async def health():
     return {"status": "ok", "message": "YouTube Content Assistant API"}
 
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """运行时指标（分析接口线程池排队/等待耗时、结果缓存命中/淘汰、频道缓存加载次数、数据库连接池、yt-dlp 提取池、YouTube 请求调度器）"""
+    from src.shared.repositories.async_repo import get_async_stats
+    from src.research.ytdlp_pool import get_ytdlp_stats
+    from src.research.request_governor import get_governor_stats
+    return {
+        "status": "ok",
+        "offload": get_offload_stats(),
+        "cache": _analysis_cache.stats(),
+        "channels": _channel_cache.stats(),
+        "title_tokens": _title_tokens.stats(),
+        "db_pool": get_pool_stats(),
+        "async_db": get_async_stats(),
+        "ytdlp": get_ytdlp_stats(),
+        "youtube_governor": get_governor_stats(),
+    }
+
+
 @app.get("/api/task/{task_id}/status")
 async def get_task_status(task_id: str):
     """
@@ -203,8 +282,8 @@ async def get_task_status(task_id: str):
 async def get_statistics():
     """获取数据库统计信息"""
     try:
-        repo = _get_repository()
-        stats = repo.get_statistics()
+        repo = _get_async_repository()
+        stats = await repo.get_statistics()
         return {"status": "ok", "data": stats}
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -483,30 +562,11 @@ async def run_data_collection(
             # 创建带实时统计的进度回调
             def progress_with_stats(stage: str, current: int, total: int):
                 """带实时统计的进度回调"""
-                # 查询当前主题相关的视频数和频道数
+                # 读取采集器维护的实时计数（随批量保存增量更新，不查询数据库）
                 try:
-                    videos = collector.get_videos_from_db(
-                        keyword_like=topic,
-                        min_views=0,
-                        limit=10000
-                    )
-                    video_count_now = len(videos)
-
-                    # 统计频道（去重）
-                    channels = set()
-                    for v in videos:
-                        if v.channel_id and v.channel_id != 'None':
-                            channels.add(v.channel_id)
-                        elif v.channel_name:
-                            channels.add(v.channel_name)
-                    channel_count_now = len(channels)
-
                     # 调用原始回调，附带实时统计
                     sync_progress_callback(stage, current, total, {
-                        "realtime_stats": {
-                            "videos": video_count_now,
-                            "channels": channel_count_now
-                        }
+                        "realtime_stats": collector.live_stats
                     })
                 except Exception as e:
                     # 即使统计失败也继续
@@ -522,51 +582,24 @@ async def run_data_collection(
                 on_progress=progress_with_stats
             )
 
-            # 获取视频列表（使用模糊匹配，包含所有扩展关键词的视频）
+            # 统计实际搜索到的全部视频（使用模糊匹配，包含所有扩展关键词的视频，不受筛选条件限制）
             # 例如搜索 "养生"，会匹配 "养生"、"中医养生"、"健康养生" 等所有相关关键词
+            # 频道去重口径：优先使用 channel_id，否则用 channel_name
+            totals = collector.repository.aggregate(keyword_like=topic)
+            actual_total_videos = totals["video_count"]
+            actual_total_channels = totals["channel_count"]
 
-            # 先获取实际搜索到的全部视频（不受筛选条件限制）用于统计
-            all_matched_videos = collector.get_videos_from_db(
-                keyword_like=topic,  # 模糊匹配，包含主题词的所有视频
-                min_views=0,  # 不限制播放量
-                limit=10000   # 足够大的数量
-            )
-
-            # 统计频道数量（去重，优先使用 channel_id，否则用 channel_name）
-            channels = set()
-            for v in all_matched_videos:
-                # 优先用 channel_id，如果没有或者是 'None' 字符串，则用 channel_name
-                if v.channel_id and v.channel_id != 'None':
-                    channels.add(v.channel_id)
-                elif v.channel_name:
-                    channels.add(v.channel_name)
-
-            actual_total_videos = len(all_matched_videos)
-            actual_total_channels = len(channels)
-
-            # 获取筛选后的视频（用于展示）
+            # 获取筛选后的视频（用于展示），排序和数量限制由数据库完成
             videos = collector.get_videos_from_db(
                 keyword_like=topic,
                 min_views=1000,
-                limit=video_count * 2  # 多取一些，后面会去重排序
+                sort_by=sort_by,
+                limit=video_count
             )
 
-            # 按排序方式排序
-            if sort_by == "views":
-                videos.sort(key=lambda v: v.view_count or 0, reverse=True)
-            elif sort_by == "likes":
-                videos.sort(key=lambda v: v.like_count or 0, reverse=True)
-            elif sort_by == "date":
-                videos.sort(key=lambda v: v.published_at or "", reverse=True)
-            elif sort_by == "engagement":
-                videos.sort(
-                    key=lambda v: ((v.like_count or 0) + (v.comment_count or 0)) / max(v.view_count or 1, 1),
-                    reverse=True
-                )
-
             # 转换为字典格式
             video_list = []
-            for v in videos[:video_count]:
+            for v in videos:
                 video_list.append({
                     "youtube_id": v.youtube_id,
                     "title": v.title,
@@ -636,165 +669,362 @@ async def run_data_collection(
 async def get_themes():
     """获取数据库中的主题列表"""
     try:
-        repo = _get_repository()
-        conn = repo._get_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT theme, COUNT(*) as count
-            FROM competitor_videos
-            WHERE theme IS NOT NULL
-            GROUP BY theme
-            ORDER BY count DESC
-        ''')
-        themes = [{"theme": row[0], "count": row[1]} for row in cursor.fetchall()]
-        conn.close()
+        # 读取物化聚合表 agg_theme（写入时增量维护）
+        repo = _get_async_repository()
+        themes = [
+            {"theme": row["theme"], "count": row["video_count"]}
+            for row in await repo.themes()
+        ]
         return {"status": "ok", "themes": themes}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 
+@app.get("/api/video/{youtube_id}")
+async def get_video_detail(youtube_id: str, comments: int = 20):
+    """
+    单个视频详情（视频信息 + 频道信息 + 高赞评论）
+
+    Args:
+        youtube_id: YouTube 视频 ID
+        comments: 返回的评论数（0-100）
+    """
+    try:
+        repo = _get_async_repository()
+        # 视频和评论互不依赖，并发查询
+        video, top_comments = await asyncio.gather(
+            repo.find_by_youtube_id(youtube_id),
+            repo.comments.find_by_video(youtube_id, limit=max(0, min(100, comments))),
+        )
+        if video is None:
+            return {"status": "error", "message": f"未找到视频 {youtube_id}"}
+
+        channel = await repo.channels.get(video.channel_id) if video.channel_id else None
+        return {
+            "status": "ok",
+            "video": video.to_dict(),
+            "channel": channel,
+            "comments": top_comments,
+        }
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+@app.get("/api/videos")
+async def list_videos(
+    request: Request,
+    theme: str = None,
+    keyword: str = None,
+    sort_by: str = "views",
+    min_views: int = 0,
+    date_from: str = None,
+    date_to: str = None,
+    limit: int = 50,
+    cursor: str = None,
+    mode: str = "json",
+    fields: str = None
+):
+    """
+    视频列表（游标分页：按排序键从上一页末尾继续，翻到多深每页代价都一样）
+
+    Args:
+        theme: 按主题精确筛选
+        keyword: 按关键词模糊筛选（包含）
+        sort_by: 排序方式 (views/likes/date/engagement)
+        min_views: 最小播放量筛选
+        date_from: 发布时间起始（YYYY-MM-DD）
+        date_to: 发布时间截止（YYYY-MM-DD）
+        limit: 每页数量（1-500）
+        cursor: 上一页返回的 next_cursor（翻页时其余参数须与第一页相同）
+        mode: 输出模式 json / chunked / ndjson
+        fields: videos 列表项只保留的字段（逗号分隔）
+    """
+    from src.shared.repositories.pagination import InvalidCursor
+    try:
+        repo = _get_async_repository()
+        videos, next_cursor = await repo.find_page(
+            limit=max(1, min(VIDEO_PAGE_MAX, limit)),
+            cursor=cursor,
+            sort_by=sort_by,
+            columns=ANALYZE_COLUMNS,
+            theme=theme or None,
+            keyword_like=keyword or None,
+            **_video_filters(min_views, date_from, date_to)
+        )
+    except InvalidCursor as e:
+        return JSONResponse(status_code=400, content={"status": "error", "message": str(e)})
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+    payload = {
+        "status": "ok",
+        "result": {
+            "videos": [_video_item(v) for v in videos],
+            "next_cursor": next_cursor,
+        }
+    }
+    return _encode_response(request, payload, mode=mode, fields=fields, stream_keys=("videos",))
+
+
+def _encode_response(
+    request: Request,
+    payload: dict,
+    mode: str = "json",
+    fields: Optional[str] = None,
+    stream_keys: tuple = ("videos", "channels"),
+) -> Response:
+    """
+    用快速编码器输出大响应，支持流式模式、字段投影和 gzip/br 压缩
+
+    Args:
+        request: 当前请求（读取 Accept-Encoding）
+        payload: 响应内容（{"status", "result"}）
+        mode: json / chunked / ndjson
+        fields: 数组项的字段投影（逗号分隔）
+        stream_keys: result 中需要流式输出、投影的数组字段
+
+    Returns:
+        Response 或 StreamingResponse
+    """
+    if mode not in fast_response.MODES:
+        return JSONResponse(
+            status_code=400,
+            content={"status": "error", "message": f"不支持的输出模式: {mode}（可选 {'/'.join(fast_response.MODES)}）"},
+        )
+
+    projection = fast_response.parse_fields(fields)
+    encoding = fast_response.negotiate_encoding(request.headers.get("accept-encoding"))
+    headers = {"Vary": "Accept-Encoding"}
+
+    if mode == "json":
+        body = fast_response.dumps(fast_response.project_payload(payload, stream_keys, projection))
+        if encoding and len(body) >= fast_response.MIN_COMPRESS_SIZE:
+            body = fast_response.compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    if mode == "ndjson":
+        chunks = fast_response.iter_ndjson(payload, stream_keys, projection)
+        media_type = "application/x-ndjson"
+    else:
+        chunks = fast_response.iter_chunked_json(payload, stream_keys, projection)
+        media_type = "application/json"
+
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return StreamingResponse(
+        fast_response.compress_stream(chunks, encoding),
+        media_type=media_type,
+        headers=headers,
+    )
+
+
 @app.get("/api/analyze/{theme}")
-async def analyze_theme(
+@offloaded("analyze", workers=4, queue=16)
+def analyze_theme(
+    request: Request,
     theme: str,
     limit: int = 100,
     sort_by: str = "views",
     min_views: int = 1000,
     date_from: str = None,
-    date_to: str = None
+    date_to: str = None,
+    mode: str = "json",
+    fields: str = None,
+    cursor: str = None
 ):
     """
     直接分析已有数据（不触发新搜索）
 
     Args:
         theme: 主题名称（如"养生"、"科技"）
-        limit: 返回视频数量
+        limit: 返回视频数量（翻页时为每页数量）
         sort_by: 排序方式 (views/likes/date/engagement)
         min_views: 最小播放量筛选
         date_from: 发布时间起始（YYYY-MM-DD）
         date_to: 发布时间截止（YYYY-MM-DD）
+        mode: 输出模式 json（默认）/ chunked（分块 JSON）/ ndjson（逐行输出 videos、channels）
+        fields: videos、channels 列表项只保留的字段（逗号分隔），例如 youtube_id,title,view_count
+        cursor: 上一次返回的 next_cursor；传入时只返回下一页视频，不重新计算分析
     """
-    try:
-        # 缓存检查（同一函数实例内复用结果）
-        cache_key = f"{theme}_{limit}_{sort_by}_{min_views}_{date_from}_{date_to}"
-        if cache_key in _analyze_cache:
-            cached_time, cached_result = _analyze_cache[cache_key]
-            if time.time() - cached_time < _CACHE_TTL:
-                return cached_result
+    if cursor:
+        from src.shared.repositories.pagination import InvalidCursor
+        try:
+            result = _compute_theme_page(theme, limit, sort_by, min_views, date_from, date_to, cursor)
+        except InvalidCursor as e:
+            return JSONResponse(status_code=400, content={"status": "error", "message": str(e)})
+        return _encode_response(request, result, mode=mode, fields=fields)
+
+    result = _analysis_cache.get_or_compute(
+        ("analyze", theme, limit, sort_by, min_views, date_from, date_to),
+        lambda: _compute_theme_analysis(theme, limit, sort_by, min_views, date_from, date_to),
+    )
+    return _encode_response(request, result, mode=mode, fields=fields)
 
-        collector = _get_data_collector()
 
-        # 使用 theme 精确匹配（新的查询方式）
-        all_videos = collector.get_videos_from_db(
-            theme=theme,
-            min_views=0,
-            limit=10000
-        )
+def _parse_date_range(date_from: Optional[str], date_to: Optional[str]):
+    """YYYY-MM-DD 日期范围 -> (起始, 截止当天结束)，格式无效的一端忽略"""
+    from_date = to_date = None
+    if date_from:
+        try:
+            from_date = datetime.strptime(date_from, "%Y-%m-%d")
+        except ValueError:
+            pass
 
-        if not all_videos:
-            # 如果没有精确匹配，尝试模糊匹配（兼容旧数据）
-            all_videos = collector.get_videos_from_db(
-                keyword_like=theme,
-                min_views=0,
-                limit=10000
-            )
+    if date_to:
+        try:
+            to_date = datetime.strptime(date_to, "%Y-%m-%d")
+            # 包含当天结束
+            to_date = to_date.replace(hour=23, minute=59, second=59)
+        except ValueError:
+            pass
+    return from_date, to_date
 
-        if not all_videos:
-            return {
-                "status": "error",
-                "message": f"没有找到主题 '{theme}' 的数据，请先搜索收集数据"
-            }
 
-        # 计算数据的时间范围（视频发布时间）
-        published_dates = [v.published_at for v in all_videos if v.published_at]
-        collected_dates = [v.collected_at for v in all_videos if v.collected_at]
+def _video_filters(min_views: int, date_from: Optional[str], date_to: Optional[str]) -> dict:
+    """播放量 + 日期筛选条件（find_all / find_page / aggregate 共用，游标校验依赖两边一致）"""
+    from_date, to_date = _parse_date_range(date_from, date_to)
+    return {
+        "min_views": min_views if min_views > 0 else None,
+        "published_from": from_date,
+        "published_to": to_date,
+    }
 
-        data_time_range = {
-            "published_earliest": min(published_dates).strftime("%Y-%m-%d") if published_dates else None,
-            "published_latest": max(published_dates).strftime("%Y-%m-%d") if published_dates else None,
-            "collected_earliest": min(collected_dates).strftime("%Y-%m-%d %H:%M") if collected_dates else None,
-            "collected_latest": max(collected_dates).strftime("%Y-%m-%d %H:%M") if collected_dates else None,
+
+def _video_item(v, compact: bool = False) -> dict:
+    """视频列表项（compact 时省略 description 和 tags 以减小响应体积）"""
+    item = {
+        "youtube_id": v.youtube_id,
+        "title": v.title,
+        "channel_name": v.channel_name,
+        "channel_id": v.channel_id,
+        "view_count": v.view_count or 0,
+        "like_count": v.like_count or 0,
+        "comment_count": v.comment_count or 0,
+        "duration": v.duration or 0,
+        "published_at": v.published_at.isoformat() if v.published_at else None,
+        "thumbnail_url": v.thumbnail_url,
+    }
+    if not compact:
+        item["description"] = v.description[:200] if v.description else None
+        item["tags"] = v.tags or []
+    return item
+
+
+def _compute_theme_page(
+    theme: str,
+    limit: int,
+    sort_by: str,
+    min_views: int,
+    date_from: Optional[str],
+    date_to: Optional[str],
+    cursor: str
+) -> dict:
+    """主题视频翻页（keyset 游标，参数同 analyze_theme；游标无效时抛出 InvalidCursor）"""
+    repo = _get_repository()
+
+    # 与 _compute_theme_analysis 相同的范围：主题有数据时精确匹配，否则模糊匹配
+    scope = {"theme": theme}
+    if not repo.find_all(limit=1, columns=("id",), **scope):
+        scope = {"keyword_like": theme}
+
+    videos, next_cursor = repo.find_page(
+        limit=max(1, min(VIDEO_PAGE_MAX, limit)),
+        cursor=cursor,
+        sort_by=sort_by,
+        columns=ANALYZE_COLUMNS,
+        **_video_filters(min_views, date_from, date_to),
+        **scope
+    )
+    compact = len(videos) > 500
+    return {
+        "status": "ok",
+        "result": {
+            "topic": theme,
+            "displayed_videos": len(videos),
+            "videos": [_video_item(v, compact) for v in videos],
+            "next_cursor": next_cursor,
         }
+    }
 
-        # 统计频道
-        channels = set()
-        for v in all_videos:
-            if v.channel_id and v.channel_id != 'None':
-                channels.add(v.channel_id)
-            elif v.channel_name:
-                channels.add(v.channel_name)
 
-        actual_total_videos = len(all_videos)
-        actual_total_channels = len(channels)
+def _compute_theme_analysis(
+    theme: str,
+    limit: int,
+    sort_by: str,
+    min_views: int,
+    date_from: Optional[str],
+    date_to: Optional[str]
+) -> dict:
+    """计算主题分析结果（不经过缓存，参数同 analyze_theme）"""
+    try:
+        repo = _get_repository()
 
-        # 筛选视频
-        valid_videos = all_videos
+        # 使用 theme 精确匹配（新的查询方式），没有数据时尝试模糊匹配（兼容旧数据）
+        scope = {"theme": theme}
+        totals = repo.aggregate(**scope)
+        if not totals["video_count"]:
+            scope = {"keyword_like": theme}
+            totals = repo.aggregate(**scope)
 
-        # 播放量筛选
-        if min_views > 0:
-            valid_videos = [v for v in valid_videos if (v.view_count or 0) >= min_views]
+        if not totals["video_count"]:
+            return {
+                "status": "error",
+                "message": f"没有找到主题 '{theme}' 的数据，请先搜索收集数据"
+            }
 
-        # 日期筛选
-        if date_from:
-            try:
-                from_date = datetime.strptime(date_from, "%Y-%m-%d")
-                valid_videos = [v for v in valid_videos if v.published_at and v.published_at >= from_date]
-            except ValueError:
-                pass
+        # 计算数据的时间范围（视频发布时间）- 数据库端 MIN/MAX
+        def _format_time(value, fmt):
+            return value.strftime(fmt) if value else None
 
-        if date_to:
-            try:
-                to_date = datetime.strptime(date_to, "%Y-%m-%d")
-                # 包含当天结束
-                to_date = to_date.replace(hour=23, minute=59, second=59)
-                valid_videos = [v for v in valid_videos if v.published_at and v.published_at <= to_date]
-            except ValueError:
-                pass
+        data_time_range = {
+            "published_earliest": _format_time(totals["published_earliest"], "%Y-%m-%d"),
+            "published_latest": _format_time(totals["published_latest"], "%Y-%m-%d"),
+            "collected_earliest": _format_time(totals["collected_earliest"], "%Y-%m-%d %H:%M"),
+            "collected_latest": _format_time(totals["collected_latest"], "%Y-%m-%d %H:%M"),
+        }
 
-        filtered_count = len(valid_videos)
-
-        # 排序
-        if sort_by == "views":
-            valid_videos.sort(key=lambda v: v.view_count or 0, reverse=True)
-        elif sort_by == "likes":
-            valid_videos.sort(key=lambda v: v.like_count or 0, reverse=True)
-        elif sort_by == "date":
-            valid_videos.sort(key=lambda v: str(v.published_at or ""), reverse=True)
-        elif sort_by == "engagement":
-            valid_videos.sort(
-                key=lambda v: ((v.like_count or 0) + (v.comment_count or 0)) / max(v.view_count or 1, 1),
-                reverse=True
-            )
+        # 统计频道 - 数据库端 COUNT / COUNT DISTINCT
+        actual_total_videos = totals["video_count"]
+        actual_total_channels = totals["channel_count"]
+
+        # 筛选视频（播放量 + 日期）
+        filters = _video_filters(min_views, date_from, date_to)
+
+        # 筛选和排序下推到数据库，只读取筛选后的视频；构建列式快照做向量化分组聚合
+        filtered = ThemeSnapshot.from_videos(repo.find_all(
+            limit=10000,
+            sort_by=sort_by,
+            columns=ANALYZE_COLUMNS,
+            **filters,
+            **scope
+        ))
+        filtered_count = len(filtered)
+        if filtered_count >= 10000:
+            # 超过读取上限时，以数据库计数为准
+            filtered_count = repo.aggregate(**filters, **scope)["video_count"]
+        valid_videos = filtered.videos
 
         # 取前 N 个
         display_videos = valid_videos[:limit]
 
         # 转换格式（大量视频时省略 description 和 tags 以减小响应体积）
         compact = len(display_videos) > 500
-        video_list = []
-        for v in display_videos:
-            item = {
-                "youtube_id": v.youtube_id,
-                "title": v.title,
-                "channel_name": v.channel_name,
-                "channel_id": v.channel_id,
-                "view_count": v.view_count or 0,
-                "like_count": v.like_count or 0,
-                "comment_count": v.comment_count or 0,
-                "duration": v.duration or 0,
-                "published_at": v.published_at.isoformat() if v.published_at else None,
-                "thumbnail_url": v.thumbnail_url,
-            }
-            if not compact:
-                item["description"] = v.description[:200] if v.description else None
-                item["tags"] = v.tags or []
-            video_list.append(item)
+        video_list = [_video_item(v, compact) for v in display_videos]
+
+        # 下一页游标（排序与 find_all 相同，带 cursor 再次请求即从第 N+1 个视频继续）
+        next_cursor = None
+        if display_videos and filtered_count > len(display_videos):
+            next_cursor = repo.find_page(
+                limit=len(display_videos), sort_by=sort_by, columns=("id",), **filters, **scope
+            )[1]
 
         # 计算统计
-        total_views = sum(v["view_count"] for v in video_list)
-        total_likes = sum(v["like_count"] for v in video_list)
-        total_comments = sum(v["comment_count"] for v in video_list)
+        total_views = int(filtered.views[:limit].sum())
+        total_likes = int(filtered.likes[:limit].sum())
+        total_comments = int(filtered.comments[:limit].sum())
 
-        db_stats = collector.get_statistics()
+        db_stats = repo.get_statistics()
 
         # 构建筛选条件描述
         filter_description_parts = []
@@ -807,51 +1037,34 @@ async def analyze_theme(
         filter_description = "，".join(filter_description_parts) if filter_description_parts else "无筛选"
 
         # 计算时长分布（用于模式洞察）- 增强版，包含平均播放量
-        duration_stats = {
-            "short": {"count": 0, "total_views": 0, "videos": []},  # < 5分钟
-            "medium": {"count": 0, "total_views": 0, "videos": []},  # 5-15分钟
-            "long": {"count": 0, "total_views": 0, "videos": []},  # > 15分钟
-        }
-        for v in valid_videos:
-            d = v.duration or 0
-            views = v.view_count or 0
-            if d < 300:  # < 5分钟
-                duration_stats["short"]["count"] += 1
-                duration_stats["short"]["total_views"] += views
-                duration_stats["short"]["videos"].append(views)
-            elif d < 900:  # 5-15分钟
-                duration_stats["medium"]["count"] += 1
-                duration_stats["medium"]["total_views"] += views
-                duration_stats["medium"]["videos"].append(views)
-            else:  # > 15分钟
-                duration_stats["long"]["count"] += 1
-                duration_stats["long"]["total_views"] += views
-                duration_stats["long"]["videos"].append(views)
-
-        # 构建增强版时长分布
+        duration_buckets = filtered.duration_buckets()
+        bucket_count = np.bincount(duration_buckets, minlength=3).tolist()
+        bucket_total = np.zeros(3, dtype=np.int64)
+        np.add.at(bucket_total, duration_buckets, filtered.views)
+        bucket_max = np.full(3, np.iinfo(np.int64).min, dtype=np.int64)
+        np.maximum.at(bucket_max, duration_buckets, filtered.views)
+        bucket_min = np.full(3, np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(bucket_min, duration_buckets, filtered.views)
+
+        duration_keys = ["short", "medium", "long"]  # < 5分钟 / 5-15分钟 / > 15分钟
         duration_distribution = {}
-        for key, stats in duration_stats.items():
-            count = stats["count"]
-            total_views = stats["total_views"]
-            videos = stats["videos"]
+        for i, key in enumerate(duration_keys):
+            count = bucket_count[i]
+            views_sum = int(bucket_total[i])
             duration_distribution[key] = {
                 "count": count,
-                "total_views": total_views,
-                "avg_views": int(total_views / count) if count > 0 else 0,
-                "max_views": max(videos) if videos else 0,
-                "min_views": min(videos) if videos else 0,
+                "total_views": views_sum,
+                "avg_views": int(views_sum / count) if count > 0 else 0,
+                "max_views": int(bucket_max[i]) if count else 0,
+                "min_views": int(bucket_min[i]) if count else 0,
             }
 
-        # 计算标题模式（提取高频关键词）- jieba 已在顶部预加载
+        # 计算标题模式（提取高频关键词）- 读取标题分词缓存，未命中时才用 jieba 分词
         title_word_count = {}
         stopwords = {'的', '了', '是', '在', '我', '有', '和', '就', '不', '人', '都', '一', '一个', '上', '也', '很', '到', '说', '要', '去', '你', '会', '着', '没有', '看', '好', '自己', '这', '那', '他', '她', '它', '们', '我们', '你们', '他们', '什么', '怎么', '这个', '那个', '还', '能', '可以', '让', '被', '把', '给', '与', '及', '之', '来', '为', '以', '于', '所', '如', '或', '而', '但', '并', '且', '因', '则', '只', '从', '如何', '如果', '就是', '什麼', '這個', '那個', '如何', '什么', '怎样', '哪些', '為什麼', '為何', '如何', '怎麼', '怎麽', '#', '｜', '|', '/', '\\', '!', '！', '?', '？', '...', '。', '，', '、', '：', '；', '"', '"', ''', ''', '「', '」', '【', '】', '《', '》', '（', '）', '(', ')', '[', ']', '{', '}', ' ', '\n', '\t'}
-        for v in valid_videos:
-            if v.title:
-                words = jieba.cut(v.title)
-                for word in words:
-                    word = word.strip()
-                    if len(word) >= 2 and word not in stopwords and not word.isdigit():
-                        title_word_count[word] = title_word_count.get(word, 0) + 1
+        for words in _title_tokens.load(valid_videos):
+            for word in filter_tokens(words, stopwords):
+                title_word_count[word] = title_word_count.get(word, 0) + 1
 
         # 排序并取前20个高频词
         title_patterns = [
@@ -860,132 +1073,102 @@ async def analyze_theme(
         ]
 
         # 计算发布趋势（按月统计）
-        publishing_trend = {}
-        for v in valid_videos:
-            if v.published_at:
-                month_key = v.published_at.strftime("%Y-%m")
-                publishing_trend[month_key] = publishing_trend.get(month_key, 0) + 1
+        months, month_counts = np.unique(
+            filtered.published_months()[filtered.has_published], return_counts=True
+        )
 
         # 转换为列表并按月份排序
         publishing_trend_list = [
             {"month": month, "count": count}
-            for month, count in sorted(publishing_trend.items())
+            for month, count in zip(months.tolist(), month_counts.tolist())
         ]
 
         # 计算近期爆款（30天内发布，高播放量）
         now = datetime.now()
-        recent_hits = []
-        evergreen_videos = []
-        for v in valid_videos:
-            if v.published_at:
-                days_old = (now - v.published_at).days
-                daily_views = (v.view_count or 0) / max(days_old, 1)
-                if days_old <= 30 and (v.view_count or 0) >= 10000:
-                    recent_hits.append({
-                        "youtube_id": v.youtube_id,
-                        "title": v.title,
-                        "channel_name": v.channel_name,
-                        "channel_id": v.channel_id,
-                        "view_count": v.view_count or 0,
-                        "video_age_days": days_old,
-                        "daily_views": int(daily_views),
-                        "published_at": v.published_at.isoformat() if v.published_at else None,
-                    })
-                elif days_old > 180 and daily_views > 100:  # 半年以上，日均播放>100
-                    evergreen_videos.append({
-                        "youtube_id": v.youtube_id,
-                        "title": v.title,
-                        "channel_name": v.channel_name,
-                        "channel_id": v.channel_id,
-                        "view_count": v.view_count or 0,
-                        "video_age_days": days_old,
-                        "daily_views": int(daily_views),
-                        "published_at": v.published_at.isoformat() if v.published_at else None,
-                    })
+        days_old = filtered.days_old(now)
+        daily_views = (filtered.views / np.maximum(days_old, 1)).astype(np.int64)
+        is_recent_hit = filtered.has_published & (days_old <= 30) & (filtered.views >= 10000)
+        # 半年以上，日均播放>100
+        is_evergreen = filtered.has_published & ~is_recent_hit & (days_old > 180) & (
+            filtered.views / np.maximum(days_old, 1) > 100
+        )
+
+        def _hit_rows(mask):
+            """按日均播放降序（稳定排序）输出视频行"""
+            rows = np.flatnonzero(mask)
+            rows = rows[np.argsort(-daily_views[rows], kind='stable')]
+            items = []
+            for row in rows.tolist():
+                v = valid_videos[row]
+                items.append({
+                    "youtube_id": v.youtube_id,
+                    "title": v.title,
+                    "channel_name": v.channel_name,
+                    "channel_id": v.channel_id,
+                    "view_count": v.view_count or 0,
+                    "video_age_days": int(days_old[row]),
+                    "daily_views": int(daily_views[row]),
+                    "published_at": v.published_at.isoformat() if v.published_at else None,
+                })
+            return items
 
-        # 按日均播放排序
-        recent_hits.sort(key=lambda x: x["daily_views"], reverse=True)
-        evergreen_videos.sort(key=lambda x: x["daily_views"], reverse=True)
+        recent_hits = _hit_rows(is_recent_hit)
+        evergreen_videos = _hit_rows(is_evergreen)
 
         # 计算内容类型（category）统计
-        category_stats = {}
-        for v in valid_videos:
-            cat = getattr(v, 'category', None) or '未分类'
-            if cat not in category_stats:
-                category_stats[cat] = {
-                    "count": 0,
-                    "total_views": 0,
-                    "videos": [],
-                }
-            category_stats[cat]["count"] += 1
-            category_stats[cat]["total_views"] += v.view_count or 0
-            category_stats[cat]["videos"].append(v.view_count or 0)
+        category_groups = GroupBy(filtered.category_codes)
+        category_count = category_groups.count().tolist()
+        category_total = category_groups.sum(filtered.views).tolist()
+        category_max = category_groups.max(filtered.views, np.iinfo(np.int64).min).tolist()
 
         # 计算各分类的平均播放量，并排序
         category_list = []
-        for cat, stats in category_stats.items():
-            count = stats["count"]
-            total_views = stats["total_views"]
-            videos = stats["videos"]
+        for i, code in enumerate(category_groups.codes.tolist()):
+            count = category_count[i]
             category_list.append({
-                "category": cat,
+                "category": filtered.categories[code],
                 "count": count,
-                "total_views": total_views,
-                "avg_views": int(total_views / count) if count > 0 else 0,
-                "max_views": max(videos) if videos else 0,
+                "total_views": category_total[i],
+                "avg_views": int(category_total[i] / count) if count > 0 else 0,
+                "max_views": category_max[i],
             })
         category_list.sort(key=lambda x: x["count"], reverse=True)
 
         # 计算时长+分类的组合统计（用于发现最佳组合）
-        duration_category_combo = {}
-        for v in valid_videos:
-            cat = getattr(v, 'category', None) or '未分类'
-            d = v.duration or 0
-            if d < 300:
-                duration_key = "short"
-            elif d < 900:
-                duration_key = "medium"
-            else:
-                duration_key = "long"
-            combo_key = f"{duration_key}_{cat}"
-            if combo_key not in duration_category_combo:
-                duration_category_combo[combo_key] = {
-                    "duration_type": duration_key,
-                    "category": cat,
-                    "count": 0,
-                    "total_views": 0,
-                }
-            duration_category_combo[combo_key]["count"] += 1
-            duration_category_combo[combo_key]["total_views"] += v.view_count or 0
-
-        # 计算每个组合的平均播放量
-        for combo in duration_category_combo.values():
-            combo["avg_views"] = int(combo["total_views"] / combo["count"]) if combo["count"] > 0 else 0
+        combo_groups = GroupBy(duration_buckets * len(filtered.categories) + filtered.category_codes)
+        combo_count = combo_groups.count().tolist()
+        combo_total = combo_groups.sum(filtered.views).tolist()
+        duration_category_combo = []
+        for i, code in enumerate(combo_groups.codes.tolist()):
+            duration_index, category_code = divmod(code, len(filtered.categories))
+            duration_category_combo.append({
+                "duration_type": duration_keys[duration_index],
+                "category": filtered.categories[category_code],
+                "count": combo_count[i],
+                "total_views": combo_total[i],
+                "avg_views": int(combo_total[i] / combo_count[i]) if combo_count[i] > 0 else 0,
+            })
 
         # 按平均播放量排序找出最佳组合
         best_combos = sorted(
-            [c for c in duration_category_combo.values() if c["count"] >= 3],  # 至少3个视频才有参考价值
+            [c for c in duration_category_combo if c["count"] >= 3],  # 至少3个视频才有参考价值
             key=lambda x: x["avg_views"],
             reverse=True
         )[:5]  # 取Top5
 
-        # 计算频道更新频率分析
-        channel_update_freq = {}
-        for v in valid_videos:
-            channel_key = v.channel_id if (v.channel_id and v.channel_id != 'None') else v.channel_name
-            if not channel_key or not v.published_at:
-                continue
-            if channel_key not in channel_update_freq:
-                channel_update_freq[channel_key] = {
-                    "channel_name": v.channel_name,
-                    "videos": [],
-                    "total_views": 0,
-                }
-            channel_update_freq[channel_key]["videos"].append({
-                "published_at": v.published_at,
-                "views": v.view_count or 0,
-            })
-            channel_update_freq[channel_key]["total_views"] += v.view_count or 0
+        # 计算频道更新频率分析（只统计有发布时间的视频）
+        freq_groups = filtered.group_by_channel(filtered.has_published)
+        freq_count = freq_groups.count()
+        freq_total = freq_groups.sum(filtered.views)
+
+        # 频道内按发布时间排序，累加相邻视频的间隔天数
+        order = np.lexsort((filtered.published[freq_groups.rows], freq_groups.labels))
+        sorted_labels = freq_groups.labels[order]
+        sorted_published = filtered.published[freq_groups.rows][order]
+        same_channel = sorted_labels[1:] == sorted_labels[:-1]
+        gaps = np.diff(sorted_published) // US_PER_DAY
+        freq_days = np.zeros(freq_groups.size, dtype=np.int64)
+        np.add.at(freq_days, sorted_labels[1:][same_channel], gaps[same_channel])
 
         # 计算每个频道的更新频率
         update_frequency_stats = {
@@ -996,20 +1179,13 @@ async def analyze_theme(
             "irregular": {"count": 0, "total_views": 0, "channels": []}, # 不规律
         }
 
-        for channel_key, data in channel_update_freq.items():
-            videos = data["videos"]
-            if len(videos) < 2:
+        for i, first_row in enumerate(freq_groups.first_rows.tolist()):
+            video_count = int(freq_count[i])
+            if video_count < 2:
                 continue  # 至少2个视频才能计算频率
 
-            # 按发布时间排序
-            videos.sort(key=lambda x: x["published_at"])
-
-            # 计算平均间隔天数
-            total_days = 0
-            for i in range(1, len(videos)):
-                delta = (videos[i]["published_at"] - videos[i-1]["published_at"]).days
-                total_days += delta
-            avg_interval = total_days / (len(videos) - 1) if len(videos) > 1 else 0
+            channel_views = int(freq_total[i])
+            avg_interval = int(freq_days[i]) / (video_count - 1)
 
             # 分类更新频率
             if avg_interval <= 2:
@@ -1024,14 +1200,14 @@ async def analyze_theme(
                 freq_type = "irregular"
 
             update_frequency_stats[freq_type]["count"] += 1
-            update_frequency_stats[freq_type]["total_views"] += data["total_views"]
+            update_frequency_stats[freq_type]["total_views"] += channel_views
             if len(update_frequency_stats[freq_type]["channels"]) < 5:  # 每类最多记录5个频道
                 update_frequency_stats[freq_type]["channels"].append({
-                    "channel_name": data["channel_name"],
-                    "video_count": len(videos),
+                    "channel_name": valid_videos[first_row].channel_name,
+                    "video_count": video_count,
                     "avg_interval_days": round(avg_interval, 1),
-                    "total_views": data["total_views"],
-                    "avg_views": data["total_views"] // len(videos) if videos else 0,
+                    "total_views": channel_views,
+                    "avg_views": channel_views // video_count,
                 })
 
         # 计算每个频率类型的平均播放量
@@ -1045,6 +1221,9 @@ async def analyze_theme(
             default=("unknown", {"avg_views": 0})
         )
 
+        # 频道统计（洞察、频道列表、地区分布共用）- 使用过滤后的视频
+        channel_stats = _extract_channel_stats(filtered)
+
         # ========== 智能分析结论 ==========
         insights = _generate_insights(
             theme=theme,
@@ -1053,7 +1232,7 @@ async def analyze_theme(
             publishing_trend=publishing_trend_list,
             recent_hits=recent_hits,
             evergreen_videos=evergreen_videos,
-            channels=_extract_channel_stats(valid_videos),  # 使用时间过滤后的视频
+            channels=channel_stats,
             total_videos=actual_total_videos,
             filtered_videos=filtered_count,
             avg_views=total_views // len(video_list) if video_list else 0,
@@ -1073,6 +1252,7 @@ async def analyze_theme(
                 "avg_views": total_views // len(video_list) if video_list else 0,
                 "avg_likes": total_likes // len(video_list) if video_list else 0,
                 "videos": video_list,
+                "next_cursor": next_cursor,
                 "data_basis": {
                     "total_videos_in_db": db_stats.get('total', 0),
                     "videos_for_this_topic": actual_total_videos,
@@ -1088,7 +1268,7 @@ async def analyze_theme(
                     "description": filter_description
                 },
                 "last_updated": datetime.now().isoformat(),
-                "channels": _extract_channel_stats(valid_videos),  # 使用时间过滤后的视频
+                "channels": channel_stats,
                 # 模式洞察数据
                 "duration_distribution": duration_distribution,
                 "title_patterns": title_patterns,  # 标题高频词
@@ -1106,21 +1286,18 @@ async def analyze_theme(
                 # 智能分析结论
                 "insights": insights,
                 # 频道榜单（用于频道运营模块的动态渲染）- 使用过滤后的视频
-                "channel_rankings": _generate_channel_rankings(valid_videos),
+                "channel_rankings": _generate_channel_rankings(filtered),
                 # 频道稳定性分析 - 使用过滤后的视频
-                "channel_stability": _calculate_channel_stability(valid_videos),
+                "channel_stability": _calculate_channel_stability(filtered),
                 # 地区分布分析（Tab2 套利挖掘）
-                "region_distribution": _analyze_region_distribution(_extract_channel_stats(valid_videos)),
+                "region_distribution": _analyze_region_distribution(channel_stats),
                 # 星期发布效果分析（Tab5 发布策略）
-                "weekday_performance": _analyze_weekday_performance(valid_videos),
+                "weekday_performance": _analyze_weekday_performance(filtered),
                 # 内容生命周期分析（Tab3 选题决策）
-                "content_lifecycle": _analyze_content_lifecycle(valid_videos),
+                "content_lifecycle": _analyze_content_lifecycle(filtered),
             }
         }
 
-        # 缓存结果
-        _analyze_cache[cache_key] = (time.time(), result)
-
         return result
     except Exception as e:
         traceback.print_exc()
@@ -1612,93 +1789,51 @@ def _generate_insights(
     return insights
 
 
-def _get_channels_info_from_db() -> dict:
-    """从 channels 表获取频道详细信息"""
-    if not db_exists():
-        return {}
-
-    channels_info = {}
-    try:
-        conn = db_get_connection(row_factory=sqlite3.Row)
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT channel_id, channel_name, handle, subscriber_count,
-                   video_count, total_views, country, description,
-                   created_at, canonical_url
-            FROM channels
-        """)
-        for row in cursor.fetchall():
-            channels_info[row['channel_id']] = {
-                'handle': row['handle'],
-                'channel_subscriber_count': row['subscriber_count'],  # channels 表的订阅数
-                'channel_video_count': row['video_count'],  # 频道总视频数
-                'channel_total_views': row['total_views'],  # 频道总观看数
-                'country': row['country'],
-                'description': row['description'],
-                'created_at': row['created_at'],
-                'canonical_url': row['canonical_url'],
-            }
-        conn.close()
-    except Exception as e:
-        print(f"查询 channels 表失败: {e}")
-
-    return channels_info
-
-
-def _extract_channel_stats(videos) -> list:
+def _extract_channel_stats(snapshot: ThemeSnapshot) -> list:
     """提取频道统计信息（合并 channels 表数据）"""
-    # 先从 channels 表获取额外信息
-    channels_extra_info = _get_channels_info_from_db()
-
-    channel_data = {}
-    for v in videos:
-        channel_key = v.channel_id if (v.channel_id and v.channel_id != 'None') else v.channel_name
-        if not channel_key:
-            continue
 
-        if channel_key not in channel_data:
-            channel_data[channel_key] = {
-                "channel_id": v.channel_id,
-                "channel_name": v.channel_name,
-                "video_count": 0,  # 该主题下的视频数
-                "total_views": 0,  # 该主题下的总播放
-                "total_likes": 0,
-                "subscriber_count": 0,  # 订阅数（取最大值）
-            }
-
-        channel_data[channel_key]["video_count"] += 1
-        channel_data[channel_key]["total_views"] += v.view_count or 0
-        channel_data[channel_key]["total_likes"] += v.like_count or 0
-        # 取该频道视频中最大的订阅数（因为不同视频采集时间可能不同）
-        video_subscriber = getattr(v, 'subscriber_count', 0) or 0
-        if video_subscriber > channel_data[channel_key]["subscriber_count"]:
-            channel_data[channel_key]["subscriber_count"] = video_subscriber
+    groups = snapshot.group_by_channel()
+    video_count = groups.count().tolist()
+    total_views = groups.sum(snapshot.views).tolist()
+    total_likes = groups.sum(snapshot.likes).tolist()
+    # 取该频道视频中最大的订阅数（因为不同视频采集时间可能不同）
+    subscriber_count = groups.max(snapshot.subscribers, 0).tolist()
+
+    channels = []
+    for i, row in enumerate(groups.first_rows.tolist()):
+        v = snapshot.videos[row]
+        channels.append({
+            "channel_id": v.channel_id,
+            "channel_name": v.channel_name,
+            "video_count": video_count[i],  # 该主题下的视频数
+            "total_views": total_views[i],  # 该主题下的总播放
+            "total_likes": total_likes[i],
+            "subscriber_count": subscriber_count[i],  # 订阅数（取最大值）
+        })
 
     # 计算平均值、合并 channels 表数据并排序
-    channels = list(channel_data.values())
     for c in channels:
         c["avg_views"] = c["total_views"] // c["video_count"] if c["video_count"] > 0 else 0
         c["subscriberCount"] = c["subscriber_count"]  # 前端期望的字段名
 
-        # 合并 channels 表的额外信息
-        channel_id = c.get("channel_id")
-        if channel_id and channel_id in channels_extra_info:
-            extra = channels_extra_info[channel_id]
-            c["handle"] = extra.get("handle")  # @用户名
-            c["country"] = extra.get("country")  # 国家/地区
-            c["description"] = extra.get("description")  # 频道描述
-            c["channel_video_count"] = extra.get("channel_video_count")  # 频道总视频数
-            c["channel_total_views"] = extra.get("channel_total_views")  # 频道总观看数
-            c["created_at"] = extra.get("created_at")  # 频道创建时间
-            c["canonical_url"] = extra.get("canonical_url")  # 频道 URL
+        # 合并 channels 表的额外信息（进程级频道缓存）
+        extra = _channel_cache.get(c.get("channel_id"))
+        if extra:
+            c["handle"] = extra.handle  # @用户名
+            c["country"] = extra.country  # 国家/地区
+            c["description"] = extra.description  # 频道描述
+            c["channel_video_count"] = extra.video_count  # 频道总视频数
+            c["channel_total_views"] = extra.total_views  # 频道总观看数
+            c["created_at"] = extra.created_at  # 频道创建时间
+            c["canonical_url"] = extra.canonical_url  # 频道 URL
             # 如果 channels 表有订阅数且比视频表的大，使用 channels 表的
-            channel_subs = extra.get("channel_subscriber_count") or 0
+            channel_subs = extra.subscriber_count
             if channel_subs > c["subscriber_count"]:
                 c["subscriber_count"] = channel_subs
                 c["subscriberCount"] = channel_subs
 
             # 计算频道年龄和日均涨粉
-            created_at = extra.get("created_at")
+            created_at = extra.created_at
             if created_at and c["subscriber_count"] > 0:
                 try:
                     from datetime import datetime
@@ -1741,7 +1876,8 @@ async def get_trending_keywords():
 # ============================================================
 
 @app.get("/api/creator-helper/{theme}")
-async def get_creator_helper(theme: str):
+@offloaded("creator", workers=2, queue=8)
+def get_creator_helper(theme: str):
     """
     创作者助手 API - 直接给出可用的建议
 
@@ -1752,6 +1888,14 @@ async def get_creator_helper(theme: str):
     4. 学习对象 - 频道榜单（总播放榜/平均播放榜/视频数榜/黑马榜/高效榜）
     5. 避坑提醒 - 3 个最重要的警告
     """
+    return _analysis_cache.get_or_compute(
+        ("creator", theme),
+        lambda: _compute_creator_helper(theme),
+    )
+
+
+def _compute_creator_helper(theme: str) -> dict:
+    """计算创作者助手结果（不经过缓存）"""
     try:
         collector = _get_data_collector()
 
@@ -1778,6 +1922,9 @@ async def get_creator_helper(theme: str):
         now = datetime.now()
         import math
 
+        # 批量预热标题分词缓存（选题助手按标题读取内存层）
+        _title_tokens.load(all_videos)
+
         # ========== 1. 选题助手 ==========
         topic_recommendations = _generate_topic_recommendations(all_videos, theme, now)
 
@@ -1788,7 +1935,7 @@ async def get_creator_helper(theme: str):
         title_helper = _generate_title_helper(all_videos)
 
         # ========== 4. 学习对象（频道榜单）==========
-        channel_rankings = _generate_channel_rankings(all_videos)
+        channel_rankings = _generate_channel_rankings(ThemeSnapshot.from_videos(all_videos))
 
         # ========== 5. 避坑提醒 ==========
         warnings = _generate_warnings(all_videos, now)
@@ -1813,7 +1960,6 @@ async def get_creator_helper(theme: str):
 
 def _generate_topic_recommendations(videos, theme: str, now) -> dict:
     """生成选题推荐"""
-    import jieba
     from collections import Counter
 
     # 分析近期爆款的关键词
@@ -1846,11 +1992,7 @@ def _generate_topic_recommendations(videos, theme: str, now) -> dict:
     keyword_counter = Counter()
 
     for v in recent_viral[:20]:
-        words = jieba.cut(v["title"])
-        for word in words:
-            word = word.strip()
-            if len(word) >= 2 and word not in stopwords and not word.isdigit():
-                keyword_counter[word] += 1
+        keyword_counter.update(filter_tokens(_title_tokens.tokens(v["title"]), stopwords))
 
     hot_keywords = [k for k, _ in keyword_counter.most_common(10)]
 
@@ -1952,7 +2094,6 @@ def _generate_viral_learning(videos, now) -> dict:
 
 def _generate_title_helper(videos) -> dict:
     """生成标题助手内容"""
-    import jieba
     from collections import Counter
 
     # 提取所有标题的关键词
@@ -1962,14 +2103,12 @@ def _generate_title_helper(videos) -> dict:
     keyword_scores = Counter()
     keyword_video_count = Counter()
 
-    for v in videos:
+    for v, words in zip(videos, _title_tokens.load(videos)):
         if not v.title or not v.view_count:
             continue
-        words = jieba.cut(v.title)
         seen_words = set()
-        for word in words:
-            word = word.strip()
-            if len(word) >= 2 and word not in stopwords and not word.isdigit() and word not in seen_words:
+        for word in filter_tokens(words, stopwords):
+            if word not in seen_words:
                 seen_words.add(word)
                 keyword_scores[word] += v.view_count
                 keyword_video_count[word] += 1
@@ -2005,109 +2144,74 @@ def _generate_title_helper(videos) -> dict:
     }
 
 
-def _generate_channel_rankings(videos) -> dict:
+def _generate_channel_rankings(snapshot: ThemeSnapshot) -> dict:
     """生成频道榜单（总播放榜/平均播放榜/视频数榜/黑马榜/高效榜/快速增长榜）"""
     import math
     from datetime import datetime
 
-    # 从 channels 表获取频道订阅数和创建时间
-    channel_info = {}  # channel_id/channel_name -> {subscriber_count, created_at, days_since_creation, subs_per_day}
-    if db_exists():
-        try:
-            conn = db_get_connection()
-            cursor = conn.cursor()
-            # 获取所有频道的订阅数（不限制 created_at）
-            cursor.execute("""
-                SELECT channel_id, channel_name, subscriber_count, created_at
-                FROM channels
-                WHERE subscriber_count > 0
-            """)
-            now = datetime.now()
-            for row in cursor.fetchall():
-                ch_id, ch_name, subs, created_at = row
-                info = {
-                    "subscriber_count": subs or 0,
-                    "created_at": None,
-                    "days_since_creation": None,
-                    "subs_per_day": 0,
-                }
-                # 如果有创建时间，计算增长速度
-                if created_at and created_at.strip():
-                    try:
-                        created = datetime.strptime(created_at, "%Y-%m-%d")
-                        days = (now - created).days
-                        if days > 0:
-                            info["created_at"] = created_at
-                            info["days_since_creation"] = days
-                            info["subs_per_day"] = round(subs / days, 1) if subs else 0
-                    except:
-                        pass
-                # 用 channel_id 和 channel_name 都作为 key
-                if ch_id:
-                    channel_info[ch_id] = info
-                if ch_name:
-                    channel_info[ch_name] = info
-            conn.close()
-        except Exception as e:
-            print(f"获取频道数据失败: {e}")
-
-    # 统计每个频道的数据
-    channel_data = {}
-    channel_videos = {}  # 存储每个频道的视频列表，用于详细分析
+    def channel_growth_info(channel_key) -> Optional[dict]:
+        """从频道缓存获取订阅数和创建时间（只使用有订阅数的频道）"""
+        channel = _channel_cache.lookup(channel_key)
+        if not channel or channel.subscriber_count <= 0:
+            return None
+        subs = channel.subscriber_count
+        info = {
+            "subscriber_count": subs,
+            "created_at": None,
+            "days_since_creation": None,
+            "subs_per_day": 0,
+        }
+        # 如果有创建时间，计算增长速度
+        created_at = channel.created_at
+        if created_at and created_at.strip():
+            try:
+                created = datetime.strptime(created_at, "%Y-%m-%d")
+                days = (now - created).days
+                if days > 0:
+                    info["created_at"] = created_at
+                    info["days_since_creation"] = days
+                    info["subs_per_day"] = round(subs / days, 1) if subs else 0
+            except:
+                pass
+        return info
 
-    for v in videos:
-        channel_key = v.channel_id if (v.channel_id and v.channel_id != 'None') else v.channel_name
-        if not channel_key:
-            continue
+    now = datetime.now()
 
-        if channel_key not in channel_data:
-            channel_data[channel_key] = {
-                "channel_id": v.channel_id,
-                "channel_name": v.channel_name,
-                "video_count": 0,
-                "total_views": 0,
-                "total_likes": 0,
-                "subscriber_count": 0,
-                "max_views": 0,
-                "min_views": float('inf'),
-                "total_duration": 0,
-                "videos": [],  # 用于分析优缺点
-            }
-            channel_videos[channel_key] = []
-
-        channel_data[channel_key]["video_count"] += 1
-        channel_data[channel_key]["total_views"] += v.view_count or 0
-        channel_data[channel_key]["total_likes"] += v.like_count or 0
-        channel_data[channel_key]["total_duration"] += v.duration or 0
-
-        if (v.view_count or 0) > channel_data[channel_key]["max_views"]:
-            channel_data[channel_key]["max_views"] = v.view_count or 0
-        if (v.view_count or 0) < channel_data[channel_key]["min_views"]:
-            channel_data[channel_key]["min_views"] = v.view_count or 0
-
-        channel_data[channel_key]["videos"].append({
-            "title": v.title,
-            "views": v.view_count or 0,
-            "likes": v.like_count or 0,
-            "duration": v.duration or 0,
+    # 统计每个频道的数据
+    groups = snapshot.group_by_channel()
+    video_count = groups.count().tolist()
+    total_views = groups.sum(snapshot.views).tolist()
+    total_likes = groups.sum(snapshot.likes).tolist()
+    total_duration = groups.sum(snapshot.duration).tolist()
+    max_views = groups.max(snapshot.views, 0).tolist()
+    min_views = groups.min(snapshot.views, np.iinfo(np.int64).max).tolist()
+    subscriber_count = groups.max(snapshot.subscribers, 0).tolist()
+
+    channels = []
+    for i, row in enumerate(groups.first_rows.tolist()):
+        v = snapshot.videos[row]
+        channels.append({
+            "channel_id": v.channel_id,
+            "channel_name": v.channel_name,
+            "video_count": video_count[i],
+            "total_views": total_views[i],
+            "total_likes": total_likes[i],
+            "subscriber_count": subscriber_count[i],
+            "max_views": max_views[i],
+            "min_views": min_views[i],
+            "total_duration": total_duration[i],
         })
 
-        video_subscriber = getattr(v, 'subscriber_count', 0) or 0
-        if video_subscriber > channel_data[channel_key]["subscriber_count"]:
-            channel_data[channel_key]["subscriber_count"] = video_subscriber
-
     # 计算派生指标
-    channels = list(channel_data.values())
     for c in channels:
         c["avg_views"] = c["total_views"] // c["video_count"] if c["video_count"] > 0 else 0
         c["avg_duration"] = c["total_duration"] // c["video_count"] if c["video_count"] > 0 else 0
         c["engagement_rate"] = c["total_likes"] / c["total_views"] if c["total_views"] > 0 else 0
-        c["views_variance"] = c["max_views"] - c["min_views"] if c["min_views"] != float('inf') else 0
+        c["views_variance"] = c["max_views"] - c["min_views"]
 
         # 【重要】先从 channels 表获取订阅数（更准确），再计算黑马指数
-        channel_key = c["channel_id"] or c["channel_name"]
-        if channel_key in channel_info:
-            info = channel_info[channel_key]
+        info = channel_growth_info(c["channel_id"] or c["channel_name"])
+        if info:
             # 使用 channels 表的订阅数（更准确）
             if info["subscriber_count"] > c["subscriber_count"]:
                 c["subscriber_count"] = info["subscriber_count"]
@@ -2385,7 +2489,7 @@ def _generate_channel_rankings(videos) -> dict:
     }
 
 
-def _calculate_channel_stability(videos) -> dict:
+def _calculate_channel_stability(snapshot: ThemeSnapshot) -> dict:
     """
     计算频道稳定性分析
 
@@ -2396,38 +2500,23 @@ def _calculate_channel_stability(videos) -> dict:
     - > 20: 极不稳定（高度依赖单一爆款）
     """
     # 统计每个频道的数据
-    channel_data = {}
-    for v in videos:
-        channel_key = v.channel_id if (v.channel_id and v.channel_id != 'None') else v.channel_name
-        if not channel_key:
-            continue
-
-        if channel_key not in channel_data:
-            channel_data[channel_key] = {
-                "channel_id": v.channel_id,
-                "channel_name": v.channel_name,
-                "views": [],
-                "total_views": 0,
-                "video_count": 0,
-            }
-
-        channel_data[channel_key]["views"].append(v.view_count or 0)
-        channel_data[channel_key]["total_views"] += v.view_count or 0
-        channel_data[channel_key]["video_count"] += 1
+    groups = snapshot.group_by_channel()
+    video_count = groups.count().tolist()
+    total_views = groups.sum(snapshot.views).tolist()
+    max_views = groups.max(snapshot.views, 0).tolist()
+    min_views = groups.min(snapshot.views, np.iinfo(np.int64).max).tolist()
 
     # 计算稳定性指标（只分析至少有3个视频的频道）
     stability_results = []
-    for key, data in channel_data.items():
-        if data["video_count"] < 3:
+    for i, row in enumerate(groups.first_rows.tolist()):
+        if video_count[i] < 3:
             continue
 
-        views = data["views"]
-        avg_views = data["total_views"] / data["video_count"]
-        max_views = max(views)
-        min_views = min(views)
+        v = snapshot.videos[row]
+        avg_views = total_views[i] / video_count[i]
 
         # max/avg 比值
-        max_avg_ratio = max_views / avg_views if avg_views > 0 else 0
+        max_avg_ratio = max_views[i] / avg_views if avg_views > 0 else 0
 
         # 判断稳定性等级
         if max_avg_ratio < 3:
@@ -2444,12 +2533,12 @@ def _calculate_channel_stability(videos) -> dict:
             stability_class = "danger"
 
         stability_results.append({
-            "channel_name": data["channel_name"],
-            "channel_id": data["channel_id"],
-            "video_count": data["video_count"],
+            "channel_name": v.channel_name,
+            "channel_id": v.channel_id,
+            "video_count": video_count[i],
             "avg_views": int(avg_views),
-            "max_views": max_views,
-            "min_views": min_views,
+            "max_views": max_views[i],
+            "min_views": min_views[i],
             "max_avg_ratio": round(max_avg_ratio, 2),
             "stability": stability,
             "stability_class": stability_class,
@@ -2577,31 +2666,31 @@ def _get_region_feature(region: str, avg_views: int, channel_count: int) -> str:
     return "新兴市场"
 
 
-def _analyze_weekday_performance(videos: list) -> dict:
+def _analyze_weekday_performance(snapshot: ThemeSnapshot) -> dict:
     """
     分析不同星期的发布效果（Tab5 发布策略）
     """
     weekday_names = ["周一", "周二", "周三", "周四", "周五", "周六", "周日"]
-    weekday_stats = {i: {"count": 0, "total_views": 0, "max_views": 0} for i in range(7)}
 
-    for v in videos:
-        if v.published_at:
-            weekday = v.published_at.weekday()  # 0=周一, 6=周日
-            views = v.view_count or 0
-            weekday_stats[weekday]["count"] += 1
-            weekday_stats[weekday]["total_views"] += views
-            weekday_stats[weekday]["max_views"] = max(weekday_stats[weekday]["max_views"], views)
+    weekdays = snapshot.published_weekdays()[snapshot.has_published]  # 0=周一, 6=周日
+    views = snapshot.views[snapshot.has_published]
+    counts = np.bincount(weekdays, minlength=7).tolist()
+    totals = np.zeros(7, dtype=np.int64)
+    np.add.at(totals, weekdays, views)
+    maxima = np.zeros(7, dtype=np.int64)
+    np.maximum.at(maxima, weekdays, views)
+    totals, maxima = totals.tolist(), maxima.tolist()
 
     results = []
-    for i, stats in weekday_stats.items():
-        if stats["count"] > 0:
-            avg_views = stats["total_views"] // stats["count"]
+    for i in range(7):
+        if counts[i] > 0:
+            avg_views = totals[i] // counts[i]
             results.append({
                 "weekday": weekday_names[i],
                 "weekday_index": i,
-                "video_count": stats["count"],
+                "video_count": counts[i],
                 "avg_views": avg_views,
-                "max_views": stats["max_views"],
+                "max_views": maxima[i],
             })
 
     # 按均播放排序
@@ -2624,45 +2713,39 @@ def _analyze_weekday_performance(videos: list) -> dict:
     }
 
 
-def _analyze_content_lifecycle(videos: list) -> dict:
+def _analyze_content_lifecycle(snapshot: ThemeSnapshot) -> dict:
     """
     分析内容类型生命周期（Tab3 选题决策）
     """
-    from datetime import datetime
-    now = datetime.now()
-
     # 按内容类型分组
-    type_stats = {}
-    for v in videos:
-        content_type = _classify_content_type(v.title or "")
-        if content_type not in type_stats:
-            type_stats[content_type] = {
-                "videos": [],
-                "total_views": 0,
-                "earliest": None,
-                "latest": None,
-            }
+    content_types = [_classify_content_type(v.title or "") for v in snapshot.videos]
+    type_names = list(dict.fromkeys(content_types))
+    type_index = {name: i for i, name in enumerate(type_names)}
+    type_codes = np.fromiter((type_index[t] for t in content_types), dtype=np.int64, count=len(content_types))
 
-        type_stats[content_type]["videos"].append(v)
-        type_stats[content_type]["total_views"] += v.view_count or 0
+    groups = GroupBy(type_codes)
+    video_counts = groups.count().tolist()
+    total_views = groups.sum(snapshot.views).tolist()
 
-        if v.published_at:
-            if type_stats[content_type]["earliest"] is None or v.published_at < type_stats[content_type]["earliest"]:
-                type_stats[content_type]["earliest"] = v.published_at
-            if type_stats[content_type]["latest"] is None or v.published_at > type_stats[content_type]["latest"]:
-                type_stats[content_type]["latest"] = v.published_at
+    # 活跃跨度只统计有发布时间的视频
+    dated = GroupBy(type_codes, snapshot.has_published)
+    dated_index = dict(zip(dated.codes.tolist(), range(dated.size)))
+    earliest = dated.min(snapshot.published, np.iinfo(np.int64).max).tolist()
+    latest = dated.max(snapshot.published, np.iinfo(np.int64).min).tolist()
 
     results = []
-    for content_type, stats in type_stats.items():
-        video_count = len(stats["videos"])
+    for i, code in enumerate(groups.codes.tolist()):
+        content_type = type_names[code]
+        video_count = video_counts[i]
         if video_count < 3:  # 至少3个视频才分析
             continue
 
-        avg_views = stats["total_views"] // video_count
+        avg_views = total_views[i] // video_count
 
         # 计算活跃跨度
-        if stats["earliest"] and stats["latest"]:
-            span_days = (stats["latest"] - stats["earliest"]).days
+        if code in dated_index:
+            j = dated_index[code]
+            span_days = (latest[j] - earliest[j]) // US_PER_DAY
             if span_days > 365:
                 span_text = f"{span_days // 365}年"
             elif span_days > 30:
@@ -2796,7 +2879,8 @@ def _generate_warnings(videos, now) -> list:
 # ============================================================
 
 @app.get("/api/user-insights/{keyword}")
-async def get_user_insights(
+@offloaded("insights", workers=2, queue=8)
+def get_user_insights(
     keyword: str,
     date_from: Optional[str] = None,
     date_to: Optional[str] = None
@@ -2829,7 +2913,8 @@ async def get_user_insights(
 
     # 构建时间过滤条件
     date_conditions = []
-    params = [f"%{keyword}%", f"%{keyword}%", f"%{keyword}%"]
+    # 标题 / 关键词 / 主题包含 keyword（走 FTS5 trigram 或 pg_trgm 索引）
+    match_condition, params = _get_search_index().contains_condition(keyword, alias="cv")
 
     if date_from:
         date_conditions.append("cv.published_at >= ?")
@@ -2845,7 +2930,7 @@ async def get_user_insights(
         SELECT vc.text, vc.like_count, vc.published_at
         FROM video_comments vc
         JOIN competitor_videos cv ON vc.youtube_id = cv.youtube_id
-        WHERE (cv.title LIKE ? OR cv.keyword_source LIKE ? OR cv.theme LIKE ?)
+        WHERE {match_condition}
         AND vc.text IS NOT NULL
         {date_filter}
     """, params)
@@ -3226,13 +3311,22 @@ async def get_user_insights(
 # ============================================================
 
 @app.get("/api/topic-network/{theme}")
-async def analyze_topic_network(theme: str, min_cooccurrence: int = 2, top_n: int = 30):
+@offloaded("network", workers=2, queue=4)
+def analyze_topic_network(theme: str, min_cooccurrence: int = 2, top_n: int = 30):
     """
     话题网络分析 - 计算话题有趣度
 
     有趣度 = 中介中心性 / 程度中心性
     高有趣度 = 高桥梁价值 + 低传播饱和度 = 被低估的高价值节点
     """
+    return _analysis_cache.get_or_compute(
+        ("network", theme, min_cooccurrence, top_n),
+        lambda: _compute_topic_network(theme, min_cooccurrence, top_n),
+    )
+
+
+def _compute_topic_network(theme: str, min_cooccurrence: int, top_n: int) -> dict:
+    """计算话题网络（不经过缓存）"""
     try:
         import networkx as nx
         from collections import defaultdict, Counter
@@ -3348,7 +3442,8 @@ async def analyze_topic_network(theme: str, min_cooccurrence: int = 2, top_n: in
 # ============================================================
 
 @app.get("/api/leaderboard")
-async def get_leaderboard():
+@offloaded("leaderboard", workers=2, queue=8)
+def get_leaderboard():
     """
     获取全局榜单数据
 
@@ -3357,49 +3452,59 @@ async def get_leaderboard():
     - Top 50 热门视频（按播放量）
     - Top 10 热门话题（按视频数/播放量）
     """
+    return _analysis_cache.get_or_compute(("leaderboard",), _compute_leaderboard, db_path=str(SERVER_DB_PATH))
+
+
+def _format_dark_horse_channels(rows: list) -> list:
+    """黑马频道榜单（agg_channel 行 -> 接口格式）"""
+    channels = []
+    for row in rows:
+        channel_id = row["channel_id"]
+        channels.append({
+            "rank": len(channels) + 1,
+            "channel_name": row["channel_name"],
+            "channel_id": channel_id,
+            "channel_url": f"https://www.youtube.com/channel/{channel_id}" if channel_id else None,
+            "video_count": int(row["video_count"] or 0),
+            "avg_views": int(row["avg_views"] or 0),
+            "max_views": int(row["max_views"] or 0),
+            "total_views": int(row["total_views"] or 0),
+            "subscriber_count": int(row["subscriber_count"] or 0),
+            "dark_horse_score": round(row["dark_horse_score"] or 0, 2)
+        })
+    return channels
+
+
+def _format_top_topics(rows: list) -> list:
+    """热门话题榜单（agg_keyword 行 -> 接口格式）"""
+    topics = []
+    for row in rows:
+        video_count = int(row["video_count"] or 0)
+        total_views = int(row["total_views"] or 0)
+        topics.append({
+            "rank": len(topics) + 1,
+            "topic": row["keyword_source"],
+            "video_count": video_count,
+            "total_views": total_views,
+            "avg_views": total_views // video_count if video_count else 0,
+            "channel_count": int(row["channel_count"] or 0)
+        })
+    return topics
+
+
+def _compute_leaderboard() -> dict:
+    """计算全局榜单（不经过缓存）"""
     try:
-        db_path = Path(__file__).parent / "data" / "youtube_pipeline.db"
-        conn = db_get_connection(str(db_path))
-        cursor = conn.cursor()
+        db_path = SERVER_DB_PATH
+        aggregates = _get_aggregates(str(db_path))
 
         # ========== Top 50 黑马频道 ==========
         # 黑马指数 = 平均播放量 / max(订阅数, 1000)
-        # 只选择至少有2个视频的频道，且有订阅数据
-        cursor.execute("""
-            SELECT
-                channel_name,
-                channel_id,
-                COUNT(*) as video_count,
-                AVG(view_count) as avg_views,
-                MAX(view_count) as max_views,
-                SUM(view_count) as total_views,
-                MAX(subscriber_count) as subscriber_count,
-                AVG(view_count) * 1.0 / GREATEST(MAX(subscriber_count), 1000) as dark_horse_score
-            FROM competitor_videos
-            WHERE channel_name IS NOT NULL
-              AND channel_name != ''
-              AND view_count > 0
-            GROUP BY channel_id, channel_name
-            HAVING COUNT(*) >= 2 AND MAX(subscriber_count) > 0
-            ORDER BY dark_horse_score DESC
-            LIMIT 50
-        """)
+        # 只选择至少有2个视频的频道，且有订阅数据（读取物化聚合表 agg_channel）
+        dark_horse_channels = _format_dark_horse_channels(aggregates.dark_horse_channels(limit=50))
 
-        dark_horse_channels = []
-        for row in cursor.fetchall():
-            channel_name, channel_id, video_count, avg_views, max_views, total_views, subscriber_count, score = row
-            dark_horse_channels.append({
-                "rank": len(dark_horse_channels) + 1,
-                "channel_name": channel_name,
-                "channel_id": channel_id,
-                "channel_url": f"https://www.youtube.com/channel/{channel_id}" if channel_id else None,
-                "video_count": video_count,
-                "avg_views": int(avg_views or 0),
-                "max_views": int(max_views or 0),
-                "total_views": int(total_views or 0),
-                "subscriber_count": int(subscriber_count or 0),
-                "dark_horse_score": round(score or 0, 2)
-            })
+        conn = db_get_connection(str(db_path))
+        cursor = conn.cursor()
 
         # ========== Top 50 热门视频 ==========
         cursor.execute("""
@@ -3440,39 +3545,11 @@ async def get_leaderboard():
                 "duration": int(duration or 0)
             })
 
+        conn.close()
+
         # ========== Top 10 热门话题 ==========
         # 使用 keyword_source 作为话题来源（比 theme 更丰富）
-        cursor.execute("""
-            SELECT
-                keyword_source,
-                COUNT(*) as video_count,
-                SUM(view_count) as total_views,
-                AVG(view_count) as avg_views,
-                COUNT(DISTINCT COALESCE(channel_id, channel_name)) as channel_count
-            FROM competitor_videos
-            WHERE keyword_source IS NOT NULL AND keyword_source != ''
-            GROUP BY keyword_source
-            ORDER BY video_count DESC, total_views DESC
-            LIMIT 10
-        """)
-
-        top_topics = []
-        for row in cursor.fetchall():
-            keyword_source, video_count, total_views, avg_views, channel_count = row
-            top_topics.append({
-                "rank": len(top_topics) + 1,
-                "topic": keyword_source,
-                "video_count": int(video_count or 0),
-                "total_views": int(total_views or 0),
-                "avg_views": int(avg_views or 0),
-                "channel_count": int(channel_count or 0)
-            })
-
-        # ========== 统计概览 ==========
-        cursor.execute("SELECT COUNT(*), COUNT(DISTINCT COALESCE(channel_id, channel_name)), SUM(view_count) FROM competitor_videos")
-        stats = cursor.fetchone()
-
-        conn.close()
+        top_topics = _format_top_topics(aggregates.top_keywords(limit=10))
 
         return {
             "status": "ok",
@@ -3480,11 +3557,8 @@ async def get_leaderboard():
                 "dark_horse_channels": dark_horse_channels,
                 "top_videos": top_videos,
                 "top_topics": top_topics,
-                "stats": {
-                    "total_videos": stats[0] or 0,
-                    "total_channels": stats[1] or 0,
-                    "total_views": stats[2] or 0
-                }
+                # 统计概览
+                "stats": aggregates.global_stats()
             }
         }
 
@@ -3498,7 +3572,8 @@ async def get_leaderboard():
 # ============================================================
 
 @app.get("/api/centrality")
-async def get_centrality_analysis():
+@offloaded("centrality", workers=1, queue=4)
+def get_centrality_analysis():
     """
     获取网络中心性分析数据
 
@@ -3510,7 +3585,7 @@ async def get_centrality_analysis():
     try:
         from src.research.network_centrality import get_centrality_data
 
-        db_path = Path(__file__).parent / "data" / "youtube_pipeline.db"
+        db_path = SERVER_DB_PATH
 
         if not db_exists(str(db_path)):
             return {"status": "error", "message": "数据库不存在"}
@@ -3558,7 +3633,7 @@ async def get_arbitrage_combined():
     try:
         from src.research.network_centrality import get_centrality_data
 
-        db_path = Path(__file__).parent / "data" / "youtube_pipeline.db"
+        db_path = SERVER_DB_PATH
 
         if not db_exists(str(db_path)):
             return {"status": "error", "message": "数据库不存在"}
@@ -3573,47 +3648,13 @@ async def get_arbitrage_combined():
             _centrality_cache["data"] = centrality_data
             _centrality_cache["timestamp"] = current_time
 
-        # 获取原有榜单数据
+        # 获取原有榜单数据（频道、话题榜单读取物化聚合表）
+        aggregates = _get_aggregates(str(db_path))
+        dark_horse_channels = _format_dark_horse_channels(aggregates.dark_horse_channels(limit=50))
+
         conn = db_get_connection(str(db_path))
         cursor = conn.cursor()
 
-        # ========== Top 50 黑马频道 ==========
-        cursor.execute("""
-            SELECT
-                channel_name,
-                channel_id,
-                COUNT(*) as video_count,
-                AVG(view_count) as avg_views,
-                MAX(view_count) as max_views,
-                SUM(view_count) as total_views,
-                MAX(subscriber_count) as subscriber_count,
-                AVG(view_count) * 1.0 / GREATEST(MAX(subscriber_count), 1000) as dark_horse_score
-            FROM competitor_videos
-            WHERE channel_name IS NOT NULL
-              AND channel_name != ''
-              AND view_count > 0
-            GROUP BY channel_id, channel_name
-            HAVING COUNT(*) >= 2 AND MAX(subscriber_count) > 0
-            ORDER BY dark_horse_score DESC
-            LIMIT 50
-        """)
-
-        dark_horse_channels = []
-        for row in cursor.fetchall():
-            channel_name, channel_id, video_count, avg_views, max_views, total_views, subscriber_count, score = row
-            dark_horse_channels.append({
-                "rank": len(dark_horse_channels) + 1,
-                "channel_name": channel_name,
-                "channel_id": channel_id,
-                "channel_url": f"https://www.youtube.com/channel/{channel_id}" if channel_id else None,
-                "video_count": video_count,
-                "avg_views": int(avg_views or 0),
-                "max_views": int(max_views or 0),
-                "total_views": int(total_views or 0),
-                "subscriber_count": int(subscriber_count or 0),
-                "dark_horse_score": round(score or 0, 2)
-            })
-
         # ========== Top 50 热门视频（按播放量）==========
         cursor.execute("""
             SELECT
@@ -3651,66 +3692,25 @@ async def get_arbitrage_combined():
                 "subscriber_count": int(subscriber_count or 0),
             })
 
-        # ========== Top 50 频道（按粉丝数）==========
-        cursor.execute("""
-            SELECT
-                channel_name,
-                channel_id,
-                COUNT(*) as video_count,
-                AVG(view_count) as avg_views,
-                SUM(view_count) as total_views,
-                MAX(subscriber_count) as subscriber_count
-            FROM competitor_videos
-            WHERE channel_name IS NOT NULL
-              AND channel_name != ''
-              AND subscriber_count > 0
-            GROUP BY channel_id, channel_name
-            ORDER BY subscriber_count DESC
-            LIMIT 50
-        """)
+        conn.close()
 
+        # ========== Top 50 频道（按粉丝数）==========
         top_channels_by_subs = []
-        for row in cursor.fetchall():
-            channel_name, channel_id, video_count, avg_views, total_views, subscriber_count = row
+        for row in aggregates.top_channels_by_subscribers(limit=50):
+            channel_id = row["channel_id"]
             top_channels_by_subs.append({
                 "rank": len(top_channels_by_subs) + 1,
-                "channel_name": channel_name,
+                "channel_name": row["channel_name"],
                 "channel_id": channel_id,
                 "channel_url": f"https://www.youtube.com/channel/{channel_id}" if channel_id else None,
-                "video_count": video_count,
-                "avg_views": int(avg_views or 0),
-                "total_views": int(total_views or 0),
-                "subscriber_count": int(subscriber_count or 0),
+                "video_count": int(row["video_count"] or 0),
+                "avg_views": int(row["avg_views"] or 0),
+                "total_views": int(row["total_views"] or 0),
+                "subscriber_count": int(row["subscriber_count"] or 0),
             })
 
-        # ========== Top 10 热门话题 ==========
-        cursor.execute("""
-            SELECT
-                keyword_source,
-                COUNT(*) as video_count,
-                SUM(view_count) as total_views,
-                AVG(view_count) as avg_views,
-                COUNT(DISTINCT COALESCE(channel_id, channel_name)) as channel_count
-            FROM competitor_videos
-            WHERE keyword_source IS NOT NULL AND keyword_source != ''
-            GROUP BY keyword_source
-            ORDER BY video_count DESC, total_views DESC
-            LIMIT 50
-        """)
-
-        top_topics = []
-        for row in cursor.fetchall():
-            keyword_source, video_count, total_views, avg_views, channel_count = row
-            top_topics.append({
-                "rank": len(top_topics) + 1,
-                "topic": keyword_source,
-                "video_count": int(video_count or 0),
-                "total_views": int(total_views or 0),
-                "avg_views": int(avg_views or 0),
-                "channel_count": int(channel_count or 0)
-            })
-
-        conn.close()
+        # ========== Top 50 热门话题 ==========
+        top_topics = _format_top_topics(aggregates.top_keywords(limit=50))
 
         # 为中心性数据添加 rank
         for category in ['betweenness', 'degree']:
@@ -3756,7 +3756,8 @@ async def get_arbitrage_combined():
 # ============================================================
 
 @app.get("/api/channel-detail/{channel_id}")
-async def get_channel_detail(channel_id: str):
+@offloaded("channel", workers=4, queue=16)
+def get_channel_detail(channel_id: str):
     """
     获取频道详情数据（用于"向高手学习"模块）
 
@@ -3767,8 +3768,17 @@ async def get_channel_detail(channel_id: str):
     - 时长分布
     - 成长轨迹（基于频道创建时间）
     """
+    return _analysis_cache.get_or_compute(
+        ("channel", channel_id),
+        lambda: _compute_channel_detail(channel_id),
+        db_path=str(SERVER_DB_PATH),
+    )
+
+
+def _compute_channel_detail(channel_id: str) -> dict:
+    """计算频道详情（不经过缓存）"""
     try:
-        db_path = Path(__file__).parent / "data" / "youtube_pipeline.db"
+        db_path = SERVER_DB_PATH
 
         if not db_exists(str(db_path)):
             return {"status": "error", "message": "数据库不存在"}
@@ -3802,14 +3812,8 @@ async def get_channel_detail(channel_id: str):
             conn.close()
             return {"status": "error", "message": f"未找到频道 {channel_id} 的数据"}
 
-        # 2. 获取频道信息（从 channels 表）
-        cursor.execute("""
-            SELECT channel_name, subscriber_count, video_count, total_views,
-                   country, description, created_at, canonical_url
-            FROM channels
-            WHERE channel_id = ?
-        """, (channel_id,))
-        channel_row = cursor.fetchone()
+        # 2. 获取频道信息（频道缓存）
+        channel_row = _channel_cache.get(channel_id)
 
         # 基本统计
         channel_name = videos[0]['channel_name'] if videos else '未知频道'
@@ -3820,10 +3824,10 @@ async def get_channel_detail(channel_id: str):
 
         # 从 channels 表获取订阅数，如果没有则从视频表估算
         if channel_row:
-            subscriber_count = channel_row['subscriber_count'] or 0
-            created_at = channel_row['created_at']
-            country = channel_row['country']
-            description = channel_row['description']
+            subscriber_count = channel_row.subscriber_count
+            created_at = channel_row.created_at
+            country = channel_row.country
+            description = channel_row.description
         else:
             # 从视频表获取最大订阅数
             cursor.execute("""
@@ -4112,7 +4116,7 @@ async def get_network_graph(graph_type: str = "topic", max_nodes: int = 50):
     try:
         from src.research.network_centrality import get_network_graph_data
 
-        db_path = Path(__file__).parent / "data" / "youtube_pipeline.db"
+        db_path = SERVER_DB_PATH
 
         if not db_exists(str(db_path)):
             return {"status": "error", "message": "数据库不存在"}
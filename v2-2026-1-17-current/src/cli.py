@@ -159,6 +159,51 @@ def research_stats():
     console.print(table)
 
 
+@research.command('rebuild-aggregates')
+@click.option('--db', 'db_path', default=None, help='SQLite 数据库路径（默认 data/youtube_pipeline.db）')
+def research_rebuild_aggregates(db_path: str):
+    """从明细表全量重建物化聚合表（修复不一致时使用）"""
+    from src.shared.repositories import AggregateRepository
+
+    with console.status("[bold green]正在重建聚合表..."):
+        counts = AggregateRepository(db_path).rebuild()
+
+    table = Table(title="聚合表重建结果")
+    table.add_column("表", style="cyan")
+    table.add_column("行数", style="green")
+    for name, count in counts.items():
+        table.add_row(name, f"{count:,}")
+    console.print(table)
+
+
+@research.command('check-aggregates')
+@click.option('--db', 'db_path', default=None, help='SQLite 数据库路径（默认 data/youtube_pipeline.db）')
+@click.option('--rebuild', is_flag=True, help='发现不一致时全量重建')
+def research_check_aggregates(db_path: str, rebuild: bool):
+    """检查物化聚合表与明细表是否一致"""
+    from src.shared.repositories import AggregateRepository
+
+    repo = AggregateRepository(db_path)
+    with console.status("[bold green]正在检查聚合表..."):
+        mismatches = repo.check()
+
+    table = Table(title="聚合表一致性检查")
+    table.add_column("表", style="cyan")
+    table.add_column("不一致行数", style="green")
+    for name, count in mismatches.items():
+        table.add_row(name, f"[red]{count:,}[/red]" if count else "0")
+    console.print(table)
+
+    if not any(mismatches.values()):
+        console.print("[green]聚合表与明细一致[/green]")
+    elif rebuild:
+        with console.status("[bold green]正在重建聚合表..."):
+            repo.rebuild()
+        console.print("[green]已全量重建聚合表[/green]")
+    else:
+        console.print("[yellow]聚合表已漂移，使用 --rebuild 或 research rebuild-aggregates 修复[/yellow]")
+
+
 # ============================================================
 # 分析模块命令
 # ============================================================
@@ -10,7 +10,6 @@
 """
 
 import json
-import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -18,6 +17,8 @@ from typing import Any, Dict, List, Optional
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from src.shared.sqlite_tuning import connect as sqlite_connect
+
 
 class TrendMonitor:
     """视频增长趋势监控器"""
@@ -30,7 +31,7 @@ class TrendMonitor:
 
     def _init_monitoring_tables(self):
         """初始化监控相关的数据库表"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_connect(self.db_path)
         cursor = conn.cursor()
 
         # 播放量快照表
@@ -75,7 +76,7 @@ class TrendMonitor:
         Returns:
             快照统计信息
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_connect(self.db_path)
         cursor = conn.cursor()
 
         # 获取符合条件的视频
@@ -117,7 +118,7 @@ class TrendMonitor:
         Returns:
             增长数据列表
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_connect(self.db_path)
         cursor = conn.cursor()
 
         since = (datetime.now() - timedelta(days=days)).isoformat()
@@ -172,7 +173,7 @@ class TrendMonitor:
         }
         days = window_days.get(time_window, 30)
 
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_connect(self.db_path)
         cursor = conn.cursor()
 
         since = (datetime.now() - timedelta(days=days)).isoformat()
@@ -251,7 +252,7 @@ class TrendMonitor:
         }
         days = window_days.get(time_window, 30)
 
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_connect(self.db_path)
         cursor = conn.cursor()
 
         since = (datetime.now() - timedelta(days=days)).isoformat()
@@ -323,7 +324,7 @@ class TrendMonitor:
 
     def get_monitoring_stats(self) -> Dict[str, Any]:
         """获取监控统计信息"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite_connect(self.db_path)
         cursor = conn.cursor()
 
         # 快照总数
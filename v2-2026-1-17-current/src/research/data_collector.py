@@ -25,6 +25,7 @@ import time
 from typing import List, Dict, Any, Optional, Tuple, Callable
 from pathlib import Path
 from datetime import datetime
+from threading import Lock
 import sys
 
 # 添加项目根目录到路径
@@ -36,6 +37,76 @@ from src.shared.models import CompetitorVideo
 from src.shared.repositories import CompetitorVideoRepository
 from .yt_dlp_client import YtDlpClient, YtDlpError, expand_keywords_from_youtube
 
+# 阶段2 获取到的详情每攒够这么多条写一次数据库
+DETAIL_WRITE_BATCH = 25
+
+# 两级搜索：新视频的详情每攒够这么多个写一次数据库
+SEARCH_WRITE_BATCH = 10
+
+# 并行搜索的排序策略：按播放量 > 相关性 > 日期
+SEARCH_STRATEGIES = [
+    ('view_count', '按播放量'),
+    ('relevance', '按相关性'),
+    ('date', '按日期'),
+]
+
+
+class CollectionCounters:
+    """
+    采集实时计数（线程安全）
+
+    采集开始时从数据库初始化一次（主题已有的视频数和频道分组键），
+    之后每批保存新视频时增量更新，进度回调直接读取，不再每次查询数据库。
+
+    口径与 CompetitorVideoRepository.aggregate(keyword_like=theme) 一致：
+    - 只统计 keyword_source 包含主题词的视频
+    - 频道按有效 channel_id 优先、否则 channel_name 去重
+    """
+
+    def __init__(self, theme: Optional[str] = None, videos: int = 0, channel_keys: Optional[set] = None):
+        """
+        Args:
+            theme: 主题词（None 表示不按关键词过滤）
+            videos: 初始视频数
+            channel_keys: 初始频道分组键集合
+        """
+        self.theme = theme
+        self._videos = videos
+        self._channel_keys = set(channel_keys or ())
+        self._new_ids = set()
+        self._lock = Lock()
+
+    @staticmethod
+    def channel_key(video: CompetitorVideo) -> Optional[str]:
+        """频道分组键：有效 channel_id 优先，否则 channel_name"""
+        if video.channel_id and video.channel_id != 'None':
+            return video.channel_id
+        return video.channel_name or None
+
+    def add(self, videos: List[CompetitorVideo]) -> None:
+        """
+        记录一批新保存的视频（同一视频被多个关键词同时插入时只计一次）
+
+        Args:
+            videos: 新保存的视频
+        """
+        with self._lock:
+            for video in videos:
+                if video.youtube_id in self._new_ids:
+                    continue
+                if self.theme and self.theme not in (video.keyword_source or ''):
+                    continue
+                self._new_ids.add(video.youtube_id)
+                self._videos += 1
+                key = self.channel_key(video)
+                if key:
+                    self._channel_keys.add(key)
+
+    def snapshot(self) -> Dict[str, int]:
+        """当前计数 {"videos": 视频数, "channels": 频道数}"""
+        with self._lock:
+            return {"videos": self._videos, "channels": len(self._channel_keys)}
+
 
 class DataCollector:
     """
@@ -78,6 +149,9 @@ class DataCollector:
         # 初始化 Repository（数据库）
         self.repository = CompetitorVideoRepository(db_path)
 
+        # 最近一次大规模采集的实时计数
+        self.counters: Optional[CollectionCounters] = None
+
     def search_videos(
         self,
         keyword: str,
@@ -137,29 +211,23 @@ class DataCollector:
 
             self.logger.info(f"获取 {detail_limit} 个视频的详细信息...")
 
-            for i, result in enumerate(search_results[:detail_limit]):
-                try:
-                    video_id = result.get('id')
-                    if not video_id:
-                        continue
+            # 并发获取详情（速率由客户端的共享令牌桶控制），结果按搜索结果顺序排列
+            video_ids = [result.get('id') for result in search_results[:detail_limit] if result.get('id')]
+            details = {}
+            for i, (video_id, detail, error) in enumerate(self.ytdlp.iter_video_info(video_ids), 1):
+                if error is not None:
+                    self.logger.warning(f"获取视频 {video_id} 详情失败: {error}")
+                else:
+                    details[video_id] = detail
 
-                    # 获取详细信息
-                    detail = self.ytdlp.get_video_info(video_id)
+                # 进度日志
+                if i % 5 == 0:
+                    self.logger.info(f"已获取 {i}/{len(video_ids)} 个视频详情")
 
+            for video_id in video_ids:
+                if video_id in details:
                     # 转换为标准格式
-                    video = self._convert_to_standard_format(detail, keyword)
-                    videos_with_details.append(video)
-
-                    # 进度日志
-                    if (i + 1) % 5 == 0:
-                        self.logger.info(f"已获取 {i + 1}/{detail_limit} 个视频详情")
-
-                    # 速率限制
-                    time.sleep(1)
-
-                except YtDlpError as e:
-                    self.logger.warning(f"获取视频 {result.get('id')} 详情失败: {e}")
-                    continue
+                    videos_with_details.append(self._convert_to_standard_format(details[video_id], keyword))
 
             # 对于超出详情获取限制的视频，使用搜索结果基本信息
             for result in search_results[detail_limit:]:
@@ -273,9 +341,6 @@ class DataCollector:
                 self.logger.error(f"收集关键词 {keyword} 失败: {e}")
                 continue
 
-            # 避免请求过快
-            time.sleep(2)
-
         # 去重
         unique_videos = self._deduplicate_videos(all_videos)
 
@@ -586,13 +651,130 @@ class DataCollector:
     # 两阶段采集（大规模采集优化）
     # ============================================================
 
+    def _flat_search(
+        self,
+        queries: List[Tuple[str, str]],
+        max_per_query: int,
+        time_range: str,
+        on_query_done: Optional[Callable[[str, str, int, Optional[str]], None]] = None
+    ) -> Tuple[Dict[str, Tuple[Dict[str, Any], str]], int]:
+        """
+        两级搜索第一级：对所有 (关键词, 排序策略) 并发执行快速列表搜索，在内存中去重
+
+        Args:
+            queries: (keyword, sort_by) 列表
+            max_per_query: 每次搜索的最大结果数
+            time_range: 时间范围
+            on_query_done: 每次搜索完成时回调 (keyword, sort_by, 结果数, 错误信息)
+
+        Returns:
+            ({youtube_id: (快速搜索结果, 来源关键词)}, 去重前的结果数)；
+            同一视频被多次搜到时归属 queries 中靠前的关键词
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        results: Dict[int, List[Dict[str, Any]]] = {}
+
+        def search(idx: int, keyword: str, sort_by: str):
+            try:
+                return idx, self.ytdlp.search_videos_flat(keyword, max_per_query, sort_by=sort_by, time_range=time_range), None
+            except YtDlpError as e:
+                return idx, [], str(e)
+
+        # 线程数取搜索请求的并发上限（实际并发和速率由请求调度器控制）
+        workers = max(1, min(self.ytdlp.governor.max_concurrency('search'), len(queries)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(search, i, kw, sort_by) for i, (kw, sort_by) in enumerate(queries)]
+            for future in as_completed(futures):
+                idx, items, error = future.result()
+                results[idx] = items
+                keyword, sort_by = queries[idx]
+                if error:
+                    self.logger.warning(f"  [{keyword}/{sort_by}] 快速搜索失败: {error}")
+                if on_query_done:
+                    on_query_done(keyword, sort_by, len(items), error)
+
+        candidates: Dict[str, Tuple[Dict[str, Any], str]] = {}
+        raw_count = 0
+        for idx, (keyword, _) in enumerate(queries):
+            for item in results.get(idx, []):
+                raw_count += 1
+                video_id = item.get('id')
+                if video_id and video_id not in candidates:
+                    candidates[video_id] = (item, keyword)
+        return candidates, raw_count
+
+    def _save_new_candidates(
+        self,
+        candidates: Dict[str, Tuple[Dict[str, Any], str]],
+        time_range: str,
+        theme: Optional[str] = None,
+        counters: Optional[CollectionCounters] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None
+    ) -> Tuple[int, int, int]:
+        """
+        两级搜索第二级：数据库中没有的视频才获取完整信息，按小批写入数据库
+
+        详情由 yt-dlp 客户端并发获取（请求调度器控制速率），保存为已有详情的视频，
+        阶段2 不会再重复获取。
+
+        Args:
+            candidates: _flat_search 的结果
+            time_range: 时间范围（two_months / quarter 在这里按发布日期后过滤）
+            theme: 主题分类
+            counters: 实时计数（保存新视频后增量更新）
+            on_progress: 详情进度回调 (completed, total)
+
+        Returns:
+            (new_count, skip_count, fail_count)：新增、数据库中已存在、获取详情失败的数量
+        """
+        existing_ids = self.repository.exists_batch(list(candidates))
+        new_ids = [video_id for video_id in candidates if video_id not in existing_ids]
+        skip_count = len(candidates) - len(new_ids)
+
+        self.logger.info(
+            f"[两级搜索] 候选 {len(candidates)} 个，已存在 {skip_count} 个，获取 {len(new_ids)} 个新视频的完整信息"
+        )
+
+        new_count = 0
+        fail_count = 0
+        pending: List[CompetitorVideo] = []
+
+        def flush():
+            nonlocal new_count, pending
+            if pending:
+                inserted, _ = self.repository.save_batch(pending)
+                new_count += inserted
+                if counters is not None:
+                    counters.add(pending)
+                pending = []
+
+        for i, (video_id, data, error) in enumerate(self.ytdlp.iter_video_info(new_ids, raw=True), 1):
+            if error is not None:
+                self.logger.warning(f"获取视频 {video_id} 完整信息失败: {error}")
+                fail_count += 1
+            elif self.ytdlp.in_time_range(data, time_range):
+                _, keyword = candidates[video_id]
+                video = CompetitorVideo.from_ytdlp_details(data, keyword, theme=theme)
+                if video.youtube_id:
+                    pending.append(video)
+
+            if len(pending) >= SEARCH_WRITE_BATCH:
+                flush()
+            if on_progress:
+                on_progress(i, len(new_ids))
+
+        flush()
+        return new_count, skip_count, fail_count
+
     def search_videos_parallel(
         self,
         keyword: str,
         max_per_strategy: int = 50,
         time_range: str = "month",
         save_to_db: bool = True,
-        theme: str = None
+        theme: str = None,
+        counters: Optional[CollectionCounters] = None
     ) -> Tuple[int, int]:
         """
         并行搜索：使用多种排序策略同时搜索同一关键词
@@ -602,99 +784,48 @@ class DataCollector:
         2. relevance: 按相关性排序（默认，覆盖最全）
         3. date: 按发布日期排序（发现新视频）
 
+        两级搜索：各策略先做快速列表搜索（每个策略一次请求），去重并排除数据库中已有的视频后，
+        只对新视频获取完整信息，每 SEARCH_WRITE_BATCH 个写一次数据库。
+
         Args:
             keyword: 搜索关键词
             max_per_strategy: 每种策略的最大结果数
             time_range: 时间范围
-            save_to_db: 是否保存到数据库
+            save_to_db: 是否保存到数据库（False 时只做快速搜索）
             theme: 主题分类（如"养生"、"科技"）
+            counters: 实时计数（保存新视频后增量更新）
 
         Returns:
             (new_count, skip_count) 新增数量和跳过数量
         """
-        from concurrent.futures import ThreadPoolExecutor, as_completed
-
         self.logger.info(f"[并行搜索] keyword={keyword}, 每策略={max_per_strategy}, time_range={time_range}")
 
         if not self.use_ytdlp:
             self.logger.warning("yt-dlp 不可用")
             return 0, 0
 
-        # 搜索策略：按播放量 > 相关性 > 日期
-        strategies = [
-            ('view_count', '按播放量'),
-            ('relevance', '按相关性'),
-            ('date', '按日期'),
-        ]
-
-        all_results = []
-
-        def search_with_strategy(sort_by: str, desc: str):
-            """执行单个策略的搜索"""
-            try:
-                self.logger.info(f"  [{desc}] 开始搜索...")
-                results = self.ytdlp.search_videos(
-                    keyword,
-                    max_per_strategy,
-                    sort_by=sort_by,
-                    time_range=time_range
-                )
-                self.logger.info(f"  [{desc}] 获得 {len(results)} 个结果")
-                return results
-            except YtDlpError as e:
-                self.logger.warning(f"  [{desc}] 搜索失败: {e}")
-                return []
-
-        # 并行执行搜索
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            futures = {
-                executor.submit(search_with_strategy, sort_by, desc): (sort_by, desc)
-                for sort_by, desc in strategies
-            }
+        candidates, raw_count = self._flat_search(
+            [(keyword, sort_by) for sort_by, _ in SEARCH_STRATEGIES],
+            max_per_strategy,
+            time_range
+        )
 
-            for future in as_completed(futures):
-                sort_by, desc = futures[future]
-                try:
-                    results = future.result()
-                    all_results.extend(results)
-                except Exception as e:
-                    self.logger.error(f"  [{desc}] 异常: {e}")
-
-        if not all_results:
+        if not candidates:
             self.logger.warning("[并行搜索] 所有策略均无结果")
             return 0, 0
 
-        # 去重（同一视频可能被多种策略搜到）
-        seen_ids = set()
-        unique_videos = []
-        for result in all_results:
-            video_id = result.get('id')
-            if video_id and video_id not in seen_ids:
-                seen_ids.add(video_id)
-                video = CompetitorVideo.from_ytdlp_search(result, keyword, theme=theme)
-                if video.youtube_id:
-                    unique_videos.append(video)
-
-        self.logger.info(f"[并行搜索] 去重后: {len(unique_videos)} 个唯一视频 (原始 {len(all_results)})")
+        self.logger.info(f"[并行搜索] 去重后: {len(candidates)} 个唯一视频 (原始 {raw_count})")
 
         if not save_to_db:
-            return len(unique_videos), 0
-
-        # 批量去重检查（与数据库）
-        youtube_ids = [v.youtube_id for v in unique_videos]
-        existing_ids = self.repository.exists_batch(youtube_ids)
+            return len(candidates), 0
 
-        # 过滤已存在的视频
-        new_videos = [v for v in unique_videos if v.youtube_id not in existing_ids]
-        skip_count = len(unique_videos) - len(new_videos)
+        new_count, skip_count, _ = self._save_new_candidates(candidates, time_range, theme=theme, counters=counters)
 
-        if new_videos:
-            inserted, updated = self.repository.save_batch(new_videos)
-            self.logger.info(f"[并行搜索] 完成: 新增 {inserted}, 跳过 {skip_count}")
-            return inserted, skip_count
+        if new_count:
+            self.logger.info(f"[并行搜索] 完成: 新增 {new_count}, 跳过 {skip_count}")
         else:
             self.logger.info(f"[并行搜索] 完成: 全部已存在，跳过 {skip_count}")
-            return 0, skip_count
+        return new_count, skip_count
 
     def search_videos_fast(
         self,
@@ -725,8 +856,8 @@ class DataCollector:
             return 0, 0
 
         try:
-            # 搜索获取基础信息（带时间过滤）
-            search_results = self.ytdlp.search_videos(keyword, max_results, time_range=time_range)
+            # 快速列表搜索获取基础信息（带时间过滤）
+            search_results = self.ytdlp.search_videos_flat(keyword, max_results, time_range=time_range)
 
             if not search_results:
                 self.logger.warning("搜索未返回结果")
@@ -798,34 +929,39 @@ class DataCollector:
 
         self.logger.info(f"[阶段2] 找到 {len(videos_need_details)} 个视频需要获取详情")
 
+        total = len(videos_need_details)
+        by_id = {video.youtube_id: video for video in videos_need_details}
         success_count = 0
         fail_count = 0
+        pending: List[CompetitorVideo] = []
 
-        for i, video in enumerate(videos_need_details):
-            try:
-                if on_progress:
-                    on_progress(i + 1, len(videos_need_details), video.youtube_id)
-
-                # 获取详情
-                details = self.ytdlp.get_video_info(video.youtube_id)
+        # 多线程并发获取（速率由客户端的共享令牌桶控制），详情攒批写入数据库
+        for i, (youtube_id, details, error) in enumerate(self.ytdlp.iter_video_info(list(by_id)), 1):
+            if on_progress:
+                on_progress(i, total, youtube_id)
 
+            if error is not None:
+                self.logger.warning(f"获取视频 {youtube_id} 详情失败: {error}")
+                fail_count += 1
+            else:
                 # 转换为模型（保留原有的 theme）
-                enriched = CompetitorVideo.from_ytdlp_details(details, video.keyword_source, theme=getattr(video, 'theme', None))
-
-                # 更新数据库
-                self.repository.update_details(enriched)
-                success_count += 1
+                video = by_id[youtube_id]
+                pending.append(CompetitorVideo.from_ytdlp_details(
+                    details, video.keyword_source, theme=getattr(video, 'theme', None)
+                ))
 
-                # 进度日志
-                if (i + 1) % 10 == 0:
-                    self.logger.info(f"[阶段2] 进度: {i + 1}/{len(videos_need_details)}")
+            if len(pending) >= DETAIL_WRITE_BATCH:
+                self.repository.update_details_batch(pending)
+                success_count += len(pending)
+                pending = []
 
-                # 速率限制
-                time.sleep(1)
+            # 进度日志
+            if i % 10 == 0:
+                self.logger.info(f"[阶段2] 进度: {i}/{total}")
 
-            except YtDlpError as e:
-                self.logger.warning(f"获取视频 {video.youtube_id} 详情失败: {e}")
-                fail_count += 1
+        if pending:
+            self.repository.update_details_batch(pending)
+            success_count += len(pending)
 
         self.logger.info(f"[阶段2] 完成: 成功 {success_count}, 失败 {fail_count}")
         return success_count, fail_count
@@ -843,7 +979,7 @@ class DataCollector:
         大规模采集（优化策略：先搜索再筛选 Top 100 获取详情）
 
         采集策略：
-        1. 阶段1（快速搜索）：大量搜索获取基础信息（200-500个）
+        1. 阶段1（两级搜索）：所有关键词和策略快速列表搜索、去重，只对新视频获取完整信息
         2. 阶段2（筛选 Top 100）：按播放量排序，对 Top 100 获取完整详情
         3. 阶段3（扩展数据）：100 以后的视频保存基础信息，后台慢慢补充
 
@@ -853,7 +989,7 @@ class DataCollector:
             detail_min_views: 获取详情的最小播放量
             detail_limit: 获取详情的数量上限
             time_range: 时间范围 (hour/today/week/month/quarter/year)
-            on_progress: 进度回调 (stage, current, total)
+            on_progress: 进度回调 (stage, current, total)，回调中可读取 self.live_stats 获取实时计数
 
         Returns:
             采集统计信息
@@ -863,6 +999,18 @@ class DataCollector:
 
         start_time = time.time()
 
+        # 实时计数：只在开始时查询一次数据库，之后随批量保存增量更新
+        try:
+            seed = self.repository.aggregate(keyword_like=theme)
+            self.counters = CollectionCounters(
+                theme=theme,
+                videos=seed['video_count'],
+                channel_keys=self.repository.distinct_channel_keys(keyword_like=theme),
+            )
+        except Exception as e:
+            self.logger.warning(f"初始化实时计数失败: {e}")
+            self.counters = CollectionCounters(theme=theme)
+
         # 生成扩展关键词
         max_keywords = min(15, max(5, target_count // 30))
         keywords = self._generate_keywords(theme, max_keywords=max_keywords)
@@ -875,59 +1023,44 @@ class DataCollector:
         self.logger.info(f"每关键词每策略搜索: {per_keyword} 个（3种策略并行）")
 
         # ============================================================
-        # 阶段1：并行搜索所有关键词（多策略 + 多关键词并行）
+        # 阶段1：两级搜索（所有关键词 × 所有策略先快速列表，再只对新视频取完整信息）
         # ============================================================
         if on_progress:
             on_progress("search", 0, len(keywords))
 
-        self.logger.info(f"[阶段1-并行搜索] 对 {len(keywords)} 个关键词并行采集...")
-
-        from concurrent.futures import ThreadPoolExecutor, as_completed
-        from threading import Lock
+        self.logger.info(f"[阶段1-并行搜索] 对 {len(keywords)} 个关键词 × {len(SEARCH_STRATEGIES)} 种策略快速搜索...")
 
-        total_new = 0
-        total_skip = 0
+        pending_queries = {kw: len(SEARCH_STRATEGIES) for kw in keywords}
         completed_count = 0
         result_lock = Lock()
 
-        # 关键词并行数（10个任务同时进行）
-        KEYWORD_WORKERS = min(10, len(keywords))
-
-        def search_keyword(idx_keyword):
-            """搜索单个关键词"""
-            idx, kw = idx_keyword
-            try:
-                new, skip = self.search_videos_parallel(
-                    kw,
-                    max_per_strategy=per_keyword,
-                    time_range=time_range,
-                    theme=theme
-                )
-                return (idx, kw, new, skip, None)
-            except Exception as e:
-                return (idx, kw, 0, 0, str(e))
-
-        with ThreadPoolExecutor(max_workers=KEYWORD_WORKERS) as executor:
-            futures = {
-                executor.submit(search_keyword, (i, kw)): (i, kw)
-                for i, kw in enumerate(keywords)
-            }
-
-            for future in as_completed(futures):
-                idx, kw, new, skip, error = future.result()
-
-                with result_lock:
-                    completed_count += 1
-                    total_new += new
-                    total_skip += skip
+        def on_query_done(kw, sort_by, count, error):
+            """某个关键词的全部策略完成时报告进度"""
+            nonlocal completed_count
+            with result_lock:
+                pending_queries[kw] -= 1
+                if pending_queries[kw]:
+                    return
+                completed_count += 1
+                self.logger.info(f"[{completed_count}/{len(keywords)}] ✓ {kw}")
+                if on_progress:
+                    on_progress("search", completed_count, len(keywords))
 
-                    if error:
-                        self.logger.warning(f"[{completed_count}/{len(keywords)}] ✗ {kw}: {error}")
-                    else:
-                        self.logger.info(f"[{completed_count}/{len(keywords)}] ✓ {kw}: +{new} 新, {skip} 跳过")
+        candidates, raw_count = self._flat_search(
+            [(kw, sort_by) for kw in keywords for sort_by, _ in SEARCH_STRATEGIES],
+            per_keyword,
+            time_range,
+            on_query_done=on_query_done
+        )
+        self.logger.info(f"[阶段1-并行搜索] 去重后: {len(candidates)} 个唯一视频 (原始 {raw_count})")
 
-                    if on_progress:
-                        on_progress("search", completed_count, len(keywords))
+        total_new, total_skip, _ = self._save_new_candidates(
+            candidates,
+            time_range,
+            theme=theme,
+            counters=self.counters,
+            on_progress=lambda c, t: on_progress("search_detail", c, t) if on_progress else None
+        )
 
         self.logger.info(f"[阶段1-并行搜索] 完成: 新增 {total_new}, 跳过 {total_skip}")
 
@@ -962,7 +1095,7 @@ class DataCollector:
             'search_phase': {
                 'new_videos': total_new,
                 'skipped': total_skip,
-                'description': '快速搜索（获取基础信息：标题、播放量、频道名）'
+                'description': '两级搜索（快速列表去重，新视频获取完整信息）'
             },
             'detail_phase': {
                 'success': total_ranking,
@@ -981,6 +1114,11 @@ class DataCollector:
 
         return result
 
+    @property
+    def live_stats(self) -> Dict[str, int]:
+        """当前采集的实时计数 {"videos", "channels"}（未开始采集时为 0）"""
+        return self.counters.snapshot() if self.counters else {"videos": 0, "channels": 0}
+
     def get_statistics(self) -> Dict[str, Any]:
         """获取数据库统计信息"""
         return self.repository.get_statistics()
@@ -993,7 +1131,10 @@ class DataCollector:
         keyword_like: Optional[str] = None,
         min_views: Optional[int] = None,
         has_details: Optional[bool] = None,
-        limit: int = 100
+        limit: int = 100,
+        published_from: Optional[datetime] = None,
+        published_to: Optional[datetime] = None,
+        sort_by: str = "views"
     ) -> List[CompetitorVideo]:
         """
         从数据库获取视频
@@ -1006,6 +1147,9 @@ class DataCollector:
             min_views: 最小播放量
             has_details: 是否有详情
             limit: 返回数量
+            published_from: 发布时间下限（含）
+            published_to: 发布时间上限（含）
+            sort_by: 排序方式 (views/likes/date/engagement)
 
         Returns:
             CompetitorVideo 列表
@@ -1017,7 +1161,10 @@ class DataCollector:
             keywords=keywords,
             keyword_like=keyword_like,
             min_views=min_views,
-            has_details=has_details
+            has_details=has_details,
+            published_from=published_from,
+            published_to=published_to,
+            sort_by=sort_by
         )
 
 
@@ -15,9 +15,10 @@
 
 import sqlite3
 from src.shared.db_compat import get_connection as db_get_connection, is_using_neon
+from src.shared.repositories import CompetitorVideoRepository
 from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, Iterator, List, Tuple, Any, Optional
 import math
 
 # 尝试导入 networkx，如果不可用则使用简化版算法
@@ -27,6 +28,12 @@ try:
 except ImportError:
     HAS_NETWORKX = False
 
+# 视频-话题网络读取的列
+VIDEO_TOPIC_COLUMNS = (
+    "youtube_id", "title", "channel_id", "channel_name", "keyword_source",
+    "view_count", "subscriber_count", "like_count", "comment_count",
+)
+
 
 class NetworkCentralityAnalyzer:
     """网络中心性分析器"""
@@ -47,51 +54,84 @@ class NetworkCentralityAnalyzer:
             self._conn.close()
             self._conn = None
 
+    def _iter_video_topic_batches(self) -> Iterator[List[Dict]]:
+        """
+        分批流式读取有话题的视频（keyword_source 非空且 youtube_id 非空，按表存储顺序）
+
+        Yields:
+            视频 dict 列表（键为 VIDEO_TOPIC_COLUMNS）
+        """
+        repo = CompetitorVideoRepository(self.db_path)
+        for rows in repo.scan_batches(VIDEO_TOPIC_COLUMNS):
+            yield [dict(zip(VIDEO_TOPIC_COLUMNS, row)) for row in rows if row[4] and row[0] is not None]
+
     def _load_video_topic_data(self) -> Tuple[List[Dict], Dict[str, List[str]]]:
         """
-        加载视频-话题数据
+        加载视频-话题数据（视频中心性需要逐个视频输出，保留完整列表）
 
         返回:
         - videos: 视频列表（含视频信息）
         - channel_topics: 频道 -> 话题列表的映射
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        # 获取所有视频及其话题
-        cursor.execute("""
-            SELECT
-                youtube_id,
-                title,
-                channel_id,
-                channel_name,
-                keyword_source,
-                view_count,
-                subscriber_count,
-                like_count,
-                comment_count
-            FROM competitor_videos
-            WHERE keyword_source IS NOT NULL
-              AND keyword_source != ''
-              AND youtube_id IS NOT NULL
-        """)
-
         videos = []
         channel_topics = defaultdict(set)
 
-        for row in cursor.fetchall():
-            video = dict(row)
-            videos.append(video)
+        for batch in self._iter_video_topic_batches():
+            for video in batch:
+                videos.append(video)
 
-            # 记录频道涉及的话题
-            if video['channel_id']:
-                channel_topics[video['channel_id']].add(video['keyword_source'])
+                # 记录频道涉及的话题
+                if video['channel_id']:
+                    channel_topics[video['channel_id']].add(video['keyword_source'])
 
         # 转换 set 为 list
         channel_topics = {k: list(v) for k, v in channel_topics.items()}
 
         return videos, channel_topics
 
+    def _scan_topic_stats(self) -> Tuple[Dict[str, List[str]], Dict[str, Dict], Dict[str, Dict]]:
+        """
+        一次流式扫描累加话题 / 频道统计（不保留视频列表）
+
+        返回:
+        - channel_topics: 频道 -> 话题列表的映射
+        - topic_stats: 话题 -> {video_count, total_views, channels}
+        - channel_stats: 频道 -> {channel_name, video_count, total_views, subscriber_count, topics}
+        """
+        channel_topics = defaultdict(set)
+        topic_stats = defaultdict(lambda: {'video_count': 0, 'total_views': 0, 'channels': set()})
+        channel_stats = defaultdict(lambda: {
+            'channel_name': '',
+            'video_count': 0,
+            'total_views': 0,
+            'subscriber_count': 0,
+            'topics': set()
+        })
+
+        for batch in self._iter_video_topic_batches():
+            for video in batch:
+                topic = video['keyword_source']
+                channel_id = video['channel_id']
+                views = video['view_count'] or 0
+
+                stats = topic_stats[topic]
+                stats['video_count'] += 1
+                stats['total_views'] += views
+
+                if channel_id:
+                    channel_topics[channel_id].add(topic)
+                    stats['channels'].add(channel_id)
+
+                    stats = channel_stats[channel_id]
+                    stats['channel_name'] = video['channel_name']
+                    stats['video_count'] += 1
+                    stats['total_views'] += views
+                    stats['subscriber_count'] = max(stats['subscriber_count'], video['subscriber_count'] or 0)
+                    stats['topics'].add(topic)
+
+        channel_topics = {k: list(v) for k, v in channel_topics.items()}
+        return channel_topics, topic_stats, channel_stats
+
     def _build_topic_cooccurrence_graph(self, channel_topics: Dict[str, List[str]]) -> Dict[str, Dict[str, int]]:
         """
         构建话题共现图
@@ -214,7 +254,7 @@ class NetworkCentralityAnalyzer:
 
         返回按中介中心性排序的话题列表
         """
-        videos, channel_topics = self._load_video_topic_data()
+        channel_topics, topic_stats, _ = self._scan_topic_stats()
 
         # 构建话题共现图
         graph = self._build_topic_cooccurrence_graph(channel_topics)
@@ -235,16 +275,6 @@ class NetworkCentralityAnalyzer:
             betweenness = self._calculate_betweenness_centrality_simple(graph)
             degree = self._calculate_degree_centrality_simple(graph)
 
-        # 统计每个话题的视频数和播放量
-        topic_stats = defaultdict(lambda: {'video_count': 0, 'total_views': 0, 'channels': set()})
-        for video in videos:
-            topic = video.get('keyword_source')
-            if topic:
-                topic_stats[topic]['video_count'] += 1
-                topic_stats[topic]['total_views'] += video.get('view_count', 0) or 0
-                if video.get('channel_id'):
-                    topic_stats[topic]['channels'].add(video['channel_id'])
-
         # 组装结果
         results = []
         for topic in graph.keys():
@@ -277,7 +307,7 @@ class NetworkCentralityAnalyzer:
 
         基于频道-话题二分图的投影
         """
-        videos, channel_topics = self._load_video_topic_data()
+        channel_topics, _, channel_stats = self._scan_topic_stats()
 
         # 构建频道-频道网络（通过共同话题连接）
         # 如果两个频道都发布过同一话题的视频，则它们之间有边
@@ -315,25 +345,6 @@ class NetworkCentralityAnalyzer:
             betweenness = self._calculate_betweenness_centrality_simple(graph, k=50)
             degree = self._calculate_degree_centrality_simple(graph)
 
-        # 统计频道信息
-        channel_stats = defaultdict(lambda: {
-            'channel_name': '',
-            'video_count': 0,
-            'total_views': 0,
-            'subscriber_count': 0,
-            'topics': set()
-        })
-
-        for video in videos:
-            channel_id = video.get('channel_id')
-            if channel_id:
-                stats = channel_stats[channel_id]
-                stats['channel_name'] = video.get('channel_name', '')
-                stats['video_count'] += 1
-                stats['total_views'] += video.get('view_count', 0) or 0
-                stats['subscriber_count'] = max(stats['subscriber_count'], video.get('subscriber_count', 0) or 0)
-                stats['topics'].add(video.get('keyword_source'))
-
         # 组装结果
         results = []
         for channel_id in graph.keys():
@@ -439,8 +450,6 @@ class NetworkCentralityAnalyzer:
         """
         import re
 
-        videos, _ = self._load_video_topic_data()
-
         # 提取标题中的关键词
         def extract_keywords(title: str) -> List[str]:
             if not title:
@@ -453,27 +462,27 @@ class NetworkCentralityAnalyzer:
 
         # 构建词共现图
         word_cooccurrence = defaultdict(lambda: defaultdict(int))
-        word_stats = defaultdict(lambda: {'count': 0, 'total_views': 0, 'videos': []})
-
-        for video in videos:
-            title = video.get('title', '')
-            keywords = extract_keywords(title)
-
-            # 统计词频和播放量
-            seen_words = set()
-            for word in keywords:
-                if word not in seen_words:
-                    word_stats[word]['count'] += 1
-                    word_stats[word]['total_views'] += video.get('view_count', 0) or 0
-                    word_stats[word]['videos'].append(video.get('youtube_id'))
-                    seen_words.add(word)
-
-            # 构建共现边
-            unique_keywords = list(seen_words)
-            for i, w1 in enumerate(unique_keywords):
-                for w2 in unique_keywords[i+1:]:
-                    word_cooccurrence[w1][w2] += 1
-                    word_cooccurrence[w2][w1] += 1
+        word_stats = defaultdict(lambda: {'count': 0, 'total_views': 0})
+
+        for batch in self._iter_video_topic_batches():
+            for video in batch:
+                title = video.get('title', '')
+                keywords = extract_keywords(title)
+
+                # 统计词频和播放量
+                seen_words = set()
+                for word in keywords:
+                    if word not in seen_words:
+                        word_stats[word]['count'] += 1
+                        word_stats[word]['total_views'] += video.get('view_count', 0) or 0
+                        seen_words.add(word)
+
+                # 构建共现边
+                unique_keywords = list(seen_words)
+                for i, w1 in enumerate(unique_keywords):
+                    for w2 in unique_keywords[i+1:]:
+                        word_cooccurrence[w1][w2] += 1
+                        word_cooccurrence[w2][w1] += 1
 
         graph = dict(word_cooccurrence)
 
@@ -648,22 +657,12 @@ def get_network_graph_data(db_path: str, graph_type: str = 'topic', max_nodes: i
     """
     analyzer = NetworkCentralityAnalyzer(db_path)
     try:
-        videos, channel_topics = analyzer._load_video_topic_data()
+        channel_topics, topic_stats, channel_stats = analyzer._scan_topic_stats()
 
         if graph_type == 'topic':
             # 构建话题共现图
             graph = analyzer._build_topic_cooccurrence_graph(channel_topics)
 
-            # 统计话题信息
-            topic_stats = defaultdict(lambda: {'video_count': 0, 'total_views': 0, 'channels': set()})
-            for video in videos:
-                topic = video.get('keyword_source')
-                if topic:
-                    topic_stats[topic]['video_count'] += 1
-                    topic_stats[topic]['total_views'] += video.get('view_count', 0) or 0
-                    if video.get('channel_id'):
-                        topic_stats[topic]['channels'].add(video['channel_id'])
-
             # 计算中心性
             if HAS_NETWORKX:
                 import networkx as nx
@@ -757,24 +756,6 @@ def get_network_graph_data(db_path: str, graph_type: str = 'topic', max_nodes: i
                         graph[c2][c1] += 1
             graph = dict(graph)
 
-            # 频道信息
-            channel_stats = defaultdict(lambda: {
-                'channel_name': '',
-                'video_count': 0,
-                'total_views': 0,
-                'subscriber_count': 0,
-                'topics': set()
-            })
-            for video in videos:
-                channel_id = video.get('channel_id')
-                if channel_id:
-                    stats = channel_stats[channel_id]
-                    stats['channel_name'] = video.get('channel_name', '')
-                    stats['video_count'] += 1
-                    stats['total_views'] += video.get('view_count', 0) or 0
-                    stats['subscriber_count'] = max(stats['subscriber_count'], video.get('subscriber_count', 0) or 0)
-                    stats['topics'].add(video.get('keyword_source'))
-
             # 计算中心性
             if HAS_NETWORKX:
                 import networkx as nx
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+YouTube 请求调度器（进程级）
+
+所有访问 YouTube 的请求（搜索、视频详情、频道、评论）都经过同一个调度器，
+取代各处手工调的 time.sleep 和写死的线程数：
+
+- 每类请求（endpoint）有自己的速率预算（令牌桶）和并发上限，另有一个全局速率上限
+- 并发数按 AIMD 自适应：每个成功请求让并发上限 +1/上限（约每轮 +1），
+  被限流时乘以 DECREASE_FACTOR；同一轮里已在途的请求再被限流不会重复减半
+- 识别到限流信号（HTTP 429、"Sign in to confirm you're not a bot" 等）时，
+  所有 endpoint 暂停一段指数退避时间（带随机抖动），YouTube 的限流按 IP 生效
+- call() 对被限流的请求在退避后自动重试
+
+配置（config.yaml 或环境变量）：
+    youtube.requests_per_second            全局速率上限，例如 YTP_YOUTUBE_REQUESTS_PER_SECOND=4
+    youtube.governor.<endpoint>.rps        该类请求的速率预算，例如 YTP_YOUTUBE_GOVERNOR_VIDEO_RPS=6
+    youtube.governor.<endpoint>.concurrency  该类请求的并发上限，例如 YTP_YOUTUBE_GOVERNOR_SEARCH_CONCURRENCY=2
+    youtube.governor.retries               被限流后的重试次数
+    youtube.governor.backoff.base / max    退避时间的初始值 / 上限（秒）
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.shared.logger import setup_logger
+from src.shared.rate_limiter import TokenBucket, get_rate_limiter
+
+logger = setup_logger('request_governor')
+
+# 各类请求的默认预算
+DEFAULT_BUDGETS = {
+    "search": {"rps": 1.0, "concurrency": 4},
+    "video": {"rps": 4.0, "concurrency": 16},
+    "channel": {"rps": 2.0, "concurrency": 8},
+    "comments": {"rps": 1.0, "concurrency": 4},
+}
+DEFAULT_GLOBAL_RPS = 4.0
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 2.0
+DEFAULT_BACKOFF_MAX = 300.0
+
+# AIMD 参数：起始并发、最低并发、被限流时的乘数
+INITIAL_CONCURRENCY = 2
+MIN_CONCURRENCY = 1
+DECREASE_FACTOR = 0.5
+
+# 限流信号（错误信息小写后匹配）
+THROTTLE_PATTERNS = (
+    "http error 429",
+    "too many requests",
+    "not a bot",
+    "rate limit",
+    "rate-limit",
+    "ratelimit",
+)
+
+
+def is_throttle_message(message: str) -> bool:
+    """错误信息是否表示被 YouTube 限流"""
+    message = (message or "").lower()
+    return any(pattern in message for pattern in THROTTLE_PATTERNS)
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    """异常是否表示被 YouTube 限流（按错误信息判断）"""
+    return is_throttle_message(str(error))
+
+
+class _Endpoint:
+    """一类请求的预算和 AIMD 状态（由 RequestGovernor 的锁保护）"""
+
+    def __init__(self, name: str, rps: float, concurrency: int):
+        self.name = name
+        self.bucket = TokenBucket(rps)
+        self.max_concurrency = max(MIN_CONCURRENCY, int(concurrency))
+        self.limit = float(min(INITIAL_CONCURRENCY, self.max_concurrency))
+        self.in_flight = 0
+        self.last_decrease = 0.0
+
+        # 指标
+        self.requests = 0
+        self.succeeded = 0
+        self.throttled = 0
+        self.failed = 0
+        self.retries = 0
+        self.total_wait = 0.0
+
+
+class RequestGovernor:
+    """YouTube 请求调度器（线程安全）"""
+
+    def __init__(
+        self,
+        budgets: Optional[Dict[str, Dict[str, float]]] = None,
+        global_limiter: Optional[TokenBucket] = None,
+        retries: int = DEFAULT_RETRIES,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+    ):
+        """
+        Args:
+            budgets: {endpoint: {"rps": 每秒请求数, "concurrency": 并发上限}}，默认 DEFAULT_BUDGETS
+            global_limiter: 所有 endpoint 共享的令牌桶（None 表示不设全局上限）
+            retries: call() 被限流后的重试次数
+            backoff_base: 第一次被限流的退避时间（秒），连续限流时翻倍
+            backoff_max: 退避时间上限（秒）
+        """
+        budgets = budgets or DEFAULT_BUDGETS
+        self._endpoints = {
+            name: _Endpoint(name, budget["rps"], budget["concurrency"])
+            for name, budget in budgets.items()
+        }
+        self.global_limiter = global_limiter
+        self.retries = max(0, int(retries))
+        self.backoff_base = float(backoff_base)
+        self.backoff_max = float(backoff_max)
+
+        self._cond = threading.Condition()
+        self._paused_until = 0.0
+        self._throttle_streak = 0
+
+    def _endpoint(self, name: str) -> _Endpoint:
+        try:
+            return self._endpoints[name]
+        except KeyError:
+            raise ValueError(f"未知的请求类型: {name}（可选: {', '.join(self._endpoints)}）") from None
+
+    def max_concurrency(self, endpoint: str) -> int:
+        """该类请求的并发上限（调用方线程池大小取这个值，实际并发由 AIMD 控制）"""
+        return self._endpoint(endpoint).max_concurrency
+
+    # ============================================================
+    # 获取 / 归还请求许可
+    # ============================================================
+
+    def acquire(self, endpoint: str) -> float:
+        """
+        等待发出一个请求的许可：退避结束、并发未满、令牌可用
+
+        Args:
+            endpoint: 请求类型（search / video / channel / comments）
+
+        Returns:
+            许可发放时间（传给 release）
+        """
+        state = self._endpoint(endpoint)
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    self._cond.wait(self._paused_until - now)
+                elif state.in_flight < int(state.limit):
+                    state.in_flight += 1
+                    break
+                else:
+                    self._cond.wait()
+
+        if self.global_limiter is not None:
+            self.global_limiter.acquire()
+        state.bucket.acquire()
+
+        granted = time.monotonic()
+        with self._cond:
+            state.requests += 1
+            state.total_wait += granted - start
+        return granted
+
+    def release(self, endpoint: str, granted: float, outcome: str = "ok"):
+        """
+        归还许可并按结果调整并发上限
+
+        Args:
+            endpoint: 请求类型
+            granted: acquire() 的返回值
+            outcome: ok（成功）/ throttled（被限流）/ error（其他失败，不调整并发）
+        """
+        state = self._endpoint(endpoint)
+        with self._cond:
+            state.in_flight -= 1
+            now = time.monotonic()
+
+            if outcome == "ok":
+                state.succeeded += 1
+                state.limit = min(state.max_concurrency, state.limit + 1.0 / state.limit)
+                # 退避结束后发出的请求成功，连续限流计数清零
+                if granted >= self._paused_until:
+                    self._throttle_streak = 0
+            elif outcome == "throttled":
+                state.throttled += 1
+                # 上次减半之后才发出的请求被限流才再次减半（同一轮在途请求只算一次）
+                if granted >= state.last_decrease:
+                    state.limit = max(MIN_CONCURRENCY, state.limit * DECREASE_FACTOR)
+                    state.last_decrease = now
+                    self._throttle_streak += 1
+                    delay = min(self.backoff_max, self.backoff_base * 2 ** (self._throttle_streak - 1))
+                    delay = delay / 2 + random.uniform(0, delay / 2)
+                    self._paused_until = max(self._paused_until, now + delay)
+                    logger.warning(
+                        f"YouTube 限流（{endpoint}）：暂停 {delay:.1f} 秒，"
+                        f"并发上限降到 {int(state.limit)}"
+                    )
+            else:
+                state.failed += 1
+
+            self._cond.notify_all()
+
+    @contextmanager
+    def request(self, endpoint: str, is_throttle: Callable[[BaseException], bool] = is_throttle_error):
+        """
+        以上下文管理器的方式发出一个请求（异常按 is_throttle 判断是否为限流）
+
+        Args:
+            endpoint: 请求类型
+            is_throttle: 判断异常是否为限流信号
+        """
+        granted = self.acquire(endpoint)
+        try:
+            yield
+        except GeneratorExit:
+            # 流式请求的调用方提前停止读取，不算失败
+            self.release(endpoint, granted, "ok")
+            raise
+        except BaseException as e:
+            self.release(endpoint, granted, "throttled" if is_throttle(e) else "error")
+            raise
+        self.release(endpoint, granted, "ok")
+
+    def call(
+        self,
+        endpoint: str,
+        func: Callable[..., Any],
+        *args,
+        is_throttle: Callable[[BaseException], bool] = is_throttle_error,
+        **kwargs
+    ) -> Any:
+        """
+        经调度器执行一次请求，被限流时退避后重试（最多 retries 次）
+
+        Args:
+            endpoint: 请求类型
+            func: 执行请求的函数
+            *args, **kwargs: 传给 func 的参数
+            is_throttle: 判断异常是否为限流信号
+
+        Returns:
+            func 的返回值
+
+        Raises:
+            func 抛出的异常（限流重试用尽后抛出最后一次的异常）
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                with self.request(endpoint, is_throttle):
+                    return func(*args, **kwargs)
+            except Exception as e:
+                if attempt >= self.retries or not is_throttle(e):
+                    raise
+                with self._cond:
+                    self._endpoint(endpoint).retries += 1
+
+    # ============================================================
+    # 指标
+    # ============================================================
+
+    def stats(self) -> Dict[str, Any]:
+        """调度器状态和各类请求的指标"""
+        with self._cond:
+            endpoints = {}
+            for name, state in self._endpoints.items():
+                endpoints[name] = {
+                    "rps": state.bucket.rate,
+                    "max_concurrency": state.max_concurrency,
+                    "concurrency_limit": round(state.limit, 2),
+                    "in_flight": state.in_flight,
+                    "requests": state.requests,
+                    "succeeded": state.succeeded,
+                    "throttled": state.throttled,
+                    "failed": state.failed,
+                    "retries": state.retries,
+                    "avg_wait_ms": round(state.total_wait / state.requests * 1000, 2) if state.requests else 0,
+                }
+            return {
+                "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 1),
+                "throttle_streak": self._throttle_streak,
+                "global": self.global_limiter.stats() if self.global_limiter is not None else None,
+                "endpoints": endpoints,
+            }
+
+
+_governor: Optional[RequestGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def _governor_settings() -> Dict[str, Any]:
+    """读取调度器配置（配置模块不可用时使用默认值）"""
+    settings = {
+        "budgets": {name: dict(budget) for name, budget in DEFAULT_BUDGETS.items()},
+        "global_rps": DEFAULT_GLOBAL_RPS,
+        "burst": None,
+        "retries": DEFAULT_RETRIES,
+        "backoff_base": DEFAULT_BACKOFF_BASE,
+        "backoff_max": DEFAULT_BACKOFF_MAX,
+    }
+    try:
+        from src.shared.config import get_config
+        config = get_config()
+    except Exception:
+        return settings
+
+    for name, budget in settings["budgets"].items():
+        for key, default in list(budget.items()):
+            budget[key] = float(config.get(f'youtube.governor.{name}.{key}', default))
+    settings["global_rps"] = float(config.get('youtube.requests_per_second', DEFAULT_GLOBAL_RPS))
+    settings["burst"] = config.get('youtube.burst')
+    settings["retries"] = int(config.get('youtube.governor.retries', DEFAULT_RETRIES))
+    settings["backoff_base"] = float(config.get('youtube.governor.backoff.base', DEFAULT_BACKOFF_BASE))
+    settings["backoff_max"] = float(config.get('youtube.governor.backoff.max', DEFAULT_BACKOFF_MAX))
+    return settings
+
+
+def get_governor() -> RequestGovernor:
+    """获取进程级共享的请求调度器"""
+    global _governor
+    governor = _governor
+    if governor is None:
+        with _governor_lock:
+            governor = _governor
+            if governor is None:
+                settings = _governor_settings()
+                governor = _governor = RequestGovernor(
+                    budgets=settings["budgets"],
+                    global_limiter=get_rate_limiter('youtube', settings["global_rps"], settings["burst"]),
+                    retries=settings["retries"],
+                    backoff_base=settings["backoff_base"],
+                    backoff_max=settings["backoff_max"],
+                )
+    return governor
+
+
+def get_governor_stats() -> Optional[Dict[str, Any]]:
+    """调度器状态（尚未创建时为 None）"""
+    governor = _governor
+    return governor.stats() if governor is not None else None
@@ -22,12 +22,24 @@
 
 import json
 import re
-import sqlite3
+import sys
 from collections import Counter
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.shared.repositories import CompetitorVideoRepository
+
+# 报告读取的列，以及转换为视频 dict 时对应的键
+SCAN_COLUMNS = (
+    "youtube_id", "title", "channel_name", "view_count", "like_count", "comment_count",
+    "duration", "published_at", "collected_at",
+)
+VIDEO_KEYS = ("id", "title", "channel_name", "views", "likes", "comments", "duration", "published_at", "collected_at")
+
 
 class ResearchReportGenerator:
     """调研报告生成器 - 数据洞察 + 原始数据浏览"""
@@ -102,47 +114,22 @@ class ResearchReportGenerator:
         return str(output_path)
 
     def _load_videos(self, time_window: str = "全部") -> List[Dict]:
-        """从数据库加载视频数据"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-
+        """从数据库加载视频数据（分批流式读取，每批直接转换为视频 dict）"""
         # 时间范围过滤
-        time_filter = ""
+        published_from = None
         if time_window != "全部":
             days_map = {"1天内": 1, "15天内": 15, "30天内": 30}
             days = days_map.get(time_window, 30)
-            cutoff = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-            time_filter = f"AND published_at >= '{cutoff}'"
-
-        query = f"""
-        SELECT
-            youtube_id as id,
-            title,
-            channel_name,
-            'https://www.youtube.com/watch?v=' || youtube_id as url,
-            view_count as views,
-            like_count as likes,
-            comment_count as comments,
-            duration,
-            published_at,
-            collected_at
-        FROM competitor_videos
-        WHERE view_count > 0
-        {time_filter}
-        ORDER BY view_count DESC
-        """
-
-        cursor = conn.execute(query)
-        rows = cursor.fetchall()
+            published_from = (datetime.now() - timedelta(days=days)).date()
 
+        repo = CompetitorVideoRepository(self.db_path)
         videos = []
-        for row in rows:
-            video = dict(row)
-            # 计算衍生指标
-            video = self._enrich_video(video)
-            videos.append(video)
-
-        conn.close()
+        for rows in repo.scan_batches(SCAN_COLUMNS, sort_by="views", min_views=1, published_from=published_from):
+            for row in rows:
+                video = dict(zip(VIDEO_KEYS, row))
+                video['url'] = f"https://www.youtube.com/watch?v={video['id']}"
+                # 计算衍生指标
+                videos.append(self._enrich_video(video))
         return videos
 
     def _enrich_video(self, video: Dict) -> Dict:
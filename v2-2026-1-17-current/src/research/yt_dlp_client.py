@@ -13,14 +13,25 @@ yt-dlp 封装层
 - 搜索视频
 - 获取视频详细信息
 - 下载字幕（仅用于竞品分析）
+
+执行后端：
+- inprocess（默认）：ytdlp_pool 中预热的 YoutubeDL 实例，省去每次调用的进程启动和提取器导入
+- subprocess：每次调用启动 yt-dlp 命令（yt_dlp 模块不可用时自动回退；字幕下载始终使用）
+
+所有请求经 request_governor 调度（速率预算、AIMD 并发、限流退避重试），调用方不再自行 sleep。
 """
 
 import json
+import queue
 import subprocess
 import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
-from datetime import datetime
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from datetime import datetime, timedelta
 import sys
 
 # 添加项目根目录到路径
@@ -28,9 +39,14 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.shared.logger import setup_logger
 from src.shared.config import get_config
+from src.research.ytdlp_pool import ExtractionError, get_ytdlp_pool
+from src.research.request_governor import get_governor, is_throttle_message
 
 logger = setup_logger('yt_dlp_client')
 
+# 已验证的 yt-dlp 命令版本（每个进程只启动一次 yt-dlp --version）
+_cli_version: Optional[str] = None
+
 
 class YtDlpError(Exception):
     """yt-dlp 相关错误"""
@@ -47,6 +63,15 @@ class YtDlpClient:
     - 仅获取公开元数据
     """
 
+    # 完整信息搜索的超时（秒），每个视频约3-5秒
+    FULL_SEARCH_TIMEOUT = 300
+
+    # YouTube 没有原生支持的时间范围，搜索后按发布日期过滤（天数）
+    POST_FILTER_DAYS = {
+        'two_months': 60,
+        'quarter': 90,
+    }
+
     # YouTube 搜索时间过滤参数（sp 参数）
     # 这些是 YouTube 原生搜索 URL 的过滤器编码
     TIME_FILTER_PARAMS = {
@@ -81,22 +106,35 @@ class YtDlpClient:
         'year': 'EgQIBRABGAI%3D',       # 今年 + 按播放量
     }
 
-    def __init__(self, config: Optional[Any] = None):
+    def __init__(self, config: Optional[Any] = None, concurrency: Optional[int] = None):
         """
         初始化客户端
 
         Args:
             config: 配置对象 (可选)
+            concurrency: 调用方并发使用本客户端的线程数（进程内提取池至少提供这么多实例）
         """
         self.config = config or get_config()
         self.timeout = self.config.get('youtube.timeout', 30)
-        self.rate_limit_delay = self.config.get('youtube.rate_limit_delay', 2)
+
+        # 进程级请求调度器（所有 YtDlpClient 实例共享速率预算和退避状态）
+        self.governor = get_governor()
+
+        # 进程内提取池（None 表示使用子进程）
+        self.pool = get_ytdlp_pool(concurrency)
 
         # 验证 yt-dlp 是否可用
         self._verify_ytdlp()
 
+    @property
+    def backend(self) -> str:
+        return "subprocess" if self.pool is None else "inprocess"
+
     def _verify_ytdlp(self):
-        """验证 yt-dlp 是否已安装"""
+        """验证 yt-dlp 是否已安装（进程内模式已在导入 yt_dlp 时验证；命令行每个进程只检查一次）"""
+        global _cli_version
+        if self.pool is not None or _cli_version is not None:
+            return
         try:
             result = subprocess.run(
                 ['yt-dlp', '--version'],
@@ -105,7 +143,8 @@ class YtDlpClient:
                 timeout=10
             )
             if result.returncode == 0:
-                logger.info(f"yt-dlp 版本: {result.stdout.strip()}")
+                _cli_version = result.stdout.strip()
+                logger.info(f"yt-dlp 版本: {_cli_version}")
             else:
                 raise YtDlpError("yt-dlp 不可用")
         except FileNotFoundError:
@@ -113,6 +152,18 @@ class YtDlpClient:
         except subprocess.TimeoutExpired:
             raise YtDlpError("yt-dlp 响应超时")
 
+    @staticmethod
+    def _classify_error(error_msg: str) -> YtDlpError:
+        """yt-dlp 错误信息 -> YtDlpError（检查常见错误）"""
+        if is_throttle_message(error_msg):
+            return YtDlpError(f"请求过于频繁: {error_msg}")
+        elif 'Video unavailable' in error_msg:
+            return YtDlpError(f"视频不可用: {error_msg}")
+        elif 'Sign in' in error_msg:
+            return YtDlpError(f"需要登录: {error_msg}")
+        else:
+            return YtDlpError(f"yt-dlp 执行失败: {error_msg}")
+
     def _run_ytdlp(self, args: List[str], timeout: Optional[int] = None) -> str:
         """
         执行 yt-dlp 命令
@@ -142,15 +193,7 @@ class YtDlpClient:
 
             if result.returncode != 0:
                 error_msg = result.stderr.strip() or result.stdout.strip()
-                # 检查常见错误
-                if 'Video unavailable' in error_msg:
-                    raise YtDlpError(f"视频不可用: {error_msg}")
-                elif 'Sign in' in error_msg:
-                    raise YtDlpError(f"需要登录: {error_msg}")
-                elif 'rate' in error_msg.lower():
-                    raise YtDlpError(f"请求过于频繁: {error_msg}")
-                else:
-                    raise YtDlpError(f"yt-dlp 执行失败: {error_msg}")
+                raise self._classify_error(error_msg)
 
             return result.stdout
 
@@ -161,6 +204,270 @@ class YtDlpClient:
                 raise
             raise YtDlpError(f"执行错误: {str(e)}")
 
+    def _dump_json(
+        self,
+        endpoint: str,
+        url: str,
+        timeout: int,
+        playlist_end: Optional[int] = None,
+        flat: bool = False,
+        ignore_errors: bool = False,
+        max_comments: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        获取 URL 的元数据（相当于 yt-dlp --dump-json --no-download），经请求调度器按当前后端执行
+
+        Args:
+            endpoint: 请求类型（search / video / channel / comments），决定速率预算和并发
+            url: 视频 / 搜索 / 频道 URL
+            timeout: 子进程超时（秒）；进程内模式为等待空闲实例的超时
+            playlist_end: 列表最多取前 N 条（--playlist-end）
+            flat: 列表条目不展开为完整视频信息（--flat-playlist）
+            ignore_errors: 跳过无法访问的条目（--ignore-errors）
+            max_comments: 大于 0 时附带按热度排序的评论（--write-comments）
+
+        Returns:
+            信息字典列表（单个视频为一项，列表为各条目）
+
+        Raises:
+            YtDlpError: 执行失败（被限流时已按调度器的退避策略重试）
+        """
+        return self.governor.call(
+            endpoint, self._fetch_json, url, timeout,
+            playlist_end=playlist_end, flat=flat, ignore_errors=ignore_errors, max_comments=max_comments,
+        )
+
+    def _fetch_json(
+        self,
+        url: str,
+        timeout: int,
+        playlist_end: Optional[int] = None,
+        flat: bool = False,
+        ignore_errors: bool = False,
+        max_comments: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """执行一次 _dump_json 请求（不经调度器）"""
+        if self.pool is not None:
+            params = self._pool_params(playlist_end, flat, ignore_errors, max_comments)
+            logger.debug(f"进程内提取: {url} {params}")
+            try:
+                info = self.pool.extract(url, timeout=timeout, **params)
+            except ExtractionError as e:
+                raise self._classify_error(str(e))
+            if info is None:
+                # ignore_errors 时整体失败不抛异常，按失败处理（与子进程的非零退出码一致）
+                raise YtDlpError(f"yt-dlp 执行失败: 未获取到 {url} 的信息")
+            if info.get('_type') == 'playlist':
+                return [entry for entry in info.get('entries') or [] if entry]
+            return [info]
+
+        args = self._cli_args(url, playlist_end, flat, ignore_errors, max_comments)
+        output = self._run_ytdlp(args, timeout=timeout)
+        items = []
+        for line in output.strip().split('\n'):
+            if not line:
+                continue
+            try:
+                items.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                logger.warning(f"JSON 解析失败: {e}")
+        return items
+
+    @staticmethod
+    def _pool_params(
+        playlist_end: Optional[int] = None,
+        flat: bool = False,
+        ignore_errors: bool = False,
+        max_comments: int = 0,
+    ) -> Dict[str, Any]:
+        """_dump_json 选项 -> 进程内 YoutubeDL 参数"""
+        params = {}
+        if playlist_end is not None:
+            params['playlistend'] = playlist_end
+        if flat:
+            params['extract_flat'] = 'in_playlist'
+        if ignore_errors:
+            params['ignoreerrors'] = True
+        if max_comments > 0:
+            params['getcomments'] = True
+            params['extractor_args'] = {'youtube': {'comment_sort': ['top'], 'max_comments': [str(max_comments)]}}
+        return params
+
+    @staticmethod
+    def _cli_args(
+        url: str,
+        playlist_end: Optional[int] = None,
+        flat: bool = False,
+        ignore_errors: bool = False,
+        max_comments: int = 0,
+    ) -> List[str]:
+        """_dump_json 选项 -> yt-dlp 命令行参数"""
+        args = ['--dump-json', '--no-download', '--no-warnings']
+        if playlist_end is not None:
+            args += ['--playlist-end', str(playlist_end)]
+        if flat:
+            args.append('--flat-playlist')
+        if ignore_errors:
+            args.append('--ignore-errors')
+        if max_comments > 0:
+            args += ['--write-comments', '--extractor-args', f"youtube:comment_sort=top;max_comments={max_comments}"]
+        args.append(url)
+        return args
+
+    # ============================================================
+    # 流式获取（逐条产出，不等整个列表完成）
+    # ============================================================
+
+    def _stream_json(
+        self,
+        endpoint: str,
+        url: str,
+        timeout: int,
+        playlist_end: Optional[int] = None,
+        ignore_errors: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        流式获取 URL 的元数据：列表中每个视频解析完成就产出，不等整个列表结束
+
+        超时或中途失败时，已产出的条目不受影响（随后抛出 YtDlpError）。
+        请求在整个迭代期间占用调度器的一个并发名额；尚未产出任何条目时被限流，按调度器退避后重试。
+
+        Args:
+            endpoint: 请求类型（search / video / channel / comments）
+            url: 视频 / 搜索 / 频道 URL
+            timeout: 整个列表的超时（秒）
+            playlist_end: 列表最多取前 N 条
+            ignore_errors: 跳过无法访问的条目
+
+        Yields:
+            与 yt-dlp --dump-json 单行 JSON 相同的信息字典
+
+        Raises:
+            YtDlpError: 执行失败或超时
+        """
+        stream = self._stream_inprocess if self.pool is not None else self._stream_subprocess
+        for attempt in range(self.governor.retries + 1):
+            produced = 0
+            try:
+                with self.governor.request(endpoint):
+                    for item in stream(url, timeout, playlist_end, ignore_errors):
+                        produced += 1
+                        yield item
+                return
+            except YtDlpError as e:
+                if produced or attempt >= self.governor.retries or not is_throttle_message(str(e)):
+                    raise
+
+    def _stream_inprocess(
+        self,
+        url: str,
+        timeout: int,
+        playlist_end: Optional[int],
+        ignore_errors: bool,
+    ) -> Iterator[Dict[str, Any]]:
+        """进程内流式提取：提取在后台线程执行，每个条目经队列交给调用方"""
+        items = queue.Queue()
+        stop = threading.Event()
+        params = self._pool_params(playlist_end, ignore_errors=ignore_errors)
+
+        def on_entry(info):
+            items.put(('entry', info))
+            return not stop.is_set()
+
+        def run():
+            try:
+                items.put(('done', self.pool.extract(url, timeout=timeout, on_entry=on_entry, **params)))
+            except ExtractionError as e:
+                items.put(('error', e))
+
+        logger.debug(f"进程内流式提取: {url} {params}")
+        threading.Thread(target=run, name="ytdlp-stream", daemon=True).start()
+
+        deadline = time.monotonic() + timeout
+        produced = 0
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise YtDlpError(f"命令执行超时 ({timeout}秒)")
+                try:
+                    kind, value = items.get(timeout=remaining)
+                except queue.Empty:
+                    continue
+                if kind == 'entry':
+                    produced += 1
+                    yield value
+                elif kind == 'error':
+                    raise self._classify_error(str(value))
+                else:
+                    if value is None and not produced:
+                        # 与 _fetch_json 一致：ignore_errors 时整体失败按失败处理
+                        raise YtDlpError(f"yt-dlp 执行失败: 未获取到 {url} 的信息")
+                    return
+        finally:
+            # 调用方停止读取或超时：提取线程在下一个条目完成时结束
+            stop.set()
+
+    def _stream_subprocess(
+        self,
+        url: str,
+        timeout: int,
+        playlist_end: Optional[int],
+        ignore_errors: bool,
+    ) -> Iterator[Dict[str, Any]]:
+        """子进程流式提取：yt-dlp 每输出一行 JSON 就解析产出"""
+        cmd = ['yt-dlp'] + self._cli_args(url, playlist_end, ignore_errors=ignore_errors)
+        logger.debug(f"流式执行命令: {' '.join(cmd)}")
+
+        # stderr 写临时文件，避免与逐行读取 stdout 互相阻塞
+        with tempfile.TemporaryFile(mode='w+') as stderr:
+            try:
+                proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr, text=True)
+            except OSError as e:
+                raise YtDlpError(f"执行错误: {e}")
+
+            timed_out = threading.Event()
+
+            def kill():
+                timed_out.set()
+                proc.kill()
+
+            timer = threading.Timer(timeout, kill)
+            timer.daemon = True
+            timer.start()
+
+            produced = 0
+            try:
+                for line in proc.stdout:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        item = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        logger.warning(f"JSON 解析失败: {e}")
+                        continue
+                    produced += 1
+                    yield item
+                returncode = proc.wait()
+            finally:
+                timer.cancel()
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+                proc.stdout.close()
+
+            if timed_out.is_set():
+                raise YtDlpError(f"命令执行超时 ({timeout}秒)")
+            if returncode != 0:
+                stderr.seek(0)
+                error_msg = stderr.read().strip()
+                # --ignore-errors 时个别条目失败也会返回非零退出码，已有结果时只记录
+                if ignore_errors and produced:
+                    logger.warning(f"部分条目获取失败: {error_msg[:200]}")
+                else:
+                    raise self._classify_error(error_msg)
+
     def search_videos(
         self,
         keyword: str,
@@ -219,72 +526,133 @@ class YtDlpClient:
             sort_by: 排序方式 (relevance/date/view_count/rating)
 
         Returns:
-            视频信息列表
+            视频信息列表（超时或中途失败时返回已获取的部分结果，一个都没有时抛出 YtDlpError）
         """
-        from urllib.parse import quote
+        # 不使用 --flat-playlist，获取完整视频信息（包括发布日期、频道ID等）；跳过无法访问的视频
+        # 逐条读取，two_months / quarter 的日期后过滤在 iter_search_videos 中完成
+        videos = []
+        try:
+            for video in self.iter_search_videos(keyword, max_results, sort_by=sort_by, time_range=time_range):
+                videos.append(video)
+        except YtDlpError as e:
+            if not videos:
+                raise
+            logger.warning(f"搜索中断，保留已获取的 {len(videos)} 个结果: {e}")
 
-        encoded_keyword = quote(keyword)
+        return videos
 
-        # 构建 sp 参数（时间过滤 + 排序）
-        sp = self._build_sp_param(time_range, sort_by)
+    def search_videos_flat(
+        self,
+        keyword: str,
+        max_results: int = 50,
+        sort_by: str = "relevance",
+        time_range: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        快速搜索：只读取搜索结果列表（--flat-playlist），不逐个打开视频页面
 
-        # 构建搜索 URL
-        if sp:
-            search_url = f"https://www.youtube.com/results?search_query={encoded_keyword}&sp={sp}"
-        else:
-            search_url = f"https://www.youtube.com/results?search_query={encoded_keyword}"
+        一次请求即可返回整页结果，但只有 id / 标题 / 频道 / 时长 / 播放量等基础字段，
+        没有发布日期，two_months / quarter 的日期后过滤需在获取详情后用 in_time_range 完成。
 
-        logger.info(f"搜索: time_range={time_range}, sort_by={sort_by}, sp={sp}")
+        Args:
+            keyword: 搜索关键词
+            max_results: 最大结果数
+            sort_by: 排序方式 (relevance/date/view_count/rating)
+            time_range: 时间范围（同 search_videos）
 
-        # 移除 --flat-playlist，获取完整视频信息（包括发布日期、频道ID等）
-        args = [
-            '--dump-json',
-            '--no-download',
-            '--playlist-end', str(max_results),
-            '--no-warnings',
-            '--ignore-errors',  # 跳过无法访问的视频
-            search_url
-        ]
+        Returns:
+            视频基础信息列表（格式同 _parse_search_result）
+        """
+        logger.info(f"快速搜索: keyword={keyword}, max_results={max_results}, sort_by={sort_by}, time_range={time_range}")
+        return self._execute_search(self._search_url(keyword, time_range, sort_by), max_results, full_info=False)
 
-        videos = self._execute_search(args, full_info=True)
+    def in_time_range(self, data: Dict[str, Any], time_range: Optional[str]) -> bool:
+        """
+        视频是否满足 time_range 的日期后过滤（YouTube 原生支持的时间范围总是 True）
 
-        # 对于 two_months（60天）和 quarter（90天），YouTube 没有原生支持，需要后过滤
-        if time_range == 'two_months':
-            videos = self._filter_by_date_range(videos, days=60)
-        elif time_range == 'quarter':
-            videos = self._filter_by_date_range(videos, days=90)
+        Args:
+            data: 视频信息（yt-dlp 原始 JSON 或 get_video_info 的结果）
+            time_range: 时间范围
+        """
+        days = self.POST_FILTER_DAYS.get(time_range)
+        if not days:
+            return True
+        video = {'upload_date': self._parse_date(data.get('upload_date'))}
+        return self._within_date_range(video, datetime.now() - timedelta(days=days))
 
-        return videos
+    def iter_search_videos(
+        self,
+        keyword: str,
+        max_results: int = 50,
+        sort_by: str = "relevance",
+        time_range: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        流式搜索：每个视频的完整信息解析完成就产出（参数和结果格式同 search_videos）
+
+        完整信息搜索要逐个请求视频页面，整体可能需要几分钟；流式读取时第一个结果几秒内即可处理，
+        超时或中途失败时已产出的结果不会丢失（随后抛出 YtDlpError）。
+
+        Yields:
+            视频信息（同 get_video_info）
+
+        Raises:
+            YtDlpError: 搜索失败或超时
+        """
+        logger.info(f"流式搜索: keyword={keyword}, max_results={max_results}, sort_by={sort_by}, time_range={time_range}")
+
+        search_url = self._search_url(keyword, time_range, sort_by)
+        days = self.POST_FILTER_DAYS.get(time_range)
+        cutoff_date = datetime.now() - timedelta(days=days) if days else None
+
+        count = 0
+        for data in self._stream_json('search', search_url, self.FULL_SEARCH_TIMEOUT,
+                                      playlist_end=max_results, ignore_errors=True):
+            video = self._parse_video_info(data)
+            if cutoff_date is None or self._within_date_range(video, cutoff_date):
+                count += 1
+                yield video
+
+        logger.info(f"流式搜索完成，获取 {count} 个结果")
+
+    def _search_url(self, keyword: str, time_range: Optional[str] = None, sort_by: str = "relevance") -> str:
+        """构建带 sp 参数（时间过滤 + 排序）的 YouTube 搜索 URL"""
+        from urllib.parse import quote
+
+        encoded_keyword = quote(keyword)
+        sp = self._build_sp_param(time_range, sort_by)
+
+        logger.info(f"搜索: time_range={time_range}, sort_by={sort_by}, sp={sp}")
 
-    def _execute_search(self, args: List[str], full_info: bool = False) -> List[Dict[str, Any]]:
+        if sp:
+            return f"https://www.youtube.com/results?search_query={encoded_keyword}&sp={sp}"
+        return f"https://www.youtube.com/results?search_query={encoded_keyword}"
+
+    def _execute_search(self, search_url: str, max_results: int, full_info: bool = False) -> List[Dict[str, Any]]:
         """
-        执行搜索命令并解析结果
+        执行搜索并解析结果
 
         Args:
-            args: yt-dlp 命令参数
+            search_url: YouTube 搜索 URL
+            max_results: 最大结果数
             full_info: 是否获取完整视频信息（包括发布日期、点赞数等）
         """
         try:
             # 完整信息模式需要更长超时（每个视频约3-5秒）
-            timeout = 300 if full_info else 60
-            output = self._run_ytdlp(args, timeout=timeout)
+            timeout = self.FULL_SEARCH_TIMEOUT if full_info else 60
+            items = self._dump_json(
+                'search', search_url, timeout, playlist_end=max_results, flat=not full_info, ignore_errors=True
+            )
 
             videos = []
-            for line in output.strip().split('\n'):
-                if not line:
-                    continue
-                try:
-                    data = json.loads(line)
-                    # 根据模式选择解析方法
-                    if full_info:
-                        video = self._parse_video_info(data)
-                    else:
-                        video = self._parse_search_result(data)
-                    if video:
-                        videos.append(video)
-                except json.JSONDecodeError as e:
-                    logger.warning(f"JSON 解析失败: {e}")
-                    continue
+            for data in items:
+                # 根据模式选择解析方法
+                if full_info:
+                    video = self._parse_video_info(data)
+                else:
+                    video = self._parse_search_result(data)
+                if video:
+                    videos.append(video)
 
             logger.info(f"搜索完成，获取 {len(videos)} 个结果 (full_info={full_info})")
             return videos
@@ -329,35 +697,20 @@ class YtDlpClient:
         # 默认（相关性排序，无时间过滤）
         return ''
 
-    def _filter_by_date_range(
-        self,
-        videos: List[Dict[str, Any]],
-        days: int
-    ) -> List[Dict[str, Any]]:
-        """按日期范围后过滤视频"""
-        from datetime import timedelta
-
-        cutoff_date = datetime.now() - timedelta(days=days)
-        filtered = []
-
-        for video in videos:
-            upload_date_str = video.get('upload_date')
-            if not upload_date_str:
-                # 没有日期信息的视频保留（宁可多不可漏）
-                filtered.append(video)
-                continue
-
-            try:
-                # 解析日期 (格式: YYYY-MM-DD)
-                upload_date = datetime.strptime(upload_date_str, '%Y-%m-%d')
-                if upload_date >= cutoff_date:
-                    filtered.append(video)
-            except ValueError:
-                # 日期解析失败，保留
-                filtered.append(video)
+    @staticmethod
+    def _within_date_range(video: Dict[str, Any], cutoff_date: datetime) -> bool:
+        """视频是否在 cutoff_date 之后发布"""
+        upload_date_str = video.get('upload_date')
+        if not upload_date_str:
+            # 没有日期信息的视频保留（宁可多不可漏）
+            return True
 
-        logger.info(f"日期过滤: {len(videos)} -> {len(filtered)} (保留 {days} 天内)")
-        return filtered
+        try:
+            # 解析日期 (格式: YYYY-MM-DD)
+            return datetime.strptime(upload_date_str, '%Y-%m-%d') >= cutoff_date
+        except ValueError:
+            # 日期解析失败，保留
+            return True
 
     def _parse_search_result(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """解析搜索结果"""
@@ -389,27 +742,33 @@ class YtDlpClient:
             视频详细信息，符合 data.spec.md CompetitorVideo 实体
         """
         logger.info(f"获取视频信息: {video_id}")
+        return self._parse_video_info(self.get_video_json(video_id))
+
+    def get_video_json(self, video_id: str, max_comments: int = 0, timeout: int = 30) -> Dict[str, Any]:
+        """
+        获取视频的原始元数据（与 yt-dlp --dump-json 输出相同，未经 _parse_video_info 转换）
+
+        Args:
+            video_id: YouTube 视频 ID (11 位字符)
+            max_comments: 大于 0 时附带按热度排序的评论（comments 字段）
+            timeout: 超时时间（秒）
+
+        Returns:
+            yt-dlp 信息字典
 
+        Raises:
+            YtDlpError: 视频 ID 无效或获取失败
+        """
         # 验证视频 ID 格式
         if not self._validate_video_id(video_id):
             raise YtDlpError(f"无效的视频 ID: {video_id}")
 
         url = f"https://www.youtube.com/watch?v={video_id}"
-
-        args = [
-            '--dump-json',
-            '--no-download',
-            '--no-warnings',
-            url
-        ]
-
-        try:
-            output = self._run_ytdlp(args, timeout=30)
-            data = json.loads(output)
-            return self._parse_video_info(data)
-
-        except json.JSONDecodeError as e:
-            raise YtDlpError(f"视频信息解析失败: {e}")
+        endpoint = 'comments' if max_comments > 0 else 'video'
+        items = self._dump_json(endpoint, url, timeout, max_comments=max_comments)
+        if not items:
+            raise YtDlpError(f"视频信息解析失败: {video_id} 没有输出")
+        return items[0]
 
     def _parse_video_info(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -464,43 +823,86 @@ class YtDlpClient:
                 result[thumb['resolution']] = thumb.get('url', '')
         return result
 
-    def get_videos_batch(
+    def iter_video_info(
         self,
         video_ids: List[str],
-        on_progress: Optional[callable] = None
-    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        workers: Optional[int] = None,
+        raw: bool = False
+    ) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[YtDlpError]]]:
         """
-        批量获取视频信息
+        并发获取多个视频的信息，按完成顺序逐个产出
+
+        线程数取调度器中 video 请求的并发上限，实际并发和速率由调度器按 AIMD 和速率预算控制。
 
         Args:
             video_ids: 视频 ID 列表
-            on_progress: 进度回调函数 (current, total, video_id)
+            workers: 线程数，默认 youtube.governor.video.concurrency
+            raw: 产出 yt-dlp 原始 JSON（get_video_json）而不是 get_video_info 的解析结果
 
-        Returns:
-            (成功列表, 失败列表)
+        Yields:
+            (video_id, 视频信息, None) 或 (video_id, None, YtDlpError)
         """
-        import time
+        if not video_ids:
+            return
 
-        logger.info(f"批量获取 {len(video_ids)} 个视频信息")
+        workers = max(1, min(workers or self.governor.max_concurrency('video'), len(video_ids)))
+        if self.pool is not None:
+            self.pool.ensure_size(workers)
 
-        successful = []
-        failed = []
+        get_info = self.get_video_json if raw else self.get_video_info
 
-        for i, video_id in enumerate(video_ids):
+        def fetch(video_id: str):
             try:
-                if on_progress:
-                    on_progress(i + 1, len(video_ids), video_id)
+                return video_id, get_info(video_id), None
+            except YtDlpError as e:
+                return video_id, None, e
+            except Exception as e:
+                return video_id, None, YtDlpError(f"解析视频信息失败: {e}")
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ytdlp-detail")
+        futures = [executor.submit(fetch, video_id) for video_id in video_ids]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # 调用方提前停止迭代时，尚未开始的请求不再执行
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def get_videos_batch(
+        self,
+        video_ids: List[str],
+        on_progress: Optional[callable] = None,
+        workers: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        批量获取视频信息（并发，见 iter_video_info）
 
-                info = self.get_video_info(video_id)
-                successful.append(info)
+        Args:
+            video_ids: 视频 ID 列表
+            on_progress: 进度回调函数 (completed, total, video_id)，每完成一个视频调用一次
+            workers: 线程数，默认 youtube.governor.video.concurrency
 
-                # 速率限制
-                if i < len(video_ids) - 1:
-                    time.sleep(self.rate_limit_delay)
+        Returns:
+            (成功列表, 失败列表)，均按 video_ids 的顺序
+        """
+        logger.info(f"批量获取 {len(video_ids)} 个视频信息")
 
-            except YtDlpError as e:
-                logger.warning(f"获取视频 {video_id} 失败: {e}")
-                failed.append(video_id)
+        results = {}
+        failed = set()
+
+        for i, (video_id, info, error) in enumerate(self.iter_video_info(video_ids, workers), 1):
+            if on_progress:
+                on_progress(i, len(video_ids), video_id)
+            if error is None:
+                results[video_id] = info
+            else:
+                logger.warning(f"获取视频 {video_id} 失败: {error}")
+                failed.add(video_id)
+
+        successful = [results[video_id] for video_id in dict.fromkeys(video_ids) if video_id in results]
+        failed = [video_id for video_id in dict.fromkeys(video_ids) if video_id in failed]
 
         logger.info(f"批量获取完成: 成功 {len(successful)}, 失败 {len(failed)}")
         return successful, failed
@@ -552,7 +954,7 @@ class YtDlpClient:
         args.append(url)
 
         try:
-            self._run_ytdlp(args, timeout=60)
+            self.governor.call('video', self._run_ytdlp, args, timeout=60)
 
             # 查找生成的字幕文件
             patterns = [
@@ -596,28 +998,14 @@ class YtDlpClient:
 
         url = f"https://www.youtube.com/channel/{channel_id}/videos"
 
-        args = [
-            '--dump-json',
-            '--flat-playlist',
-            '--playlist-end', str(max_results),
-            '--no-warnings',
-            url
-        ]
-
         try:
-            output = self._run_ytdlp(args, timeout=60)
+            items = self._dump_json('channel', url, 60, playlist_end=max_results, flat=True)
 
             videos = []
-            for line in output.strip().split('\n'):
-                if not line:
-                    continue
-                try:
-                    data = json.loads(line)
-                    video = self._parse_search_result(data)
-                    if video:
-                        videos.append(video)
-                except json.JSONDecodeError:
-                    continue
+            for data in items:
+                video = self._parse_search_result(data)
+                if video:
+                    videos.append(video)
 
             logger.info(f"获取频道视频完成，共 {len(videos)} 个")
             return videos
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+yt-dlp 进程内提取池
+
+每次启动 `yt-dlp` 子进程都要重新启动解释器、导入全部提取器、重新建立 HTTPS 连接，
+单个视频的元数据请求里这部分开销往往比网络请求本身还大。这里在进程内保留若干个
+预热的 yt_dlp.YoutubeDL 实例：
+
+- 每个实例同一时间只借给一个线程（YoutubeDL 不是线程安全的），用完归还；池大小即并发上限
+- 实例复用提取器对象（YouTube 播放器 JS 等缓存）、Cookie 和 HTTP 连接
+- 每次调用的选项（截取条数、扁平列表、评论等）借出期间临时写入 params，归还前还原
+
+返回值与 `yt-dlp --dump-json` 输出的 JSON 相同（sanitize_info），可直接替换子进程调用。
+传入 on_entry 时，列表中每个视频解析完成就回调一次（流式处理，不必等整个列表结束）。
+yt_dlp 未安装或配置为 subprocess 时 get_ytdlp_pool() 返回 None，由调用方回退到子进程。
+
+配置（config.yaml 或环境变量）：
+    youtube.backend      inprocess（默认）/ subprocess，例如 YTP_YOUTUBE_BACKEND=subprocess
+    youtube.pool_size    预热实例数，例如 YTP_YOUTUBE_POOL_SIZE=8
+"""
+
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.shared.logger import setup_logger
+
+logger = setup_logger('ytdlp_pool')
+
+DEFAULT_BACKEND = "inprocess"
+DEFAULT_POOL_SIZE = 4
+
+# 单次网络读写超时（秒）；进程内调用无法像子进程那样整体终止，卡住的连接靠它结束
+SOCKET_TIMEOUT = 30
+
+# 等待空闲实例的默认超时（秒）
+ACQUIRE_TIMEOUT = 300
+
+# 所有实例共用的选项（相当于 --no-download --no-warnings，不输出进度）
+BASE_OPTIONS = {
+    'quiet': True,
+    'no_warnings': True,
+    'noprogress': True,
+    'skip_download': True,
+    'socket_timeout': SOCKET_TIMEOUT,
+}
+
+_MISSING = object()
+
+
+class ExtractionError(Exception):
+    """进程内提取失败（消息为 yt-dlp 的错误信息，与子进程 stderr 一致）"""
+    pass
+
+
+class _LogAdapter:
+    """yt-dlp 的输出转到 debug 日志（失败通过异常返回，不打印到终端）"""
+
+    def debug(self, msg):
+        logger.debug(msg)
+
+    def info(self, msg):
+        logger.debug(msg)
+
+    def warning(self, msg):
+        logger.debug(msg)
+
+    def error(self, msg):
+        logger.debug(msg)
+
+
+def _entry_hook(yt_dlp, on_entry):
+    """
+    创建逐条回调的后处理器（after_filter 阶段，每个视频提取完成、下载之前执行）
+
+    on_entry 返回 False 时抛出 DownloadCancelled 终止剩余条目的提取。
+    """
+    class EntryHook(yt_dlp.postprocessor.PostProcessor):
+        def run(self, info):
+            if on_entry(yt_dlp.YoutubeDL.sanitize_info(info)) is False:
+                raise yt_dlp.utils.DownloadCancelled("调用方停止接收条目")
+            return [], info
+
+    return EntryHook()
+
+
+class YtDlpPool:
+    """预热 YoutubeDL 实例池（线程安全）"""
+
+    def __init__(self, size: int = DEFAULT_POOL_SIZE, options: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            size: 最多创建的实例数（并发上限），实例在首次需要时创建
+            options: 追加到 BASE_OPTIONS 的 YoutubeDL 选项
+
+        Raises:
+            ImportError: yt_dlp 未安装
+        """
+        import yt_dlp
+
+        self._yt_dlp = yt_dlp
+        self.version = yt_dlp.version.__version__
+        self.size = max(1, int(size))
+        self.options = {**BASE_OPTIONS, 'logger': _LogAdapter(), **(options or {})}
+        self.pid = os.getpid()
+
+        # LIFO：优先借出最近用过的实例，连接最可能仍然存活
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+
+        # 指标
+        self._calls = 0
+        self._failed = 0
+        self._total_wait = 0.0
+        self._total_run = 0.0
+
+    def ensure_size(self, size: int):
+        """把并发上限提高到至少 size（只增不减，新实例按需创建）"""
+        with self._lock:
+            self.size = max(self.size, int(size))
+
+    def _acquire(self, timeout: float):
+        """借出一个实例：优先空闲实例，其次新建，都没有时等待归还"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            create = self._created < self.size
+            if create:
+                self._created += 1
+        if create:
+            try:
+                return self._yt_dlp.YoutubeDL(dict(self.options))
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise ExtractionError(f"等待空闲 yt-dlp 实例超时 ({timeout}秒)") from None
+
+    def _release(self, ydl, broken: bool = False):
+        """归还实例；出现意外异常的实例关闭丢弃，下次按需重建"""
+        if not broken:
+            self._idle.put(ydl)
+            return
+        with self._lock:
+            self._created -= 1
+        try:
+            ydl.close()
+        except Exception:
+            pass
+
+    def extract(
+        self,
+        url: str,
+        timeout: Optional[float] = None,
+        on_entry: Optional[Callable[[Dict[str, Any]], Optional[bool]]] = None,
+        **params
+    ) -> Optional[Dict[str, Any]]:
+        """
+        提取 URL 的元数据（不下载）
+
+        Args:
+            url: 视频 / 搜索 / 频道 URL
+            timeout: 等待空闲实例的超时（秒）；网络超时由 socket_timeout 控制
+            on_entry: 每个视频提取完成时的回调（参数同 --dump-json 的单行 JSON），
+                      返回 False 时停止提取剩余条目（extract 返回 None）；扁平列表的条目不触发
+            **params: 本次调用临时设置的 YoutubeDL 选项，例如
+                      playlistend=50、ignoreerrors=True、extract_flat='in_playlist'、getcomments=True
+
+        Returns:
+            与 `yt-dlp --dump-json` 相同的信息字典；播放列表 / 搜索结果的条目在 entries 中。
+            ignoreerrors=True 且整体失败、或 on_entry 要求停止时为 None
+
+        Raises:
+            ExtractionError: 提取失败
+        """
+        start = time.perf_counter()
+        ydl = self._acquire(timeout or ACQUIRE_TIMEOUT)
+        acquired = time.perf_counter()
+
+        saved = {key: ydl.params.get(key, _MISSING) for key in params}
+        ydl.params.update(params)
+        hook = _entry_hook(self._yt_dlp, on_entry) if on_entry is not None else None
+        if hook is not None:
+            ydl.add_post_processor(hook, when='after_filter')
+        broken = False
+        try:
+            info = ydl.extract_info(url, download=False)
+            return self._yt_dlp.YoutubeDL.sanitize_info(info) if info is not None else None
+        except self._yt_dlp.utils.DownloadCancelled:
+            return None
+        except self._yt_dlp.utils.DownloadError as e:
+            with self._lock:
+                self._failed += 1
+            raise ExtractionError(str(e)) from None
+        except Exception as e:
+            broken = True
+            with self._lock:
+                self._failed += 1
+            raise ExtractionError(f"执行错误: {e}") from e
+        finally:
+            if hook is not None:
+                ydl._pps['after_filter'].remove(hook)
+            for key, value in saved.items():
+                if value is _MISSING:
+                    ydl.params.pop(key, None)
+                else:
+                    ydl.params[key] = value
+            self._release(ydl, broken)
+            with self._lock:
+                self._calls += 1
+                self._total_wait += acquired - start
+                self._total_run += time.perf_counter() - acquired
+
+    def close(self):
+        """关闭所有空闲实例（释放 HTTP 连接）"""
+        while True:
+            try:
+                ydl = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._created -= 1
+            try:
+                ydl.close()
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """池状态和调用指标"""
+        with self._lock:
+            calls = self._calls
+            return {
+                "version": self.version,
+                "size": self.size,
+                "created": self._created,
+                "idle": self._idle.qsize(),
+                "calls": calls,
+                "failed": self._failed,
+                "avg_wait_ms": round(self._total_wait / calls * 1000, 2) if calls else 0,
+                "avg_run_ms": round(self._total_run / calls * 1000, 2) if calls else 0,
+            }
+
+
+_pool: Optional[YtDlpPool] = None
+_pool_lock = threading.Lock()
+_pool_unavailable = False
+
+
+def _pool_settings() -> Dict[str, Any]:
+    """读取后端配置（配置模块不可用时使用默认值）"""
+    settings = {"backend": DEFAULT_BACKEND, "pool_size": DEFAULT_POOL_SIZE}
+    try:
+        from src.shared.config import get_config
+        config = get_config()
+        for key, default in list(settings.items()):
+            settings[key] = config.get(f'youtube.{key}', default)
+    except Exception:
+        pass
+    return settings
+
+
+def get_ytdlp_pool(min_size: Optional[int] = None) -> Optional[YtDlpPool]:
+    """
+    获取进程级共享的提取池（fork 出的子进程会新建自己的池）
+
+    Args:
+        min_size: 调用方的并发线程数，池的并发上限至少提高到该值
+
+    Returns:
+        YtDlpPool；配置为 subprocess 或 yt_dlp 未安装时为 None
+    """
+    global _pool, _pool_unavailable
+    pool = _pool
+    if pool is None or pool.pid != os.getpid():
+        if _pool_unavailable:
+            return None
+        with _pool_lock:
+            pool = _pool
+            if pool is None or pool.pid != os.getpid():
+                settings = _pool_settings()
+                if str(settings["backend"]).lower() != DEFAULT_BACKEND:
+                    _pool_unavailable = True
+                    return None
+                try:
+                    pool = _pool = YtDlpPool(int(settings["pool_size"]))
+                except ImportError as e:
+                    _pool_unavailable = True
+                    logger.warning(f"yt_dlp 模块不可用，回退到 yt-dlp 子进程: {e}")
+                    return None
+                logger.info(f"yt-dlp 进程内提取池: 版本 {pool.version}, 实例上限 {pool.size}")
+    if min_size:
+        pool.ensure_size(min_size)
+    return pool
+
+
+def get_ytdlp_stats() -> Optional[Dict[str, Any]]:
+    """提取池状态（尚未创建或使用子进程时为 None）"""
+    pool = _pool
+    return pool.stats() if pool is not None else None
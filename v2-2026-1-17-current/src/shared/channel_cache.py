@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+频道维度缓存
+
+channels 表在分析接口中只用于按 channel_id / channel_name 补充频道信息，
+以前每次调用都整表扫描。这里在进程内缓存一份只读副本：
+- 按 channel_id、channel_name 的字典查找
+- 每个频道存为 NamedTuple（无 per-object __dict__），国家等重复字符串做 intern
+- 变化检测：行数 + MAX(updated_at)，每 CHECK_INTERVAL 秒最多检查一次；
+  本进程写入 channels 后可调用 mark_changed() 立即失效
+"""
+
+import sys
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+
+from .db_compat import get_connection, db_exists
+from .logger import setup_logger
+
+logger = setup_logger('channel_cache')
+
+# 变化检测的最小间隔（秒）
+CHECK_INTERVAL = 5.0
+
+
+class ChannelInfo(NamedTuple):
+    """channels 表中的一行"""
+    channel_id: str
+    channel_name: Optional[str]
+    handle: Optional[str]
+    subscriber_count: int
+    video_count: Optional[int]
+    total_views: Optional[int]
+    country: Optional[str]
+    description: Optional[str]
+    created_at: Optional[str]
+    canonical_url: Optional[str]
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """短的重复字符串（国家、创建日期）共享同一对象"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class ChannelCache:
+    """channels 表的进程内只读缓存（线程安全）"""
+
+    def __init__(self, db_path: Optional[str] = None, check_interval: float = CHECK_INTERVAL):
+        """
+        Args:
+            db_path: SQLite 数据库路径（PostgreSQL 模式下忽略）
+            check_interval: 变化检测的最小间隔（秒）
+        """
+        self.db_path = db_path
+        self.check_interval = check_interval
+
+        self._by_id: Dict[str, ChannelInfo] = {}
+        self._by_name: Dict[str, ChannelInfo] = {}
+        self._fingerprint = None
+        self._checked_at = 0.0
+        self._stale = True
+        self._lock = threading.Lock()
+
+        self._loads = 0
+        self._checks = 0
+
+    def mark_changed(self):
+        """标记 channels 表已被修改（下次访问时重新加载）"""
+        self._stale = True
+
+    def _read_fingerprint(self, cursor) -> tuple:
+        cursor.execute("SELECT COUNT(*), MAX(updated_at) FROM channels")
+        return tuple(cursor.fetchone())
+
+    def _refresh(self):
+        """必要时重新加载（调用方持有锁）"""
+        now = time.monotonic()
+        if not self._stale and now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+
+        if not db_exists(self.db_path):
+            self._by_id, self._by_name, self._fingerprint = {}, {}, None
+            self._stale = False
+            return
+
+        conn = get_connection(self.db_path)
+        try:
+            cursor = conn.cursor()
+            self._checks += 1
+            fingerprint = self._read_fingerprint(cursor)
+            if not self._stale and fingerprint == self._fingerprint:
+                return
+
+            cursor.execute("""
+                SELECT channel_id, channel_name, handle, subscriber_count,
+                       video_count, total_views, country, description,
+                       created_at, canonical_url
+                FROM channels
+            """)
+            by_id = {}
+            by_name = {}
+            for row in cursor.fetchall():
+                info = ChannelInfo(
+                    channel_id=row[0],
+                    channel_name=row[1],
+                    handle=row[2],
+                    subscriber_count=row[3] or 0,
+                    video_count=row[4],
+                    total_views=row[5],
+                    country=_intern(row[6]),
+                    description=row[7],
+                    created_at=_intern(row[8]),
+                    canonical_url=row[9],
+                )
+                if info.channel_id:
+                    by_id[info.channel_id] = info
+                if info.channel_name:
+                    by_name[info.channel_name] = info
+
+            self._by_id, self._by_name = by_id, by_name
+            self._fingerprint = fingerprint
+            self._stale = False
+            self._loads += 1
+        except Exception as e:
+            logger.warning(f"查询 channels 表失败: {e}")
+            self._stale = False
+        finally:
+            conn.close()
+
+    def _indexes(self) -> tuple:
+        with self._lock:
+            self._refresh()
+            return self._by_id, self._by_name
+
+    def get(self, channel_id: Optional[str]) -> Optional[ChannelInfo]:
+        """按 channel_id 查找"""
+        if not channel_id:
+            return None
+        by_id, _ = self._indexes()
+        return by_id.get(channel_id)
+
+    def get_by_name(self, channel_name: Optional[str]) -> Optional[ChannelInfo]:
+        """按 channel_name 查找（同名频道取最后加载的一行）"""
+        if not channel_name:
+            return None
+        _, by_name = self._indexes()
+        return by_name.get(channel_name)
+
+    def lookup(self, key: Optional[str]) -> Optional[ChannelInfo]:
+        """按频道分组键查找：先 channel_id，再 channel_name"""
+        if not key:
+            return None
+        by_id, by_name = self._indexes()
+        return by_id.get(key) or by_name.get(key)
+
+    def stats(self) -> Dict[str, int]:
+        """缓存指标"""
+        with self._lock:
+            return {
+                "channels": len(self._by_id),
+                "loads": self._loads,
+                "checks": self._checks,
+            }
+
+
+_channel_cache: Optional[ChannelCache] = None
+_channel_cache_lock = threading.Lock()
+
+
+def get_channel_cache() -> ChannelCache:
+    """获取进程级共享的频道缓存"""
+    global _channel_cache
+    if _channel_cache is None:
+        with _channel_cache_lock:
+            if _channel_cache is None:
+                _channel_cache = ChannelCache()
+    return _channel_cache
@@ -159,7 +159,13 @@ class Config:
             'database': {
                 'path': 'data/youtube_pipeline.db',
                 'echo': False,  # SQL 日志
-                'pool_size': 5,
+                'pool_size': 5,               # PostgreSQL 连接池最大连接数
+                'pool_min_size': 1,           # PostgreSQL 连接池常驻连接数
+                'pool_timeout': 30,           # 连接耗尽时最长等待（秒）
+                'pool_idle_timeout': 300,     # 空闲连接回收时间（秒）
+                'pool_check_interval': 30,    # 空闲超过该时长的连接借出前做健康检查（秒）
+                'pool_enabled': True,         # 关闭后每次 get_connection 都新建连接
+                'sqlite_idle_per_thread': 2,  # 每个线程缓存的空闲 SQLite 连接数
             },
             # YouTube 相关配置
             'youtube': {
@@ -168,7 +174,19 @@ class Config:
                 'region_code': 'US',
                 'language': 'zh',
                 'timeout': 30,
-                'rate_limit_delay': 2,  # 请求间隔（秒）
+                'backend': 'inprocess',       # yt-dlp 调用方式：inprocess（进程内提取池）/ subprocess
+                'pool_size': 4,               # 进程内提取池的预热实例数
+                'requests_per_second': 4.0,   # 所有 YouTube 请求合计的速率上限（<= 0 不限速）
+                'burst': 4,                   # 令牌桶容量（允许的瞬时请求数）
+                # 请求调度器：各类请求的速率预算和并发上限（实际并发按 AIMD 自适应）
+                'governor': {
+                    'search': {'rps': 1.0, 'concurrency': 4},
+                    'video': {'rps': 4.0, 'concurrency': 16},
+                    'channel': {'rps': 2.0, 'concurrency': 8},
+                    'comments': {'rps': 1.0, 'concurrency': 4},
+                    'retries': 3,                          # 被限流的请求退避后重试次数
+                    'backoff': {'base': 2.0, 'max': 300.0},  # 退避时间初始值 / 上限（秒）
+                },
             },
             # 调研模块配置
             'research': {
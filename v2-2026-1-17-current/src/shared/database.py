@@ -19,6 +19,7 @@ from contextlib import contextmanager
 
 from .logger import setup_logger
 from .config import get_config, get_data_dir
+from .sqlite_tuning import connect as sqlite_connect
 
 logger = setup_logger('database')
 
@@ -273,8 +274,8 @@ class Database:
     @contextmanager
     def get_connection(self):
         """获取数据库连接（上下文管理器）"""
-        conn = sqlite3.connect(
-            str(self.db_path),
+        conn = sqlite_connect(
+            self.db_path,
             detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
         )
         conn.row_factory = sqlite3.Row
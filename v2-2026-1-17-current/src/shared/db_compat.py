@@ -4,16 +4,64 @@
 
 当设置了 DATABASE_URL 环境变量时使用 PostgreSQL（通过 SQLAlchemy），
 否则回退到 SQLite。提供 sqlite3 兼容的接口，让上层代码无需修改 SQL。
+
+连接复用：
+- PostgreSQL：进程级线程安全连接池（最小/最大连接数、取连接前健康检查、空闲超时回收），
+  PgConnection.close() / with 结束时把连接归还连接池，而不是断开
+- SQLite：每个线程缓存已打开的连接，close() / with 结束时回滚未提交事务后留给本线程下次使用；
+  新连接统一应用 sqlite_tuning 的性能配置（WAL、busy_timeout 等）
+- get_pool_stats() 返回连接池指标（使用中、等待中、已创建等）
+
+批量写入（PostgreSQL）：
+- ? -> %s 的 SQL 转换按语句文本缓存
+- executemany：INSERT ... VALUES 改写为多行 VALUES（execute_values），其他语句按页合并往返（execute_batch）
+- copy_rows()：COPY FROM STDIN 批量导入（只追加，适合迁移到空表）
+
+读取（PostgreSQL）：
+- PgRow 直接持有结果元组，列名映射按查询共享（PgColumnIndex），兼容 sqlite3.Row 的 row['列名'] / row[下标] / keys()
+- fetchmany / 游标迭代分批取行；iter_batches() / iter_rows() 用服务端游标流式扫描大结果集
+
+连接池参数来自配置 database.pool_*（可用 YTP_DATABASE_POOL_* 环境变量覆盖），
+异步 Repository（repositories/async_repo.py）的引擎使用同一组参数。
 """
 
+import io
+import json
 import os
 import re
 import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import date, datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .sqlite_tuning import apply_profile
 
 _database_url = None
 
+# 连接池默认参数（配置 database.pool_* 覆盖）
+POOL_DEFAULTS = {
+    'pool_enabled': True,
+    'pool_min_size': 1,          # PostgreSQL 常驻连接数
+    'pool_size': 5,              # PostgreSQL 最大连接数
+    'pool_timeout': 30.0,        # 连接耗尽时最长等待（秒）
+    'pool_idle_timeout': 300.0,  # 空闲超过该时长的连接被关闭（保留 min_size 个）
+    'pool_check_interval': 30.0, # 空闲超过该时长的连接取出前先 SELECT 1 检查
+    'sqlite_idle_per_thread': 2, # 每个线程每个 SQLite 库缓存的空闲连接数
+}
+
+# executemany 每页行数（execute_values 每条语句的行数 / execute_batch 每次往返的语句数）
+BATCH_PAGE_SIZE = 500
+
+# copy_rows 每次 COPY 发送的行数
+COPY_CHUNK_ROWS = 10000
+
+# 流式读取每批行数（iter_rows / PgCursor 迭代 / 服务端游标 itersize）
+FETCH_BATCH_ROWS = 2000
+
 
 def get_database_url() -> Optional[str]:
     """获取 DATABASE_URL"""
@@ -29,8 +77,9 @@ def is_using_neon() -> bool:
     return bool(url and ('postgresql' in url or 'postgres' in url))
 
 
+@lru_cache(maxsize=2048)
 def _convert_sql(sql: str) -> str:
-    """将 SQLite 风格 SQL 转换为 PostgreSQL 兼容格式
+    """将 SQLite 风格 SQL 转换为 PostgreSQL 兼容格式（按语句文本缓存）
     - ? 占位符 -> %s
     - COALESCE 等函数保持不变
     """
@@ -55,18 +104,138 @@ def _convert_sql(sql: str) -> str:
     return ''.join(result)
 
 
+@lru_cache(maxsize=2048)
+def _is_insert(pg_sql: str) -> bool:
+    return pg_sql.lstrip().upper().startswith('INSERT')
+
+
+# INSERT 语句中的 VALUES (...) 行模板（允许字符串和一层嵌套括号，如 COALESCE(?, 0)）
+_VALUES_RE = re.compile(r"\bVALUES\s*(\((?:[^()']|'[^']*'|\([^()]*\))*\))", re.IGNORECASE)
+_INSERT_COLUMNS_RE = re.compile(r"^\s*INSERT\s+INTO\s+[\w.\"]+\s*\(([^()]*)\)", re.IGNORECASE)
+_CONFLICT_RE = re.compile(r"\bON\s+CONFLICT\s*(\(([^()]*)\))?\s*DO\s+(UPDATE|NOTHING)", re.IGNORECASE)
+
+
+def _column_names(text: str) -> List[str]:
+    return [name.strip().strip('"').lower() for name in text.split(',')]
+
+
+def _template_items(template: str) -> List[str]:
+    """按顶层逗号拆分行模板 (?, COALESCE(?, 0), 'a,b')"""
+    items, depth, quoted, current = [], 0, False, []
+    for ch in template.strip()[1:-1]:
+        if ch == "'":
+            quoted = not quoted
+        elif not quoted and ch == '(':
+            depth += 1
+        elif not quoted and ch == ')':
+            depth -= 1
+        elif not quoted and depth == 0 and ch == ',':
+            items.append(''.join(current).strip())
+            current = []
+            continue
+        current.append(ch)
+    items.append(''.join(current).strip())
+    return items
+
+
+@lru_cache(maxsize=512)
+def _split_insert_values(sql: str) -> Optional[tuple]:
+    """
+    把 INSERT ... VALUES (?, ...) [ON CONFLICT ...] 拆成 execute_values 的参数
+
+    Returns:
+        (带单个 %s 的语句, 行模板, 冲突键列下标或 None)；
+        VALUES 之外还有占位符、或 DO UPDATE 的冲突键无法解析时返回 None（改走 execute_batch）
+    """
+    match = _VALUES_RE.search(sql)
+    if not match or not _is_insert(sql):
+        return None
+    head, tail = sql[:match.start(1)], sql[match.end(1):]
+    if '%s' in _convert_sql(head) or '%s' in _convert_sql(tail):
+        return None
+
+    key_indexes = None
+    conflict = _CONFLICT_RE.search(tail)
+    if conflict and conflict.group(3).upper() == 'UPDATE':
+        # 同一条多行 INSERT 里同一个键出现两次会报错，执行时按冲突键分页
+        columns = _INSERT_COLUMNS_RE.match(head)
+        if not columns or not conflict.group(2):
+            return None
+        names = _column_names(columns.group(1))
+        items = _template_items(match.group(1))
+        keys = _column_names(conflict.group(2))
+        if len(items) != len(names) or not all(key in names for key in keys):
+            return None
+        # 冲突键对应的参数下标（模板中的常量列对所有行相同，不参与判重）
+        key_indexes = []
+        for key in keys:
+            item = items[names.index(key)]
+            if item == '?':
+                key_indexes.append(sum(other.count('?') for other in items[:names.index(key)]))
+            elif '?' in item:
+                return None
+        key_indexes = tuple(key_indexes)
+
+    return _convert_sql(head) + '%s' + _convert_sql(tail), _convert_sql(match.group(1)), key_indexes
+
+
+def _unique_key_pages(rows: Sequence, key_indexes: tuple, page_size: int) -> Iterator[list]:
+    """按顺序分页，保证每页内冲突键不重复（与逐行执行的结果一致）"""
+    page, seen = [], set()
+    for row in rows:
+        key = tuple(row[i] for i in key_indexes)
+        if key in seen or len(page) >= page_size:
+            yield page
+            page, seen = [], set()
+        page.append(row)
+        seen.add(key)
+    if page:
+        yield page
+
+
+class PgColumnIndex:
+    """一次查询结果的列名 -> 下标映射（该结果的所有 PgRow 共享）"""
+
+    __slots__ = ('names', 'positions', '_folded')
+
+    def __init__(self, description):
+        self.names = tuple(desc[0] for desc in description)
+        # 同名列保留第一个（与 sqlite3.Row 一致）
+        self.positions = {}
+        for position, name in enumerate(self.names):
+            self.positions.setdefault(name, position)
+        self._folded = None
+
+    def lookup(self, key: str) -> int:
+        """列名 -> 下标（精确匹配失败时按 sqlite3.Row 的规则忽略大小写）"""
+        position = self.positions.get(key)
+        if position is not None:
+            return position
+        if self._folded is None:
+            folded = {}
+            for name, position in self.positions.items():
+                folded.setdefault(name.lower(), position)
+            self._folded = folded
+        return self._folded[key.lower()]
+
+
 class PgRow:
-    """模拟 sqlite3.Row，支持 dict-like 和 index 访问"""
+    """
+    模拟 sqlite3.Row，支持 row['列名'] / row[下标]、keys()、迭代和 len
+
+    直接持有 psycopg2 返回的元组，列名映射由 PgColumnIndex 共享，不为每行构建 dict。
+    """
+
+    __slots__ = ('_index', '_values')
 
-    def __init__(self, columns, values):
-        self._columns = columns
+    def __init__(self, index: PgColumnIndex, values: tuple):
+        self._index = index
         self._values = values
-        self._dict = dict(zip(columns, values))
 
     def __getitem__(self, key):
-        if isinstance(key, int):
-            return self._values[key]
-        return self._dict[key]
+        if isinstance(key, str):
+            return self._values[self._index.lookup(key)]
+        return self._values[key]
 
     def __iter__(self):
         return iter(self._values)
@@ -74,18 +243,34 @@ class PgRow:
     def __len__(self):
         return len(self._values)
 
+    def __eq__(self, other):
+        if not isinstance(other, PgRow):
+            return NotImplemented
+        return self._index.names == other._index.names and self._values == other._values
+
+    def __hash__(self):
+        return hash((self._index.names, self._values))
+
+    def __repr__(self):
+        return f"PgRow({dict(zip(self._index.names, self._values))!r})"
+
     def keys(self):
-        return self._columns
+        return list(self._index.names)
 
 
 class PgCursor:
-    """模拟 sqlite3.Cursor"""
+    """模拟 sqlite3.Cursor（传入 name 时为服务端游标，结果分批从服务器读取）"""
 
-    def __init__(self, pg_conn, use_row_factory=False):
+    def __init__(self, pg_conn, use_row_factory=False, name: Optional[str] = None,
+                 itersize: int = FETCH_BATCH_ROWS):
         self._conn = pg_conn
-        self._cursor = pg_conn.cursor()
+        if name is None:
+            self._cursor = pg_conn.cursor()
+        else:
+            self._cursor = pg_conn.cursor(name=name)
+            self._cursor.itersize = itersize
         self._use_row_factory = use_row_factory
-        self._description = None
+        self._index = None
         self._lastrowid = None
 
     @property
@@ -96,8 +281,27 @@ class PgCursor:
     def lastrowid(self):
         return self._lastrowid
 
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def arraysize(self):
+        return self._cursor.arraysize
+
+    @arraysize.setter
+    def arraysize(self, value):
+        self._cursor.arraysize = value
+
+    def _row_index(self) -> Optional[PgColumnIndex]:
+        """当前结果的列映射（每次 execute 后首次取行时构建一次）"""
+        if self._index is None and self._cursor.description:
+            self._index = PgColumnIndex(self._cursor.description)
+        return self._index
+
     def execute(self, sql, params=None):
         pg_sql = _convert_sql(sql)
+        self._index = None
         try:
             if params:
                 self._cursor.execute(pg_sql, params)
@@ -109,7 +313,7 @@ class PgCursor:
             raise
 
         # 处理 INSERT 返回 lastrowid
-        if pg_sql.strip().upper().startswith('INSERT'):
+        if _is_insert(pg_sql):
             try:
                 # PostgreSQL 用 RETURNING 获取插入ID，但这里兼容不加RETURNING的情况
                 if self._cursor.description:
@@ -120,51 +324,127 @@ class PgCursor:
                 pass
 
     def executemany(self, sql, seq_of_params):
-        pg_sql = _convert_sql(sql)
-        for params in seq_of_params:
-            self._cursor.execute(pg_sql, params)
+        """
+        批量执行（每页一次往返，而不是每行一次）
+
+        - INSERT ... VALUES (?, ...)：改写为多行 VALUES（psycopg2.extras.execute_values）
+        - 其他语句：多条语句拼接后按页发送（psycopg2.extras.execute_batch）
+        """
+        rows = seq_of_params if isinstance(seq_of_params, (list, tuple)) else list(seq_of_params)
+        if not rows:
+            return
+        from psycopg2.extras import execute_batch, execute_values
+
+        split = _split_insert_values(sql) if not isinstance(rows[0], dict) else None
+        try:
+            if split is None:
+                execute_batch(self._cursor, _convert_sql(sql), rows, page_size=BATCH_PAGE_SIZE)
+            elif split[2] is None:
+                execute_values(self._cursor, split[0], rows, template=split[1], page_size=BATCH_PAGE_SIZE)
+            else:
+                for page in _unique_key_pages(rows, split[2], BATCH_PAGE_SIZE):
+                    execute_values(self._cursor, split[0], page, template=split[1], page_size=len(page))
+        except Exception:
+            self._conn.rollback()
+            raise
+
+    def _wrap(self, rows: list) -> list:
+        if self._use_row_factory and rows:
+            index = self._row_index()
+            if index is not None:
+                return [PgRow(index, row) for row in rows]
+        return rows
 
     def fetchone(self):
         row = self._cursor.fetchone()
         if row is None:
             return None
-        if self._use_row_factory and self._cursor.description:
-            columns = [desc[0] for desc in self._cursor.description]
-            return PgRow(columns, list(row))
+        if self._use_row_factory:
+            index = self._row_index()
+            if index is not None:
+                return PgRow(index, row)
         return row
 
+    def fetchmany(self, size: Optional[int] = None):
+        return self._wrap(self._cursor.fetchmany(self.arraysize if size is None else size))
+
     def fetchall(self):
-        rows = self._cursor.fetchall()
-        if self._use_row_factory and self._cursor.description:
-            columns = [desc[0] for desc in self._cursor.description]
-            return [PgRow(columns, list(row)) for row in rows]
-        return rows
+        return self._wrap(self._cursor.fetchall())
+
+    def __iter__(self):
+        """逐批读取（每批 FETCH_BATCH_ROWS 行），不一次性构建整个结果列表"""
+        while True:
+            rows = self.fetchmany(FETCH_BATCH_ROWS)
+            if not rows:
+                return
+            yield from rows
 
     def close(self):
         self._cursor.close()
 
 
 class PgConnection:
-    """模拟 sqlite3.Connection，基于 psycopg2"""
+    """模拟 sqlite3.Connection，基于 psycopg2（传入 pool 时从连接池借用连接）"""
 
-    def __init__(self, database_url: str, row_factory=None):
-        import psycopg2
-        self._conn = psycopg2.connect(database_url)
-        self._conn.autocommit = False
+    def __init__(self, database_url: str, row_factory=None, pool: "PgConnectionPool" = None):
+        self._pool = pool
+        if pool is not None:
+            self._conn = pool.acquire()
+        else:
+            import psycopg2
+            self._conn = psycopg2.connect(database_url)
+            self._conn.autocommit = False
         self._use_row_factory = row_factory is not None
         self.row_factory = row_factory
+        self._stream_count = 0
 
     def cursor(self):
         return PgCursor(self._conn, use_row_factory=self._use_row_factory)
 
+    def stream_cursor(self, itersize: int = FETCH_BATCH_ROWS) -> PgCursor:
+        """
+        服务端游标（只能 execute 一次；结果按 itersize 分批从服务器读取，客户端不缓存全部结果）
+
+        Args:
+            itersize: 每次从服务器读取的行数
+
+        Returns:
+            PgCursor
+        """
+        self._stream_count += 1
+        name = f"ytp_stream_{id(self):x}_{self._stream_count}"
+        return PgCursor(self._conn, use_row_factory=self._use_row_factory, name=name, itersize=itersize)
+
     def commit(self):
         self._conn.commit()
 
     def rollback(self):
         self._conn.rollback()
 
+    def copy_rows(self, table: str, columns: Sequence[str], rows: Iterable[Sequence]) -> int:
+        """COPY FROM STDIN 批量导入（见模块函数 copy_rows）"""
+        sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+        cursor = self._conn.cursor()
+        total = 0
+        try:
+            for chunk in _copy_chunks(rows, COPY_CHUNK_ROWS):
+                cursor.copy_expert(sql, chunk[0])
+                total += chunk[1]
+        except Exception:
+            self._conn.rollback()
+            raise
+        finally:
+            cursor.close()
+        return total
+
     def close(self):
-        self._conn.close()
+        if self._conn is None:
+            return
+        if self._pool is not None:
+            self._pool.release(self._conn)
+        else:
+            self._conn.close()
+        self._conn = None
 
     def execute(self, sql, params=None):
         cursor = self.cursor()
@@ -183,6 +463,551 @@ class PgConnection:
         return False
 
 
+class PoolTimeoutError(RuntimeError):
+    """连接池耗尽且等待超时"""
+
+
+class PgConnectionPool:
+    """线程安全的 psycopg2 连接池"""
+
+    def __init__(
+        self,
+        database_url: str,
+        min_size: int = 1,
+        max_size: int = 5,
+        timeout: float = 30.0,
+        idle_timeout: float = 300.0,
+        check_interval: float = 30.0,
+    ):
+        """
+        Args:
+            database_url: PostgreSQL 连接串
+            min_size: 空闲回收时保留的最少连接数
+            max_size: 最大连接数（使用中 + 空闲）
+            timeout: 连接耗尽时最长等待秒数，超时抛出 PoolTimeoutError
+            idle_timeout: 空闲超过该秒数的连接被关闭
+            check_interval: 空闲超过该秒数的连接在借出前做一次 SELECT 1 健康检查
+        """
+        self.database_url = database_url
+        self.min_size = max(0, min_size)
+        self.max_size = max(1, max_size, self.min_size)
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.check_interval = check_interval
+        self.pid = os.getpid()
+
+        self._idle = deque()  # (connection, 归还时间)，右端最近使用
+        self._in_use = 0
+        self._cond = threading.Condition()
+
+        self._waiting = 0
+        self._created = 0
+        self._closed = 0
+        self._acquired = 0
+        self._reused = 0
+        self._timeouts = 0
+        self._health_failures = 0
+        self._wait_seconds = 0.0
+
+    def _connect(self):
+        import psycopg2
+        conn = psycopg2.connect(self.database_url)
+        conn.autocommit = False
+        return conn
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, conn) -> bool:
+        """SELECT 1 检查（连接被服务端或网络断开时返回 False）"""
+        if conn.closed:
+            return False
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            cursor.close()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _reap_idle(self, now: float) -> list:
+        """取出空闲超时的连接（调用方持有锁，返回值在锁外关闭）"""
+        expired = []
+        while self._idle and len(self._idle) + self._in_use > self.min_size:
+            conn, released_at = self._idle[0]
+            if now - released_at < self.idle_timeout:
+                break
+            self._idle.popleft()
+            expired.append(conn)
+        self._closed += len(expired)
+        return expired
+
+    def acquire(self):
+        """
+        借出一个连接
+
+        Returns:
+            psycopg2 connection（autocommit=False）
+
+        Raises:
+            PoolTimeoutError: 等待 timeout 秒仍无可用连接
+        """
+        started = time.monotonic()
+        deadline = started + self.timeout
+        while True:
+            conn = None
+            idle_since = None
+            with self._cond:
+                expired = self._reap_idle(time.monotonic())
+                while not self._idle and self._in_use >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(
+                            f"数据库连接池已满（{self.max_size} 个连接均在使用），等待 {self.timeout:g}s 超时"
+                        )
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+                if self._idle:
+                    conn, idle_since = self._idle.pop()
+                self._in_use += 1
+                self._acquired += 1
+                self._wait_seconds += time.monotonic() - started
+
+            for stale in expired:
+                self._close_quietly(stale)
+
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    self._return_slot()
+                    raise
+                with self._cond:
+                    self._created += 1
+                return conn
+
+            if time.monotonic() - idle_since < self.check_interval or self._is_healthy(conn):
+                with self._cond:
+                    self._reused += 1
+                return conn
+
+            # 健康检查失败：丢弃后重新获取（不计入等待超时）
+            self._close_quietly(conn)
+            with self._cond:
+                self._health_failures += 1
+                self._closed += 1
+            self._return_slot()
+
+    def _return_slot(self):
+        with self._cond:
+            self._in_use -= 1
+            self._cond.notify()
+
+    def release(self, conn):
+        """归还连接（未结束的事务回滚，状态异常的连接直接关闭）"""
+        reusable = not conn.closed
+        if reusable:
+            try:
+                from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_UNKNOWN
+                status = conn.get_transaction_status()
+                if status == TRANSACTION_STATUS_UNKNOWN:
+                    reusable = False
+                elif status != TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                reusable = False
+
+        with self._cond:
+            self._in_use -= 1
+            if reusable and os.getpid() == self.pid:
+                self._idle.append((conn, time.monotonic()))
+            else:
+                self._closed += 1
+            self._cond.notify()
+        if not reusable:
+            self._close_quietly(conn)
+
+    def close_all(self):
+        """关闭所有空闲连接（使用中的连接归还时正常处理）"""
+        with self._cond:
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._closed += len(idle)
+        for conn in idle:
+            self._close_quietly(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        """连接池指标"""
+        with self._cond:
+            return {
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                "created": self._created,
+                "closed": self._closed,
+                "acquired": self._acquired,
+                "reused": self._reused,
+                "timeouts": self._timeouts,
+                "health_check_failures": self._health_failures,
+                "avg_wait_ms": round(self._wait_seconds / self._acquired * 1000, 2) if self._acquired else 0.0,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+            }
+
+
+class SqliteConnection:
+    """
+    可复用的 SQLite 连接（sqlite3.Connection 的代理）
+
+    close() / with 结束时回滚未提交的事务并归还给当前线程的缓存；
+    归还后继续使用会自动再借出一个连接。
+    """
+
+    def __init__(self, cache: "SqliteConnectionCache", db_path: str, row_factory=None):
+        self._cache = cache
+        self._db_path = db_path
+        self._conn = None
+        self._row_factory = row_factory
+
+    @property
+    def _raw(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = self._cache.acquire(self._db_path)
+            self._conn.row_factory = self._row_factory
+        return self._conn
+
+    @property
+    def row_factory(self):
+        return self._row_factory
+
+    @row_factory.setter
+    def row_factory(self, value):
+        self._row_factory = value
+        if self._conn is not None:
+            self._conn.row_factory = value
+
+    def cursor(self, *args):
+        return self._raw.cursor(*args)
+
+    def execute(self, sql, params=()):
+        return self._raw.execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self._raw.executemany(sql, seq_of_params)
+
+    def executescript(self, script):
+        return self._raw.executescript(script)
+
+    def commit(self):
+        if self._conn is not None:
+            self._conn.commit()
+
+    def rollback(self):
+        if self._conn is not None:
+            self._conn.rollback()
+
+    def close(self):
+        if self._conn is not None:
+            self._cache.release(self._db_path, self._conn)
+            self._conn = None
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        self.close()
+        return False
+
+
+class SqliteConnectionCache:
+    """按线程缓存 SQLite 连接（sqlite3 连接默认不能跨线程使用，每个线程各自复用）"""
+
+    def __init__(self, idle_per_thread: int = 2):
+        """
+        Args:
+            idle_per_thread: 每个线程每个数据库文件最多缓存的空闲连接数
+        """
+        self.idle_per_thread = idle_per_thread
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._created = 0
+        self._reused = 0
+        self._closed = 0
+
+    def _idle(self) -> Dict[str, list]:
+        idle = getattr(self._local, 'idle', None)
+        if idle is None:
+            idle = self._local.idle = {}
+        return idle
+
+    @staticmethod
+    def _file_id(db_path: str) -> Optional[tuple]:
+        """数据库文件标识（文件被删除或替换后，旧连接不再复用）"""
+        try:
+            stat = os.stat(db_path)
+        except OSError:
+            return None
+        return (stat.st_dev, stat.st_ino)
+
+    def acquire(self, db_path: str) -> sqlite3.Connection:
+        """借出当前线程缓存的连接，没有时新建"""
+        idle = self._idle().get(db_path)
+        if idle:
+            file_id = self._file_id(db_path)
+            while idle:
+                conn, conn_file_id = idle.pop()
+                if conn_file_id is not None and conn_file_id == file_id:
+                    with self._lock:
+                        self._in_use += 1
+                        self._reused += 1
+                    return conn
+                conn.close()
+                with self._lock:
+                    self._closed += 1
+
+        conn = apply_profile(sqlite3.connect(db_path), db_path)
+        with self._lock:
+            self._in_use += 1
+            self._created += 1
+        return conn
+
+    def release(self, db_path: str, conn: sqlite3.Connection):
+        """回滚未提交的事务后放回当前线程的缓存"""
+        with self._lock:
+            self._in_use -= 1
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = None
+            idle = self._idle().setdefault(db_path, [])
+            file_id = self._file_id(db_path)
+            if file_id is not None and len(idle) < self.idle_per_thread:
+                idle.append((conn, file_id))
+                return
+        except sqlite3.ProgrammingError:
+            pass  # 在其他线程归还，或连接已被关闭
+        try:
+            conn.close()
+        except sqlite3.ProgrammingError:
+            pass
+        with self._lock:
+            self._closed += 1
+
+    def stats(self) -> Dict[str, int]:
+        """缓存指标（空闲连接分散在各线程，不单独统计）"""
+        with self._lock:
+            return {
+                "in_use": self._in_use,
+                "created": self._created,
+                "reused": self._reused,
+                "closed": self._closed,
+            }
+
+
+_pg_pool: Optional[PgConnectionPool] = None
+_sqlite_cache: Optional[SqliteConnectionCache] = None
+_pooling: Optional[bool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool_settings() -> Dict[str, Any]:
+    """读取连接池配置（配置模块不可用时使用默认值）"""
+    settings = dict(POOL_DEFAULTS)
+    try:
+        from .config import get_config
+        config = get_config()
+        for key, default in POOL_DEFAULTS.items():
+            settings[key] = config.get(f'database.{key}', default)
+    except Exception:
+        pass
+    return settings
+
+
+def get_pg_pool() -> PgConnectionPool:
+    """获取进程级 PostgreSQL 连接池（fork 出的子进程会新建自己的连接池）"""
+    global _pg_pool
+    pool = _pg_pool
+    if pool is None or pool.pid != os.getpid():
+        with _pool_lock:
+            pool = _pg_pool
+            if pool is None or pool.pid != os.getpid():
+                settings = get_pool_settings()
+                pool = _pg_pool = PgConnectionPool(
+                    get_database_url(),
+                    min_size=int(settings['pool_min_size']),
+                    max_size=int(settings['pool_size']),
+                    timeout=float(settings['pool_timeout']),
+                    idle_timeout=float(settings['pool_idle_timeout']),
+                    check_interval=float(settings['pool_check_interval']),
+                )
+    return pool
+
+
+def get_sqlite_cache() -> SqliteConnectionCache:
+    """获取进程级 SQLite 连接缓存"""
+    global _sqlite_cache
+    if _sqlite_cache is None:
+        with _pool_lock:
+            if _sqlite_cache is None:
+                settings = get_pool_settings()
+                _sqlite_cache = SqliteConnectionCache(int(settings['sqlite_idle_per_thread']))
+    return _sqlite_cache
+
+
+def _pooling_enabled() -> bool:
+    global _pooling
+    if _pooling is None:
+        _pooling = bool(get_pool_settings()['pool_enabled'])
+    return _pooling
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    连接池指标
+
+    Returns:
+        {"backend": "postgresql"/"sqlite", "enabled": bool, ...连接池统计}
+    """
+    if is_using_neon():
+        stats = _pg_pool.stats() if _pg_pool is not None else {}
+        return {"backend": "postgresql", "enabled": _pooling_enabled(), **stats}
+    stats = _sqlite_cache.stats() if _sqlite_cache is not None else {}
+    return {"backend": "sqlite", "enabled": _pooling_enabled(), **stats}
+
+
+def _copy_value(value) -> str:
+    """COPY 文本格式的单个字段"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    elif isinstance(value, (dict, list)):
+        value = json.dumps(value, ensure_ascii=False)
+    else:
+        value = str(value)
+    # PostgreSQL 文本不接受 NUL 字节
+    return (value.replace('\x00', '').replace('\\', '\\\\')
+            .replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def _copy_chunks(rows: Iterable[Sequence], chunk_rows: int) -> Iterator[tuple]:
+    """按块编码为 COPY 文本，返回 (StringIO, 行数)，内存占用与总行数无关"""
+    buffer, count = io.StringIO(), 0
+    for row in rows:
+        buffer.write('\t'.join(_copy_value(value) for value in row))
+        buffer.write('\n')
+        count += 1
+        if count >= chunk_rows:
+            buffer.seek(0)
+            yield buffer, count
+            buffer, count = io.StringIO(), 0
+    if count:
+        buffer.seek(0)
+        yield buffer, count
+
+
+def copy_rows(conn, table: str, columns: Sequence[str], rows: Iterable[Sequence]) -> int:
+    """
+    批量导入行
+
+    PostgreSQL 使用 COPY FROM STDIN（比多行 INSERT 更快）；SQLite 回退为 executemany INSERT。
+    只追加、不处理主键冲突，适合迁移到空表或导入新表，调用方负责 commit。
+
+    Args:
+        conn: get_connection() 返回的连接
+        table: 表名
+        columns: 列名
+        rows: 与 columns 顺序一致的行（可以是生成器）
+
+    Returns:
+        导入的行数
+    """
+    if isinstance(conn, PgConnection):
+        return conn.copy_rows(table, columns, rows)
+
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    total = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= COPY_CHUNK_ROWS:
+            conn.executemany(sql, batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        conn.executemany(sql, batch)
+        total += len(batch)
+    return total
+
+
+def iter_batches(conn, sql: str, params: Sequence = (), batch_size: int = FETCH_BATCH_ROWS) -> Iterator[list]:
+    """
+    流式读取查询结果，按批返回（大结果集扫描用，内存只保留一批行）
+
+    PostgreSQL 使用服务端游标分批读取；SQLite 的游标本身按需步进，按批 fetchmany。
+    迭代期间连接被占用，调用方读完（或停止迭代）后再执行其他语句。
+
+    Args:
+        conn: get_connection() 返回的连接
+        sql: 查询语句（? 占位符）
+        params: 参数
+        batch_size: 每批行数
+
+    Yields:
+        行列表（连接设置了 row_factory 时为 sqlite3.Row / PgRow，否则为元组）
+    """
+    if isinstance(conn, PgConnection):
+        cursor = conn.stream_cursor(itersize=batch_size)
+    else:
+        cursor = conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield rows
+    finally:
+        cursor.close()
+
+
+def iter_rows(conn, sql: str, params: Sequence = (), batch_size: int = FETCH_BATCH_ROWS) -> Iterator:
+    """
+    流式读取查询结果，逐行返回（见 iter_batches）
+
+    Args:
+        conn: get_connection() 返回的连接
+        sql: 查询语句（? 占位符）
+        params: 参数
+        batch_size: 每批从数据库读取的行数
+
+    Yields:
+        行
+    """
+    for rows in iter_batches(conn, sql, params, batch_size):
+        yield from rows
+
+
 def get_connection(db_path: str = None, row_factory=None):
     """
     获取数据库连接。
@@ -195,15 +1020,19 @@ def get_connection(db_path: str = None, row_factory=None):
         row_factory: 设为 sqlite3.Row 或任意值时启用 dict-like 行访问
 
     Returns:
-        Connection 对象（sqlite3.Connection 或 PgConnection）
+        Connection 对象（PgConnection、SqliteConnection 或关闭连接池时的 sqlite3.Connection）
     """
     if is_using_neon():
-        return PgConnection(get_database_url(), row_factory=row_factory)
+        pool = get_pg_pool() if _pooling_enabled() else None
+        return PgConnection(get_database_url(), row_factory=row_factory, pool=pool)
 
     # 回退到 SQLite
     if db_path is None:
         db_path = str(Path("data/youtube_pipeline.db"))
-    conn = sqlite3.connect(db_path)
+    db_path = str(db_path)
+    if _pooling_enabled() and db_path != ':memory:' and not db_path.startswith('file:'):
+        return SqliteConnection(get_sqlite_cache(), db_path, row_factory=row_factory)
+    conn = apply_profile(sqlite3.connect(db_path), db_path)
     if row_factory is not None:
         conn.row_factory = row_factory
     return conn
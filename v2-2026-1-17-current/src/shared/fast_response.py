@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+大响应的快速序列化与流式输出
+
+/api/analyze 在 limit 较大时会返回数千条视频和全部频道，
+FastAPI 默认的 jsonable_encoder + json.dumps 会先遍历整个结果再一次性写入缓冲区。
+本模块提供：
+- 快速 JSON 编码：优先 orjson，未安装时回退到标准库 json（紧凑分隔符）
+- 字段投影：fields=youtube_id,title,view_count 只保留列表项中的指定字段
+- 三种输出模式：
+    json     一次性输出完整 JSON（与原格式一致）
+    chunked  与 json 相同的文档，但大数组逐批编码、分块发送
+    ndjson   每行一个 JSON：首行 {"type": "meta", ...}，之后每条 {"type": <数组名>, "data": {...}}，
+             末行 {"type": "end", "counts": {...}}
+- 压缩协商：按 Accept-Encoding 选择 br（需安装 brotli）或 gzip
+"""
+
+import json
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+# 流式输出时每批编码的列表项数
+CHUNK_ITEMS = 200
+
+# 小于该字节数的完整响应不压缩
+MIN_COMPRESS_SIZE = 1024
+
+# 支持的输出模式
+MODES = ("json", "chunked", "ndjson")
+
+try:
+    import orjson
+except ImportError:  # 可选依赖
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # 可选依赖
+    brotli = None
+
+
+def dumps(value: Any) -> bytes:
+    """
+    编码为 UTF-8 JSON 字节串
+
+    Args:
+        value: 待编码的对象（datetime 等非 JSON 类型转为字符串）
+
+    Returns:
+        JSON 字节串
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            value,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    解析 fields 参数
+
+    Args:
+        fields: 逗号分隔的字段名，例如 "youtube_id,title,view_count"
+
+    Returns:
+        字段列表，未指定时返回 None（表示保留全部字段）
+    """
+    if not fields:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    return names or None
+
+
+def project(item: Any, fields: Optional[Sequence[str]]) -> Any:
+    """只保留字典中的指定字段（不修改原字典）"""
+    if fields is None or not isinstance(item, dict):
+        return item
+    return {name: item[name] for name in fields if name in item}
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    根据 Accept-Encoding 选择压缩方式
+
+    Args:
+        accept_encoding: 请求头 Accept-Encoding
+
+    Returns:
+        "br" / "gzip" / None
+    """
+    if not accept_encoding:
+        return None
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        token, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(token.strip())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+class _Compressor:
+    """增量压缩器（每块都 flush，客户端可以边收边解压）"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=4)
+        else:
+            self._gz = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    def feed(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._br.process(data) + self._br.flush()
+        return self._gz.compress(data) + self._gz.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._br.finish()
+        return self._gz.flush(zlib.Z_FINISH)
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """一次性压缩完整响应"""
+    if encoding == "br":
+        return brotli.compress(data, quality=4)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _iter_items(items: Sequence[Any], fields: Optional[Sequence[str]]) -> Iterator[bytes]:
+    """逐批编码列表项（JSON 数组元素之间以逗号分隔）"""
+    for start in range(0, len(items), CHUNK_ITEMS):
+        batch = items[start:start + CHUNK_ITEMS]
+        encoded = b",".join(dumps(project(item, fields)) for item in batch)
+        yield (b"," if start else b"") + encoded
+
+
+def iter_chunked_json(
+    payload: Dict[str, Any],
+    stream_keys: Sequence[str],
+    fields: Optional[Sequence[str]] = None,
+) -> Iterator[bytes]:
+    """
+    分块输出 {"status": ..., "result": {...}}，result 中的大数组逐批编码
+
+    输出与 json 模式完全相同的 JSON 文档（字段投影除外）。
+
+    Args:
+        payload: 完整响应（result 为字典）
+        stream_keys: result 中需要流式输出的数组字段
+        fields: 数组项的字段投影
+    """
+    result = payload.get("result")
+    if not isinstance(result, dict):
+        yield dumps(payload)
+        return
+
+    head = {k: v for k, v in payload.items() if k != "result"}
+    yield dumps(head)[:-1] + (b',"result":{' if head else b'"result":{')
+
+    first = True
+    for key, value in result.items():
+        yield (b"" if first else b",") + dumps(key) + b":"
+        first = False
+        if key in stream_keys and isinstance(value, list):
+            yield b"["
+            yield from _iter_items(value, fields)
+            yield b"]"
+        else:
+            yield dumps(value)
+    yield b"}}"
+
+
+def iter_ndjson(
+    payload: Dict[str, Any],
+    stream_keys: Sequence[str],
+    fields: Optional[Sequence[str]] = None,
+) -> Iterator[bytes]:
+    """
+    按行输出：meta 行（去掉大数组的结果）→ 每个数组项一行 → end 行
+
+    Args:
+        payload: 完整响应（result 为字典）
+        stream_keys: result 中需要逐行输出的数组字段
+        fields: 数组项的字段投影
+    """
+    result = payload.get("result")
+    if not isinstance(result, dict):
+        yield dumps(payload) + b"\n"
+        return
+
+    streamed = [k for k in stream_keys if isinstance(result.get(k), list)]
+    meta = {"type": "meta"}
+    meta.update((k, v) for k, v in payload.items() if k != "result")
+    meta["result"] = {k: v for k, v in result.items() if k not in streamed}
+    yield dumps(meta) + b"\n"
+
+    counts = {}
+    for key in streamed:
+        items = result[key]
+        counts[key] = len(items)
+        line_prefix = b'{"type":' + dumps(key) + b',"data":'
+        for start in range(0, len(items), CHUNK_ITEMS):
+            yield b"".join(
+                line_prefix + dumps(project(item, fields)) + b"}\n"
+                for item in items[start:start + CHUNK_ITEMS]
+            )
+    yield dumps({"type": "end", "counts": counts}) + b"\n"
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: Optional[str]) -> Iterator[bytes]:
+    """对分块输出做增量压缩（encoding 为 None 时原样输出）"""
+    if encoding is None:
+        yield from chunks
+        return
+    compressor = _Compressor(encoding)
+    for chunk in chunks:
+        data = compressor.feed(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def project_payload(
+    payload: Dict[str, Any],
+    stream_keys: Sequence[str],
+    fields: Optional[Sequence[str]],
+) -> Dict[str, Any]:
+    """对 result 中的数组字段做投影（返回浅拷贝，不修改缓存中的原结果）"""
+    result = payload.get("result")
+    if fields is None or not isinstance(result, dict):
+        return payload
+    projected = dict(result)
+    for key in stream_keys:
+        if isinstance(projected.get(key), list):
+            projected[key] = [project(item, fields) for item in projected[key]]
+    return {**payload, "result": projected}
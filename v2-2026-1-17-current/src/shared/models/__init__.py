@@ -58,7 +58,7 @@ from .script import Script, Spec, create_script, create_spec
 from .media import Subtitle, Thumbnail, create_subtitle, create_thumbnail
 
 # 竞品视频 - 调研阶段
-from .research import CompetitorVideo, create_competitor_video
+from .research import CompetitorVideo, VideoRecord, create_competitor_video
 
 # 数据分析 - 复盘阶段
 from .analytics import Analytics, create_analytics
@@ -106,6 +106,7 @@ __all__ = [
     "Subtitle",
     "Thumbnail",
     "CompetitorVideo",
+    "VideoRecord",
     "Analytics",
     "Task",
     "TaskTypes",
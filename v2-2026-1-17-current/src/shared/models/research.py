@@ -15,7 +15,7 @@ CompetitorVideo 数据模型
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
 
 from .base import (
     BaseModel,
@@ -364,6 +364,138 @@ class CompetitorVideo(BaseModel):
         return f"CompetitorVideo(id={self.youtube_id}, title='{self.title[:20]}...', views={self.view_count_formatted})"
 
 
+# ============================================================
+# 只读记录（批量读取）
+# ============================================================
+
+def _decode_description(value: Optional[str]) -> Optional[str]:
+    if value and len(value) > MAX_DESCRIPTION_LENGTH:
+        return value[:MAX_DESCRIPTION_LENGTH]
+    return value
+
+
+def _decode_tags(value: Any) -> List[str]:
+    tags = parse_json_field(value) or []
+    return tags[:MAX_TAGS_COUNT] if len(tags) > MAX_TAGS_COUNT else tags
+
+
+def _count(value: Any) -> int:
+    return value or 0
+
+
+# 列 -> 解码函数（与 CompetitorVideo.from_dict 的转换一致）
+RECORD_DECODERS = {
+    'channel_name': lambda value: value or None,
+    'view_count': _count,
+    'like_count': _count,
+    'comment_count': _count,
+    'subscriber_count': _count,
+    'published_at': parse_datetime,
+    'has_details': bool,
+    'description': _decode_description,
+    'tags': _decode_tags,
+    'pattern_type': lambda value: parse_enum(PatternType, value, PatternType.UNKNOWN),
+    'collected_at': lambda value: parse_datetime(value) or datetime.now(),
+}
+
+# 解码开销大的列：首次访问时解码并缓存在记录上
+LAZY_COLUMNS = frozenset({'published_at', 'collected_at', 'description', 'tags', 'pattern_type'})
+
+
+def _column_property(name: str, position: int) -> property:
+    """按列生成只读属性：原样返回 / 每次轻量转换 / 首次访问解码并缓存"""
+    decoder = RECORD_DECODERS.get(name)
+    if decoder is None:
+        return property(lambda self: self._values[position])
+    if name not in LAZY_COLUMNS:
+        return property(lambda self: decoder(self._values[position]))
+
+    def getter(self):
+        decoded = self._decoded
+        if decoded is None:
+            decoded = self._decoded = {}
+        elif name in decoded:
+            return decoded[name]
+        value = decoded[name] = decoder(self._values[position])
+        return value
+    return property(getter)
+
+
+class VideoRecord:
+    """
+    竞品视频只读记录（批量读取用）
+
+    CompetitorVideo.from_dict 会对每行解析时间、json.loads 标签，
+    分析接口读取上万行时大部分时间耗在这里，而多数字段根本用不到。
+    VideoRecord 直接持有查询返回的元组：每种列组合生成一个子类（for_columns），
+    列访问是类上的属性（列下标在子类里共享，不按行建 dict）；
+    时间、标签、描述在首次访问时才解码，结果与 CompetitorVideo 相同。
+
+    只能访问查询时读取的列，未读取的列抛出 AttributeError
+    （getattr(record, name, default) 可正常取默认值）。
+    """
+
+    __slots__ = ('_values', '_decoded')
+
+    COLUMNS: Tuple[str, ...] = ()
+
+    def __init__(self, values: tuple):
+        """
+        Args:
+            values: 一行的值（按 COLUMNS 顺序）
+        """
+        self._values = values
+        self._decoded = None
+
+    @classmethod
+    def for_columns(cls, columns: Sequence[str]) -> Type['VideoRecord']:
+        """
+        按列组合获取记录类型（同一组合复用同一个子类）
+
+        Args:
+            columns: 查询返回的列名（按 SELECT 顺序）
+
+        Returns:
+            VideoRecord 子类
+        """
+        columns = tuple(columns)
+        record_type = _record_types.get(columns)
+        if record_type is None:
+            attrs = {name: _column_property(name, position) for position, name in enumerate(columns)}
+            attrs.update(__slots__=(), COLUMNS=columns)
+            record_type = _record_types.setdefault(columns, type(cls.__name__, (cls,), attrs))
+        return record_type
+
+    def keys(self) -> List[str]:
+        """已读取的列名"""
+        return list(self.COLUMNS)
+
+    @property
+    def url(self) -> str:
+        """YouTube 链接"""
+        return f"https://www.youtube.com/watch?v={self.youtube_id}"
+
+    @property
+    def engagement_rate(self) -> float:
+        """互动率 (点赞+评论 / 播放)"""
+        if self.view_count <= 0:
+            return 0.0
+        return (self.like_count + self.comment_count) / self.view_count
+
+    def to_model(self) -> CompetitorVideo:
+        """转换为完整的 CompetitorVideo（未读取的列取模型默认值）"""
+        data = dict(zip(self.COLUMNS, self._values))
+        if 'has_details' in data:
+            data['has_details'] = bool(data['has_details'])
+        return CompetitorVideo.from_dict(data)
+
+    def __repr__(self) -> str:
+        return f"VideoRecord(id={getattr(self, 'youtube_id', None)}, columns={len(self.COLUMNS)})"
+
+
+_record_types: Dict[Tuple[str, ...], Type[VideoRecord]] = {}
+
+
 # ============================================================
 # 工厂函数
 # ============================================================
@@ -15,8 +15,9 @@ import os
 from datetime import datetime
 from typing import Optional, List, Any
 from contextlib import asynccontextmanager
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
-from sqlalchemy import create_engine, Column, Integer, BigInteger, String, Text, DateTime, Float, Boolean, ForeignKey
+from sqlalchemy import create_engine, Column, Integer, BigInteger, String, Text, DateTime, Float, Boolean, ForeignKey, Index, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base, sessionmaker, relationship
 from sqlalchemy.pool import NullPool
@@ -140,6 +141,30 @@ class Spec(Base):
 class CompetitorVideo(Base):
     """竞品视频表 - 核心数据表"""
     __tablename__ = 'competitor_videos'
+    __table_args__ = (
+        Index('idx_cv_published_at', 'published_at'),
+        Index('idx_cv_channel_id', 'channel_id'),
+        Index('idx_cv_theme_views', 'theme', 'view_count'),
+        # 游标分页索引（与 CompetitorVideoRepository.SORT_KEYS 的表达式一致）
+        Index('idx_cv_keyset_views', text('COALESCE(view_count, 0) DESC'), text('id DESC')),
+        Index('idx_cv_theme_keyset_views', 'theme', text('COALESCE(view_count, 0) DESC'), text('id DESC')),
+        Index(
+            'idx_cv_theme_keyset_likes', 'theme',
+            text('COALESCE(like_count, 0) DESC'), text('COALESCE(view_count, 0) DESC'), text('id DESC'),
+        ),
+        Index(
+            'idx_cv_theme_keyset_date', 'theme', text('(published_at IS NULL)'), text('published_at DESC'),
+            text('COALESCE(view_count, 0) DESC'), text('id DESC'),
+        ),
+        # 频道分组键（与 aggregate_repo.CHANNEL_KEY_SQL 一致）
+        Index(
+            'idx_cv_channel_key',
+            text("(CASE WHEN channel_id IS NOT NULL AND channel_id NOT IN ('', 'None') "
+                 "THEN channel_id ELSE NULLIF(channel_name, '') END)"),
+        ),
+        # result_cache 数据库指纹
+        Index('idx_cv_updated_at', 'updated_at'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     youtube_id = Column(String(20), unique=True, nullable=False)
@@ -443,12 +468,26 @@ class NeonDatabase:
         logger.info(f"数据库类型: {'Neon PostgreSQL' if self.is_neon else 'SQLite'}")
 
     def _get_async_url(self) -> str:
-        """转换为异步连接 URL"""
+        """
+        转换为异步连接 URL
+
+        asyncpg 不认识 libpq 的 sslmode / channel_binding 参数（Neon 连接串默认带这两个），
+        sslmode 改为 asyncpg 的 ssl，channel_binding 去掉。
+        """
         if self.database_url.startswith('postgresql://'):
-            return self.database_url.replace('postgresql://', 'postgresql+asyncpg://')
+            url = self.database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
         elif self.database_url.startswith('postgres://'):
-            return self.database_url.replace('postgres://', 'postgresql+asyncpg://')
-        return self.database_url
+            url = self.database_url.replace('postgres://', 'postgresql+asyncpg://', 1)
+        else:
+            return self.database_url
+
+        parts = urlsplit(url)
+        query = [
+            ('ssl' if key == 'sslmode' else key, value)
+            for key, value in parse_qsl(parts.query)
+            if key != 'channel_binding'
+        ]
+        return urlunsplit(parts._replace(query=urlencode(query)))
 
     @property
     def sync_engine(self):
@@ -464,13 +503,30 @@ class NeonDatabase:
 
     @property
     def async_engine(self):
-        """获取异步引擎"""
+        """
+        获取异步引擎
+
+        Vercel 等无服务器环境每次调用都是新进程，使用 NullPool；
+        常驻进程（uvicorn）的并发请求共享一个小连接池，大小取 database.pool_* 配置。
+        """
         if self._async_engine is None:
             async_url = self._get_async_url()
+            if self.is_neon and not os.getenv('VERCEL'):
+                from .db_compat import get_pool_settings
+                settings = get_pool_settings()
+                pool_kwargs = {
+                    'pool_size': int(settings['pool_size']),
+                    'max_overflow': 0,
+                    'pool_timeout': float(settings['pool_timeout']),
+                    'pool_recycle': float(settings['pool_idle_timeout']),
+                    'pool_pre_ping': True,
+                }
+            else:
+                pool_kwargs = {'poolclass': NullPool if self.is_neon else None}
             self._async_engine = create_async_engine(
                 async_url,
-                poolclass=NullPool if self.is_neon else None,
-                echo=False
+                echo=False,
+                **pool_kwargs
             )
         return self._async_engine
 
@@ -526,9 +582,15 @@ class NeonDatabase:
         if self._sync_engine:
             self._sync_engine.dispose()
         if self._async_engine:
-            # 异步引擎需要在事件循环中关闭
+            # 异步引擎需要在事件循环中关闭（见 close_async）
             pass
 
+    async def close_async(self):
+        """关闭异步引擎的连接池"""
+        if self._async_engine:
+            await self._async_engine.dispose()
+            self._async_engine = None
+
 
 # ==================== 全局实例 ====================
 
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+阻塞任务卸载层
+
+分析类接口（SQL 查询、jieba 分词、networkx 计算）都是同步阻塞的，
+直接在事件循环里执行会卡住 WebSocket 心跳和任务状态轮询。
+
+本模块为每个接口提供独立的有界线程池：
+- 并发上限：每个接口最多同时运行 workers 个任务
+- 有界队列：排队任务超过 queue 个时直接拒绝（OffloadRejected → HTTP 503）
+- 指标：排队深度、运行数、等待耗时、拒绝次数
+
+配置（config.yaml 或环境变量）：
+    offload.<name>.workers   例如 YTP_OFFLOAD_ANALYZE_WORKERS=4
+    offload.<name>.queue     例如 YTP_OFFLOAD_ANALYZE_QUEUE=16
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+# 默认配额
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE = 8
+
+
+class OffloadRejected(Exception):
+    """线程池已满（运行中 + 排队中达到上限）"""
+
+    def __init__(self, name: str, queue_depth: int):
+        self.name = name
+        self.queue_depth = queue_depth
+        super().__init__(f"服务繁忙（{name} 排队 {queue_depth} 个任务），请稍后重试")
+
+
+class WorkerPool:
+    """单个接口的有界线程池"""
+
+    def __init__(self, name: str, workers: int = DEFAULT_WORKERS, queue: int = DEFAULT_QUEUE):
+        """
+        Args:
+            name: 池名称（用于线程名和指标）
+            workers: 最大并发数
+            queue: 最大排队数（超出即拒绝）
+        """
+        self.name = name
+        self.workers = max(1, int(workers))
+        self.queue = max(0, int(queue))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix=f"offload-{name}"
+        )
+        self._lock = threading.Lock()
+
+        # 指标
+        self._queued = 0
+        self._running = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_run = 0.0
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        在线程池中执行同步函数并等待结果
+
+        Raises:
+            OffloadRejected: 排队已满
+        """
+        with self._lock:
+            if self._queued + self._running >= self.workers + self.queue:
+                self._rejected += 1
+                raise OffloadRejected(self.name, self._queued)
+            self._queued += 1
+            self._submitted += 1
+
+        enqueued_at = time.monotonic()
+
+        def task():
+            started_at = time.monotonic()
+            wait = started_at - enqueued_at
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+            ok = False
+            try:
+                result = func(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._total_run += time.monotonic() - started_at
+                    if ok:
+                        self._completed += 1
+                    else:
+                        self._failed += 1
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, task)
+
+    def stats(self) -> Dict[str, Any]:
+        """当前指标快照"""
+        with self._lock:
+            started = self._completed + self._failed + self._running
+            finished = self._completed + self._failed
+            return {
+                "workers": self.workers,
+                "queue_limit": self.queue,
+                "queue_depth": self._queued,
+                "running": self._running,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._total_wait / started * 1000, 2) if started else 0,
+                "max_wait_ms": round(self._max_wait * 1000, 2),
+                "avg_run_ms": round(self._total_run / finished * 1000, 2) if finished else 0,
+            }
+
+
+_pools: Dict[str, WorkerPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name: str, workers: int = DEFAULT_WORKERS, queue: int = DEFAULT_QUEUE) -> WorkerPool:
+    """
+    获取（或创建）指定名称的线程池，配置项优先于传入的默认值
+
+    Args:
+        name: 池名称
+        workers: 默认并发数
+        queue: 默认排队上限
+    """
+    pool = _pools.get(name)
+    if pool is not None:
+        return pool
+
+    with _pools_lock:
+        if name not in _pools:
+            try:
+                from .config import get_config
+                config = get_config()
+                workers = config.get(f'offload.{name}.workers', workers)
+                queue = config.get(f'offload.{name}.queue', queue)
+            except Exception:
+                pass
+            _pools[name] = WorkerPool(name, workers, queue)
+        return _pools[name]
+
+
+def offloaded(name: str, workers: int = DEFAULT_WORKERS, queue: int = DEFAULT_QUEUE):
+    """
+    装饰器：把同步函数包装成在专属线程池执行的 async 函数
+
+    保留原函数签名（FastAPI 依赖 __wrapped__ 解析参数）。
+
+    用法：
+        @app.get("/api/analyze/{theme}")
+        @offloaded("analyze", workers=4)
+        def analyze_theme(theme: str): ...
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await get_pool(name, workers, queue).run(func, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_offload_stats() -> Dict[str, Dict[str, Any]]:
+    """所有线程池的指标"""
+    return {name: pool.stats() for name, pool in list(_pools.items())}
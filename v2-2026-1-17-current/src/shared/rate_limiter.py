@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+令牌桶限流器
+
+并发请求外部服务（YouTube）时，用一个进程内共享的令牌桶控制总请求速率，
+取代每个调用点各自 time.sleep 固定间隔：
+
+- 令牌以 rate 个/秒匀速补充，最多积累 burst 个；每个请求消耗一个令牌
+- 令牌不足时 acquire() 阻塞到下一个令牌可用，多个工作线程共享同一速率上限
+- 同名限流器在进程内只有一个实例，并发的多个采集任务合计不超过该速率
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class TokenBucket:
+    """令牌桶（线程安全）"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Args:
+            rate: 每秒补充的令牌数（即平均请求速率）；<= 0 表示不限速
+            burst: 最多积累的令牌数（允许的瞬时并发请求数），默认等于 max(1, rate)
+        """
+        self.rate = float(rate)
+        self.burst = float(burst) if burst is not None else max(1.0, self.rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        # 指标
+        self._acquired = 0
+        self._total_wait = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        取走令牌，不足时阻塞等待
+
+        Args:
+            tokens: 需要的令牌数
+
+        Returns:
+            等待的秒数
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    self._acquired += 1
+                    self._total_wait += waited
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def stats(self) -> Dict[str, Any]:
+        """限流器状态和等待指标"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "tokens": round(self._tokens, 2),
+                "acquired": self._acquired,
+                "avg_wait_ms": round(self._total_wait / self._acquired * 1000, 2) if self._acquired else 0,
+            }
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str, rate: float, burst: Optional[float] = None) -> TokenBucket:
+    """
+    获取进程级共享的限流器（同名只创建一次，之后的 rate / burst 参数被忽略）
+
+    Args:
+        name: 限流器名称（如 "youtube"）
+        rate: 每秒请求数
+        burst: 瞬时允许的请求数
+
+    Returns:
+        TokenBucket
+    """
+    limiter = _limiters.get(name)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(name)
+            if limiter is None:
+                limiter = _limiters[name] = TokenBucket(rate, burst)
+    return limiter
+
+
+def get_rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """各限流器的状态"""
+    return {name: limiter.stats() for name, limiter in list(_limiters.items())}
@@ -7,7 +7,14 @@ Repository 层
 """
 
 from .competitor_video_repo import CompetitorVideoRepository
+from .aggregate_repo import AggregateRepository
+from .async_repo import AsyncCompetitorVideoRepository, get_async_repository
+from .pagination import InvalidCursor
 
 __all__ = [
     "CompetitorVideoRepository",
+    "AggregateRepository",
+    "AsyncCompetitorVideoRepository",
+    "get_async_repository",
+    "InvalidCursor",
 ]
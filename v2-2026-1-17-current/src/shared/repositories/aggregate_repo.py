@@ -0,0 +1,638 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+物化聚合表 Repository
+
+/api/themes、/api/leaderboard、/api/arbitrage 以前每次调用都对整个 competitor_videos
+做 GROUP BY。这里维护一组聚合表，读接口只读聚合表，耗时不随视频表增长：
+
+- agg_theme          每个主题的视频数、播放/点赞/评论总数
+- agg_keyword        每个 keyword_source 的视频数、播放总数、频道数
+- agg_keyword_channel  keyword_source × 频道 的视频数（用于维护 agg_keyword.channel_count）
+- agg_channel        每个频道的视频数、有播放的视频数、播放总数、最高播放、最高订阅
+- agg_theme_month    主题 × 发布月份（YYYY-MM）的视频数、播放总数
+- agg_global         全库视频数、播放总数（单行）
+
+维护方式（由 CompetitorVideoRepository 在同一事务内调用）：
+0. lock() 先取得写锁，并发写入同一视频时两个事务的前后快照不会交错（否则两边都按"新视频"各加一次）
+1. 写入前 capture() 读取受影响视频的旧值
+2. 写入后再次 capture() 读取新值
+3. apply() 按 新值 - 旧值 对主题 / 关键词 / 月份 / 全局做增量 UPSERT；
+   频道的 MAX 类指标无法增量扣减，只对受影响的频道按索引重算
+
+聚合表损坏或与明细不一致时，用 rebuild() 全量重建；check() 只读对比明细与聚合表，发现漂移：
+    python src/cli.py research check-aggregates [--rebuild]
+    python src/cli.py research rebuild-aggregates
+
+频道分组口径与 CompetitorVideoRepository.CHANNEL_KEY_SQL 一致（有效 channel_id 优先，否则 channel_name）。
+"""
+
+import sqlite3
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from src.shared.db_compat import get_connection as db_get_connection, is_using_neon
+from src.shared.logger import setup_logger
+
+
+# 频道分组键（与 CompetitorVideoRepository.CHANNEL_KEY_SQL 相同）
+CHANNEL_KEY_SQL = (
+    "CASE WHEN channel_id IS NOT NULL AND channel_id NOT IN ('', 'None') "
+    "THEN channel_id ELSE NULLIF(channel_name, '') END"
+)
+
+# capture() 读取的列（顺序即元组下标）
+ROW_COLUMNS = (
+    "youtube_id", "theme", "keyword_source", "channel_id", "channel_name",
+    "view_count", "like_count", "comment_count", "subscriber_count", "published_at",
+)
+
+# IN 查询每批的参数个数（SQLite 变量上限）
+IN_BATCH = 500
+
+# PostgreSQL 维护聚合表的事务级咨询锁键（所有维护聚合表的写入串行执行）
+PG_LOCK_KEY = 0x79747061
+
+# 已确认建表的数据库（进程内只建一次）
+_ready_databases = set()
+_ready_lock = threading.Lock()
+
+
+def channel_key(channel_id: Optional[str], channel_name: Optional[str]) -> Optional[str]:
+    """频道分组键：有效 channel_id 优先，否则 channel_name"""
+    if channel_id and channel_id != 'None':
+        return channel_id
+    return channel_name or None
+
+
+def month_key(published_at) -> Optional[str]:
+    """发布月份（YYYY-MM）：SQLite 为 ISO 字符串，PostgreSQL 为 datetime"""
+    if not published_at:
+        return None
+    if isinstance(published_at, str):
+        return published_at[:7]
+    return published_at.strftime('%Y-%m')
+
+
+class AggregateRepository:
+    """物化聚合表的维护与读取"""
+
+    # 建表 SQL（SQLite 与 PostgreSQL 通用）
+    CREATE_TABLES_SQL = [
+        """
+        CREATE TABLE IF NOT EXISTS agg_theme (
+            theme TEXT PRIMARY KEY,
+            video_count BIGINT NOT NULL DEFAULT 0,
+            total_views BIGINT NOT NULL DEFAULT 0,
+            total_likes BIGINT NOT NULL DEFAULT 0,
+            total_comments BIGINT NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS agg_keyword (
+            keyword_source TEXT PRIMARY KEY,
+            video_count BIGINT NOT NULL DEFAULT 0,
+            total_views BIGINT NOT NULL DEFAULT 0,
+            channel_count BIGINT NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS agg_keyword_channel (
+            keyword_source TEXT NOT NULL,
+            channel_key TEXT NOT NULL,
+            video_count BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (keyword_source, channel_key)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS agg_channel (
+            channel_key TEXT PRIMARY KEY,
+            channel_id TEXT,
+            channel_name TEXT,
+            video_count BIGINT NOT NULL DEFAULT 0,
+            viewed_count BIGINT NOT NULL DEFAULT 0,
+            total_views BIGINT NOT NULL DEFAULT 0,
+            max_views BIGINT NOT NULL DEFAULT 0,
+            max_subscribers BIGINT NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS agg_theme_month (
+            theme TEXT NOT NULL,
+            month TEXT NOT NULL,
+            video_count BIGINT NOT NULL DEFAULT 0,
+            total_views BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (theme, month)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS agg_global (
+            id INTEGER PRIMARY KEY,
+            video_count BIGINT NOT NULL DEFAULT 0,
+            total_views BIGINT NOT NULL DEFAULT 0
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_agg_keyword_count ON agg_keyword(video_count DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_agg_channel_subs ON agg_channel(max_subscribers DESC)",
+    ]
+
+    # 频道聚合列（重算与全量重建共用）
+    _CHANNEL_COLUMNS = f"""
+        {CHANNEL_KEY_SQL} AS channel_key,
+        MAX(CASE WHEN channel_id IS NOT NULL AND channel_id NOT IN ('', 'None') THEN channel_id END) AS channel_id,
+        MAX(NULLIF(channel_name, '')) AS channel_name,
+        COUNT(*) AS video_count,
+        SUM(CASE WHEN view_count > 0 THEN 1 ELSE 0 END) AS viewed_count,
+        COALESCE(SUM(view_count), 0) AS total_views,
+        COALESCE(MAX(view_count), 0) AS max_views,
+        COALESCE(MAX(subscriber_count), 0) AS max_subscribers
+    """
+
+    TABLES = ("agg_theme", "agg_keyword", "agg_keyword_channel", "agg_channel", "agg_theme_month", "agg_global")
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        初始化 Repository（首次使用时建表，聚合表为空时从明细全量构建）
+
+        Args:
+            db_path: 数据库路径，默认 data/youtube_pipeline.db
+        """
+        self.logger = setup_logger('aggregate_repo')
+
+        if db_path is None:
+            db_path = Path("data/youtube_pipeline.db")
+        self.db_path = Path(db_path)
+
+        self._ensure_tables()
+
+    def _get_connection(self):
+        """获取数据库连接"""
+        return db_get_connection(str(self.db_path), row_factory=sqlite3.Row)
+
+    def _ensure_tables(self):
+        """
+        建表并检查聚合表（每个数据库每进程一次）
+
+        聚合表从未构建过，或 agg_global 的视频数 / 播放总数与明细不一致
+        （例如有程序绕过 Repository 直接写表）时，执行一次全量重建。
+        """
+        key = 'neon' if is_using_neon() else str(self.db_path.resolve())
+        if key in _ready_databases:
+            return
+        with _ready_lock:
+            if key in _ready_databases:
+                return
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                for sql in self.CREATE_TABLES_SQL:
+                    cursor.execute(sql)
+                cursor.execute("SELECT video_count, total_views FROM agg_global WHERE id = 1")
+                stored = cursor.fetchone()
+                cursor.execute("SELECT COUNT(*), COALESCE(SUM(view_count), 0) FROM competitor_videos")
+                actual = tuple(cursor.fetchone())
+                conn.commit()
+            if stored is None:
+                self.rebuild()
+            elif tuple(stored) != actual:
+                self.logger.warning(f"聚合表与明细不一致 (视频数, 播放总数): {tuple(stored)} != {actual}，全量重建")
+                self.rebuild()
+            _ready_databases.add(key)
+
+    # ============================================================
+    # 写入维护（调用方传入自己事务中的 cursor）
+    # ============================================================
+
+    @staticmethod
+    def lock(conn, cursor):
+        """
+        取得写锁（必须在写入前的 capture() 之前调用，锁随事务提交或回滚释放）
+
+        SQLite 的 SELECT 不会开启事务，PostgreSQL 默认 READ COMMITTED，
+        不加锁时两个事务可能都读到"视频不存在"，各自把同一视频计入聚合表一次。
+
+        - SQLite：BEGIN IMMEDIATE，数据库级写锁，其他写入者在 busy_timeout 内排队
+        - PostgreSQL：pg_advisory_xact_lock(PG_LOCK_KEY)
+
+        Args:
+            conn: 调用方的连接（尚未写入）
+            cursor: 该连接的 cursor
+        """
+        if is_using_neon():
+            cursor.execute("SELECT pg_advisory_xact_lock(?)", (PG_LOCK_KEY,))
+        elif not conn.in_transaction:
+            cursor.execute("BEGIN IMMEDIATE")
+
+    def capture(self, cursor, youtube_ids: Iterable[str]) -> Dict[str, tuple]:
+        """
+        读取视频的聚合相关列
+
+        Args:
+            cursor: 调用方事务中的 cursor
+            youtube_ids: YouTube ID 列表
+
+        Returns:
+            {youtube_id: 按 ROW_COLUMNS 排列的元组}
+        """
+        ids = list(dict.fromkeys(i for i in youtube_ids if i))
+        rows = {}
+        for start in range(0, len(ids), IN_BATCH):
+            batch = ids[start:start + IN_BATCH]
+            placeholders = ','.join('?' * len(batch))
+            cursor.execute(
+                f"SELECT {', '.join(ROW_COLUMNS)} FROM competitor_videos "
+                f"WHERE youtube_id IN ({placeholders})",
+                batch
+            )
+            for row in cursor.fetchall():
+                values = tuple(row[i] for i in range(len(ROW_COLUMNS)))
+                rows[values[0]] = values
+        return rows
+
+    def apply(self, cursor, before: Dict[str, tuple], after: Dict[str, tuple]):
+        """
+        按写入前后的差值更新聚合表
+
+        Args:
+            cursor: 调用方事务中的 cursor
+            before: 写入前 capture() 的结果
+            after: 写入后 capture() 的结果
+        """
+        themes = defaultdict(lambda: [0, 0, 0, 0])
+        keywords = defaultdict(lambda: [0, 0])
+        pairs = defaultdict(int)
+        months = defaultdict(lambda: [0, 0])
+        total = [0, 0]
+        channels = set()
+
+        def collect(row: tuple, sign: int):
+            _, theme, keyword, channel_id, channel_name, views, likes, comments, _, published_at = row
+            views, likes, comments = views or 0, likes or 0, comments or 0
+            key = channel_key(channel_id, channel_name)
+
+            total[0] += sign
+            total[1] += sign * views
+            if theme is not None:
+                delta = themes[theme]
+                delta[0] += sign
+                delta[1] += sign * views
+                delta[2] += sign * likes
+                delta[3] += sign * comments
+                month = month_key(published_at)
+                if month:
+                    delta = months[(theme, month)]
+                    delta[0] += sign
+                    delta[1] += sign * views
+            if keyword:
+                delta = keywords[keyword]
+                delta[0] += sign
+                delta[1] += sign * views
+                if key:
+                    pairs[(keyword, key)] += sign
+            if key:
+                channels.add(key)
+
+        # 聚合列未变化的视频（例如只更新了描述）不参与计算
+        for youtube_id, row in before.items():
+            if after.get(youtube_id) != row:
+                collect(row, -1)
+        for youtube_id, row in after.items():
+            if before.get(youtube_id) != row:
+                collect(row, 1)
+
+        themes = {k: v for k, v in themes.items() if any(v)}
+        keywords = {k: v for k, v in keywords.items() if any(v)}
+        pairs = {k: v for k, v in pairs.items() if v}
+        months = {k: v for k, v in months.items() if any(v)}
+
+        if any(total):
+            cursor.execute("""
+                INSERT INTO agg_global (id, video_count, total_views) VALUES (1, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    video_count = agg_global.video_count + excluded.video_count,
+                    total_views = agg_global.total_views + excluded.total_views
+            """, total)
+
+        if themes:
+            cursor.executemany("""
+                INSERT INTO agg_theme (theme, video_count, total_views, total_likes, total_comments)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (theme) DO UPDATE SET
+                    video_count = agg_theme.video_count + excluded.video_count,
+                    total_views = agg_theme.total_views + excluded.total_views,
+                    total_likes = agg_theme.total_likes + excluded.total_likes,
+                    total_comments = agg_theme.total_comments + excluded.total_comments
+            """, [(k, *v) for k, v in themes.items()])
+            cursor.executemany(
+                "DELETE FROM agg_theme WHERE theme = ? AND video_count <= 0",
+                [(k,) for k in themes]
+            )
+
+        if months:
+            cursor.executemany("""
+                INSERT INTO agg_theme_month (theme, month, video_count, total_views)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (theme, month) DO UPDATE SET
+                    video_count = agg_theme_month.video_count + excluded.video_count,
+                    total_views = agg_theme_month.total_views + excluded.total_views
+            """, [(*k, *v) for k, v in months.items()])
+            cursor.executemany(
+                "DELETE FROM agg_theme_month WHERE theme = ? AND month = ? AND video_count <= 0",
+                list(months)
+            )
+
+        if pairs:
+            cursor.executemany("""
+                INSERT INTO agg_keyword_channel (keyword_source, channel_key, video_count)
+                VALUES (?, ?, ?)
+                ON CONFLICT (keyword_source, channel_key) DO UPDATE SET
+                    video_count = agg_keyword_channel.video_count + excluded.video_count
+            """, [(*k, v) for k, v in pairs.items()])
+            cursor.executemany(
+                "DELETE FROM agg_keyword_channel WHERE keyword_source = ? AND channel_key = ? AND video_count <= 0",
+                list(pairs)
+            )
+
+        if keywords or pairs:
+            affected = set(keywords) | {k for k, _ in pairs}
+            cursor.executemany("""
+                INSERT INTO agg_keyword (keyword_source, video_count, total_views)
+                VALUES (?, ?, ?)
+                ON CONFLICT (keyword_source) DO UPDATE SET
+                    video_count = agg_keyword.video_count + excluded.video_count,
+                    total_views = agg_keyword.total_views + excluded.total_views
+            """, [(k, *keywords.get(k, (0, 0))) for k in affected])
+            cursor.executemany("""
+                UPDATE agg_keyword SET channel_count = (
+                    SELECT COUNT(*) FROM agg_keyword_channel p
+                    WHERE p.keyword_source = agg_keyword.keyword_source
+                )
+                WHERE keyword_source = ?
+            """, [(k,) for k in affected])
+            cursor.executemany(
+                "DELETE FROM agg_keyword WHERE keyword_source = ? AND video_count <= 0",
+                [(k,) for k in affected]
+            )
+
+        if channels:
+            self._refresh_channels(cursor, channels)
+
+    def _refresh_channels(self, cursor, keys: set):
+        """
+        重算指定频道的聚合行（MAX 类指标无法增量扣减）
+
+        按频道分组键查询，走表达式索引 idx_cv_channel_key（SQLite 迁移 4 / PostgreSQL 启动时补建），
+        耗时只与这些频道的视频数有关，不随整表增长。
+        """
+        keys = list(keys)
+        for start in range(0, len(keys), IN_BATCH):
+            batch = keys[start:start + IN_BATCH]
+            placeholders = ','.join('?' * len(batch))
+            cursor.execute(f"""
+                SELECT {self._CHANNEL_COLUMNS}
+                FROM competitor_videos
+                WHERE {CHANNEL_KEY_SQL} IN ({placeholders})
+                GROUP BY {CHANNEL_KEY_SQL}
+            """, batch)
+
+            rows = [tuple(row) for row in cursor.fetchall()]
+            cursor.executemany(
+                "DELETE FROM agg_channel WHERE channel_key = ?",
+                [(k,) for k in batch]
+            )
+            if rows:
+                cursor.executemany(
+                    "INSERT INTO agg_channel (channel_key, channel_id, channel_name, video_count, "
+                    "viewed_count, total_views, max_views, max_subscribers) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+
+    # ============================================================
+    # 全量重建
+    # ============================================================
+
+    def rebuild(self) -> Dict[str, int]:
+        """
+        从 competitor_videos 全量重建所有聚合表（单个事务）
+
+        Returns:
+            {表名: 行数}
+        """
+        month_sql = (
+            "to_char(published_at, 'YYYY-MM')" if is_using_neon()
+            else "substr(published_at, 1, 7)"
+        )
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            self.lock(conn, cursor)
+            for table in self.TABLES:
+                cursor.execute(f"DELETE FROM {table}")
+
+            cursor.execute("""
+                INSERT INTO agg_global (id, video_count, total_views)
+                SELECT 1, COUNT(*), COALESCE(SUM(view_count), 0) FROM competitor_videos
+            """)
+            cursor.execute("""
+                INSERT INTO agg_theme (theme, video_count, total_views, total_likes, total_comments)
+                SELECT theme, COUNT(*), COALESCE(SUM(view_count), 0),
+                       COALESCE(SUM(like_count), 0), COALESCE(SUM(comment_count), 0)
+                FROM competitor_videos
+                WHERE theme IS NOT NULL
+                GROUP BY theme
+            """)
+            cursor.execute(f"""
+                INSERT INTO agg_theme_month (theme, month, video_count, total_views)
+                SELECT theme, {month_sql}, COUNT(*), COALESCE(SUM(view_count), 0)
+                FROM competitor_videos
+                WHERE theme IS NOT NULL AND published_at IS NOT NULL
+                GROUP BY theme, {month_sql}
+            """)
+            cursor.execute(f"""
+                INSERT INTO agg_keyword_channel (keyword_source, channel_key, video_count)
+                SELECT keyword_source, {CHANNEL_KEY_SQL}, COUNT(*)
+                FROM competitor_videos
+                WHERE keyword_source IS NOT NULL AND keyword_source != ''
+                  AND {CHANNEL_KEY_SQL} IS NOT NULL
+                GROUP BY keyword_source, {CHANNEL_KEY_SQL}
+            """)
+            cursor.execute("""
+                INSERT INTO agg_keyword (keyword_source, video_count, total_views, channel_count)
+                SELECT keyword_source, COUNT(*), COALESCE(SUM(view_count), 0),
+                       (SELECT COUNT(*) FROM agg_keyword_channel p
+                        WHERE p.keyword_source = competitor_videos.keyword_source)
+                FROM competitor_videos
+                WHERE keyword_source IS NOT NULL AND keyword_source != ''
+                GROUP BY keyword_source
+            """)
+            cursor.execute(f"""
+                INSERT INTO agg_channel (channel_key, channel_id, channel_name, video_count,
+                                         viewed_count, total_views, max_views, max_subscribers)
+                SELECT {self._CHANNEL_COLUMNS}
+                FROM competitor_videos
+                WHERE {CHANNEL_KEY_SQL} IS NOT NULL
+                GROUP BY {CHANNEL_KEY_SQL}
+            """)
+
+            counts = {}
+            for table in self.TABLES:
+                cursor.execute(f"SELECT COUNT(*) FROM {table}")
+                counts[table] = cursor.fetchone()[0]
+            conn.commit()
+
+        self.logger.info(f"聚合表重建完成: {counts}")
+        return counts
+
+    # 一致性检查：{表: (明细重算 SQL, 聚合表 SQL)}，两边都返回 (键, 指标...)
+    CHECK_SQL = {
+        "agg_global": (
+            "SELECT 1, COUNT(*), COALESCE(SUM(view_count), 0) FROM competitor_videos",
+            "SELECT id, video_count, total_views FROM agg_global",
+        ),
+        "agg_theme": (
+            """
+            SELECT theme, COUNT(*), COALESCE(SUM(view_count), 0),
+                   COALESCE(SUM(like_count), 0), COALESCE(SUM(comment_count), 0)
+            FROM competitor_videos WHERE theme IS NOT NULL GROUP BY theme
+            """,
+            "SELECT theme, video_count, total_views, total_likes, total_comments FROM agg_theme",
+        ),
+        "agg_keyword": (
+            """
+            SELECT keyword_source, COUNT(*), COALESCE(SUM(view_count), 0)
+            FROM competitor_videos WHERE keyword_source IS NOT NULL AND keyword_source != ''
+            GROUP BY keyword_source
+            """,
+            "SELECT keyword_source, video_count, total_views FROM agg_keyword",
+        ),
+        "agg_channel": (
+            f"""
+            SELECT {CHANNEL_KEY_SQL}, COUNT(*), COALESCE(SUM(view_count), 0),
+                   COALESCE(MAX(view_count), 0), COALESCE(MAX(subscriber_count), 0)
+            FROM competitor_videos WHERE {CHANNEL_KEY_SQL} IS NOT NULL GROUP BY {CHANNEL_KEY_SQL}
+            """,
+            "SELECT channel_key, video_count, total_views, max_views, max_subscribers FROM agg_channel",
+        ),
+    }
+
+    def check(self) -> Dict[str, int]:
+        """
+        对比明细重算结果与聚合表（只读，不修改数据）
+
+        绕过 Repository 直接写 competitor_videos 的程序会让聚合表漂移，
+        发现不一致时用 rebuild() 修复。
+
+        Returns:
+            {表名: 不一致的行数}，全部为 0 表示一致
+        """
+        mismatches = {}
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            for table, (expected_sql, actual_sql) in self.CHECK_SQL.items():
+                cursor.execute(expected_sql)
+                expected = {row[0]: tuple(row[1:]) for row in cursor.fetchall()}
+                cursor.execute(actual_sql)
+                actual = {row[0]: tuple(row[1:]) for row in cursor.fetchall()}
+                mismatches[table] = sum(
+                    1 for key in expected.keys() | actual.keys()
+                    if expected.get(key) != actual.get(key)
+                )
+
+        if any(mismatches.values()):
+            self.logger.warning(f"聚合表与明细不一致: {mismatches}")
+        return mismatches
+
+    # ============================================================
+    # 读取
+    # ============================================================
+
+    def _query(self, sql: str, params: tuple = ()) -> List[dict]:
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            return [dict(zip(row.keys(), row)) for row in cursor.fetchall()]
+
+    def themes(self) -> List[dict]:
+        """主题列表（按视频数降序）: [{theme, video_count, total_views, total_likes, total_comments}]"""
+        return self._query("SELECT * FROM agg_theme ORDER BY video_count DESC")
+
+    def theme_months(self, theme: str) -> List[dict]:
+        """主题按发布月份的分布（按月份升序）: [{month, video_count, total_views}]"""
+        return self._query(
+            "SELECT month, video_count, total_views FROM agg_theme_month WHERE theme = ? ORDER BY month",
+            (theme,)
+        )
+
+    def top_keywords(self, limit: int = 10) -> List[dict]:
+        """热门关键词（按视频数、播放量降序）: [{keyword_source, video_count, total_views, channel_count}]"""
+        return self._query(
+            "SELECT * FROM agg_keyword ORDER BY video_count DESC, total_views DESC LIMIT ?",
+            (limit,)
+        )
+
+    def dark_horse_channels(self, limit: int = 50, min_videos: int = 2) -> List[dict]:
+        """
+        黑马频道：平均播放量 / max(订阅数, 1000)
+
+        Args:
+            limit: 返回数量
+            min_videos: 有播放的视频数下限
+
+        Returns:
+            [{channel_key, channel_id, channel_name, video_count, avg_views, max_views,
+              total_views, subscriber_count, dark_horse_score}]
+        """
+        return self._query("""
+            SELECT channel_key, channel_id, channel_name,
+                   viewed_count AS video_count,
+                   total_views * 1.0 / viewed_count AS avg_views,
+                   max_views, total_views,
+                   max_subscribers AS subscriber_count,
+                   total_views * 1.0 / viewed_count
+                       / (CASE WHEN max_subscribers > 1000 THEN max_subscribers ELSE 1000 END)
+                       AS dark_horse_score
+            FROM agg_channel
+            WHERE channel_name IS NOT NULL
+              AND viewed_count >= ?
+              AND max_subscribers > 0
+            ORDER BY dark_horse_score DESC
+            LIMIT ?
+        """, (min_videos, limit))
+
+    def top_channels_by_subscribers(self, limit: int = 50) -> List[dict]:
+        """
+        订阅数最高的频道
+
+        Returns:
+            [{channel_key, channel_id, channel_name, video_count, avg_views, total_views, subscriber_count}]
+        """
+        return self._query("""
+            SELECT channel_key, channel_id, channel_name, video_count,
+                   total_views * 1.0 / video_count AS avg_views,
+                   total_views,
+                   max_subscribers AS subscriber_count
+            FROM agg_channel
+            WHERE channel_name IS NOT NULL AND max_subscribers > 0
+            ORDER BY max_subscribers DESC
+            LIMIT ?
+        """, (limit,))
+
+    def global_stats(self) -> dict:
+        """全库概览: {total_videos, total_channels, total_views}"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT video_count, total_views FROM agg_global WHERE id = 1")
+            row = cursor.fetchone()
+            cursor.execute("SELECT COUNT(*) FROM agg_channel")
+            channel_count = cursor.fetchone()[0]
+        return {
+            "total_videos": row[0] if row else 0,
+            "total_channels": channel_count or 0,
+            "total_views": row[1] if row else 0,
+        }
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+异步 Repository（FastAPI 的 async 接口直接 await，不阻塞事件循环）
+
+同步 Repository 经 db_compat 阻塞执行，在 async 接口里调用会卡住事件循环上的其他请求。
+这里提供对应的异步只读查询：
+- AsyncCompetitorVideoRepository：筛选 / 排序 / 投影与 CompetitorVideoRepository 一致
+- AsyncChannelRepository：channels 表、频道的视频列表
+- AsyncCommentRepository：video_comments 表
+
+执行器（每个数据库一个，进程内共享）：
+- PostgreSQL：NeonDatabase.async_engine（asyncpg）
+- SQLite：sqlite+aiosqlite 的 AsyncEngine，新连接应用 sqlite_tuning 的 PRAGMA
+连接池大小取 database.pool_*，大量并发的看板请求共用少量连接。
+
+SQL 与同步 Repository 写法相同（? 占位符），执行前改写为命名参数。
+sqlalchemy / aiosqlite / asyncpg 未安装时，查询改为在线程中用 db_compat 同步执行，调用方照常 await。
+"""
+
+import asyncio
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from src.shared.db_compat import get_connection as db_get_connection, get_pool_settings, is_using_neon
+from src.shared.logger import setup_logger
+from src.shared.models import CompetitorVideo, VideoRecord
+from src.shared.sqlite_tuning import PRAGMAS
+from .competitor_video_repo import CompetitorVideoRepository
+
+logger = setup_logger('async_repo')
+
+DEFAULT_DB_PATH = "data/youtube_pipeline.db"
+
+# channels 表读取的列
+CHANNEL_COLUMNS = (
+    "channel_id", "channel_name", "handle", "subscriber_count", "video_count",
+    "total_views", "country", "description", "created_at", "canonical_url",
+)
+
+# video_comments 表读取的列
+COMMENT_COLUMNS = (
+    "comment_id", "text", "author", "author_id", "like_count", "reply_count",
+    "is_pinned", "is_favorited", "published_at",
+)
+
+
+@lru_cache(maxsize=1024)
+def _to_named(sql: str) -> str:
+    """
+    ? 占位符改写为 :p0, :p1 ...（按语句文本缓存）
+
+    字符串内的 ? 保持不变；其余冒号（包括字符串内的）转义为 \\:，避免被 text() 当作参数。
+    """
+    result = []
+    index = 0
+    quote = None
+    for ch in sql:
+        if ch == ':':
+            result.append('\\:')
+        elif quote is not None:
+            result.append(ch)
+            if ch == quote:
+                quote = None
+        elif ch in ("'", '"'):
+            quote = ch
+            result.append(ch)
+        elif ch == '?':
+            result.append(f':p{index}')
+            index += 1
+        else:
+            result.append(ch)
+    return ''.join(result)
+
+
+@lru_cache(maxsize=1024)
+def _statement(sql: str):
+    """SQL 文本 -> 可复用的 TextClause"""
+    from sqlalchemy import text
+    return text(_to_named(sql))
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """aiosqlite 新连接应用与同步连接相同的 PRAGMA（WAL 已由同步初始化写入数据库文件）"""
+    cursor = dbapi_connection.cursor()
+    for name, value in PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+class AsyncDatabase:
+    """一个数据库的异步查询执行器"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Args:
+            db_path: SQLite 数据库路径（PostgreSQL 模式下忽略）
+        """
+        self.db_path = None if is_using_neon() else str(db_path or DEFAULT_DB_PATH)
+        self.engine = self._create_engine()
+
+    @property
+    def backend(self) -> str:
+        if self.engine is None:
+            return "thread"
+        return "asyncpg" if self.db_path is None else "aiosqlite"
+
+    def _create_engine(self):
+        """创建 AsyncEngine（驱动未安装时返回 None，查询回退到线程）"""
+        try:
+            if self.db_path is None:
+                from src.shared.neon_database import get_neon_database
+                return get_neon_database().async_engine
+
+            import aiosqlite  # noqa: F401  只检查驱动是否可用
+            from sqlalchemy import event
+            from sqlalchemy.ext.asyncio import create_async_engine
+
+            settings = get_pool_settings()
+            engine = create_async_engine(
+                f"sqlite+aiosqlite:///{Path(self.db_path).resolve()}",
+                pool_size=int(settings['pool_size']),
+                max_overflow=0,
+                pool_timeout=float(settings['pool_timeout']),
+            )
+            event.listen(engine.sync_engine, "connect", _apply_sqlite_pragmas)
+            return engine
+        except ImportError as e:
+            logger.warning(f"异步数据库驱动不可用，查询改在线程中执行: {e}")
+            return None
+
+    async def fetch(self, sql: str, params: Sequence = ()) -> Tuple[List[str], List[tuple]]:
+        """
+        执行查询
+
+        Args:
+            sql: 查询语句（? 占位符）
+            params: 参数
+
+        Returns:
+            (列名列表, 行元组列表)
+        """
+        if self.engine is None:
+            return await asyncio.to_thread(self._fetch_sync, sql, params)
+
+        binds = {f"p{i}": value for i, value in enumerate(params)}
+        async with self.engine.connect() as conn:
+            result = await conn.execute(_statement(sql), binds)
+            return list(result.keys()), [tuple(row) for row in result.all()]
+
+    def _fetch_sync(self, sql: str, params: Sequence) -> Tuple[List[str], List[tuple]]:
+        with db_get_connection(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, list(params))
+            rows = [tuple(row) for row in cursor.fetchall()]
+            return [column[0] for column in cursor.description], rows
+
+    async def fetch_dicts(self, sql: str, params: Sequence = ()) -> List[Dict[str, Any]]:
+        """执行查询，每行转为 {列名: 值}"""
+        keys, rows = await self.fetch(sql, params)
+        return [dict(zip(keys, row)) for row in rows]
+
+    async def fetch_one(self, sql: str, params: Sequence = ()) -> Optional[Dict[str, Any]]:
+        """执行查询，返回第一行（没有结果时为 None）"""
+        rows = await self.fetch_dicts(sql, params)
+        return rows[0] if rows else None
+
+    async def dispose(self):
+        """关闭连接池"""
+        if self.engine is not None:
+            await self.engine.dispose()
+
+    def stats(self) -> Dict[str, Any]:
+        """执行器状态（排查用）"""
+        return {
+            "backend": self.backend,
+            "pool": self.engine.pool.status() if self.engine is not None else None,
+        }
+
+
+_databases: Dict[str, AsyncDatabase] = {}
+_databases_lock = threading.Lock()
+
+
+def _database_key(db_path: Optional[str]) -> str:
+    return 'neon' if is_using_neon() else str(Path(db_path or DEFAULT_DB_PATH).resolve())
+
+
+def get_async_database(db_path: Optional[str] = None) -> AsyncDatabase:
+    """获取进程级共享的异步执行器（每个数据库一个）"""
+    key = _database_key(db_path)
+    database = _databases.get(key)
+    if database is None:
+        with _databases_lock:
+            database = _databases.get(key)
+            if database is None:
+                database = _databases[key] = AsyncDatabase(db_path)
+    return database
+
+
+async def dispose_async_databases():
+    """关闭所有异步执行器的连接池（应用关闭时调用）"""
+    with _repositories_lock:
+        _repositories.clear()
+    with _databases_lock:
+        databases = list(_databases.values())
+        _databases.clear()
+    for database in databases:
+        await database.dispose()
+
+
+def get_async_stats() -> Dict[str, Any]:
+    """各数据库异步执行器的状态"""
+    return {key: database.stats() for key, database in list(_databases.items())}
+
+
+# ============================================================
+# Repository
+# ============================================================
+
+class AsyncChannelRepository:
+    """频道查询（异步）"""
+
+    def __init__(self, db: AsyncDatabase):
+        self.db = db
+
+    async def get(self, channel_id: str) -> Optional[Dict[str, Any]]:
+        """
+        channels 表中的频道信息
+
+        Args:
+            channel_id: 频道 ID
+
+        Returns:
+            {CHANNEL_COLUMNS 各列} 或 None
+        """
+        return await self.db.fetch_one(
+            f"SELECT {', '.join(CHANNEL_COLUMNS)} FROM channels WHERE channel_id = ?",
+            (channel_id,)
+        )
+
+    async def videos(
+        self,
+        channel_id: str,
+        columns: Sequence[str] = ("youtube_id", "title", "view_count", "like_count", "published_at"),
+        limit: int = 50,
+    ) -> List[VideoRecord]:
+        """
+        频道的视频（按播放量降序；channel_id 为空的旧数据按同名频道匹配，与频道详情口径一致）
+
+        Args:
+            channel_id: 频道 ID
+            columns: 读取的列（取自 CompetitorVideoRepository.COLUMNS）
+            limit: 返回数量
+
+        Returns:
+            VideoRecord 列表
+        """
+        columns = CompetitorVideoRepository._check_columns(dict.fromkeys(columns))
+        _, rows = await self.db.fetch(f"""
+            SELECT {', '.join(columns)} FROM competitor_videos
+            WHERE channel_id = ? OR channel_name = (
+                SELECT channel_name FROM competitor_videos WHERE channel_id = ? LIMIT 1
+            )
+            ORDER BY view_count DESC
+            LIMIT ?
+        """, (channel_id, channel_id, limit))
+        record_type = VideoRecord.for_columns(columns)
+        return [record_type(row) for row in rows]
+
+
+class AsyncCommentRepository:
+    """评论查询（异步）"""
+
+    def __init__(self, db: AsyncDatabase):
+        self.db = db
+
+    async def find_by_video(self, youtube_id: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        视频的评论（按点赞数降序）
+
+        Args:
+            youtube_id: YouTube 视频 ID
+            limit: 返回数量
+
+        Returns:
+            [{COMMENT_COLUMNS 各列}]
+        """
+        return await self.db.fetch_dicts(f"""
+            SELECT {', '.join(COMMENT_COLUMNS)} FROM video_comments
+            WHERE youtube_id = ? AND text IS NOT NULL
+            ORDER BY like_count DESC
+            LIMIT ?
+        """, (youtube_id, limit))
+
+    async def count(self, youtube_id: Optional[str] = None) -> int:
+        """评论数（不传 youtube_id 时为全部评论）"""
+        if youtube_id:
+            row = await self.db.fetch_one(
+                "SELECT COUNT(*) AS count FROM video_comments WHERE youtube_id = ?", (youtube_id,)
+            )
+        else:
+            row = await self.db.fetch_one("SELECT COUNT(*) AS count FROM video_comments")
+        return row['count'] if row else 0
+
+
+class AsyncCompetitorVideoRepository:
+    """CompetitorVideoRepository 的异步版本（只读查询）"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Args:
+            db_path: 数据库路径，默认 data/youtube_pipeline.db
+        """
+        # 同步 Repository 负责建表和索引迁移，并提供共用的 WHERE 构建、排序子句和行转换
+        self.sync = CompetitorVideoRepository(db_path)
+        self.db = get_async_database(str(self.sync.db_path))
+        self.channels = AsyncChannelRepository(self.db)
+        self.comments = AsyncCommentRepository(self.db)
+
+    async def find_by_youtube_id(self, youtube_id: str) -> Optional[CompetitorVideo]:
+        """根据 YouTube ID 查找视频"""
+        row = await self.db.fetch_one(
+            "SELECT * FROM competitor_videos WHERE youtube_id = ?", (youtube_id,)
+        )
+        return self.sync._row_to_model(row) if row else None
+
+    async def find_all(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        sort_by: str = "views",
+        columns: Optional[Sequence[str]] = None,
+        **filters,
+    ):
+        """
+        查询视频列表（参数同 CompetitorVideoRepository.find_all）
+
+        Args:
+            limit: 返回数量限制
+            offset: 偏移量
+            sort_by: 排序方式 (views/likes/date/engagement)
+            columns: 只读取这些列，返回 VideoRecord；不传时返回 CompetitorVideo
+            **filters: 传给 _build_where 的筛选条件（theme / keyword_like / min_views / published_from 等）
+
+        Returns:
+            CompetitorVideo 列表（传 columns 时为 VideoRecord 列表）
+        """
+        where_clause, params = self.sync._build_where(**filters)
+        order_clause = self.sync.SORT_CLAUSES.get(sort_by, self.sync.SORT_CLAUSES["views"])
+        params.extend([limit, offset])
+
+        if columns is None:
+            rows = await self.db.fetch_dicts(f"""
+                SELECT * FROM competitor_videos
+                WHERE {where_clause}
+                ORDER BY {order_clause}
+                LIMIT ? OFFSET ?
+            """, params)
+            return [self.sync._row_to_model(row) for row in rows]
+
+        columns = self.sync._check_columns(dict.fromkeys(columns))
+        _, rows = await self.db.fetch(f"""
+            SELECT {', '.join(columns)} FROM competitor_videos
+            WHERE {where_clause}
+            ORDER BY {order_clause}
+            LIMIT ? OFFSET ?
+        """, params)
+        record_type = VideoRecord.for_columns(columns)
+        return [record_type(row) for row in rows]
+
+    async def find_page(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        sort_by: str = "views",
+        columns: Optional[Sequence[str]] = None,
+        **filters,
+    ):
+        """
+        游标分页查询（参数同 CompetitorVideoRepository.find_page）
+
+        Returns:
+            (本页视频列表, 下一页游标；没有下一页时为 None)
+
+        Raises:
+            InvalidCursor: 游标无法解析，或与排序方式 / 筛选条件不匹配
+        """
+        sql, params = self.sync._page_query(limit, cursor, sort_by, columns, filters)
+        names, rows = await self.db.fetch(sql, params)
+        return self.sync._page_result(names, rows, limit, sort_by, columns, filters)
+
+    async def count(self, keyword: Optional[str] = None) -> int:
+        """统计视频数量（可按关键词筛选）"""
+        if keyword:
+            row = await self.db.fetch_one(
+                "SELECT COUNT(*) AS count FROM competitor_videos WHERE keyword_source = ?", (keyword,)
+            )
+        else:
+            row = await self.db.fetch_one("SELECT COUNT(*) AS count FROM competitor_videos")
+        return row['count'] if row else 0
+
+    async def get_statistics(self, keyword: Optional[str] = None) -> dict:
+        """获取统计信息（同 CompetitorVideoRepository.get_statistics，两条查询并发执行）"""
+        where_clause, params = self.sync._statistics_where(keyword)
+        row, pattern_rows = await asyncio.gather(
+            self.db.fetch_one(self.sync.STATISTICS_SQL.format(where=where_clause), params),
+            self.db.fetch_dicts(self.sync.PATTERN_DISTRIBUTION_SQL.format(where=where_clause), params),
+        )
+        return self.sync._format_statistics(row, pattern_rows)
+
+    async def themes(self) -> List[Dict[str, Any]]:
+        """主题列表（物化聚合表 agg_theme，按视频数降序）"""
+        return await self.db.fetch_dicts("SELECT * FROM agg_theme ORDER BY video_count DESC")
+
+
+_repositories: Dict[str, AsyncCompetitorVideoRepository] = {}
+_repositories_lock = threading.Lock()
+
+
+def get_async_repository(db_path: Optional[str] = None) -> AsyncCompetitorVideoRepository:
+    """获取进程级共享的异步 Repository（每个数据库一个，首次获取时初始化表结构）"""
+    key = _database_key(db_path)
+    repo = _repositories.get(key)
+    if repo is None:
+        with _repositories_lock:
+            repo = _repositories.get(key)
+            if repo is None:
+                repo = _repositories[key] = AsyncCompetitorVideoRepository(db_path)
+    return repo
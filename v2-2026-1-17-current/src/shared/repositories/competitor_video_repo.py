@@ -11,9 +11,11 @@ CompetitorVideo Repository
 
 import json
 import sqlite3
-from src.shared.db_compat import get_connection as db_get_connection, is_using_neon
-from typing import List, Optional, Tuple
+import threading
+from src.shared.db_compat import FETCH_BATCH_ROWS, get_connection as db_get_connection, is_using_neon, iter_batches
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 from pathlib import Path
+from collections import defaultdict
 from datetime import datetime
 import sys
 
@@ -21,7 +23,17 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from src.shared.logger import setup_logger
-from src.shared.models import CompetitorVideo, PatternType
+from src.shared.models import CompetitorVideo, PatternType, VideoRecord
+from src.shared.models.base import parse_datetime
+from src.shared.result_cache import mark_data_changed
+from src.shared.sqlite_tuning import connect as sqlite_connect, ensure_migrated
+from .aggregate_repo import AggregateRepository, CHANNEL_KEY_SQL
+from .pagination import decode_cursor, encode_cursor, filters_fingerprint, keyset_condition, order_clause
+from .search_index import get_search_index
+
+# PostgreSQL 索引已确认存在（进程内只检查一次）
+_pg_indexes_ready = False
+_pg_indexes_lock = threading.Lock()
 
 
 class CompetitorVideoRepository:
@@ -53,6 +65,7 @@ class CompetitorVideoRepository:
         channel_id TEXT,
         thumbnail_url TEXT,
         category TEXT,
+        subscriber_count INTEGER,
 
         -- 调研相关
         theme TEXT,
@@ -72,8 +85,66 @@ class CompetitorVideoRepository:
         "CREATE INDEX IF NOT EXISTS idx_cv_keyword ON competitor_videos(keyword_source)",
         "CREATE INDEX IF NOT EXISTS idx_cv_pattern ON competitor_videos(pattern_type)",
         "CREATE INDEX IF NOT EXISTS idx_cv_view_count ON competitor_videos(view_count DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_cv_published_at ON competitor_videos(published_at)",
+        "CREATE INDEX IF NOT EXISTS idx_cv_channel_id ON competitor_videos(channel_id)",
+        "CREATE INDEX IF NOT EXISTS idx_cv_theme_views ON competitor_videos(theme, view_count DESC)",
+    ]
+
+    # PostgreSQL 索引（与 sqlite_tuning 迁移 1 / 3 / 4 / 5 及 neon_database 的 ORM 定义一致）
+    # ORM 的 create_all 只为新建的表建索引，已有的 Neon 库在启动时按 IF NOT EXISTS 补齐
+    PG_INDEXES_SQL = [
+        "CREATE INDEX IF NOT EXISTS idx_cv_published_at ON competitor_videos(published_at)",
+        "CREATE INDEX IF NOT EXISTS idx_cv_channel_id ON competitor_videos(channel_id)",
+        "CREATE INDEX IF NOT EXISTS idx_cv_theme_views ON competitor_videos(theme, view_count)",
+        "CREATE INDEX IF NOT EXISTS idx_cv_keyset_views ON competitor_videos(COALESCE(view_count, 0) DESC, id DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_cv_theme_keyset_views"
+        " ON competitor_videos(theme, COALESCE(view_count, 0) DESC, id DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_cv_theme_keyset_likes"
+        " ON competitor_videos(theme, COALESCE(like_count, 0) DESC, COALESCE(view_count, 0) DESC, id DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_cv_theme_keyset_date"
+        " ON competitor_videos(theme, (published_at IS NULL), published_at DESC, COALESCE(view_count, 0) DESC, id DESC)",
+        f"CREATE INDEX IF NOT EXISTS idx_cv_channel_key ON competitor_videos(({CHANNEL_KEY_SQL}))",
+        "CREATE INDEX IF NOT EXISTS idx_cv_updated_at ON competitor_videos(updated_at)",
     ]
 
+    # find_all(columns=...) 允许投影的列
+    COLUMNS = (
+        "id", "youtube_id", "title", "channel_name", "view_count", "duration", "published_at",
+        "has_details", "like_count", "comment_count", "description", "tags",
+        "channel_id", "thumbnail_url", "category", "subscriber_count",
+        "theme", "keyword_source", "pattern_type", "pattern_score", "collected_at", "updated_at",
+    )
+
+    # update_fields_batch 允许更新的列（updated_at 由写入方法自动设置）
+    UPDATABLE_COLUMNS = frozenset(COLUMNS) - {"id", "youtube_id", "collected_at", "updated_at"}
+
+    # 排序方式 -> 排序键 (表达式, 是否降序)
+    # 非播放量排序以播放量为次序（与旧的 Python 稳定排序一致），最后以 id 兜底构成全序，
+    # 游标分页（find_page）据此定位上一页的最后一行；表达式与 sqlite_tuning 迁移 3 的索引一致
+    SORT_KEYS = {
+        "views": (("COALESCE(view_count, 0)", True), ("id", True)),
+        "likes": (("COALESCE(like_count, 0)", True), ("COALESCE(view_count, 0)", True), ("id", True)),
+        "date": (
+            ("(published_at IS NULL)", False), ("published_at", True),
+            ("COALESCE(view_count, 0)", True), ("id", True),
+        ),
+        "engagement": (
+            (
+                "(COALESCE(like_count, 0) + COALESCE(comment_count, 0)) * 1.0"
+                " / (CASE WHEN view_count > 1 THEN view_count ELSE 1 END)",
+                True,
+            ),
+            ("COALESCE(view_count, 0)", True),
+            ("id", True),
+        ),
+    }
+
+    # 排序方式 -> ORDER BY 子句
+    SORT_CLAUSES = {name: order_clause(keys) for name, keys in SORT_KEYS.items()}
+
+    # 频道分组键：有效 channel_id 优先，否则 channel_name（与 api_server 的频道统计口径一致）
+    CHANNEL_KEY_SQL = CHANNEL_KEY_SQL
+
     def __init__(self, db_path: Optional[str] = None):
         """
         初始化 Repository
@@ -91,20 +162,58 @@ class CompetitorVideoRepository:
         # 初始化数据库
         self._init_database()
 
+        # 物化聚合表（写入时在同一事务内增量维护）
+        self.aggregates = AggregateRepository(self.db_path)
+
+        # keyword_like 模糊筛选用的子串索引
+        self.search_index = get_search_index(self.db_path)
+
     def _init_database(self):
         """初始化数据库表"""
         if is_using_neon():
-            # Neon 表已由 neon_database.py 创建
+            # Neon 表已由 neon_database.py 创建，这里只补齐索引
             self.logger.info("使用 Neon PostgreSQL，跳过本地表初始化")
+            self._ensure_pg_indexes()
             return
-        with sqlite3.connect(self.db_path) as conn:
+        conn = sqlite_connect(self.db_path)
+        try:
             cursor = conn.cursor()
             cursor.execute(self.CREATE_TABLE_SQL)
+            # 旧库补齐 subscriber_count 列（update_details 与聚合表需要）
+            columns = {row[1] for row in cursor.execute("PRAGMA table_info(competitor_videos)")}
+            if 'subscriber_count' not in columns:
+                cursor.execute("ALTER TABLE competitor_videos ADD COLUMN subscriber_count INTEGER")
             for index_sql in self.CREATE_INDEXES_SQL:
                 cursor.execute(index_sql)
             conn.commit()
+        finally:
+            conn.close()
+        # 版本化索引迁移（每个数据库每进程一次）
+        ensure_migrated(self.db_path)
         self.logger.info(f"数据库初始化完成: {self.db_path}")
 
+    def _ensure_pg_indexes(self):
+        """PostgreSQL 补齐索引（每进程一次；失败时只记录警告，查询仍可用）"""
+        global _pg_indexes_ready
+        if _pg_indexes_ready:
+            return
+        with _pg_indexes_lock:
+            if _pg_indexes_ready:
+                return
+            conn = db_get_connection()
+            try:
+                cursor = conn.cursor()
+                for sql in self.PG_INDEXES_SQL:
+                    cursor.execute(sql)
+                conn.commit()
+                self.logger.info(f"PostgreSQL 索引检查完成: {len(self.PG_INDEXES_SQL)} 个")
+            except Exception as e:
+                conn.rollback()
+                self.logger.warning(f"创建 PostgreSQL 索引失败: {e}")
+            finally:
+                conn.close()
+            _pg_indexes_ready = True
+
     def _get_connection(self):
         """获取数据库连接"""
         return db_get_connection(str(self.db_path), row_factory=sqlite3.Row)
@@ -113,6 +222,38 @@ class CompetitorVideoRepository:
     # CRUD 操作
     # ============================================================
 
+    # UPSERT：新视频插入；已有视频更新全部采集字段，theme / keyword_source 保留首次写入的值
+    UPSERT_SQL = """
+    INSERT INTO competitor_videos (
+        youtube_id, title, channel_name, view_count, duration, published_at,
+        has_details, like_count, comment_count, description, tags,
+        channel_id, thumbnail_url, category,
+        theme, keyword_source, pattern_type, pattern_score, collected_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (youtube_id) DO UPDATE SET
+        title = excluded.title,
+        channel_name = excluded.channel_name,
+        view_count = excluded.view_count,
+        duration = excluded.duration,
+        published_at = excluded.published_at,
+        has_details = excluded.has_details,
+        like_count = excluded.like_count,
+        comment_count = excluded.comment_count,
+        description = excluded.description,
+        tags = excluded.tags,
+        channel_id = excluded.channel_id,
+        thumbnail_url = excluded.thumbnail_url,
+        category = excluded.category,
+        theme = COALESCE(competitor_videos.theme, excluded.theme),
+        keyword_source = COALESCE(competitor_videos.keyword_source, excluded.keyword_source),
+        pattern_type = excluded.pattern_type,
+        pattern_score = excluded.pattern_score,
+        updated_at = excluded.updated_at
+    """
+
+    # SQLite 3.35+ 支持 RETURNING（PostgreSQL 始终支持）
+    SQLITE_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
     def save(self, video: CompetitorVideo) -> int:
         """
         保存单个视频（插入或更新）
@@ -125,33 +266,34 @@ class CompetitorVideoRepository:
         """
         with self._get_connection() as conn:
             cursor = conn.cursor()
+            self.aggregates.lock(conn, cursor)
+            before = self.aggregates.capture(cursor, [video.youtube_id])
+
+            params = self._upsert_params(video, datetime.now().isoformat())
+            if is_using_neon():
+                cursor.execute(self.UPSERT_SQL + " RETURNING id", params)
+                record_id = cursor.lastrowid
+            elif self.SQLITE_RETURNING:
+                cursor.execute(self.UPSERT_SQL + " RETURNING id", params)
+                record_id = cursor.fetchone()[0]
+            else:
+                cursor.execute(self.UPSERT_SQL, params)
+                cursor.execute(
+                    "SELECT id FROM competitor_videos WHERE youtube_id = ?",
+                    (video.youtube_id,)
+                )
+                record_id = cursor.fetchone()[0]
 
-            # 检查是否存在
-            cursor.execute(
-                "SELECT id FROM competitor_videos WHERE youtube_id = ?",
-                (video.youtube_id,)
-            )
-            existing = cursor.fetchone()
+            after = self.aggregates.capture(cursor, [video.youtube_id])
+            self.aggregates.apply(cursor, before, after)
 
-            if existing:
-                # 更新
-                self._update(cursor, video, existing['id'])
-                return existing['id']
-            else:
-                # 插入
-                return self._insert(cursor, video)
+        mark_data_changed()
+        return record_id
 
-    def _insert(self, cursor: sqlite3.Cursor, video: CompetitorVideo) -> int:
-        """插入新记录"""
-        sql = """
-        INSERT INTO competitor_videos (
-            youtube_id, title, channel_name, view_count, duration, published_at,
-            has_details, like_count, comment_count, description, tags,
-            channel_id, thumbnail_url, category,
-            theme, keyword_source, pattern_type, pattern_score, collected_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        cursor.execute(sql, (
+    @staticmethod
+    def _upsert_params(video: CompetitorVideo, now: str) -> tuple:
+        """UPSERT_SQL 的参数"""
+        return (
             video.youtube_id,
             video.title,
             video.channel_name,
@@ -171,47 +313,12 @@ class CompetitorVideoRepository:
             video.pattern_type.value,
             video.pattern_score,
             video.collected_at.isoformat(),
-        ))
-        return cursor.lastrowid
-
-    def _update(self, cursor: sqlite3.Cursor, video: CompetitorVideo, record_id: int):
-        """更新现有记录"""
-        sql = """
-        UPDATE competitor_videos SET
-            title = ?, channel_name = ?, view_count = ?, duration = ?, published_at = ?,
-            has_details = ?, like_count = ?, comment_count = ?, description = ?, tags = ?,
-            channel_id = ?, thumbnail_url = ?, category = ?,
-            theme = COALESCE(theme, ?),
-            keyword_source = COALESCE(keyword_source, ?),
-            pattern_type = ?, pattern_score = ?,
-            updated_at = ?
-        WHERE id = ?
-        """
-        cursor.execute(sql, (
-            video.title,
-            video.channel_name,
-            video.view_count,
-            video.duration,
-            video.published_at.isoformat() if video.published_at else None,
-            video.has_details,  # PostgreSQL psycopg2 可以处理 Python bool
-            video.like_count,
-            video.comment_count,
-            video.description,
-            json.dumps(video.tags, ensure_ascii=False) if video.tags else None,
-            video.channel_id,
-            video.thumbnail_url,
-            video.category,
-            getattr(video, 'theme', None),
-            video.keyword_source,
-            video.pattern_type.value,
-            video.pattern_score,
-            datetime.now().isoformat(),
-            record_id,
-        ))
+            now,
+        )
 
     def save_batch(self, videos: List[CompetitorVideo]) -> Tuple[int, int]:
         """
-        批量保存视频
+        批量保存视频（一条 UPSERT 语句批量执行，不再逐条 SELECT 判断是否存在）
 
         Args:
             videos: CompetitorVideo 列表
@@ -219,28 +326,33 @@ class CompetitorVideoRepository:
         Returns:
             (inserted_count, updated_count)
         """
-        inserted = 0
-        updated = 0
+        if not videos:
+            return 0, 0
 
         with self._get_connection() as conn:
             cursor = conn.cursor()
-
-            for video in videos:
-                cursor.execute(
-                    "SELECT id FROM competitor_videos WHERE youtube_id = ?",
-                    (video.youtube_id,)
-                )
-                existing = cursor.fetchone()
-
-                if existing:
-                    self._update(cursor, video, existing['id'])
-                    updated += 1
-                else:
-                    self._insert(cursor, video)
+            self.aggregates.lock(conn, cursor)
+            youtube_ids = [video.youtube_id for video in videos]
+            before = self.aggregates.capture(cursor, youtube_ids)
+
+            # 写入前已存在的视频（聚合维护本来就要读取）决定插入/更新计数；
+            # 同一批内重复的视频，第二次起计为更新
+            seen = set(before)
+            inserted = 0
+            for youtube_id in youtube_ids:
+                if youtube_id not in seen:
                     inserted += 1
+                    seen.add(youtube_id)
+            updated = len(videos) - inserted
+
+            now = datetime.now().isoformat()
+            cursor.executemany(self.UPSERT_SQL, [self._upsert_params(video, now) for video in videos])
 
+            after = self.aggregates.capture(cursor, youtube_ids)
+            self.aggregates.apply(cursor, before, after)
             conn.commit()
 
+        mark_data_changed()
         self.logger.info(f"批量保存完成: 插入 {inserted}, 更新 {updated}")
         return inserted, updated
 
@@ -298,34 +410,23 @@ class CompetitorVideoRepository:
             )
             return {row['youtube_id'] for row in cursor.fetchall()}
 
-    def find_all(
+    def _build_where(
         self,
-        limit: int = 100,
-        offset: int = 0,
         theme: Optional[str] = None,
         keyword: Optional[str] = None,
         keywords: Optional[List[str]] = None,
         keyword_like: Optional[str] = None,
         min_views: Optional[int] = None,
         has_details: Optional[bool] = None,
-        pattern_type: Optional[PatternType] = None
-    ) -> List[CompetitorVideo]:
+        pattern_type: Optional[PatternType] = None,
+        published_from: Optional[datetime] = None,
+        published_to: Optional[datetime] = None,
+    ) -> Tuple[str, list]:
         """
-        查询视频列表
-
-        Args:
-            limit: 返回数量限制
-            offset: 偏移量
-            theme: 按主题精确筛选（如"养生"、"科技"）
-            keyword: 按关键词精确筛选（单个）
-            keywords: 按多个关键词筛选（列表，OR 关系）
-            keyword_like: 按关键词模糊筛选（包含）
-            min_views: 最小播放量
-            has_details: 是否有详情
-            pattern_type: 模式类型
+        构建 WHERE 子句（find_all / aggregate 共用）
 
         Returns:
-            CompetitorVideo 列表
+            (where_clause, params)
         """
         conditions = []
         params = []
@@ -347,8 +448,9 @@ class CompetitorVideoRepository:
             params.append(keyword)
         elif keyword_like:
             # 模糊匹配（包含关键词）
-            conditions.append("keyword_source LIKE ?")
-            params.append(f"%{keyword_like}%")
+            condition, like_params = self.search_index.contains_condition(keyword_like, ("keyword_source",))
+            conditions.append(condition)
+            params.extend(like_params)
 
         if min_views is not None:
             conditions.append("view_count >= ?")
@@ -365,21 +467,353 @@ class CompetitorVideoRepository:
             conditions.append("pattern_type = ?")
             params.append(pattern_type.value)
 
+        # 发布时间范围（SQLite 存 ISO 字符串，PostgreSQL 为 timestamp）
+        if published_from is not None:
+            conditions.append("published_at >= ?")
+            params.append(self._time_param(published_from))
+
+        if published_to is not None:
+            conditions.append("published_at <= ?")
+            params.append(self._time_param(published_to))
+
         where_clause = " AND ".join(conditions) if conditions else "1=1"
+        return where_clause, params
+
+    @staticmethod
+    def _time_param(value: datetime):
+        """时间参数：PostgreSQL 直接传 datetime，SQLite 传 ISO 字符串"""
+        return value if is_using_neon() else value.isoformat()
+
+    def find_all(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        theme: Optional[str] = None,
+        keyword: Optional[str] = None,
+        keywords: Optional[List[str]] = None,
+        keyword_like: Optional[str] = None,
+        min_views: Optional[int] = None,
+        has_details: Optional[bool] = None,
+        pattern_type: Optional[PatternType] = None,
+        published_from: Optional[datetime] = None,
+        published_to: Optional[datetime] = None,
+        sort_by: str = "views",
+        columns: Optional[Sequence[str]] = None,
+    ) -> Union[List[CompetitorVideo], List[VideoRecord]]:
+        """
+        查询视频列表
+
+        Args:
+            limit: 返回数量限制
+            offset: 偏移量
+            theme: 按主题精确筛选（如"养生"、"科技"）
+            keyword: 按关键词精确筛选（单个）
+            keywords: 按多个关键词筛选（列表，OR 关系）
+            keyword_like: 按关键词模糊筛选（包含）
+            min_views: 最小播放量
+            has_details: 是否有详情
+            pattern_type: 模式类型
+            published_from: 发布时间下限（含）
+            published_to: 发布时间上限（含）
+            sort_by: 排序方式 (views/likes/date/engagement)，均为降序
+            columns: 只读取这些列（取自 COLUMNS），返回懒解码的 VideoRecord；
+                     不传时返回完整的 CompetitorVideo
+
+        Returns:
+            CompetitorVideo 列表（传 columns 时为 VideoRecord 列表）
+        """
+        where_clause, params = self._build_where(
+            theme=theme,
+            keyword=keyword,
+            keywords=keywords,
+            keyword_like=keyword_like,
+            min_views=min_views,
+            has_details=has_details,
+            pattern_type=pattern_type,
+            published_from=published_from,
+            published_to=published_to,
+        )
+        order_clause = self.SORT_CLAUSES.get(sort_by, self.SORT_CLAUSES["views"])
+        params.extend([limit, offset])
+
+        if columns is not None:
+            return self._find_records(columns, where_clause, order_clause, params)
 
         sql = f"""
         SELECT * FROM competitor_videos
         WHERE {where_clause}
-        ORDER BY view_count DESC
+        ORDER BY {order_clause}
         LIMIT ? OFFSET ?
         """
-        params.extend([limit, offset])
 
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(sql, params)
             return [self._row_to_model(row) for row in cursor.fetchall()]
 
+    def _find_records(
+        self,
+        columns: Sequence[str],
+        where_clause: str,
+        order_clause: str,
+        params: list,
+    ) -> List[VideoRecord]:
+        """投影查询：只读取指定列，行元组直接包装为 VideoRecord"""
+        columns = self._check_columns(dict.fromkeys(columns))
+        sql = f"""
+        SELECT {', '.join(columns)} FROM competitor_videos
+        WHERE {where_clause}
+        ORDER BY {order_clause}
+        LIMIT ? OFFSET ?
+        """
+        record_type = VideoRecord.for_columns(columns)
+
+        # 不设置 row_factory：直接拿元组，不为每行构建 Row 对象
+        with db_get_connection(str(self.db_path)) as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            return [record_type(tuple(row)) for row in cursor.fetchall()]
+
+    @classmethod
+    def _check_columns(cls, columns: Sequence[str]) -> List[str]:
+        """校验投影列（列名会拼进 SQL，只允许 COLUMNS 中的列）"""
+        columns = list(columns)
+        unknown = [name for name in columns if name not in cls.COLUMNS]
+        if unknown or not columns:
+            raise ValueError(f"未知列: {unknown}" if unknown else "至少需要一列")
+        return columns
+
+    def find_page(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        sort_by: str = "views",
+        columns: Optional[Sequence[str]] = None,
+        **filters,
+    ) -> Tuple[Union[List[CompetitorVideo], List[VideoRecord]], Optional[str]]:
+        """
+        游标分页查询（keyset）：从上一页最后一行的排序键继续，不使用 OFFSET，
+        每页代价与翻到第几页无关；排序与 find_all 相同
+
+        Args:
+            limit: 每页数量
+            cursor: 上一页返回的游标，None 表示第一页
+            sort_by: 排序方式 (views/likes/date/engagement)
+            columns: 只读取这些列（取自 COLUMNS），返回 VideoRecord；不传时返回 CompetitorVideo
+            **filters: 传给 _build_where 的筛选条件（翻页时必须与第一页相同）
+
+        Returns:
+            (本页视频列表, 下一页游标；没有下一页时为 None)
+
+        Raises:
+            InvalidCursor: 游标无法解析，或与排序方式 / 筛选条件不匹配
+        """
+        sql, params = self._page_query(limit, cursor, sort_by, columns, filters)
+        # 不设置 row_factory：末尾的排序键列按位置取
+        with db_get_connection(str(self.db_path)) as conn:
+            db_cursor = conn.cursor()
+            db_cursor.execute(sql, params)
+            names = [description[0] for description in db_cursor.description]
+            rows = [tuple(row) for row in db_cursor.fetchall()]
+        return self._page_result(names, rows, limit, sort_by, columns, filters)
+
+    def _page_query(
+        self,
+        limit: int,
+        cursor: Optional[str],
+        sort_by: str,
+        columns: Optional[Sequence[str]],
+        filters: dict,
+    ) -> Tuple[str, list]:
+        """find_page 的 SQL：选出的列之后追加排序键列，多取一行用于判断是否还有下一页"""
+        sort_by = sort_by if sort_by in self.SORT_KEYS else "views"
+        keys = self.SORT_KEYS[sort_by]
+        where_clause, params = self._build_where(**filters)
+        if cursor:
+            values = decode_cursor(cursor, sort_by, filters_fingerprint(filters), len(keys))
+            condition, condition_params = keyset_condition(keys, values)
+            where_clause = f"{where_clause} AND {condition}"
+            params.extend(condition_params)
+
+        selected = "*" if columns is None else ", ".join(self._check_columns(dict.fromkeys(columns)))
+        key_columns = ", ".join(f"{expr} AS _sort_key{i}" for i, (expr, _) in enumerate(keys))
+        sql = f"""
+        SELECT {selected}, {key_columns} FROM competitor_videos
+        WHERE {where_clause}
+        ORDER BY {self.SORT_CLAUSES[sort_by]}
+        LIMIT ?
+        """
+        params.append(limit + 1)
+        return sql, params
+
+    def _page_result(
+        self,
+        names: List[str],
+        rows: List[tuple],
+        limit: int,
+        sort_by: str,
+        columns: Optional[Sequence[str]],
+        filters: dict,
+    ) -> Tuple[Union[List[CompetitorVideo], List[VideoRecord]], Optional[str]]:
+        """find_page 的结果：去掉排序键列，由本页最后一行生成下一页游标"""
+        sort_by = sort_by if sort_by in self.SORT_KEYS else "views"
+        key_count = len(self.SORT_KEYS[sort_by])
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            if rows:
+                next_cursor = encode_cursor(sort_by, filters_fingerprint(filters), rows[-1][-key_count:])
+
+        names = names[:-key_count]
+        if columns is None:
+            items = [self._row_to_model(dict(zip(names, row))) for row in rows]
+        else:
+            record_type = VideoRecord.for_columns(list(dict.fromkeys(columns)))
+            items = [record_type(row[:-key_count]) for row in rows]
+        return items, next_cursor
+
+    def scan_batches(
+        self,
+        columns: Sequence[str],
+        batch_size: int = FETCH_BATCH_ROWS,
+        sort_by: Optional[str] = None,
+        **filters,
+    ) -> Iterator[List[tuple]]:
+        """
+        流式扫描视频表（整表分析用，内存只保留一批行）
+
+        PostgreSQL 使用服务端游标，SQLite 按批 fetchmany；只读取 columns 指定的列。
+
+        Args:
+            columns: 读取的列（取自 COLUMNS），行元组按此顺序
+            batch_size: 每批行数
+            sort_by: 排序方式（SORT_CLAUSES 的键），None 表示不排序（按表存储顺序）
+            **filters: 传给 _build_where 的筛选条件（theme / keyword_like / min_views / published_from 等）
+
+        Yields:
+            行元组列表
+        """
+        columns = self._check_columns(columns)
+        where_clause, params = self._build_where(**filters)
+        sql = f"SELECT {', '.join(columns)} FROM competitor_videos WHERE {where_clause}"
+        if sort_by is not None:
+            sql += f" ORDER BY {self.SORT_CLAUSES.get(sort_by, self.SORT_CLAUSES['views'])}"
+
+        conn = db_get_connection(str(self.db_path))
+        try:
+            yield from iter_batches(conn, sql, params, batch_size)
+        finally:
+            conn.close()
+
+    def scan(
+        self,
+        columns: Sequence[str],
+        batch_size: int = FETCH_BATCH_ROWS,
+        sort_by: Optional[str] = None,
+        **filters,
+    ) -> Iterator[List[VideoRecord]]:
+        """
+        流式扫描视频表，每批包装为懒解码的 VideoRecord（参数同 scan_batches）
+
+        Yields:
+            VideoRecord 列表
+        """
+        columns = self._check_columns(dict.fromkeys(columns))
+        record_type = VideoRecord.for_columns(columns)
+        for rows in self.scan_batches(columns, batch_size, sort_by, **filters):
+            yield [record_type(tuple(row)) for row in rows]
+
+    def aggregate(
+        self,
+        theme: Optional[str] = None,
+        keyword: Optional[str] = None,
+        keywords: Optional[List[str]] = None,
+        keyword_like: Optional[str] = None,
+        min_views: Optional[int] = None,
+        has_details: Optional[bool] = None,
+        published_from: Optional[datetime] = None,
+        published_to: Optional[datetime] = None,
+    ) -> dict:
+        """
+        在数据库端计算汇总统计（筛选条件同 find_all）
+
+        Returns:
+            {
+                video_count, channel_count, total_views, total_likes, total_comments,
+                published_earliest, published_latest, collected_earliest, collected_latest
+            }
+            其中时间字段为 datetime 或 None
+        """
+        where_clause, params = self._build_where(
+            theme=theme,
+            keyword=keyword,
+            keywords=keywords,
+            keyword_like=keyword_like,
+            min_views=min_views,
+            has_details=has_details,
+            published_from=published_from,
+            published_to=published_to,
+        )
+
+        sql = f"""
+        SELECT
+            COUNT(*) as video_count,
+            COUNT(DISTINCT {self.CHANNEL_KEY_SQL}) as channel_count,
+            SUM(view_count) as total_views,
+            SUM(like_count) as total_likes,
+            SUM(comment_count) as total_comments,
+            MIN(published_at) as published_earliest,
+            MAX(published_at) as published_latest,
+            MIN(collected_at) as collected_earliest,
+            MAX(collected_at) as collected_latest
+        FROM competitor_videos
+        WHERE {where_clause}
+        """
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+
+        return {
+            'video_count': row['video_count'] or 0,
+            'channel_count': row['channel_count'] or 0,
+            'total_views': row['total_views'] or 0,
+            'total_likes': row['total_likes'] or 0,
+            'total_comments': row['total_comments'] or 0,
+            'published_earliest': parse_datetime(row['published_earliest']),
+            'published_latest': parse_datetime(row['published_latest']),
+            'collected_earliest': parse_datetime(row['collected_earliest']),
+            'collected_latest': parse_datetime(row['collected_latest']),
+        }
+
+    def distinct_channel_keys(
+        self,
+        theme: Optional[str] = None,
+        keyword_like: Optional[str] = None,
+    ) -> set:
+        """
+        获取去重后的频道分组键（CHANNEL_KEY_SQL 口径），用于初始化采集实时计数
+
+        Args:
+            theme: 按主题精确筛选
+            keyword_like: 按关键词模糊筛选
+
+        Returns:
+            频道分组键集合
+        """
+        where_clause, params = self._build_where(theme=theme, keyword_like=keyword_like)
+        sql = f"""
+        SELECT DISTINCT {self.CHANNEL_KEY_SQL} as channel_key
+        FROM competitor_videos
+        WHERE {where_clause}
+        """
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            return {row['channel_key'] for row in cursor.fetchall() if row['channel_key']}
+
     def find_without_details(self, min_views: int = 0, limit: int = 100) -> List[CompetitorVideo]:
         """
         查找没有详情的高播放量视频（用于第二阶段采集）
@@ -454,8 +888,25 @@ class CompetitorVideoRepository:
                 youtube_id
             ))
             conn.commit()
+            mark_data_changed()
             return cursor.rowcount > 0
 
+    UPDATE_DETAILS_SQL = """
+    UPDATE competitor_videos SET
+        has_details = true,
+        like_count = ?,
+        comment_count = ?,
+        description = ?,
+        tags = ?,
+        channel_id = ?,
+        channel_name = COALESCE(NULLIF(channel_name, ''), ?),
+        thumbnail_url = ?,
+        category = ?,
+        subscriber_count = ?,
+        updated_at = ?
+    WHERE youtube_id = ?
+    """
+
     def update_details(self, video: CompetitorVideo) -> bool:
         """
         更新视频详情（第二阶段采集后调用）
@@ -466,24 +917,28 @@ class CompetitorVideoRepository:
         Returns:
             是否更新成功
         """
-        sql = """
-        UPDATE competitor_videos SET
-            has_details = true,
-            like_count = ?,
-            comment_count = ?,
-            description = ?,
-            tags = ?,
-            channel_id = ?,
-            channel_name = COALESCE(NULLIF(channel_name, ''), ?),
-            thumbnail_url = ?,
-            category = ?,
-            subscriber_count = ?,
-            updated_at = ?
-        WHERE youtube_id = ?
+        return self.update_details_batch([video]) > 0
+
+    def update_details_batch(self, videos: List[CompetitorVideo]) -> int:
+        """
+        批量更新视频详情（一个事务、一次 executemany，聚合统计只维护一次）
+
+        Args:
+            videos: 包含详情的 CompetitorVideo 列表
+
+        Returns:
+            实际更新的视频数（数据库中不存在的视频不计）
         """
+        if not videos:
+            return 0
+
+        now = datetime.now().isoformat()
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(sql, (
+            self.aggregates.lock(conn, cursor)
+            youtube_ids = [video.youtube_id for video in videos]
+            before = self.aggregates.capture(cursor, youtube_ids)
+            cursor.executemany(self.UPDATE_DETAILS_SQL, [(
                 video.like_count,
                 video.comment_count,
                 video.description,
@@ -493,22 +948,148 @@ class CompetitorVideoRepository:
                 video.thumbnail_url,
                 video.category,
                 video.subscriber_count,
-                datetime.now().isoformat(),
+                now,
                 video.youtube_id,
-            ))
+            ) for video in videos])
+            # 按 youtube_id 更新，写入后存在的视频即被更新的视频
+            after = self.aggregates.capture(cursor, youtube_ids)
+            self.aggregates.apply(cursor, before, after)
             conn.commit()
-            return cursor.rowcount > 0
+
+        mark_data_changed()
+        return len(after)
+
+    def update_fields(self, youtube_id: str, fields: Dict[str, Any]) -> bool:
+        """
+        更新单个视频的指定列（维护脚本按需补字段时使用）
+
+        Args:
+            youtube_id: YouTube 视频 ID
+            fields: {列名: 新值}
+
+        Returns:
+            是否更新成功
+        """
+        return self.update_fields_batch([(youtube_id, fields)]) > 0
+
+    def update_fields_batch(self, updates: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        批量更新视频的指定列（一个事务，聚合统计只维护一次）
+
+        每个视频可以更新不同的列；列集合相同的视频合并为一次 executemany。
+        tags 传入列表时按 JSON 保存，updated_at 自动设置为当前时间。
+
+        Args:
+            updates: [(youtube_id, {列名: 新值})]
+
+        Returns:
+            实际更新的视频数（数据库中不存在的视频不计）
+
+        Raises:
+            ValueError: 包含不允许更新的列
+        """
+        if not updates:
+            return 0
+
+        now = datetime.now().isoformat()
+        groups = defaultdict(list)
+        for youtube_id, fields in updates:
+            unknown = set(fields) - self.UPDATABLE_COLUMNS
+            if unknown:
+                raise ValueError(f"不允许更新的列: {sorted(unknown)}")
+            columns = tuple(fields)
+            values = [
+                json.dumps(value, ensure_ascii=False) if column == 'tags' and isinstance(value, (list, tuple))
+                else value
+                for column, value in fields.items()
+            ]
+            groups[columns].append((*values, now, youtube_id))
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            self.aggregates.lock(conn, cursor)
+            youtube_ids = [youtube_id for youtube_id, _ in updates]
+            before = self.aggregates.capture(cursor, youtube_ids)
+            for columns, params in groups.items():
+                assignments = ''.join(f"{column} = ?, " for column in columns)
+                cursor.executemany(
+                    f"UPDATE competitor_videos SET {assignments}updated_at = ? WHERE youtube_id = ?",
+                    params
+                )
+            after = self.aggregates.capture(cursor, youtube_ids)
+            self.aggregates.apply(cursor, before, after)
+            conn.commit()
+
+        mark_data_changed()
+        return len(after)
+
+    def update_channel_subscribers(self, channel_id: str, subscriber_count: int) -> int:
+        """
+        更新某频道所有视频的订阅数
+
+        Args:
+            channel_id: 频道 ID
+            subscriber_count: 订阅数
+
+        Returns:
+            更新的视频数
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            self.aggregates.lock(conn, cursor)
+            cursor.execute(
+                "SELECT youtube_id FROM competitor_videos WHERE channel_id = ?",
+                (channel_id,)
+            )
+            youtube_ids = [row[0] for row in cursor.fetchall()]
+            if not youtube_ids:
+                return 0
+            before = self.aggregates.capture(cursor, youtube_ids)
+            cursor.execute(
+                "UPDATE competitor_videos SET subscriber_count = ?, updated_at = ? WHERE channel_id = ?",
+                (subscriber_count, datetime.now().isoformat(), channel_id)
+            )
+            updated = cursor.rowcount
+            after = self.aggregates.capture(cursor, youtube_ids)
+            self.aggregates.apply(cursor, before, after)
+            conn.commit()
+
+        mark_data_changed()
+        return updated
 
     def delete(self, youtube_id: str) -> bool:
         """删除视频"""
         with self._get_connection() as conn:
             cursor = conn.cursor()
+            self.aggregates.lock(conn, cursor)
+            before = self.aggregates.capture(cursor, [youtube_id])
             cursor.execute(
                 "DELETE FROM competitor_videos WHERE youtube_id = ?",
                 (youtube_id,)
             )
+            deleted = cursor.rowcount > 0
+            self.aggregates.apply(cursor, before, {})
             conn.commit()
-            return cursor.rowcount > 0
+            mark_data_changed()
+            return deleted
+
+    # get_statistics 的查询（{where} 为空或按关键词筛选）
+    # 使用 CASE WHEN has_details THEN 1 ELSE 0 END 兼容 PostgreSQL 和 SQLite
+    STATISTICS_SQL = """
+        SELECT
+            COUNT(*) as total,
+            SUM(CASE WHEN has_details THEN 1 ELSE 0 END) as with_details,
+            SUM(view_count) as total_views,
+            AVG(view_count) as avg_views,
+            MAX(view_count) as max_views,
+            AVG(duration) as avg_duration
+        FROM competitor_videos {where}
+    """
+    PATTERN_DISTRIBUTION_SQL = """
+        SELECT pattern_type, COUNT(*) as count
+        FROM competitor_videos {where}
+        GROUP BY pattern_type
+    """
 
     def get_statistics(self, keyword: Optional[str] = None) -> dict:
         """
@@ -520,43 +1101,37 @@ class CompetitorVideoRepository:
         Returns:
             统计数据
         """
+        where_clause, params = self._statistics_where(keyword)
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
-            where_clause = "WHERE keyword_source = ?" if keyword else ""
-            params = (keyword,) if keyword else ()
-
             # 总数和详情数
-            # 使用 CASE WHEN has_details THEN 1 ELSE 0 END 兼容 PostgreSQL 和 SQLite
-            cursor.execute(f"""
-                SELECT
-                    COUNT(*) as total,
-                    SUM(CASE WHEN has_details THEN 1 ELSE 0 END) as with_details,
-                    SUM(view_count) as total_views,
-                    AVG(view_count) as avg_views,
-                    MAX(view_count) as max_views,
-                    AVG(duration) as avg_duration
-                FROM competitor_videos {where_clause}
-            """, params)
+            cursor.execute(self.STATISTICS_SQL.format(where=where_clause), params)
             row = cursor.fetchone()
 
             # 模式分布
-            cursor.execute(f"""
-                SELECT pattern_type, COUNT(*) as count
-                FROM competitor_videos {where_clause}
-                GROUP BY pattern_type
-            """, params)
-            pattern_dist = {r['pattern_type']: r['count'] for r in cursor.fetchall()}
-
-            return {
-                'total': row['total'] or 0,
-                'with_details': row['with_details'] or 0,
-                'total_views': row['total_views'] or 0,
-                'avg_views': int(row['avg_views'] or 0),
-                'max_views': row['max_views'] or 0,
-                'avg_duration': int(row['avg_duration'] or 0),
-                'pattern_distribution': pattern_dist,
-            }
+            cursor.execute(self.PATTERN_DISTRIBUTION_SQL.format(where=where_clause), params)
+            return self._format_statistics(row, cursor.fetchall())
+
+    @staticmethod
+    def _statistics_where(keyword: Optional[str]) -> Tuple[str, tuple]:
+        """get_statistics 的筛选条件"""
+        if keyword:
+            return "WHERE keyword_source = ?", (keyword,)
+        return "", ()
+
+    @staticmethod
+    def _format_statistics(row, pattern_rows) -> dict:
+        """把 STATISTICS_SQL / PATTERN_DISTRIBUTION_SQL 的结果整理为 get_statistics 的返回值"""
+        return {
+            'total': row['total'] or 0,
+            'with_details': row['with_details'] or 0,
+            'total_views': row['total_views'] or 0,
+            'avg_views': int(row['avg_views'] or 0),
+            'max_views': row['max_views'] or 0,
+            'avg_duration': int(row['avg_duration'] or 0),
+            'pattern_distribution': {r['pattern_type']: r['count'] for r in pattern_rows},
+        }
 
     def _row_to_model(self, row: sqlite3.Row) -> CompetitorVideo:
         """将数据库行转换为模型"""
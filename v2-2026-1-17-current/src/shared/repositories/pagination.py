@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+游标分页（keyset pagination）
+
+LIMIT ? OFFSET ? 翻到第 N 页时，数据库要先按排序扫描并丢弃前面所有行。keyset 分页记住上一页
+最后一行的排序键，下一页用 WHERE 条件直接从该位置继续，配合与排序键一致的索引，
+每页的代价与翻到第几页无关。
+
+- 每种排序方式的排序键都以 id 结尾，构成全序，同分的视频不会跨页重复或遗漏
+- 游标是 base64url 编码的 JSON（排序方式、筛选条件指纹、上一页最后一行的排序键值），对客户端不透明；
+  与当前请求的排序方式或筛选条件不一致时拒绝（InvalidCursor）
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Sequence, Tuple
+
+# 排序键：(SQL 表达式, 是否降序)
+SortKeys = Sequence[Tuple[str, bool]]
+
+CURSOR_VERSION = 1
+
+
+class InvalidCursor(ValueError):
+    """游标无法解析，或与当前排序方式 / 筛选条件不匹配"""
+
+
+def order_clause(keys: SortKeys) -> str:
+    """排序键 -> ORDER BY 子句"""
+    return ", ".join(f"{expr} DESC" if descending else expr for expr, descending in keys)
+
+
+def filters_fingerprint(filters: Dict[str, Any]) -> str:
+    """筛选条件指纹（忽略值为 None 的条件）"""
+    items = sorted((key, value) for key, value in filters.items() if value is not None)
+    text = json.dumps(items, ensure_ascii=False, default=str)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]
+
+
+def _encode_value(value):
+    # PostgreSQL 返回 datetime / Decimal，带类型标记以便还原为同类型参数（SQLite 中都是字符串或数字）
+    if isinstance(value, datetime):
+        return {"t": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if set(value) == {"t"} and isinstance(value["t"], str):
+            return datetime.fromisoformat(value["t"])
+        if set(value) == {"n"} and isinstance(value["n"], str):
+            return Decimal(value["n"])
+        raise InvalidCursor("游标中的排序键值无效")
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise InvalidCursor("游标中的排序键值无效")
+
+
+def encode_cursor(sort_by: str, fingerprint: str, values: Sequence) -> str:
+    """
+    生成游标
+
+    Args:
+        sort_by: 排序方式
+        fingerprint: filters_fingerprint() 的结果
+        values: 上一页最后一行的排序键值（与排序键一一对应）
+
+    Returns:
+        游标字符串
+    """
+    payload = {
+        "v": CURSOR_VERSION,
+        "s": sort_by,
+        "f": fingerprint,
+        "k": [_encode_value(value) for value in values],
+    }
+    raw = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(token: str, sort_by: str, fingerprint: str, key_count: int) -> List:
+    """
+    解析并校验游标
+
+    Args:
+        token: 游标字符串
+        sort_by: 当前请求的排序方式
+        fingerprint: 当前请求的筛选条件指纹
+        key_count: 排序键个数
+
+    Returns:
+        排序键值列表
+
+    Raises:
+        InvalidCursor: 游标无法解析，或与当前排序方式 / 筛选条件不匹配
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw.decode('utf-8'))
+    except (binascii.Error, ValueError) as e:
+        raise InvalidCursor(f"游标无法解析: {e}") from None
+
+    if not isinstance(payload, dict) or payload.get("v") != CURSOR_VERSION:
+        raise InvalidCursor("游标版本不匹配")
+    if payload.get("s") != sort_by or payload.get("f") != fingerprint:
+        raise InvalidCursor("游标与当前的排序方式或筛选条件不一致，请从第一页重新开始")
+    values = payload.get("k")
+    if not isinstance(values, list) or len(values) != key_count:
+        raise InvalidCursor("游标中的排序键个数不匹配")
+    return [_decode_value(value) for value in values]
+
+
+def keyset_condition(keys: SortKeys, values: Sequence) -> Tuple[str, list]:
+    """
+    "排在游标之后" 的 WHERE 条件
+
+    展开为 k1 > v1 OR (k1 = v1 AND k2 > v2) OR ...（降序键用 <），并在前面加上首个排序键的
+    范围条件，让索引直接从游标位置开始扫描。
+
+    值为 None 的键（只有按发布时间排序时的 published_at）所在的行已由前面的
+    (published_at IS NULL) 键分到同一组，组内都是 NULL，只作为相等条件。
+
+    Args:
+        keys: 排序键
+        values: 游标中的排序键值
+
+    Returns:
+        (条件 SQL, 参数列表)
+    """
+    terms = []
+    params = []
+    equal = []          # 前面各键的相等条件
+    equal_params = []
+    for (expr, descending), value in zip(keys, values):
+        if value is None:
+            equal.append(f"{expr} IS NULL")
+            continue
+        op = "<" if descending else ">"
+        terms.append(" AND ".join([*equal, f"{expr} {op} ?"]))
+        params.extend([*equal_params, value])
+        equal.append(f"{expr} = ?")
+        equal_params.append(value)
+
+    if not terms:
+        return "1=0", []
+
+    condition = "(" + " OR ".join(f"({term})" for term in terms) + ")"
+    (first_expr, first_descending), first_value = keys[0], values[0]
+    if first_value is not None:
+        condition = f"{first_expr} {'<=' if first_descending else '>='} ? AND {condition}"
+        params.insert(0, first_value)
+    return condition, params
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+视频模糊搜索索引
+
+keyword_like 筛选和 /api/user-insights 的关键词匹配以前都是 `LIKE '%词%'`，
+前导通配符用不上 B-tree 索引，每次都扫描整个 competitor_videos。这里为
+title / keyword_source / theme 建立子串索引：
+
+- SQLite：FTS5 trigram 外部内容表 competitor_videos_fts（rowid = competitor_videos.id），
+  由 INSERT / DELETE / UPDATE 触发器同步，任何连接（包括直接写表的脚本）的写入都会更新索引
+- PostgreSQL：pg_trgm 扩展 + GIN(gin_trgm_ops) 索引，LIKE 语句不变，由查询规划器选用
+
+trigram 至少需要 3 个字符，更短的词（如两字中文关键词"养生"）直接用 LIKE。
+
+索引只用来缩小候选集，条件里始终保留原来的 LIKE 复核，结果与纯 LIKE 完全一致；
+是否命中只由 competitor_videos 本身决定，不依赖聚合表等派生数据。
+FTS5 / trigram 不可用（SQLite < 3.34）或 pg_trgm 无权限创建时，自动回退到 LIKE。
+"""
+
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from src.shared.db_compat import get_connection as db_get_connection, is_using_neon
+from src.shared.logger import setup_logger
+
+logger = setup_logger('search_index')
+
+FTS_TABLE = "competitor_videos_fts"
+
+# 建立子串索引的列（顺序即 FTS5 表的列顺序）
+INDEXED_COLUMNS = ("title", "keyword_source", "theme")
+
+# trigram 可用的最短词长
+MIN_TRIGRAM_LENGTH = 3
+
+_COLUMN_LIST = ", ".join(INDEXED_COLUMNS)
+_NEW_VALUES = ", ".join(f"new.{column}" for column in INDEXED_COLUMNS)
+_OLD_VALUES = ", ".join(f"old.{column}" for column in INDEXED_COLUMNS)
+
+SQLITE_CREATE_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        {_COLUMN_LIST},
+        content='competitor_videos', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON competitor_videos BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {_COLUMN_LIST}) VALUES (new.id, {_NEW_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON competitor_videos BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMN_LIST}) VALUES ('delete', old.id, {_OLD_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {_COLUMN_LIST} ON competitor_videos BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMN_LIST}) VALUES ('delete', old.id, {_OLD_VALUES});
+        INSERT INTO {FTS_TABLE}(rowid, {_COLUMN_LIST}) VALUES (new.id, {_NEW_VALUES});
+    END
+    """,
+]
+
+PG_CREATE_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    *[
+        f"CREATE INDEX IF NOT EXISTS idx_cv_{column}_trgm ON competitor_videos USING gin ({column} gin_trgm_ops)"
+        for column in INDEXED_COLUMNS
+    ],
+]
+
+
+class VideoSearchIndex:
+    """competitor_videos 的子串搜索索引（线程安全，每个数据库一个实例）"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Args:
+            db_path: SQLite 数据库路径（PostgreSQL 模式下忽略）
+        """
+        self.db_path = str(db_path) if db_path is not None else None
+        self.fts_enabled = False              # SQLite FTS5 表可用
+        self.trgm_enabled = False             # PostgreSQL pg_trgm 索引可用
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def ensure(self) -> "VideoSearchIndex":
+        """
+        建立索引（每个实例只执行一次；首次建立 FTS5 表时从现有数据全量构建）
+
+        Returns:
+            self
+        """
+        if self._ready:
+            return self
+        with self._lock:
+            if self._ready:
+                return self
+            try:
+                if is_using_neon():
+                    self._ensure_postgres()
+                else:
+                    self._ensure_sqlite()
+            except Exception as e:
+                logger.warning(f"建立视频搜索索引失败，回退到 LIKE: {e}")
+            self._ready = True
+        return self
+
+    def _ensure_sqlite(self):
+        conn = db_get_connection(self.db_path)
+        try:
+            cursor = conn.cursor()
+            tables = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            if 'competitor_videos' not in tables:
+                return
+
+            if FTS_TABLE not in tables:
+                try:
+                    # 建表、触发器和全量构建放在同一事务里，中途失败不会留下空索引
+                    cursor.execute("BEGIN")
+                    for sql in SQLITE_CREATE_SQL:
+                        cursor.execute(sql)
+                    cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+                    conn.commit()
+                    logger.info(f"视频搜索索引已建立: {FTS_TABLE}")
+                except Exception as e:
+                    # 未编译 FTS5 或不支持 trigram 分词器（SQLite < 3.34）
+                    conn.rollback()
+                    logger.warning(f"SQLite 不支持 FTS5 trigram，模糊搜索回退到 LIKE: {e}")
+                    return
+            self.fts_enabled = True
+        finally:
+            conn.close()
+
+    def _ensure_postgres(self):
+        conn = db_get_connection()
+        try:
+            cursor = conn.cursor()
+            try:
+                for sql in PG_CREATE_SQL:
+                    cursor.execute(sql)
+                conn.commit()
+                self.trgm_enabled = True
+            except Exception as e:
+                # 没有 CREATE EXTENSION 权限时 LIKE 仍可用，只是没有索引
+                conn.rollback()
+                logger.warning(f"创建 pg_trgm 索引失败，模糊搜索回退到 LIKE: {e}")
+        finally:
+            conn.close()
+
+    def contains_condition(
+        self,
+        term: str,
+        columns: Sequence[str] = INDEXED_COLUMNS,
+        alias: str = "",
+    ) -> Tuple[str, List]:
+        """
+        "任一列包含 term" 的 WHERE 条件（语义与 `col LIKE '%term%' OR ...` 相同）
+
+        Args:
+            term: 搜索词（% 和 _ 按 LIKE 通配符处理，与旧实现一致）
+            columns: 要匹配的列，取自 INDEXED_COLUMNS
+            alias: competitor_videos 的表别名（如 "cv"）
+
+        Returns:
+            (条件 SQL, 参数列表)
+        """
+        prefix = f"{alias}." if alias else ""
+        pattern = f"%{term}%"
+        like_sql = " OR ".join(f"{prefix}{column} LIKE ?" for column in columns)
+        like_params = [pattern] * len(columns)
+
+        # 短词（或含通配符、没有 trigram 索引）：纯 LIKE
+        if len(term) >= MIN_TRIGRAM_LENGTH and not any(c in term for c in '%_'):
+            if self.fts_enabled:
+                # FTS5 给出候选 rowid，LIKE 复核（trigram 对非 ASCII 字母的大小写折叠比 LIKE 宽）
+                match = '{%s} : "%s"' % (' '.join(columns), term.replace('"', '""'))
+                return (
+                    f"({prefix}id IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH ?)"
+                    f" AND ({like_sql}))",
+                    [match, *like_params],
+                )
+        return f"({like_sql})", like_params
+
+    def status(self) -> Dict[str, object]:
+        """索引状态（排查用）"""
+        return {
+            "fts_enabled": self.fts_enabled,
+            "trgm_enabled": self.trgm_enabled,
+        }
+
+
+_indexes: Dict[str, VideoSearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_search_index(db_path: Optional[str] = None) -> VideoSearchIndex:
+    """获取进程级共享的搜索索引（每个数据库一个实例，首次获取时建立索引）"""
+    key = 'neon' if is_using_neon() else str(Path(db_path or "data/youtube_pipeline.db").resolve())
+    index = _indexes.get(key)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(key)
+            if index is None:
+                index = _indexes[key] = VideoSearchIndex(db_path)
+    return index.ensure()
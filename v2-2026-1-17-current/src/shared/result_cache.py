@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分析结果缓存
+
+替代 api_server 中无上限的 dict 缓存，提供：
+- LRU + TTL 淘汰，并按估算的字节数限制总内存
+- 单飞（single-flight）：同一个 key 并发未命中时只计算一次，其余请求等待结果
+- 数据版本失效：competitor_videos 变化后旧结果全部作废
+- 命中 / 未命中 / 淘汰计数
+
+数据版本由两部分组成：
+1. 本进程内的写入计数（Repository 写入后调用 mark_data_changed）
+2. 条目计算时所读数据库的指纹（最大 id + 最大 updated_at + agg_global 视频数），用于感知其他进程
+   （脚本、定时任务）的写入；三项都走索引或单行读取，每个数据库每 FINGERPRINT_INTERVAL 秒最多查询一次
+
+因此所有写入都必须设置 updated_at 并调用 mark_data_changed：脚本和定时任务应通过
+CompetitorVideoRepository 写入（save_batch / update_details_batch / update_fields_batch 等都会这样做），
+不要直接执行 UPDATE，否则只改数值列的写入在 TTL 到期前不会使缓存失效。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .db_compat import get_connection, db_exists, is_using_neon
+from .logger import setup_logger
+
+logger = setup_logger('result_cache')
+
+# 数据库指纹的最小刷新间隔（秒）
+FINGERPRINT_INTERVAL = 5.0
+
+# 估算大小时数字、布尔、None 等标量按这么多字节计
+SCALAR_BYTES = 8
+
+# 估算大小时大容器只抽样这么多个元素，按元素数放大
+SIZE_SAMPLE = 32
+
+# 数据库指纹：MAX 分别放在标量子查询里，各自走主键 / idx_cv_updated_at 索引
+# （合在一个 SELECT 里时 SQLite 不做 min/max 优化，会整表扫描）；
+# 删除不改变前两项，由 Repository 维护的 agg_global.video_count 反映
+FINGERPRINT_SQL = """
+    SELECT
+        (SELECT MAX(id) FROM competitor_videos),
+        (SELECT MAX(updated_at) FROM competitor_videos),
+        (SELECT video_count FROM agg_global WHERE id = 1)
+"""
+
+_local_version = 0
+_fingerprints: Dict[str, tuple] = {}  # 数据库 -> (checked_at, fingerprint)
+_version_lock = threading.Lock()
+
+
+def mark_data_changed():
+    """标记 competitor_videos 已被本进程修改（使缓存立即失效）"""
+    global _local_version
+    with _version_lock:
+        _local_version += 1
+
+
+def _database_key(db_path: Optional[str]) -> str:
+    """指纹缓存的数据库标识（PostgreSQL 模式下所有路径指向同一个库）"""
+    if is_using_neon():
+        return 'neon'
+    return str(Path(db_path or "data/youtube_pipeline.db").resolve())
+
+
+def _read_fingerprint(db_path: Optional[str]):
+    """读取指定数据库中 competitor_videos 的指纹"""
+    if not db_exists(db_path):
+        return None
+    conn = get_connection(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(FINGERPRINT_SQL)
+        return tuple(cursor.fetchone())
+    finally:
+        conn.close()
+
+
+def data_version(db_path: Optional[str] = None) -> tuple:
+    """
+    当前数据版本（本进程写入计数 + 数据库指纹）
+
+    Args:
+        db_path: 结果读取的数据库路径，默认 data/youtube_pipeline.db（PostgreSQL 模式下忽略）
+
+    Returns:
+        可比较的版本元组
+    """
+    key = _database_key(db_path)
+    now = time.monotonic()
+    checked_at, fingerprint = _fingerprints.get(key, (None, None))
+    if checked_at is None or now - checked_at >= FINGERPRINT_INTERVAL:
+        try:
+            fingerprint = _read_fingerprint(db_path)
+        except Exception as e:
+            # 查询失败时沿用上次的指纹（本进程的写入仍会通过 mark_data_changed 生效）
+            logger.warning(f"读取数据库指纹失败 ({key}): {e}")
+        with _version_lock:
+            _fingerprints[key] = (now, fingerprint)
+    return (_local_version, fingerprint)
+
+
+def estimate_size(value: Any) -> int:
+    """
+    估算结果占用的字节数（近似 JSON 输出长度）
+
+    不做序列化：字符串按长度、标量按 SCALAR_BYTES 计；超过 SIZE_SAMPLE 个元素的列表 / 字典
+    只估算均匀抽取的 SIZE_SAMPLE 个元素再按元素数放大，写入缓存的开销与结果大小基本无关。
+    """
+    if isinstance(value, (str, bytes)):
+        return len(value) + 2
+    if isinstance(value, dict):
+        count = len(value)
+        items = list(islice(value.items(), SIZE_SAMPLE)) if count > SIZE_SAMPLE else value.items()
+        sampled = sum(estimate_size(k) + estimate_size(v) + 2 for k, v in items)
+        return 2 + (sampled * count // SIZE_SAMPLE if count > SIZE_SAMPLE else sampled)
+    if isinstance(value, (list, tuple)):
+        count = len(value)
+        if count > SIZE_SAMPLE:
+            step = count / SIZE_SAMPLE
+            sampled = sum(estimate_size(value[int(i * step)]) for i in range(SIZE_SAMPLE))
+            return 2 + count + sampled * count // SIZE_SAMPLE
+        return 2 + count + sum(estimate_size(item) for item in value)
+    return SCALAR_BYTES
+
+
+class _Flight:
+    """进行中的计算"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class ResultCache:
+    """LRU + TTL + 字节预算的单飞缓存（线程安全）"""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 600,
+        version_fn: Callable[[Optional[str]], Any] = data_version,
+    ):
+        """
+        Args:
+            max_entries: 最大条目数
+            max_bytes: 最大总字节数
+            ttl: 默认过期时间（秒）
+            version_fn: 数据版本函数（参数为条目读取的数据库路径），版本变化后旧条目失效
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.version_fn = version_fn
+
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (expires_at, version, size, value)
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+        self._expired = 0
+        self._invalidated = 0
+        self._namespaces: Dict[str, Dict[str, int]] = {}
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        ttl: Optional[float] = None,
+        cacheable: Callable[[Any], bool] = None,
+        db_path: Optional[str] = None,
+    ) -> Any:
+        """
+        读取缓存，未命中时计算并写入
+
+        Args:
+            key: 缓存键（建议为元组，首元素作为命名空间统计）
+            compute: 计算函数
+            ttl: 本条目的过期时间（秒），默认使用实例配置
+            cacheable: 判断结果是否可缓存，默认不缓存 {"status": "error"} 结果
+            db_path: compute 读取的数据库路径，条目按该库的数据版本失效，默认 data/youtube_pipeline.db
+
+        Returns:
+            缓存或新计算的结果
+        """
+        namespace = key[0] if isinstance(key, tuple) and key else str(key)
+        version = self.version_fn(db_path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, entry_version, size, value = entry
+                if entry_version != version:
+                    self._drop(key)
+                    self._invalidated += 1
+                elif expires_at < time.monotonic():
+                    self._drop(key)
+                    self._expired += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    self._count(namespace, "hits")
+                    return value
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._misses += 1
+                self._count(namespace, "misses")
+            else:
+                self._coalesced += 1
+                self._count(namespace, "coalesced")
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            value = compute()
+            flight.result = value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+        if (cacheable or _default_cacheable)(value):
+            self._store(key, value, version, self.ttl if ttl is None else ttl)
+        return value
+
+    def _store(self, key: Hashable, value: Any, version: Any, ttl: float):
+        """写入条目并按条目数 / 字节预算淘汰最久未用的条目"""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl, version, size, value)
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._evictions += 1
+
+    def _drop(self, key: Hashable):
+        """删除条目（调用方持有锁）"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def _count(self, namespace: str, field: str):
+        """命名空间计数（调用方持有锁）"""
+        counters = self._namespaces.setdefault(namespace, {"hits": 0, "misses": 0, "coalesced": 0})
+        counters[field] += 1
+
+    def invalidate(self, namespace: Optional[str] = None):
+        """
+        清除缓存
+
+        Args:
+            namespace: 只清除该命名空间的条目，None 表示全部
+        """
+        with self._lock:
+            keys = [
+                k for k in self._entries
+                if namespace is None or (isinstance(k, tuple) and k and k[0] == namespace)
+            ]
+            for k in keys:
+                self._drop(k)
+            self._invalidated += len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存指标"""
+        with self._lock:
+            lookups = self._hits + self._misses + self._coalesced
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "coalesced": self._coalesced,
+                "evictions": self._evictions,
+                "expired": self._expired,
+                "invalidated": self._invalidated,
+                "hit_rate": round((self._hits + self._coalesced) / lookups, 4) if lookups else 0,
+                "namespaces": {k: dict(v) for k, v in self._namespaces.items()},
+            }
+
+
+def _default_cacheable(value: Any) -> bool:
+    """错误结果不缓存"""
+    return not (isinstance(value, dict) and value.get("status") == "error")
+
+
+# 分析接口共享的缓存实例
+_analysis_cache: Optional[ResultCache] = None
+
+
+def get_analysis_cache() -> ResultCache:
+    """获取分析接口共享的缓存实例（容量可通过 cache.entries / cache.megabytes / cache.ttl 配置）"""
+    global _analysis_cache
+    if _analysis_cache is None:
+        with _version_lock:
+            if _analysis_cache is None:
+                max_entries, megabytes, ttl = 256, 64, 600
+                try:
+                    from .config import get_config
+                    config = get_config()
+                    max_entries = config.get('cache.entries', max_entries)
+                    megabytes = config.get('cache.megabytes', megabytes)
+                    ttl = config.get('cache.ttl', ttl)
+                except Exception:
+                    pass
+                _analysis_cache = ResultCache(
+                    max_entries=int(max_entries),
+                    max_bytes=int(megabytes * 1024 * 1024),
+                    ttl=float(ttl),
+                )
+    return _analysis_cache
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQLite 性能配置与索引迁移
+
+所有 SQLite 连接统一使用同一组 PRAGMA：
+- journal_mode=WAL      读写互不阻塞（读不再等写事务结束）
+- busy_timeout          写锁被占用时等待而不是立即报 "database is locked"
+- synchronous=NORMAL    WAL 模式下安全且每次提交不再 fsync
+- mmap_size / cache_size / temp_store=MEMORY  减少读取和排序时的系统调用与磁盘临时文件
+
+索引迁移按版本号记录在 schema_migrations 表中，每个数据库每进程检查一次；
+迁移依赖的表还不存在时跳过，等表创建后下次启动再执行。
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .logger import setup_logger
+
+logger = setup_logger('sqlite_tuning')
+
+# 连接级 PRAGMA（journal_mode 写入数据库文件，只需设置一次，其余每个连接都要设置）
+PRAGMAS = {
+    "busy_timeout": 30000,        # 毫秒
+    "synchronous": "NORMAL",
+    "mmap_size": 268435456,       # 256MB
+    "cache_size": -65536,         # 负数表示 KB，即 64MB
+    "temp_store": "MEMORY",
+}
+JOURNAL_MODE = "WAL"
+
+# 索引迁移：(版本, 说明, 依赖的表, SQL 列表)
+MIGRATIONS = [
+    (1, "competitor_videos 常用筛选/排序索引", ("competitor_videos",), [
+        "CREATE INDEX IF NOT EXISTS idx_cv_channel_id ON competitor_videos(channel_id)",
+        "CREATE INDEX IF NOT EXISTS idx_cv_published_at ON competitor_videos(published_at)",
+        "CREATE INDEX IF NOT EXISTS idx_cv_theme_views ON competitor_videos(theme, view_count DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_cv_keyword_views ON competitor_videos(keyword_source, view_count DESC)",
+    ]),
+    (2, "video_comments 按视频查询评论", ("video_comments",), [
+        "CREATE INDEX IF NOT EXISTS idx_comments_video ON video_comments(youtube_id)",
+    ]),
+    # 与 CompetitorVideoRepository.SORT_KEYS 的表达式一致，游标分页按索引顺序定位，不再排序
+    (3, "competitor_videos 游标分页索引", ("competitor_videos",), [
+        "CREATE INDEX IF NOT EXISTS idx_cv_keyset_views ON competitor_videos(COALESCE(view_count, 0) DESC, id DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_cv_theme_keyset_views"
+        " ON competitor_videos(theme, COALESCE(view_count, 0) DESC, id DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_cv_theme_keyset_likes"
+        " ON competitor_videos(theme, COALESCE(like_count, 0) DESC, COALESCE(view_count, 0) DESC, id DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_cv_theme_keyset_date"
+        " ON competitor_videos(theme, (published_at IS NULL), published_at DESC, COALESCE(view_count, 0) DESC, id DESC)",
+    ]),
+    # 与 aggregate_repo.CHANNEL_KEY_SQL 的表达式一致，聚合表按频道键重算时走索引
+    (4, "competitor_videos 频道分组键索引", ("competitor_videos",), [
+        "CREATE INDEX IF NOT EXISTS idx_cv_channel_key ON competitor_videos(("
+        "CASE WHEN channel_id IS NOT NULL AND channel_id NOT IN ('', 'None') "
+        "THEN channel_id ELSE NULLIF(channel_name, '') END))",
+    ]),
+    # result_cache 的数据库指纹读取 MAX(updated_at)
+    (5, "competitor_videos 更新时间索引", ("competitor_videos",), [
+        "CREATE INDEX IF NOT EXISTS idx_cv_updated_at ON competitor_videos(updated_at)",
+    ]),
+]
+
+CREATE_MIGRATIONS_SQL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name TEXT,
+    applied_at TEXT DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+_wal_ready = set()
+_migrated = set()
+_lock = threading.Lock()
+
+
+def apply_profile(conn: sqlite3.Connection, db_path: Optional[str] = None) -> sqlite3.Connection:
+    """
+    对连接应用性能 PRAGMA
+
+    Args:
+        conn: sqlite3 连接
+        db_path: 数据库路径（用于每个文件只切换一次 WAL；内存库传 None）
+
+    Returns:
+        同一个连接
+    """
+    for name, value in PRAGMAS.items():
+        conn.execute(f"PRAGMA {name}={value}")
+
+    key = _file_key(db_path)
+    if key is not None and key not in _wal_ready:
+        try:
+            conn.execute(f"PRAGMA journal_mode={JOURNAL_MODE}")
+            _wal_ready.add(key)
+        except sqlite3.OperationalError as e:
+            # 其他连接正持有事务或文件只读时无法切换，下个连接再试
+            logger.warning(f"切换 SQLite WAL 模式失败: {e}")
+    return conn
+
+
+def connect(db_path: Union[str, Path], timeout: float = 30.0, **kwargs) -> sqlite3.Connection:
+    """
+    打开 SQLite 连接并应用性能配置（替代直接调用 sqlite3.connect）
+
+    Args:
+        db_path: 数据库路径
+        timeout: 等待写锁的秒数
+        **kwargs: 传给 sqlite3.connect 的其他参数
+
+    Returns:
+        sqlite3 连接
+    """
+    conn = sqlite3.connect(str(db_path), timeout=timeout, **kwargs)
+    return apply_profile(conn, str(db_path))
+
+
+def _file_key(db_path: Optional[str]) -> Optional[str]:
+    if not db_path or db_path == ":memory:" or db_path.startswith("file:"):
+        return None
+    return str(Path(db_path).resolve())
+
+
+def migrate(conn: sqlite3.Connection) -> List[int]:
+    """
+    执行尚未应用的索引迁移
+
+    Args:
+        conn: sqlite3 连接
+
+    Returns:
+        本次应用的迁移版本号
+    """
+    conn.execute(CREATE_MIGRATIONS_SQL)
+    applied = {row[0] for row in conn.execute("SELECT version FROM schema_migrations")}
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+    done = []
+    for version, name, required, statements in MIGRATIONS:
+        if version in applied or not all(table in tables for table in required):
+            continue
+        for sql in statements:
+            conn.execute(sql)
+        conn.execute("INSERT INTO schema_migrations (version, name) VALUES (?, ?)", (version, name))
+        done.append(version)
+    conn.commit()
+
+    if done:
+        # 新索引需要统计信息，查询规划器才会选用
+        conn.execute("PRAGMA optimize")
+    return done
+
+
+def ensure_migrated(db_path: Union[str, Path]) -> List[int]:
+    """
+    每个数据库每进程执行一次 migrate()
+
+    Args:
+        db_path: 数据库路径
+
+    Returns:
+        本次应用的迁移版本号（已检查过的数据库返回空列表）
+    """
+    key = _file_key(str(db_path))
+    if key is None or key in _migrated:
+        return []
+    with _lock:
+        if key in _migrated:
+            return []
+        conn = connect(db_path)
+        try:
+            done = migrate(conn)
+        finally:
+            conn.close()
+        _migrated.add(key)
+    if done:
+        logger.info(f"SQLite 索引迁移完成: {db_path} -> 版本 {done}")
+    return done
+
+
+def profile_status(conn: sqlite3.Connection) -> Dict[str, object]:
+    """当前连接实际生效的 PRAGMA（排查用）"""
+    names = ["journal_mode", *PRAGMAS]
+    return {name: conn.execute(f"PRAGMA {name}").fetchone()[0] for name in names}
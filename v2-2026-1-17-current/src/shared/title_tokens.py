@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+标题分词缓存
+
+多个分析模块（/api/analyze 标题模式、创作助手选题/标题、套利分析关键词）都要对同一批标题做 jieba 分词，
+以前每次请求都重新分词。这里提供进程共享的分词结果：
+
+- 持久层：title_tokens 表，按 youtube_id 存储，附带标题哈希；标题变化或分词规则升级后自动重算
+- 内存层：按标题哈希的 LRU（相同标题只分词一次，只有标题没有 youtube_id 的调用方也能命中）
+- 批量加载：load() 一次查询一批缺失的视频，未命中的集中分词后批量写回
+
+缓存的是"分词 + 基础过滤"后的词（去空白、去单字、去纯数字），
+各模块的停用词表不同，在读取后用 filter_tokens() 各自过滤。
+"""
+
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from .db_compat import get_connection, is_using_neon
+from .logger import setup_logger
+
+logger = setup_logger('title_tokens')
+
+# 分词规则版本（修改 tokenize() 的过滤规则后递增，旧缓存自动失效）
+TOKENIZER_VERSION = 1
+
+# 内存层最多缓存的标题数
+MAX_MEMORY_ENTRIES = 200_000
+
+# IN 查询每批的参数个数（SQLite 变量上限）
+IN_BATCH = 500
+
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS title_tokens (
+    youtube_id TEXT PRIMARY KEY,
+    title_hash TEXT NOT NULL,
+    tokens TEXT NOT NULL
+)
+"""
+
+
+def title_hash(title: str) -> str:
+    """标题哈希（包含分词规则版本）"""
+    data = f"{TOKENIZER_VERSION}\x00{title}".encode('utf-8')
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def tokenize(title: Optional[str]) -> List[str]:
+    """
+    jieba 分词 + 基础过滤（去空白、长度 < 2、纯数字）
+
+    Args:
+        title: 标题
+
+    Returns:
+        按出现顺序排列的词（可能重复）
+    """
+    if not title:
+        return []
+    import jieba
+
+    tokens = []
+    for word in jieba.cut(title):
+        word = word.strip()
+        if len(word) >= 2 and not word.isdigit():
+            tokens.append(word)
+    return tokens
+
+
+def filter_tokens(tokens: Iterable[str], stopwords: set) -> List[str]:
+    """按调用方的停用词表过滤"""
+    return [word for word in tokens if word not in stopwords]
+
+
+def _id_and_title(video: Any) -> tuple:
+    """兼容 CompetitorVideo 对象和 dict"""
+    if isinstance(video, dict):
+        return video.get('youtube_id'), video.get('title')
+    return getattr(video, 'youtube_id', None), getattr(video, 'title', None)
+
+
+class TitleTokenStore:
+    """标题分词缓存（线程安全）"""
+
+    def __init__(self, db_path: Optional[str] = None, max_entries: int = MAX_MEMORY_ENTRIES):
+        """
+        Args:
+            db_path: SQLite 数据库路径（PostgreSQL 模式下忽略）
+            max_entries: 内存层最多缓存的标题数
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()  # title_hash -> tokens
+        self._lock = threading.Lock()
+        self._table_ready = False
+
+        self._memory_hits = 0
+        self._db_hits = 0
+        self._tokenized = 0
+
+    def _get_connection(self):
+        return get_connection(self.db_path, row_factory=sqlite3.Row)
+
+    def _ensure_table(self, cursor):
+        if not self._table_ready:
+            cursor.execute(CREATE_TABLE_SQL)
+            self._table_ready = True
+
+    def _remember(self, key: str, tokens: tuple):
+        """写入内存层（调用方持有锁）"""
+        self._memory[key] = tokens
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def tokens(self, title: Optional[str]) -> List[str]:
+        """
+        单个标题的分词结果（只走内存层，不读写数据库）
+
+        Args:
+            title: 标题
+
+        Returns:
+            基础过滤后的词列表
+        """
+        if not title:
+            return []
+        key = title_hash(title)
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                self._memory.move_to_end(key)
+                self._memory_hits += 1
+                return list(cached)
+
+        tokens = tuple(tokenize(title))
+        with self._lock:
+            self._tokenized += 1
+            self._remember(key, tokens)
+        return list(tokens)
+
+    def load(self, videos: Sequence[Any]) -> List[List[str]]:
+        """
+        批量获取分词结果：内存层 → title_tokens 表 → 分词并写回
+
+        Args:
+            videos: CompetitorVideo 对象或含 youtube_id / title 的 dict
+
+        Returns:
+            与 videos 一一对应的词列表
+        """
+        entries = []
+        for video in videos:
+            youtube_id, title = _id_and_title(video)
+            entries.append((youtube_id, title, title_hash(title) if title else None))
+
+        results: Dict[str, tuple] = {}
+        with self._lock:
+            for _, _, key in entries:
+                if key is not None and key not in results:
+                    cached = self._memory.get(key)
+                    if cached is not None:
+                        self._memory.move_to_end(key)
+                        self._memory_hits += 1
+                        results[key] = cached
+
+        # 数据库层：按 youtube_id 查询，标题哈希一致才算命中
+        missing = {yid: key for yid, _, key in entries if key is not None and key not in results and yid}
+        if missing:
+            try:
+                found = self._read(missing)
+                results.update(found)
+                with self._lock:
+                    self._db_hits += len(found)
+                    for key, tokens in found.items():
+                        self._remember(key, tokens)
+            except Exception as e:
+                logger.warning(f"读取 title_tokens 失败: {e}")
+
+        # 分词未命中的标题，有 youtube_id 的批量写回
+        computed = {}
+        rows = []
+        for youtube_id, title, key in entries:
+            if key is None or key in results:
+                continue
+            tokens = computed.get(key)
+            if tokens is None:
+                tokens = computed[key] = tuple(tokenize(title))
+            if youtube_id:
+                rows.append((youtube_id, key, ' '.join(tokens)))
+        if computed:
+            results.update(computed)
+            with self._lock:
+                self._tokenized += len(computed)
+                for key, tokens in computed.items():
+                    self._remember(key, tokens)
+        if rows:
+            try:
+                self._write(rows)
+            except Exception as e:
+                logger.warning(f"写入 title_tokens 失败: {e}")
+
+        return [list(results[key]) if key is not None else [] for _, _, key in entries]
+
+    def _read(self, missing: Dict[str, str]) -> Dict[str, tuple]:
+        """按 youtube_id 读取，返回 {title_hash: tokens}（哈希不一致的行视为过期）"""
+        found = {}
+        ids = list(missing)
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            self._ensure_table(cursor)
+            for start in range(0, len(ids), IN_BATCH):
+                batch = ids[start:start + IN_BATCH]
+                placeholders = ','.join('?' * len(batch))
+                cursor.execute(
+                    f"SELECT youtube_id, title_hash, tokens FROM title_tokens WHERE youtube_id IN ({placeholders})",
+                    batch
+                )
+                for row in cursor.fetchall():
+                    if missing.get(row['youtube_id']) == row['title_hash']:
+                        found[row['title_hash']] = tuple(row['tokens'].split(' ')) if row['tokens'] else ()
+            conn.commit()
+        finally:
+            conn.close()
+        return found
+
+    def _write(self, rows: List[tuple]):
+        """批量写回 (youtube_id, title_hash, tokens)"""
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            self._ensure_table(cursor)
+            cursor.executemany("""
+                INSERT INTO title_tokens (youtube_id, title_hash, tokens) VALUES (?, ?, ?)
+                ON CONFLICT (youtube_id) DO UPDATE SET
+                    title_hash = excluded.title_hash,
+                    tokens = excluded.tokens
+            """, rows)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, int]:
+        """缓存指标"""
+        with self._lock:
+            return {
+                "memory_entries": len(self._memory),
+                "memory_hits": self._memory_hits,
+                "db_hits": self._db_hits,
+                "tokenized": self._tokenized,
+            }
+
+
+_stores: Dict[str, TitleTokenStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_title_token_store(db_path: Optional[str] = None) -> TitleTokenStore:
+    """获取进程级共享的标题分词缓存（每个数据库一个实例）"""
+    key = 'neon' if is_using_neon() else str(Path(db_path or "data/youtube_pipeline.db").resolve())
+    store = _stores.get(key)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(key)
+            if store is None:
+                store = _stores[key] = TitleTokenStore(db_path)
+    return store